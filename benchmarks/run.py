@@ -0,0 +1,406 @@
+"""Throughput and latency benchmarks for the sync and async queues.
+
+Runs each scenario for every payload size and concurrency level and prints
+one JSON document with ops/sec and p50/p99/p999 latencies, so results can be
+stored and compared across commits. See benchmarks/README.md.
+
+    python -m benchmarks.run                          # in-process fakeredis
+    python -m benchmarks.run --redis-server redis-server
+    python -m benchmarks.run --redis-url redis://localhost:6379/15 --output bench.json
+"""
+
+import argparse
+import asyncio
+import importlib.metadata
+import json
+import math
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+import redis
+
+from redis_message_queue import RedisMessageQueue
+from redis_message_queue._stored_message import encode_stored_message
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+SCENARIOS = (
+    "publish",
+    "publish_dedup",
+    "claim",
+    "ack",
+    "heartbeat_renew",
+    "reclaim_under_backlog",
+    "redrive",
+    "stats",
+)
+MODES = ("sync", "async")
+# Visibility timeout used by the reclaim scenario; its leases are left to expire.
+_RECLAIM_VISIBILITY_TIMEOUT_SECONDS = 1
+_REDRIVE_BATCH = 100
+
+
+@dataclass(frozen=True)
+class Result:
+    scenario: str
+    mode: str
+    payload_bytes: int
+    concurrency: int
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+
+
+class _Latencies:
+    """Thread-safe latency sink; ops/sec is measured over the whole timed phase."""
+
+    def __init__(self) -> None:
+        self._samples: list[float] = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def result(self, scenario: str, mode: str, payload_bytes: int, concurrency: int, elapsed: float) -> Result:
+        samples = sorted(self._samples)
+        return Result(
+            scenario=scenario,
+            mode=mode,
+            payload_bytes=payload_bytes,
+            concurrency=concurrency,
+            ops=len(samples),
+            seconds=round(elapsed, 6),
+            ops_per_sec=round(len(samples) / elapsed, 1) if elapsed > 0 else 0.0,
+            p50_ms=_percentile(samples, 0.50),
+            p99_ms=_percentile(samples, 0.99),
+            p999_ms=_percentile(samples, 0.999),
+        )
+
+
+def _percentile(samples: list[float], quantile: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, math.ceil(quantile * len(samples)) - 1))
+    return round(samples[index] * 1000, 4)
+
+
+def _split(ops: int, concurrency: int) -> list[int]:
+    base, extra = divmod(ops, concurrency)
+    return [base + (1 if worker < extra else 0) for worker in range(concurrency)]
+
+
+class _Backend:
+    """Hands out Redis clients for one benchmark run: fakeredis, a URL, or a spawned redis-server."""
+
+    def __init__(self, redis_url: str | None, redis_server: str | None) -> None:
+        self._process: subprocess.Popen[bytes] | None = None
+        self._fake_server: Any = None
+        if redis_server is not None:
+            executable = shutil.which(redis_server)
+            if executable is None:
+                raise SystemExit(f"redis-server executable not found: {redis_server}")
+            port = _free_port()
+            self._process = subprocess.Popen(
+                [executable, "--port", str(port), "--save", "", "--appendonly", "no"],
+                stdout=subprocess.DEVNULL,
+            )
+            redis_url = f"redis://127.0.0.1:{port}/0"
+            _wait_for_redis(redis_url)
+        self.redis_url = redis_url
+        if redis_url is None:
+            try:
+                import fakeredis
+            except ImportError:
+                raise SystemExit("fakeredis is not installed; pass --redis-url or --redis-server") from None
+            self._fake_server = fakeredis.FakeServer()
+        self.description = "fakeredis" if redis_url is None else redis_url
+
+    def sync_client(self) -> redis.Redis:
+        if self._fake_server is not None:
+            import fakeredis
+
+            return fakeredis.FakeRedis(server=self._fake_server)
+        assert self.redis_url is not None
+        return redis.Redis.from_url(self.redis_url)
+
+    def async_client(self) -> Any:
+        if self._fake_server is not None:
+            import fakeredis
+
+            return fakeredis.FakeAsyncRedis(server=self._fake_server)
+        assert self.redis_url is not None
+        return redis.asyncio.Redis.from_url(self.redis_url)
+
+    def close(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_redis(url: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    client = redis.Redis.from_url(url)
+    while True:
+        try:
+            client.ping()
+            return
+        except redis.exceptions.ConnectionError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _queue_options(scenario: str) -> dict[str, Any]:
+    if scenario == "publish_dedup":
+        return {"deduplication": True, "get_deduplication_key": lambda message: uuid.uuid4().hex}
+    if scenario == "reclaim_under_backlog":
+        return {"visibility_timeout_seconds": _RECLAIM_VISIBILITY_TIMEOUT_SECONDS}
+    return {}
+
+
+def _fill_pending(client: redis.Redis, queue: RedisMessageQueue, payload: str, count: int) -> None:
+    """Load ``count`` envelopes straight into pending; setup is not what is being measured."""
+    pipeline = client.pipeline(transaction=False)
+    for _ in range(count):
+        pipeline.lpush(queue.key.pending, encode_stored_message(payload))
+    pipeline.execute()
+
+
+def _claim_abandoned(queue: RedisMessageQueue, count: int) -> None:
+    """Claim ``count`` messages without acking them, as crashed consumers would."""
+    gateway = queue._redis
+    for _ in range(count):
+        gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+
+
+def _run_threads(concurrency: int, ops: int, work: Callable[[int], None]) -> float:
+    threads = [threading.Thread(target=work, args=(share,)) for share in _split(ops, concurrency)]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started_at
+
+
+def run_sync(backend: _Backend, scenario: str, payload: str, ops: int, concurrency: int) -> Result:
+    client = backend.sync_client()
+    name = f"bench-{uuid.uuid4().hex[:8]}"
+    queue = RedisMessageQueue(name, client=client, **_queue_options(scenario))
+    latencies = _Latencies()
+    payload_bytes = len(payload.encode())
+    # Phase timing for the claim/ack split: each latency is one side of the
+    # ``with`` block, so both scenarios run the full claim-then-ack cycle.
+    measure_ack = scenario == "ack"
+
+    if scenario in ("claim", "ack", "reclaim_under_backlog"):
+        _fill_pending(client, queue, payload, ops)
+    if scenario == "reclaim_under_backlog":
+        # Half the backlog sits in processing with leases that expire before
+        # the timed phase, so every claim runs the reclaim sweep over them.
+        _claim_abandoned(queue, ops // 2)
+        time.sleep(_RECLAIM_VISIBILITY_TIMEOUT_SECONDS + 0.1)
+    if scenario == "redrive":
+        dead_letter = queue._redis.dead_letter_queue
+        pipeline = client.pipeline(transaction=False)
+        for _ in range(ops):
+            pipeline.lpush(dead_letter, encode_stored_message(payload))
+        pipeline.execute()
+    lease = None
+    if scenario == "heartbeat_renew":
+        _fill_pending(client, queue, payload, 1)
+        lease = queue._redis.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+
+    def work(share: int) -> None:
+        for _ in range(share):
+            started_at = time.perf_counter()
+            if scenario in ("publish", "publish_dedup"):
+                queue.publish(payload)
+            elif scenario in ("claim", "ack", "reclaim_under_backlog"):
+                with queue.process_message() as message:
+                    claimed_at = time.perf_counter()
+                    assert message is not None
+                if measure_ack:
+                    latencies.add(time.perf_counter() - claimed_at)
+                    continue
+                latencies.add(claimed_at - started_at)
+                continue
+            elif scenario == "heartbeat_renew":
+                assert lease is not None
+                queue._redis.renew_message_lease(queue.key.processing, lease.stored_message, lease.lease_token)
+            elif scenario == "redrive":
+                queue.redrive_dead_letters(max_messages=_REDRIVE_BATCH)
+            elif scenario == "stats":
+                queue.stats()
+            latencies.add(time.perf_counter() - started_at)
+
+    if scenario == "redrive":
+        # One op is one redrive call moving up to _REDRIVE_BATCH messages.
+        ops = max(1, ops // _REDRIVE_BATCH)
+    elapsed = _run_threads(concurrency, ops, work)
+    _delete_queue_keys(client, name)
+    client.close()
+    return latencies.result(scenario, "sync", payload_bytes, concurrency, elapsed)
+
+
+async def run_async(backend: _Backend, scenario: str, payload: str, ops: int, concurrency: int) -> Result:
+    # Setup goes through the sync client; only the timed phase is async.
+    setup_client = backend.sync_client()
+    client = backend.async_client()
+    name = f"bench-{uuid.uuid4().hex[:8]}"
+    options = _queue_options(scenario)
+    setup_queue = RedisMessageQueue(name, client=setup_client, **options)
+    queue = AsyncRedisMessageQueue(name, client=client, **options)
+    latencies = _Latencies()
+    payload_bytes = len(payload.encode())
+    measure_ack = scenario == "ack"
+
+    if scenario in ("claim", "ack", "reclaim_under_backlog"):
+        _fill_pending(setup_client, setup_queue, payload, ops)
+    if scenario == "reclaim_under_backlog":
+        _claim_abandoned(setup_queue, ops // 2)
+        time.sleep(_RECLAIM_VISIBILITY_TIMEOUT_SECONDS + 0.1)
+    if scenario == "redrive":
+        dead_letter = setup_queue._redis.dead_letter_queue
+        pipeline = setup_client.pipeline(transaction=False)
+        for _ in range(ops):
+            pipeline.lpush(dead_letter, encode_stored_message(payload))
+        pipeline.execute()
+    lease = None
+    if scenario == "heartbeat_renew":
+        _fill_pending(setup_client, setup_queue, payload, 1)
+        lease = await queue._redis.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+
+    async def work(share: int) -> None:
+        for _ in range(share):
+            started_at = time.perf_counter()
+            if scenario in ("publish", "publish_dedup"):
+                await queue.publish(payload)
+            elif scenario in ("claim", "ack", "reclaim_under_backlog"):
+                async with queue.process_message() as message:
+                    claimed_at = time.perf_counter()
+                    assert message is not None
+                if measure_ack:
+                    latencies.add(time.perf_counter() - claimed_at)
+                    continue
+                latencies.add(claimed_at - started_at)
+                continue
+            elif scenario == "heartbeat_renew":
+                assert lease is not None
+                await queue._redis.renew_message_lease(queue.key.processing, lease.stored_message, lease.lease_token)
+            elif scenario == "redrive":
+                await queue.redrive_dead_letters(max_messages=_REDRIVE_BATCH)
+            elif scenario == "stats":
+                await queue.stats()
+            latencies.add(time.perf_counter() - started_at)
+
+    if scenario == "redrive":
+        ops = max(1, ops // _REDRIVE_BATCH)
+    workers: list[Awaitable[None]] = [work(share) for share in _split(ops, concurrency)]
+    started_at = time.perf_counter()
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - started_at
+    await client.aclose()
+    _delete_queue_keys(setup_client, name)
+    setup_client.close()
+    return latencies.result(scenario, "async", payload_bytes, concurrency, elapsed)
+
+
+def _delete_queue_keys(client: redis.Redis, name: str) -> None:
+    keys = list(client.scan_iter(match=f"{name}::*"))
+    if keys:
+        client.delete(*keys)
+
+
+def _package_version() -> str | None:
+    try:
+        return importlib.metadata.version("redis-message-queue")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _csv(kind: Callable[[str], Any], choices: tuple[str, ...] | None = None) -> Callable[[str], list[Any]]:
+    def parse(text: str) -> list[Any]:
+        values = [kind(item.strip()) for item in text.split(",") if item.strip()]
+        if choices is not None:
+            unknown = sorted(set(values) - set(choices))
+            if unknown:
+                raise argparse.ArgumentTypeError(f"unknown value(s) {unknown}; choose from {list(choices)}")
+        return values
+
+    return parse
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--redis-url", help="benchmark against this Redis; its queue keys are deleted afterwards")
+    target.add_argument("--redis-server", help="spawn this redis-server binary on a free port for the run")
+    parser.add_argument("--scenarios", type=_csv(str, SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--modes", type=_csv(str, MODES), default=list(MODES))
+    parser.add_argument("--payload-sizes", type=_csv(int), default=[64, 1024, 16384], help="payload bytes")
+    parser.add_argument("--concurrency", type=_csv(int), default=[1, 8], help="threads (sync) or tasks (async)")
+    parser.add_argument("--ops", type=int, default=2000, help="operations per scenario run")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    backend = _Backend(args.redis_url, args.redis_server)
+    results: list[Result] = []
+    try:
+        for scenario in args.scenarios:
+            for mode in args.modes:
+                for payload_bytes in args.payload_sizes:
+                    for concurrency in args.concurrency:
+                        payload = "x" * payload_bytes
+                        if mode == "sync":
+                            result = run_sync(backend, scenario, payload, args.ops, concurrency)
+                        else:
+                            result = asyncio.run(run_async(backend, scenario, payload, args.ops, concurrency))
+                        results.append(result)
+                        print(
+                            f"{scenario:<22} {mode:<5} {payload_bytes:>7}B x{concurrency:<3} "
+                            f"{result.ops_per_sec:>10.1f} ops/s  p99 {result.p99_ms:.3f} ms",
+                            file=sys.stderr,
+                        )
+    finally:
+        backend.close()
+
+    document = {
+        "meta": {
+            "version": _package_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend.description,
+            "ops": args.ops,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": [asdict(result) for result in results],
+    }
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
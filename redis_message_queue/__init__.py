@@ -1,5 +1,10 @@
 from redis_message_queue._abstract_redis_gateway import AbstractRedisGateway
+from redis_message_queue._collect_stats import collect_stats
+from redis_message_queue._consumer_supervisor import ConsumerSupervisor, run_consumer_processes
+from redis_message_queue._dedup_census import DeduplicationCensus
 from redis_message_queue._event import EventOperation, EventOutcome, QueueEvent
+from redis_message_queue._event_dispatch import BackgroundEventDispatcher
+from redis_message_queue._event_filter import EventFilter
 from redis_message_queue._exceptions import (
     ClaimStoreFailedError,
     CleanupFailedError,
@@ -15,8 +20,15 @@ from redis_message_queue._exceptions import (
     RedisMessageQueueError,
     RetryBudgetExhaustedError,
 )
+from redis_message_queue._message_handle import MessageHandle
+from redis_message_queue._metadata_gc import OrphanedMetadataReport
+from redis_message_queue._metrics import MetricsCollector, OperationMetrics
+from redis_message_queue._purge import PurgeProgress
 from redis_message_queue._queue_stats import QueueStats
+from redis_message_queue._queue_stats_collector import QueueStatsCollector
+from redis_message_queue._queue_worker import QueueWorker, run_consumers
 from redis_message_queue._redis_gateway import RedisGateway
+from redis_message_queue._round_trips import RoundTripStats
 from redis_message_queue._stored_message import ClaimedMessage, PublishPayload, ReceivedPayload
 from redis_message_queue.interrupt_handler import (
     BaseGracefulInterruptHandler,
@@ -27,16 +39,31 @@ from redis_message_queue.redis_message_queue import RedisMessageQueue
 
 __all__ = [
     "RedisMessageQueue",
+    "QueueWorker",
+    "run_consumers",
+    "ConsumerSupervisor",
+    "run_consumer_processes",
     "RedisGateway",
     "AbstractRedisGateway",
     "ClaimedMessage",
+    "MessageHandle",
     "ReceivedPayload",
     "PublishPayload",
     "QueueStats",
+    "collect_stats",
+    "QueueStatsCollector",
+    "PurgeProgress",
+    "OrphanedMetadataReport",
+    "DeduplicationCensus",
+    "RoundTripStats",
+    "MetricsCollector",
+    "OperationMetrics",
     "EventDrivenInterruptHandler",
     "GracefulInterruptHandler",
     "BaseGracefulInterruptHandler",
     "QueueEvent",
+    "EventFilter",
+    "BackgroundEventDispatcher",
     "EventOperation",
     "EventOutcome",
     "RedisMessageQueueError",
@@ -0,0 +1,3 @@
+from redis_message_queue._cli import main
+
+raise SystemExit(main())
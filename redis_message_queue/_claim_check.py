@@ -0,0 +1,108 @@
+import json
+import re
+import uuid
+
+from redis_message_queue._exceptions import ConfigurationError, MalformedStoredMessageError
+from redis_message_queue._payload_limits import validate_payload_limit_parameter
+from redis_message_queue._stored_message import ReceivedPayload, decode_stored_message
+
+# A claim-checked message carries ``<prefix><reference id>:<body size>`` as its
+# payload instead of the body. Only the reference id travels; the body key is
+# always rebuilt from the consuming queue's own key namespace, so a forged
+# reference cannot point a consumer (or its ack-time cleanup) at an arbitrary
+# Redis key.
+CLAIM_CHECK_REFERENCE_PREFIX = "\x1eRMQREF1:"
+_CLAIM_CHECK_REFERENCE_PREFIX_BYTES = CLAIM_CHECK_REFERENCE_PREFIX.encode("utf-8")
+_CLAIM_CHECK_REFERENCE_PATTERN = re.compile(r"([0-9a-f]{32}):([0-9]{1,18})")
+# An envelope-wrapped reference is about 110 bytes; any longer stored value
+# holds its payload inline and is not decoded to look for one.
+MAX_STORED_REFERENCE_SIZE = 256
+# What purge scripts search a stored value for to tell it may carry a
+# reference: the prefix itself (raw payloads and binary envelopes) or its JSON
+# escape (text envelopes). Python still parses every value they return.
+CLAIM_CHECK_REFERENCE_MARKERS = (CLAIM_CHECK_REFERENCE_PREFIX, json.dumps(CLAIM_CHECK_REFERENCE_PREFIX)[1:-1])
+
+
+def validate_claim_check_parameters(
+    claim_check_threshold_bytes: int | None,
+    claim_check_ttl_seconds: int | None,
+) -> tuple[int | None, int | None]:
+    claim_check_threshold_bytes = validate_payload_limit_parameter(
+        "claim_check_threshold_bytes", claim_check_threshold_bytes
+    )
+    claim_check_ttl_seconds = validate_payload_limit_parameter("claim_check_ttl_seconds", claim_check_ttl_seconds)
+    if claim_check_ttl_seconds is not None and claim_check_threshold_bytes is None:
+        raise ConfigurationError("'claim_check_ttl_seconds' requires 'claim_check_threshold_bytes' to be set.")
+    return claim_check_threshold_bytes, claim_check_ttl_seconds
+
+
+def claim_check_body_size(message: str | bytes, threshold_bytes: int) -> int | None:
+    """Return the UTF-8 size of ``message`` if it is above ``threshold_bytes``, else ``None``."""
+    if isinstance(message, bytes):
+        return len(message) if len(message) > threshold_bytes else None
+    # A str's UTF-8 size is between len() and 4 * len(); skip the encode when
+    # even the upper bound stays under the threshold.
+    if len(message) * 4 <= threshold_bytes:
+        return None
+    size = len(message.encode("utf-8"))
+    return size if size > threshold_bytes else None
+
+
+def new_claim_check_reference(body_size: int) -> tuple[str, str]:
+    """Return ``(reference_id, reference_payload)`` for a new claim-checked body."""
+    reference_id = uuid.uuid4().hex
+    return reference_id, f"{CLAIM_CHECK_REFERENCE_PREFIX}{reference_id}:{body_size}"
+
+
+def parse_claim_check_reference(payload: ReceivedPayload) -> tuple[str, int] | None:
+    """Return ``(reference_id, body_size)`` if ``payload`` is a claim-check reference, else ``None``."""
+    if isinstance(payload, bytes):
+        if not payload.startswith(_CLAIM_CHECK_REFERENCE_PREFIX_BYTES):
+            return None
+        try:
+            reference = payload[len(_CLAIM_CHECK_REFERENCE_PREFIX_BYTES) :].decode("ascii")
+        except UnicodeDecodeError:
+            return None
+    else:
+        if not payload.startswith(CLAIM_CHECK_REFERENCE_PREFIX):
+            return None
+        reference = payload[len(CLAIM_CHECK_REFERENCE_PREFIX) :]
+    match = _CLAIM_CHECK_REFERENCE_PATTERN.fullmatch(reference)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def parse_stored_claim_check_reference(stored: ReceivedPayload) -> str | None:
+    """Return the reference id carried by a list entry, envelope-wrapped or raw.
+
+    Pending/processing entries are envelopes; completed, failed, and
+    dead-letter entries hold the raw payload. Undecodable entries carry no
+    reference.
+    """
+    try:
+        payload = decode_stored_message(stored, strict_envelope_decoding=False)
+    except MalformedStoredMessageError:
+        return None
+    reference = parse_claim_check_reference(payload)
+    return None if reference is None else reference[0]
+
+
+def read_stored_claim_check_reference(
+    stored: ReceivedPayload, *, strict_envelope_decoding: bool = False
+) -> tuple[str, int] | None:
+    """Return ``(reference_id, body_size)`` for a claimed envelope without decoding inline payloads.
+
+    Raises ``MalformedStoredMessageError`` like ``decode_stored_message`` for
+    short values, which are the only ones decoded.
+    """
+    if len(stored) > MAX_STORED_REFERENCE_SIZE:
+        return None
+    payload = decode_stored_message(stored, strict_envelope_decoding=strict_envelope_decoding)
+    return parse_claim_check_reference(payload)
+
+
+def missing_claim_check_body_error(body_key: str) -> MalformedStoredMessageError:
+    return MalformedStoredMessageError(
+        f"claim-check body {body_key!r} is missing; it expired (claim_check_ttl_seconds) or was purged"
+    )
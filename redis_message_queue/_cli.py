@@ -0,0 +1,388 @@
+"""``python -m redis_message_queue``: stream queue lists to and from NDJSON files, collect orphaned metadata."""
+
+import argparse
+import base64
+import binascii
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator, Sequence, TypeVar
+
+import redis
+
+from redis_message_queue._claim_check import missing_claim_check_body_error, read_stored_claim_check_reference
+from redis_message_queue._exceptions import ConfigurationError, MalformedStoredMessageError, RedisMessageQueueError
+from redis_message_queue._metadata_gc import DEFAULT_METADATA_GC_BATCH_SIZE
+from redis_message_queue._queue_key_manager import QueueKeyManager
+from redis_message_queue._stored_message import decode_stored_message, encode_stored_message
+from redis_message_queue.redis_message_queue import RedisMessageQueue
+
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_TRANSFER_BATCH_SIZE = 1000
+DEFAULT_PIPELINE_DEPTH = 4
+
+_T = TypeVar("_T")
+
+_EXPORT_SOURCES = ("pending", "processing", "completed", "failed", "dead_letter")
+# processing entries are tied to lease metadata an import cannot recreate.
+_IMPORT_TARGETS = ("pending", "completed", "failed", "dead_letter")
+
+
+@dataclass(frozen=True)
+class TransferStats:
+    """Totals of one export or import run."""
+
+    entries: int
+    payload_bytes: int
+    seconds: float
+
+    def summary(self, verb: str, key: str) -> str:
+        rate = self.entries / self.seconds if self.seconds > 0 else float(self.entries)
+        megabytes = self.payload_bytes / 1_000_000
+        return (
+            f"{verb} {self.entries} entries ({megabytes:.1f} MB) {'from' if verb == 'exported' else 'into'} {key!r}"
+            f" in {self.seconds:.2f}s ({rate:,.0f} entries/s)"
+        )
+
+
+def _encode_field(record: dict[str, str], name: str, value: bytes) -> None:
+    try:
+        record[name] = value.decode("utf-8")
+    except UnicodeDecodeError:
+        record[f"{name}_b64"] = base64.b64encode(value).decode("ascii")
+
+
+def encode_ndjson_line(stored: bytes, body: bytes | None = None) -> str:
+    """Return one NDJSON line for a stored list entry, exactly as stored.
+
+    ``body`` is the claim-check body the entry references, carried inline so
+    an import can restore it.
+    """
+    record: dict[str, str] = {}
+    _encode_field(record, "stored", stored)
+    if body is not None:
+        _encode_field(record, "body", body)
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _decode_field(record: dict[str, object], name: str, line_number: int) -> bytes | None:
+    value = record.get(name)
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    encoded = record.get(f"{name}_b64")
+    if isinstance(encoded, str):
+        try:
+            return base64.b64decode(encoded, validate=True)
+        except binascii.Error:
+            raise ConfigurationError(f"line {line_number}: '{name}_b64' is not valid base64") from None
+    return None
+
+
+def decode_ndjson_record(line: str, line_number: int) -> tuple[bytes, bytes | None]:
+    """Return the stored entry of one NDJSON line and the claim-check body it carries, if any."""
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ConfigurationError(f"line {line_number}: not valid JSON ({exc.msg})") from None
+    stored = _decode_field(record, "stored", line_number) if isinstance(record, dict) else None
+    if stored is None:
+        raise ConfigurationError(f"line {line_number}: expected an object with a 'stored' or 'stored_b64' string")
+    return stored, _decode_field(record, "body", line_number)
+
+
+def decode_ndjson_line(line: str, line_number: int) -> bytes:
+    """Return the stored entry of one NDJSON line."""
+    return decode_ndjson_record(line, line_number)[0]
+
+
+def _claim_check_reference_id(stored: bytes) -> str | None:
+    try:
+        reference = read_stored_claim_check_reference(stored)
+    except MalformedStoredMessageError:
+        return None
+    return None if reference is None else reference[0]
+
+
+def rewrap_stored_entry(stored: bytes) -> bytes:
+    """Return ``stored``'s payload in a fresh envelope, as ``redrive_dead_letters()`` would.
+
+    Envelopes are unwrapped first, so the new envelope never nests an old one.
+    The fresh id resets the delivery count and restarts the queue-wait clock.
+    """
+    payload = decode_stored_message(stored, strict_envelope_decoding=False)
+    if isinstance(payload, bytes):
+        try:
+            payload = payload.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+    wrapped = encode_stored_message(payload)
+    return wrapped.encode("utf-8") if isinstance(wrapped, str) else wrapped
+
+
+def export_list(
+    client: redis.Redis,
+    key: str,
+    out: IO[str],
+    *,
+    batch_size: int = DEFAULT_TRANSFER_BATCH_SIZE,
+    pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+    claim_check_prefix: str | None = None,
+) -> TransferStats:
+    """Write every entry of list ``key`` to ``out`` as NDJSON, oldest first.
+
+    Each round trip pipelines ``pipeline_depth`` tail-relative ``LRANGE``
+    windows of ``batch_size`` entries, so memory is bounded by their product.
+    The walk covers the length seen at the start; entries pushed meanwhile are
+    not exported, and concurrent tail removals may skip or repeat entries.
+
+    With ``claim_check_prefix``, the body of every claim-check reference is
+    read from ``<claim_check_prefix><reference id>`` in one ``MGET`` per round
+    trip and written on the entry's line; a missing body raises
+    ``MalformedStoredMessageError``.
+    """
+    started = time.perf_counter()
+    length = int(client.llen(key))
+    entries = 0
+    payload_bytes = 0
+    while entries < length:
+        pipeline = client.pipeline(transaction=False)
+        offset = entries
+        while offset < length and len(pipeline) < pipeline_depth:
+            window = min(batch_size, length - offset)
+            pipeline.lrange(key, -(offset + window), -(offset + 1))
+            offset += window
+        requested = offset - entries
+        received = 0
+        oldest_first: list[bytes] = []
+        for window_entries in pipeline.execute():
+            oldest_first.extend(reversed(window_entries))
+            received += len(window_entries)
+        bodies = _read_claim_check_bodies(client, oldest_first, claim_check_prefix)
+        for stored, body in zip(oldest_first, bodies):
+            out.write(encode_ndjson_line(stored, body))
+            payload_bytes += len(stored)
+        entries += received
+        if received < requested:
+            # The list shrank under the walk; everything left was read.
+            break
+    return TransferStats(entries, payload_bytes, time.perf_counter() - started)
+
+
+def _read_claim_check_bodies(
+    client: redis.Redis, entries: list[bytes], claim_check_prefix: str | None
+) -> list[bytes | None]:
+    bodies: list[bytes | None] = [None] * len(entries)
+    if claim_check_prefix is None:
+        return bodies
+    referencing = [(index, _claim_check_reference_id(stored)) for index, stored in enumerate(entries)]
+    body_keys = {index: f"{claim_check_prefix}{reference_id}" for index, reference_id in referencing if reference_id}
+    if not body_keys:
+        return bodies
+    for (index, body_key), body in zip(body_keys.items(), client.mget(list(body_keys.values()))):
+        if not isinstance(body, bytes):
+            raise missing_claim_check_body_error(body_key)
+        bodies[index] = body
+    return bodies
+
+
+def _chunks(values: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    chunk: list[_T] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_list(
+    client: redis.Redis,
+    key: str,
+    entries: Iterable[bytes | tuple[bytes, bytes | None]],
+    *,
+    batch_size: int = DEFAULT_TRANSFER_BATCH_SIZE,
+    pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+    claim_check_prefix: str | None = None,
+) -> TransferStats:
+    """``LPUSH`` ``entries`` (oldest first) onto list ``key`` in pipelined batches.
+
+    Each ``LPUSH`` carries ``batch_size`` entries and each round trip
+    ``pipeline_depth`` of them, so the oldest entry ends up nearest the tail,
+    where it is claimed or redriven first. Entries are consumed lazily.
+
+    An entry may be a ``(stored, body)`` pair, as ``export_list`` writes a
+    claim-check reference: the body is ``SET`` at
+    ``<claim_check_prefix><reference id>`` in the same round trip, ahead of
+    the ``LPUSH`` that makes it claimable.
+    """
+    started = time.perf_counter()
+    imported = 0
+    payload_bytes = 0
+    pipeline = client.pipeline(transaction=False)
+    for chunk in _chunks(entries, batch_size):
+        stored_entries = []
+        for entry in chunk:
+            stored, body = entry if isinstance(entry, tuple) else (entry, None)
+            if body is not None:
+                reference_id = _claim_check_reference_id(stored)
+                if reference_id is None or claim_check_prefix is None:
+                    raise ConfigurationError("a claim-check body needs a reference entry and 'claim_check_prefix'")
+                pipeline.set(f"{claim_check_prefix}{reference_id}", body)
+            stored_entries.append(stored)
+        pipeline.lpush(key, *stored_entries)
+        imported += len(stored_entries)
+        payload_bytes += sum(len(stored) for stored in stored_entries)
+        if len(pipeline) >= pipeline_depth:
+            pipeline.execute()
+    if len(pipeline):
+        pipeline.execute()
+    return TransferStats(imported, payload_bytes, time.perf_counter() - started)
+
+
+def _read_entries(
+    lines: Iterable[str], *, rewrap: bool, require_envelope: bool
+) -> Iterator[tuple[bytes, bytes | None]]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        stored, body = decode_ndjson_record(line, line_number)
+        if body is not None and _claim_check_reference_id(stored) is None:
+            raise ConfigurationError(f"line {line_number}: carries a claim-check body but no reference entry")
+        if rewrap:
+            stored = rewrap_stored_entry(stored)
+        elif require_envelope:
+            try:
+                decode_stored_message(stored, strict_envelope_decoding=True)
+            except MalformedStoredMessageError:
+                raise ConfigurationError(
+                    f"line {line_number}: not an RMQ envelope; pending needs envelopes, pass --rewrap to wrap payloads"
+                ) from None
+        yield stored, body
+
+
+def _import_lines(client: redis.Redis, key: str, lines: Iterable[str], args: argparse.Namespace) -> TransferStats:
+    entries = _read_entries(lines, rewrap=args.rewrap, require_envelope=args.target == "pending")
+    return import_list(
+        client,
+        key,
+        entries,
+        batch_size=args.batch_size,
+        pipeline_depth=args.pipeline_depth,
+        claim_check_prefix=_claim_check_prefix(args),
+    )
+
+
+def _claim_check_prefix(args: argparse.Namespace) -> str:
+    return QueueKeyManager(args.queue, args.key_separator).claim_check_prefix
+
+
+def _list_key(args: argparse.Namespace, list_name: str) -> str:
+    if list_name == "dead_letter" and args.dead_letter_queue is not None:
+        return str(args.dead_letter_queue)
+    return str(getattr(QueueKeyManager(args.queue, args.key_separator), list_name))
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m redis_message_queue",
+        description=(
+            "Stream redis-message-queue lists to and from NDJSON files with constant memory, "
+            "and collect orphaned per-message metadata."
+        ),
+    )
+    connection = argparse.ArgumentParser(add_help=False)
+    connection.add_argument(
+        "--url",
+        default=os.environ.get("REDIS_URL", DEFAULT_REDIS_URL),
+        help="Redis URL (default: $REDIS_URL or %(default)s)",
+    )
+    connection.add_argument("--queue", required=True, help="queue name, as passed to RedisMessageQueue")
+    connection.add_argument("--key-separator", default="::", help="the queue's key_separator (default: %(default)s)")
+    common = argparse.ArgumentParser(add_help=False, parents=[connection])
+    common.add_argument(
+        "--dead-letter-queue", default=None, help="custom dead_letter_queue key (default: <queue><sep>dlq)"
+    )
+    common.add_argument("--batch-size", type=_positive_int, default=DEFAULT_TRANSFER_BATCH_SIZE)
+    common.add_argument("--pipeline-depth", type=_positive_int, default=DEFAULT_PIPELINE_DEPTH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", parents=[common], help="write a list to NDJSON, oldest entry first")
+    export.add_argument("--source", choices=_EXPORT_SOURCES, default="dead_letter")
+    export.add_argument("--output", default="-", help="output file (default: stdout)")
+
+    load = commands.add_parser("import", parents=[common], help="push NDJSON entries onto a list")
+    load.add_argument("--target", choices=_IMPORT_TARGETS, default="pending")
+    load.add_argument("--input", default="-", help="input file (default: stdin)")
+    load.add_argument(
+        "--rewrap",
+        action="store_true",
+        help="wrap each payload in a fresh envelope (new id, delivery count reset), like redrive",
+    )
+
+    gc = commands.add_parser(
+        "gc", parents=[connection], help="delete delivery counts and claim results of messages no longer in flight"
+    )
+    gc.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=DEFAULT_METADATA_GC_BATCH_SIZE,
+        help="hash fields per HSCAN and per cleanup script (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        client = redis.Redis.from_url(args.url, decode_responses=False)
+        if args.command == "gc":
+            queue = RedisMessageQueue(args.queue, client=client, key_separator=args.key_separator)
+            report = queue.collect_orphaned_metadata(batch_size=args.batch_size)
+            print(
+                f"removed {report.removed} of {report.scanned} metadata fields of {queue.key.processing!r}"
+                f" ({report.bytes_reclaimed:,} bytes)"
+            )
+            return 0
+        if args.command == "export":
+            key = _list_key(args, args.source)
+            options = {
+                "batch_size": args.batch_size,
+                "pipeline_depth": args.pipeline_depth,
+                "claim_check_prefix": _claim_check_prefix(args),
+            }
+            if args.output == "-":
+                stats = export_list(client, key, sys.stdout, **options)
+            else:
+                with open(args.output, "w", encoding="utf-8") as out:
+                    stats = export_list(client, key, out, **options)
+            print(stats.summary("exported", key), file=sys.stderr)
+            return 0
+        if args.rewrap and args.target != "pending":
+            raise ConfigurationError(
+                f"--rewrap only applies to --target pending; {args.target} stores unwrapped payloads"
+            )
+        key = _list_key(args, args.target)
+        if args.input == "-":
+            # stdin belongs to the caller; only a file the CLI opened is closed.
+            stats = _import_lines(client, key, sys.stdin, args)
+        else:
+            with open(args.input, encoding="utf-8") as source:
+                stats = _import_lines(client, key, source, args)
+        print(stats.summary("imported", key), file=sys.stderr)
+        return 0
+    except (RedisMessageQueueError, TypeError, OSError, redis.exceptions.RedisError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
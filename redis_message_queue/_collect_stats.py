@@ -0,0 +1,31 @@
+from typing import Iterable, cast
+
+from redis_message_queue._queue_stats import QueueStats, group_stats_batches
+from redis_message_queue.redis_message_queue import RedisMessageQueue
+
+
+def collect_stats(queues: Iterable[RedisMessageQueue]) -> list[QueueStats]:
+    """Return ``stats()`` for every queue, batched into one round trip per Redis client.
+
+    Queues whose built-in gateways share a Redis client are snapshotted with a
+    single pipeline of stats scripts; each ``QueueStats`` is consistent on its
+    own, but the snapshots are not one transaction across queues. Queues on a
+    custom gateway fall back to their own ``stats()``. Results follow the
+    input order.
+    """
+    queues = list(queues)
+    for queue in queues:
+        if not isinstance(queue, RedisMessageQueue):
+            raise TypeError(f"'queues' must contain RedisMessageQueue instances, got {type(queue).__name__}")
+    results: list[QueueStats | None] = [None] * len(queues)
+    batches, unbatched = group_stats_batches([queue._redis for queue in queues])
+    for positions in batches:
+        gateway = queues[positions[0]]._redis
+        snapshots = gateway.queue_stats_snapshots(  # type: ignore[attr-defined]
+            [queues[position]._stats_keys() for position in positions]
+        )
+        for position, snapshot in zip(positions, snapshots):
+            results[position] = snapshot
+    for position in unbatched:
+        results[position] = queues[position].stats()
+    return cast(list[QueueStats], results)
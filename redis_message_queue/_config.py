@@ -30,6 +30,10 @@ DEFAULT_RETRY_MAX_DELAY_SECONDS = 5.0
 DEFAULT_RETRY_INITIAL_DELAY_SECONDS = 0.01
 DEFAULT_PENDING_OVERLOAD_BLOCK_TIMEOUT_SECONDS = 1.0
 INTERRUPTIBLE_RETRY_SLEEP_POLL_SECONDS = 0.05
+# A claim prefetched by process_message_callback(prefetch_next=True) is handed
+# to a handler only while less than this fraction of its visibility timeout
+# has elapsed; an older one is returned to pending instead.
+PREFETCHED_CLAIM_MAX_LEASE_FRACTION = 0.5
 PENDING_OVERLOAD_LUA_SENTINEL = -1
 CLAIM_STORE_FAILED_LUA_SENTINEL = "\0__rmq_claim_store_failed__"
 PENDING_OVERLOAD_POLICIES = ("raise", "drop_oldest", "block")
@@ -38,6 +42,31 @@ DEDUPLICATION_REQUIRES_KEY_MESSAGE = (
     "Pass a callable like `lambda msg: msg['id']` (recommended: a stable logical ID), "
     "or set deduplication=False."
 )
+BYTES_PAYLOAD_REQUIRES_BINARY_CLIENT_MESSAGE = (
+    "bytes payloads require a Redis client created with decode_responses=False; "
+    "a decode_responses=True client cannot read arbitrary bytes back. "
+    "Publish a str (e.g. base64) or use a separate decode_responses=False client for bytes traffic."
+)
+BYTES_PAYLOAD_REQUIRES_BUILTIN_GATEWAY_MESSAGE = (
+    "bytes payloads require the built-in RedisGateway; custom AbstractRedisGateway "
+    "implementations receive str messages only. Publish a str (e.g. base64) through a custom gateway."
+)
+
+
+def redis_client_decodes_responses(redis_client: object) -> bool:
+    """Whether ``redis_client`` was built with ``decode_responses=True``.
+
+    Reads redis-py's connection kwargs; clients that do not expose them are
+    treated as bytes clients.
+    """
+    get_connection_kwargs = getattr(redis_client, "get_connection_kwargs", None)
+    if not callable(get_connection_kwargs):
+        return False
+    try:
+        connection_kwargs = get_connection_kwargs()
+    except Exception:
+        return False
+    return isinstance(connection_kwargs, dict) and connection_kwargs.get("decode_responses") is True
 
 
 def is_redis_retryable_exception(exception):
@@ -643,6 +672,94 @@ return removed
 """
 )
 
+# Hand a live visibility-timeout claim back to the head of pending before any
+# handler ran (QueueWorker's prefetch buffer on shutdown). Lease-token gated
+# like MOVE_MESSAGE_WITH_LEASE_TOKEN; the delivery-count charge taken at claim
+# is refunded, mirroring the claim-store-failure compensation path.
+RETURN_LEASED_MESSAGE_TO_PENDING_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[2], 'list')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[3], 'zset')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[4], 'hash')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[5], 'hash')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[6], 'hash')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[7], 'hash')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[8], 'hash')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[9], 'string')
+if err then
+    return err
+end
+
+local current_lease_token = redis.call('HGET', KEYS[4], ARGV[1])
+if current_lease_token ~= ARGV[2] then
+    if redis.call('GET', KEYS[9]) then
+        return 1
+    end
+    return 0
+end
+
+redis.call('RPUSH', KEYS[2], ARGV[1])
+local removed = redis.call('LREM', KEYS[1], 1, ARGV[1])
+if removed == 1 then
+    redis.call('ZREM', KEYS[3], ARGV[1])
+    redis.call('HDEL', KEYS[4], ARGV[1])
+    local claim_result_key = redis.call('HGET', KEYS[6], ARGV[2])
+    if claim_result_key then
+        -- pcall: see MOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT (undeclared key in Cluster).
+        redis.pcall('DEL', claim_result_key)
+        redis.call('HDEL', KEYS[6], ARGV[2])
+    end
+    local claim_id = redis.call('HGET', KEYS[8], ARGV[2])
+    if claim_id then
+        redis.call('HDEL', KEYS[7], claim_id)
+        redis.call('HDEL', KEYS[8], ARGV[2])
+    end
+    if redis.call('HINCRBY', KEYS[5], ARGV[1], -1) <= 0 then
+        redis.call('HDEL', KEYS[5], ARGV[1])
+    end
+    redis.call('SET', KEYS[9], '1', 'PX', tonumber(ARGV[3]))
+else
+    redis.call('LREM', KEYS[2], 1, ARGV[1])
+end
+
+return removed
+"""
+)
+
 REMOVE_MESSAGE_LUA_SCRIPT = (
     _LUA_KEY_TYPE_GUARD
     + """
@@ -739,8 +856,37 @@ return stored
 """
 )
 
+_LUA_CLAIM_CODEC = """
+-- Claim results are cjson.encode({stored, lease_token}), except for binary
+-- envelopes (publish(bytes)): their raw payload bytes need not be valid UTF-8,
+-- which JSON decoders reject, so they are cached as '<lease_token>:<stored>'.
+-- The two forms are told apart by the leading '['.
+local function redis_message_queue_encode_claim(stored, lease_token)
+    if string.sub(stored, 1, 7) == string.char(30) .. 'RMQ1B:' then
+        return lease_token .. ':' .. stored
+    end
+    return cjson.encode({stored, lease_token})
+end
+
+local function redis_message_queue_decode_claim(cached_claim)
+    if string.sub(cached_claim, 1, 1) ~= '[' then
+        local separator = string.find(cached_claim, ':', 1, true)
+        if separator and separator > 1 then
+            return {string.sub(cached_claim, separator + 1), string.sub(cached_claim, 1, separator - 1)}
+        end
+        return nil
+    end
+    local ok, claim = pcall(cjson.decode, cached_claim)
+    if ok and type(claim) == 'table' and type(claim[1]) == 'string' and type(claim[2]) == 'string' then
+        return claim
+    end
+    return nil
+end
+"""
+
 CLAIM_MESSAGE_WITH_VISIBILITY_TIMEOUT_LUA_SCRIPT = (
     _LUA_KEY_TYPE_GUARD
+    + _LUA_CLAIM_CODEC
     + """
 local err = redis_message_queue_require_type(KEYS[1], 'list')
 if err then
@@ -800,17 +946,22 @@ if max_delivery_count > 0 then
     end
 end
 
-local function redis_message_queue_decode_claim(cached_claim)
-    local ok, claim = pcall(cjson.decode, cached_claim)
-    if ok and type(claim) == 'table' and type(claim[1]) == 'string' and type(claim[2]) == 'string' then
-        return claim
-    end
-    return nil
-end
-
 local function redis_message_queue_decode_envelope(stored)
     local prefix = string.char(30) .. 'RMQ1:'
-    if type(stored) ~= 'string' or string.sub(stored, 1, string.len(prefix)) ~= prefix then
+    local binary_prefix = string.char(30) .. 'RMQ1B:'
+    if type(stored) ~= 'string' then
+        return nil
+    end
+    -- Binary envelope (publish(bytes)): prefix, id, ':', raw payload bytes.
+    if string.sub(stored, 1, string.len(binary_prefix)) == binary_prefix then
+        local id_start = string.len(binary_prefix) + 1
+        local id_end = string.find(stored, ':', id_start, true)
+        if id_end and id_end > id_start then
+            return {id = string.sub(stored, id_start, id_end - 1), payload = string.sub(stored, id_end + 1)}
+        end
+        return nil
+    end
+    if string.sub(stored, 1, string.len(prefix)) ~= prefix then
         return nil
     end
     local ok, envelope = pcall(cjson.decode, string.sub(stored, string.len(prefix) + 1))
@@ -857,7 +1008,7 @@ if cached_claim then
         redis.call('HSET', KEYS[11], claim[2], ARGV[4])
         redis.call('HSET', KEYS[9], claim[2], KEYS[8])
         redis.call('ZADD', KEYS[3], now_ms + tonumber(ARGV[1]), claim[1])
-        return {claim[1], claim[2]}
+        return {claim[1], claim[2], {}, {}, tostring(redis.call('HGET', KEYS[6], claim[1]) or '')}
     end
     redis.call('DEL', KEYS[8])
 end
@@ -870,7 +1021,7 @@ if cached_recovery then
         redis.call('HSET', KEYS[11], claim[2], ARGV[4])
         redis.call('HSET', KEYS[9], claim[2], KEYS[8])
         redis.call('ZADD', KEYS[3], now_ms + tonumber(ARGV[1]), claim[1])
-        return {claim[1], claim[2]}
+        return {claim[1], claim[2], {}, {}, tostring(redis.call('HGET', KEYS[6], claim[1]) or '')}
     end
     redis.call('HDEL', KEYS[10], ARGV[4])
 end
@@ -936,20 +1087,20 @@ end
 local dead_lettered_events = {}
 local claim_store_failed_sentinel = string.char(0) .. '__rmq_claim_store_failed__'
 
-local function store_claim_and_return(stored)
+local function store_claim_and_return(stored, delivery_count)
     -- pcall guards against OOM mid-write: fail fast while preserving a live payload copy.
     local lease_token = nil
     local ok, result = pcall(function()
         redis.call('INCR', KEYS[5])
         lease_token = redis.call('GET', KEYS[5])
-        local claim_payload = cjson.encode({stored, lease_token})
+        local claim_payload = redis_message_queue_encode_claim(stored, lease_token)
         redis.call('ZADD', KEYS[3], now_ms + tonumber(ARGV[1]), stored)
         redis.call('HSET', KEYS[4], stored, lease_token)
         redis.call('SET', KEYS[8], claim_payload, 'PX', tonumber(ARGV[3]))
         redis.call('HSET', KEYS[9], lease_token, KEYS[8])
         redis.call('HSET', KEYS[10], ARGV[4], claim_payload)
         redis.call('HSET', KEYS[11], lease_token, ARGV[4])
-        return {stored, lease_token, reclaimed_events, dead_lettered_events}
+        return {stored, lease_token, reclaimed_events, dead_lettered_events, tostring(delivery_count)}
     end)
     if not ok then
         redis.call('HINCRBY', KEYS[6], stored, -1)
@@ -1002,7 +1153,7 @@ while claim_attempts < 100 do
         redis.call('HDEL', KEYS[6], stored)
         table.insert(dead_lettered_events, {redis_message_queue_message_id(stored), tostring(count)})
     else
-        return store_claim_and_return(stored)
+        return store_claim_and_return(stored, count)
     end
 end
 
@@ -1245,6 +1396,35 @@ return 1
 """
 )
 
+# Trims a retained log to ARGV[1] entries by popping at most ARGV[2] of its
+# oldest (tail) entries. Returns the number popped and only the popped entries
+# starting with the claim-check reference prefix ARGV[3], so the caller can
+# release their bodies without receiving inline payloads. The excess is measured in the same call,
+# so concurrent trims never drop more than it.
+TRIM_QUEUE_TAIL_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+local excess = redis.call('LLEN', KEYS[1]) - tonumber(ARGV[1])
+if excess <= 0 then
+    return {0, {}}
+end
+local dropped = redis.call('RPOP', KEYS[1], math.min(excess, tonumber(ARGV[2])))
+local prefix = ARGV[3]
+local references = {}
+for _, entry in ipairs(dropped) do
+    if string.sub(entry, 1, #prefix) == prefix then
+        references[#references + 1] = entry
+    end
+end
+return {#dropped, references}
+"""
+)
+
 # Operator-tooling scripts (stats/peek/purge/redrive). These support the queue's
 # inspection and management helpers; they never run on the message hot path.
 
@@ -1262,33 +1442,371 @@ return removed
 """
 )
 
-REDRIVE_DEAD_LETTERS_LUA_SCRIPT = (
+# Claim-check-aware purges: whether a stored value may carry a claim-check
+# reference. ARGV positions are given by each script: the largest stored value
+# that can be one, then the raw and JSON-escaped reference prefixes. Bodies
+# are unlinked from Python, so every key a script touches is declared.
+_LUA_CLAIM_CHECK_REFERENCE_FILTER = """
+local function redis_message_queue_may_reference(stored, max_size, raw_marker, escaped_marker)
+    if #stored > max_size then
+        return false
+    end
+    return string.find(stored, raw_marker, 1, true) ~= nil or string.find(stored, escaped_marker, 1, true) ~= nil
+end
+"""
+
+# Deletes KEYS[1] like PURGE_QUEUE_LUA_SCRIPT unless an entry may carry a
+# reference, and returns -1 without touching it if one does. ARGV: the
+# reference filter's three arguments, then the LRANGE window. The scan is
+# O(N) inside Redis, like freeing the list; no entry leaves the server.
+PURGE_UNREFERENCED_QUEUE_LUA_SCRIPT = (
     _LUA_KEY_TYPE_GUARD
+    + _LUA_CLAIM_CHECK_REFERENCE_FILTER
     + """
 local err = redis_message_queue_require_type(KEYS[1], 'list')
 if err then
     return err
 end
 
-local err = redis_message_queue_require_type(KEYS[2], 'list')
+local max_size = tonumber(ARGV[1])
+local window = tonumber(ARGV[4])
+local length = redis.call('LLEN', KEYS[1])
+for start = 0, length - 1, window do
+    local entries = redis.call('LRANGE', KEYS[1], start, start + window - 1)
+    for _, stored in ipairs(entries) do
+        if redis_message_queue_may_reference(stored, max_size, ARGV[2], ARGV[3]) then
+            return -1
+        end
+    end
+end
+redis.call('UNLINK', KEYS[1])
+return length
+"""
+)
+
+# Incremental purge, one bounded slice per call. KEYS: the list, then the
+# queue's delivery-count hash. Both scripts delete each removed entry's
+# delivery count when ARGV[1] is '1' (pending entries that were reclaimed
+# after a lease expired still carry one); other lists hold raw payloads that
+# never have one.
+_LUA_PURGE_SLICE_GUARD = """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
 if err then
     return err
 end
 
--- The dead-letter queue stores the raw (envelope-stripped) payload, so each
--- redriven message is re-wrapped in a fresh RMQ envelope carrying a caller-
--- supplied id (one per ARGV slot). A fresh envelope is a fresh delivery-count
--- key, so the redriven message gets the full max_delivery_count budget again
--- instead of being dead-lettered on its next claim. Oldest dead-letter entries
--- (the tail, since dead-lettering LPUSHes) are moved first and re-enter the
--- head of pending, mirroring how publish() enqueues fresh messages.
---
--- The envelope is UTF-8 JSON text, but the DLQ can hold raw foreign bytes that
--- are not valid UTF-8 (cjson.encode would embed them unescaped, producing an
--- envelope no decoder can read). Those payloads are wrapped with the
--- binary-safe payload_hex field instead, which both the Python decoder and the
--- claim script's dead-letter branch expand back to the exact original bytes.
+local err = redis_message_queue_require_type(KEYS[2], 'hash')
+if err then
+    return err
+end
 
+local clear_delivery_counts = ARGV[1] == '1'
+"""
+
+# Pops up to ARGV[2] entries from the tail (oldest first) and returns how many.
+PURGE_QUEUE_SLICE_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_PURGE_SLICE_GUARD
+    + """
+local count = tonumber(ARGV[2])
+local removed = 0
+while removed < count do
+    local stored = redis.call('RPOP', KEYS[1])
+    if not stored then
+        break
+    end
+    if clear_delivery_counts then
+        redis.call('HDEL', KEYS[2], stored)
+    end
+    removed = removed + 1
+end
+return removed
+"""
+)
+
+# PURGE_QUEUE_SLICE_LUA_SCRIPT that also returns the popped entries that may
+# carry a claim-check reference, as {popped, entries}, so their bodies can be
+# unlinked. ARGV[3..5] are the reference filter's arguments.
+PURGE_QUEUE_SLICE_WITH_CLAIM_CHECKS_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_CLAIM_CHECK_REFERENCE_FILTER
+    + _LUA_PURGE_SLICE_GUARD
+    + """
+local count = tonumber(ARGV[2])
+local max_size = tonumber(ARGV[3])
+local removed = 0
+local references = {}
+while removed < count do
+    local stored = redis.call('RPOP', KEYS[1])
+    if not stored then
+        break
+    end
+    if clear_delivery_counts then
+        redis.call('HDEL', KEYS[2], stored)
+    end
+    if redis_message_queue_may_reference(stored, max_size, ARGV[4], ARGV[5]) then
+        references[#references + 1] = stored
+    end
+    removed = removed + 1
+end
+return {removed, references}
+"""
+)
+
+# Removes the entries in ARGV[2..] by value, nearest the tail first, and
+# returns the ones that were still there.
+PURGE_SELECTED_MESSAGES_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_PURGE_SLICE_GUARD
+    + """
+local removed = {}
+for i = 2, #ARGV do
+    if redis.call('LREM', KEYS[1], -1, ARGV[i]) == 1 then
+        if clear_delivery_counts then
+            redis.call('HDEL', KEYS[2], ARGV[i])
+        end
+        removed[#removed + 1] = ARGV[i]
+    end
+end
+return removed
+"""
+)
+
+# Orphaned-metadata GC: a fingerprint of each list entry ARGV[1]..ARGV[2] of
+# KEYS[1] (its first ARGV[3] bytes in hex, then ':' and its length), so the
+# collector can look its candidates up in a long list without receiving the
+# payloads. The envelope id sits in those first bytes; entries that share a
+# fingerprint only make the collector keep metadata.
+RANGE_MESSAGE_FINGERPRINTS_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+local entries = redis.call('LRANGE', KEYS[1], ARGV[1], ARGV[2])
+local width = tonumber(ARGV[3])
+local function hex(character)
+    return string.format('%02x', string.byte(character))
+end
+for i = 1, #entries do
+    local entry = entries[i]
+    local head = string.gsub(string.sub(entry, 1, width), '.', hex)
+    entries[i] = head .. ':' .. #entry
+end
+return entries
+"""
+)
+
+# Orphaned-metadata GC. KEYS: processing list, lease tokens, delivery counts,
+# claim-result refs, ids, and backrefs. ARGV[1] names the hash to clean,
+# ARGV[2] is '1' when the queue uses visibility timeouts, and ARGV[3..] are
+# fields of the hash; each field whose message is no longer in flight is
+# deleted. Returns {fields deleted, bytes of field names and values}.
+# Delivery counts of reclaimed messages waiting in pending are live too; the
+# caller only passes fields whose message it did not find in pending, after
+# checking that the message held no lease before and after that walk.
+REMOVE_STALE_METADATA_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_CLAIM_CODEC
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+for i = 2, 6 do
+    local err = redis_message_queue_require_type(KEYS[i], 'hash')
+    if err then
+        return err
+    end
+end
+
+-- Claim-result metadata is keyed by message without visibility timeouts and
+-- by lease token or claim id with them. A cached claim is live while its
+-- message still holds the lease it was claimed under; returns that token.
+local function live_lease_token(cached_claim)
+    if not cached_claim then
+        return nil
+    end
+    local claim = redis_message_queue_decode_claim(cached_claim)
+    if claim and redis.call('HGET', KEYS[2], claim[1]) == claim[2] then
+        return claim[2]
+    end
+    return nil
+end
+
+local function live_claim_id(claim_id, lease_token)
+    return claim_id and live_lease_token(redis.call('HGET', KEYS[5], claim_id)) == lease_token
+end
+
+local metadata = ARGV[1]
+local leased = ARGV[2] == '1'
+local hash_key = KEYS[3]
+if metadata == 'claim_result_refs' then
+    hash_key = KEYS[4]
+elseif metadata == 'claim_result_ids' then
+    hash_key = KEYS[5]
+elseif metadata == 'claim_result_backrefs' then
+    hash_key = KEYS[6]
+end
+
+-- A message in flight holds a lease token when visibility timeouts are on,
+-- an O(1) check. Without them, fields that fail every O(1) check wait for a
+-- single walk of processing below instead of one scan of it per field.
+local candidates = {}
+local awaited = {}
+local awaiting = false
+for i = 3, #ARGV do
+    local field = ARGV[i]
+    local value = redis.call('HGET', hash_key, field)
+    if value then
+        local live
+        local message
+        if metadata == 'claim_result_refs' then
+            live = live_claim_id(redis.call('HGET', KEYS[6], field), field)
+        elseif metadata == 'claim_result_ids' then
+            live = live_lease_token(value) ~= nil
+            message = value
+        elseif metadata == 'claim_result_backrefs' then
+            live = live_claim_id(value, field)
+            message = field
+        else
+            live = redis.call('HEXISTS', KEYS[2], field) == 1
+            if not leased then
+                message = field
+            end
+        end
+        if not live and message and leased then
+            live = redis.call('HEXISTS', KEYS[2], message) == 1
+            message = nil
+        end
+        if not live then
+            candidates[#candidates + 1] = {field, value, message}
+            if message then
+                awaited[message] = false
+                awaiting = true
+            end
+        end
+    end
+end
+
+if awaiting then
+    local window_size = 1000
+    local start = 0
+    while true do
+        local window = redis.call('LRANGE', KEYS[1], start, start + window_size - 1)
+        for _, stored in ipairs(window) do
+            if awaited[stored] == false then
+                awaited[stored] = true
+            end
+        end
+        if #window < window_size then
+            break
+        end
+        start = start + window_size
+    end
+end
+
+local removed = 0
+local reclaimed_bytes = 0
+for _, candidate in ipairs(candidates) do
+    local field, value, message = candidate[1], candidate[2], candidate[3]
+    if not (message and awaited[message]) then
+        redis.call('HDEL', hash_key, field)
+        removed = removed + 1
+        reclaimed_bytes = reclaimed_bytes + string.len(field) + string.len(value)
+    end
+end
+
+return {removed, reclaimed_bytes}
+"""
+)
+
+# Message id of a list's oldest entry (the tail, next to be claimed): '' when
+# that entry is not an RMQ envelope, false when the list is empty. Only the id
+# leaves Redis, however large the payload.
+_LUA_OLDEST_MESSAGE_ID = """
+local function redis_message_queue_oldest_message_id(key)
+    local stored = redis.call('LINDEX', key, -1)
+    if not stored then
+        return false
+    end
+    local text_prefix = string.char(30) .. 'RMQ1:{"id":"'
+    local binary_prefix = string.char(30) .. 'RMQ1B:'
+    local id_start
+    local terminator
+    if string.sub(stored, 1, string.len(text_prefix)) == text_prefix then
+        id_start = string.len(text_prefix) + 1
+        terminator = '"'
+    elseif string.sub(stored, 1, string.len(binary_prefix)) == binary_prefix then
+        id_start = string.len(binary_prefix) + 1
+        terminator = ':'
+    else
+        return ''
+    end
+    local id_end = string.find(string.sub(stored, 1, id_start + 64), terminator, id_start, true)
+    if not id_end then
+        return ''
+    end
+    return string.sub(stored, id_start, id_end - 1)
+end
+"""
+
+OLDEST_MESSAGE_ID_LUA_SCRIPT = (
+    _LUA_OLDEST_MESSAGE_ID
+    + """
+return redis_message_queue_oldest_message_id(KEYS[1])
+"""
+)
+
+# One atomic stats snapshot. KEYS: pending, processing, the lease-deadline
+# ZSET, then whichever of completed/failed/dead-letter are enabled. Returns
+# {pending, processing, leases, expired_leases, oldest_pending_id, ...depths of
+# the optional lists in KEYS order}; oldest_pending_id is '' when pending is
+# empty or its tail is not an envelope.
+QUEUE_STATS_SNAPSHOT_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_OLDEST_MESSAGE_ID
+    + """
+for index, key in ipairs(KEYS) do
+    local err = redis_message_queue_require_type(key, index == 3 and 'zset' or 'list')
+    if err then
+        return err
+    end
+end
+
+local time = redis.call('TIME')
+local now_ms = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local snapshot = {
+    redis.call('LLEN', KEYS[1]),
+    redis.call('LLEN', KEYS[2]),
+    redis.call('ZCARD', KEYS[3]),
+    redis.call('ZCOUNT', KEYS[3], '-inf', now_ms),
+    redis_message_queue_oldest_message_id(KEYS[1]) or '',
+}
+for index = 4, #KEYS do
+    snapshot[#snapshot + 1] = redis.call('LLEN', KEYS[index])
+end
+return snapshot
+"""
+)
+
+# Re-wrap a raw dead-letter payload in a fresh RMQ envelope for redrive.
+#
+# The dead-letter queue stores the raw (envelope-stripped) payload, so each
+# redriven message is re-wrapped in a fresh RMQ envelope carrying a caller-
+# supplied id. A fresh envelope is a fresh delivery-count key, so the redriven
+# message gets the full max_delivery_count budget again instead of being
+# dead-lettered on its next claim.
+#
+# The envelope is UTF-8 JSON text, but the DLQ can hold raw foreign bytes that
+# are not valid UTF-8 (cjson.encode would embed them unescaped, producing an
+# envelope no decoder can read). Those payloads are wrapped with the
+# binary-safe payload_hex field instead, which both the Python decoder and the
+# claim script's dead-letter branch expand back to the exact original bytes.
+_LUA_REDRIVE_ENVELOPE = """
 -- Incremental RFC 3629 validation: rejects continuation/overlong lead bytes
 -- (0x80-0xC1), out-of-range leads (0xF5-0xFF), overlong 3/4-byte forms (0xE0 /
 -- 0xF0 second-byte floors), UTF-16 surrogates (0xED ceiling), and code points
@@ -1348,22 +1866,124 @@ local function redis_message_queue_hex_encode(value)
     end))
 end
 
-local prefix = string.char(30) .. 'RMQ1:'
+local function redis_message_queue_redrive_envelope(id, payload)
+    local prefix = string.char(30) .. 'RMQ1:'
+    if redis_message_queue_is_valid_utf8(payload) then
+        return prefix .. cjson.encode({id = id, payload = payload})
+    end
+    return prefix .. cjson.encode({id = id, payload_hex = redis_message_queue_hex_encode(payload)})
+end
+"""
+
+REDRIVE_DEAD_LETTERS_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_REDRIVE_ENVELOPE
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[2], 'list')
+if err then
+    return err
+end
+
+-- One fresh envelope id per ARGV slot. Oldest dead-letter entries (the tail,
+-- since dead-lettering LPUSHes) are moved first and re-enter the head of
+-- pending, mirroring how publish() enqueues fresh messages.
 local moved = 0
 for i = 1, #ARGV do
     local payload = redis.call('RPOP', KEYS[1])
     if not payload then
         break
     end
-    local envelope
-    if redis_message_queue_is_valid_utf8(payload) then
-        envelope = prefix .. cjson.encode({id = ARGV[i], payload = payload})
-    else
-        envelope = prefix .. cjson.encode({id = ARGV[i], payload_hex = redis_message_queue_hex_encode(payload)})
+    redis.call('LPUSH', KEYS[2], redis_message_queue_redrive_envelope(ARGV[i], payload))
+    moved = moved + 1
+end
+return moved
+"""
+)
+
+# Batch redrive with server-derived ids: ARGV[1] is a 24-hex-digit id prefix
+# (new_message_id_prefix()) and ARGV[2] the batch size; the i-th message moved
+# gets the prefix plus i as 8 hex digits. Same order as the script above.
+REDRIVE_DEAD_LETTER_BATCH_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_REDRIVE_ENVELOPE
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[2], 'list')
+if err then
+    return err
+end
+
+local id_prefix = ARGV[1]
+local count = tonumber(ARGV[2])
+local moved = 0
+while moved < count do
+    local payload = redis.call('RPOP', KEYS[1])
+    if not payload then
+        break
     end
-    redis.call('LPUSH', KEYS[2], envelope)
+    local id = id_prefix .. string.format('%08x', moved)
+    redis.call('LPUSH', KEYS[2], redis_message_queue_redrive_envelope(id, payload))
     moved = moved + 1
 end
 return moved
 """
 )
+
+# Selective redrive: ARGV[1] is a tombstone unique to the call, followed by N
+# fresh envelope ids, the N dead-letter entries (oldest first) a caller-side
+# predicate chose, and their N tail-relative (negative) indices. Each entry
+# found at its index is overwritten with the tombstone, and one LREM from the
+# tail removes every tombstone, so the call walks the list once instead of
+# once per entry. An entry that moved (a concurrent redrive or purge removed
+# entries nearer the tail) is removed by value instead, and one that is gone
+# is skipped. The entries left behind keep their order. Returns how many were
+# moved.
+REDRIVE_SELECTED_DEAD_LETTERS_LUA_SCRIPT = (
+    _LUA_KEY_TYPE_GUARD
+    + _LUA_REDRIVE_ENVELOPE
+    + """
+local err = redis_message_queue_require_type(KEYS[1], 'list')
+if err then
+    return err
+end
+
+local err = redis_message_queue_require_type(KEYS[2], 'list')
+if err then
+    return err
+end
+
+local tombstone = ARGV[1]
+local count = (#ARGV - 1) / 3
+local moved = 0
+local tombstoned = 0
+for i = 1, count do
+    local payload = ARGV[1 + count + i]
+    local index = tonumber(ARGV[1 + 2 * count + i])
+    local found = false
+    if redis.call('LINDEX', KEYS[1], index) == payload then
+        redis.call('LSET', KEYS[1], index, tombstone)
+        tombstoned = tombstoned + 1
+        found = true
+    else
+        found = redis.call('LREM', KEYS[1], -1, payload) == 1
+    end
+    if found then
+        redis.call('LPUSH', KEYS[2], redis_message_queue_redrive_envelope(ARGV[1 + i], payload))
+        moved = moved + 1
+    end
+end
+if tombstoned > 0 then
+    redis.call('LREM', KEYS[1], -tombstoned, tombstone)
+end
+return moved
+"""
+)
@@ -0,0 +1,284 @@
+import dataclasses
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+from redis_message_queue._callable_utils import is_async_callable
+from redis_message_queue._event import QueueEvent
+from redis_message_queue._exceptions import ConfigurationError
+from redis_message_queue._queue_worker import QueueWorker, _validate_worker_count
+from redis_message_queue._stored_message import ReceivedPayload
+from redis_message_queue.interrupt_handler import BaseGracefulInterruptHandler
+from redis_message_queue.redis_message_queue import _SYNC_CALLBACK_AWAITABLE_RETURN_MESSAGE, RedisMessageQueue
+
+logger = logging.getLogger(__name__)
+# How often the parent checks child liveness, restarts, and its interrupt.
+_SUPERVISE_INTERVAL_SECONDS = 0.1
+# Extra time a child gets to exit after its drain timeout before SIGKILL.
+_CHILD_EXIT_GRACE_SECONDS = 5.0
+
+
+class _ChildStopInterrupt(BaseGracefulInterruptHandler):
+    """Child-side stop signal: the supervisor's shared event, or the parent dying."""
+
+    def __init__(self, stop_event: Any, parent_pid: int) -> None:
+        self._stop_event = stop_event
+        self._parent_pid = parent_pid
+
+    def is_interrupted(self) -> bool:
+        return self._stop_event.is_set() or os.getppid() != self._parent_pid
+
+
+def _validate_seconds(name: str, value: float) -> float:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise TypeError(f"'{name}' must be a number, got {type(value).__name__}")
+    if not math.isfinite(value) or value < 0:
+        raise ConfigurationError(f"'{name}' must be a finite non-negative number, got {value}")
+    return float(value)
+
+
+def _run_child(
+    build_queue: Callable[[], RedisMessageQueue],
+    handler: Callable[[ReceivedPayload], None],
+    concurrency: int,
+    prefetch: int | None,
+    drain_timeout_seconds: float,
+    stop_event: Any,
+    event_queue: Any,
+    parent_pid: int,
+) -> None:
+    # The supervisor owns shutdown: a terminal Ctrl-C or a process-group
+    # SIGTERM must not abort handlers mid-message in every child at once.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    queue = build_queue()
+    if not isinstance(queue, RedisMessageQueue):
+        raise TypeError(f"'build_queue' must return a sync RedisMessageQueue, got {type(queue).__name__}")
+    if event_queue is not None:
+        user_on_event = queue._on_event
+
+        def forward_event(event: QueueEvent) -> None:
+            # The exception object may not pickle; exception_type still
+            # carries its name across the process boundary.
+            event_queue.put(dataclasses.replace(event, error=None))
+            if user_on_event is not None:
+                user_on_event(event)
+
+        queue._on_event = forward_event
+    worker = QueueWorker(
+        queue,
+        handler,
+        concurrency=concurrency,
+        prefetch=prefetch,
+        interrupt=_ChildStopInterrupt(stop_event, parent_pid),
+    )
+    try:
+        worker.run()
+    finally:
+        queue.drain(timeout=drain_timeout_seconds)
+
+
+class ConsumerSupervisor:
+    """Run ``handler`` in ``processes`` child processes and keep them running.
+
+    Each child calls ``build_queue()`` after it starts, so every process owns
+    its Redis client and queue (see "Fork safety and pre-fork servers" in
+    docs/operations.md), then runs a ``QueueWorker`` with ``concurrency`` and
+    ``prefetch``. With a ``spawn`` or ``forkserver`` start method,
+    ``build_queue`` and ``handler`` must be picklable (module-level functions).
+
+    A child that exits while the supervisor is running is restarted after
+    ``restart_backoff_seconds``, doubling per consecutive crash of that slot
+    up to ``max_restart_backoff_seconds``. The backoff resets once a child
+    stays up longer than the maximum backoff.
+
+    ``run()`` blocks until ``stop()`` is called, ``interrupt`` fires (pass one
+    ``GracefulInterruptHandler`` constructed in the parent), or the parent
+    gets ``KeyboardInterrupt``. It then signals every child to stop claiming,
+    finish buffered messages, and ``drain(timeout=drain_timeout_seconds)``;
+    children still alive after that plus a short grace period are killed.
+    Children ignore SIGINT and SIGTERM and stop on their own if the parent
+    dies.
+
+    ``on_event`` receives every child queue's ``QueueEvent`` in the parent,
+    on a dispatcher thread. Forwarded events have ``error=None``; use
+    ``exception_type``. A child queue's own ``on_event`` still runs in the
+    child.
+    """
+
+    def __init__(
+        self,
+        build_queue: Callable[[], RedisMessageQueue],
+        handler: Callable[[ReceivedPayload], None],
+        *,
+        processes: int | None = None,
+        concurrency: int = 1,
+        prefetch: int | None = None,
+        interrupt: BaseGracefulInterruptHandler | None = None,
+        on_event: Callable[[QueueEvent], None] | None = None,
+        restart_backoff_seconds: float = 1.0,
+        max_restart_backoff_seconds: float = 60.0,
+        drain_timeout_seconds: float = 25.0,
+        start_method: str | None = None,
+    ):
+        if not callable(build_queue):
+            raise TypeError(f"'build_queue' must be callable, got {type(build_queue).__name__}")
+        if not callable(handler):
+            raise TypeError(f"'handler' must be callable, got {type(handler).__name__}")
+        if is_async_callable(handler):
+            raise TypeError(_SYNC_CALLBACK_AWAITABLE_RETURN_MESSAGE)
+        if on_event is not None and not callable(on_event):
+            raise TypeError(f"'on_event' must be callable or None, got {type(on_event).__name__}")
+        if interrupt is not None and not isinstance(interrupt, BaseGracefulInterruptHandler):
+            raise TypeError(f"'interrupt' must be a BaseGracefulInterruptHandler, got {type(interrupt).__name__}")
+        self._build_queue = build_queue
+        self._handler = handler
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self._processes = _validate_worker_count("processes", processes)
+        self._concurrency = _validate_worker_count("concurrency", concurrency)
+        self._prefetch = None if prefetch is None else _validate_worker_count("prefetch", prefetch)
+        self._interrupt = interrupt
+        self._on_event = on_event
+        self._restart_backoff_seconds = _validate_seconds("restart_backoff_seconds", restart_backoff_seconds)
+        self._max_restart_backoff_seconds = _validate_seconds(
+            "max_restart_backoff_seconds", max_restart_backoff_seconds
+        )
+        if self._max_restart_backoff_seconds < self._restart_backoff_seconds:
+            raise ConfigurationError("'max_restart_backoff_seconds' must be >= 'restart_backoff_seconds'")
+        self._drain_timeout_seconds = _validate_seconds("drain_timeout_seconds", drain_timeout_seconds)
+        self._context: Any = multiprocessing.get_context(start_method)
+        self._stop_requested = threading.Event()
+        self._restarts = 0
+
+    @property
+    def restarts(self) -> int:
+        """How many child processes have been restarted after an unexpected exit."""
+        return self._restarts
+
+    def stop(self) -> None:
+        """Ask ``run()`` to shut the children down; safe to call from any thread or a signal handler."""
+        self._stop_requested.set()
+
+    def run(self) -> None:
+        """Start the children and supervise them until stopped; blocks the calling thread."""
+        stop_event = self._context.Event()
+        event_queue = self._context.Queue() if self._on_event is not None else None
+        dispatcher = None
+        if event_queue is not None:
+            dispatcher = threading.Thread(
+                target=self._dispatch_events, args=(event_queue,), name="rmq-supervisor-events", daemon=True
+            )
+            dispatcher.start()
+        children: list[Any] = [None] * self._processes
+        started_at = [0.0] * self._processes
+        backoff = [self._restart_backoff_seconds] * self._processes
+        restart_at: list[float | None] = [0.0] * self._processes
+        try:
+            while not self._should_stop():
+                now = time.monotonic()
+                for slot in range(self._processes):
+                    child = children[slot]
+                    if child is not None and not child.is_alive():
+                        child.join()
+                        if now - started_at[slot] > self._max_restart_backoff_seconds:
+                            backoff[slot] = self._restart_backoff_seconds
+                        delay = backoff[slot]
+                        logger.warning(
+                            "Consumer process %s exited with code %s; restarting in %.1fs",
+                            child.pid,
+                            child.exitcode,
+                            delay,
+                        )
+                        restart_at[slot] = now + delay
+                        backoff[slot] = min(delay * 2, self._max_restart_backoff_seconds)
+                        children[slot] = None
+                        self._restarts += 1
+                    deadline = restart_at[slot]
+                    if children[slot] is None and deadline is not None and now >= deadline:
+                        children[slot] = self._start_child(stop_event, event_queue)
+                        started_at[slot] = now
+                        restart_at[slot] = None
+                self._stop_requested.wait(_SUPERVISE_INTERVAL_SECONDS)
+        finally:
+            stop_event.set()
+            self._join_children([child for child in children if child is not None])
+            if event_queue is not None and dispatcher is not None:
+                event_queue.put(None)
+                dispatcher.join()
+
+    def _should_stop(self) -> bool:
+        if self._stop_requested.is_set():
+            return True
+        return self._interrupt is not None and self._interrupt.is_interrupted()
+
+    def _start_child(self, stop_event: Any, event_queue: Any) -> Any:
+        child = self._context.Process(
+            target=_run_child,
+            args=(
+                self._build_queue,
+                self._handler,
+                self._concurrency,
+                self._prefetch,
+                self._drain_timeout_seconds,
+                stop_event,
+                event_queue,
+                os.getpid(),
+            ),
+            name="rmq-consumer",
+            daemon=True,
+        )
+        child.start()
+        return child
+
+    def _join_children(self, children: list[Any]) -> None:
+        deadline = time.monotonic() + self._drain_timeout_seconds + _CHILD_EXIT_GRACE_SECONDS
+        for child in children:
+            child.join(max(0.0, deadline - time.monotonic()))
+        for child in children:
+            if child.is_alive():
+                # Children ignore SIGTERM, so terminate() would not end them.
+                logger.warning("Consumer process %s did not stop in time; killing it", child.pid)
+                child.kill()
+                child.join()
+
+    def _dispatch_events(self, event_queue: Any) -> None:
+        assert self._on_event is not None
+        while True:
+            try:
+                event = event_queue.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            try:
+                self._on_event(event)
+            except Exception:
+                logger.exception("Supervisor on_event callback raised an exception")
+
+
+def run_consumer_processes(
+    build_queue: Callable[[], RedisMessageQueue],
+    handler: Callable[[ReceivedPayload], None],
+    *,
+    processes: int | None = None,
+    concurrency: int = 1,
+    prefetch: int | None = None,
+    interrupt: BaseGracefulInterruptHandler | None = None,
+    on_event: Callable[[QueueEvent], None] | None = None,
+) -> None:
+    """Build a ``ConsumerSupervisor`` and ``run()`` it until stopped; see ``ConsumerSupervisor``."""
+    ConsumerSupervisor(
+        build_queue,
+        handler,
+        processes=processes,
+        concurrency=concurrency,
+        prefetch=prefetch,
+        interrupt=interrupt,
+        on_event=on_event,
+    ).run()
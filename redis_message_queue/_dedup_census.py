@@ -0,0 +1,111 @@
+import math
+import re
+from dataclasses import dataclass, field
+
+from redis_message_queue._exceptions import ConfigurationError, GatewayContractError
+from redis_message_queue._stored_message import ReceivedPayload
+
+DEFAULT_CENSUS_BATCH_SIZE = 1000
+# Upper bounds, in seconds, of the expiry histogram's buckets; the last is open.
+CENSUS_EXPIRY_BUCKETS = (60.0, 300.0, 900.0, 3600.0, 21_600.0, 86_400.0, 604_800.0, math.inf)
+# Rough per-key cost of a short string with a TTL on a 64-bit server (dict
+# entry, key and value objects, expires entry), added to the key and value
+# lengths when MEMORY USAGE is unavailable.
+ESTIMATED_STRING_KEY_OVERHEAD_BYTES = 64
+# Publish replay keys are the marker they belong to plus this suffix and a
+# uuid4 hex operation id; see RedisGateway._publish_operation_result_key().
+# Anchored at the end, so a user key that merely contains the words is still
+# counted as a marker.
+_PUBLISH_REPLAY_SUFFIX = re.compile(r":publish_operation_result:[0-9a-f]{32}\Z")
+_PUBLISH_REPLAY_SUFFIX_BYTES = re.compile(_PUBLISH_REPLAY_SUFFIX.pattern.encode())
+
+
+@dataclass(frozen=True)
+class DeduplicationCensus:
+    """Result of ``deduplication_census()``.
+
+    ``markers`` counts the deduplication markers seen and ``estimated_bytes``
+    their memory: the sum of ``MEMORY USAGE`` when ``memory_measured``, else
+    key and value lengths plus a fixed per-key overhead. ``expiry_histogram``
+    maps each bucket's upper bound in seconds (the last is ``math.inf``) to
+    how many markers expire within it and after the previous bound;
+    ``without_ttl`` counts markers with no expiry. ``complete`` is False when
+    ``max_markers`` stopped the scan early, making the result a sample.
+    """
+
+    markers: int
+    estimated_bytes: int
+    expiry_histogram: dict[float, int] = field(hash=False)
+    without_ttl: int
+    complete: bool
+    memory_measured: bool
+
+    @property
+    def bytes_per_marker(self) -> float:
+        """Average ``estimated_bytes`` per marker, the figure to size ``message_deduplication_log_ttl_seconds`` by."""
+        return self.estimated_bytes / self.markers if self.markers else 0.0
+
+
+def validate_census_arguments(max_markers: int | None, batch_size: int) -> None:
+    """Validate ``deduplication_census()`` arguments."""
+    if max_markers is not None:
+        if isinstance(max_markers, bool) or not isinstance(max_markers, int):
+            raise TypeError(f"'max_markers' must be an int or None, got {type(max_markers).__name__}")
+        if max_markers < 1:
+            raise ConfigurationError(f"'max_markers' must be >= 1 when provided, got {max_markers}")
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int):
+        raise TypeError(f"'batch_size' must be an int, got {type(batch_size).__name__}")
+    if batch_size < 1:
+        raise ConfigurationError(f"'batch_size' must be >= 1, got {batch_size}")
+
+
+def is_deduplication_marker(key: ReceivedPayload) -> bool:
+    """Return whether a key under the deduplication prefix is a marker, not a publish replay key."""
+    if isinstance(key, bytes):
+        return _PUBLISH_REPLAY_SUFFIX_BYTES.search(key) is None
+    return _PUBLISH_REPLAY_SUFFIX.search(key) is None
+
+
+class CensusTally:
+    """Accumulate per-marker footprints into a ``DeduplicationCensus``."""
+
+    def __init__(self) -> None:
+        self.markers = 0
+        self.estimated_bytes = 0
+        self.without_ttl = 0
+        self.memory_measured = True
+        self.histogram = dict.fromkeys(CENSUS_EXPIRY_BUCKETS, 0)
+
+    def add(self, key: ReceivedPayload, footprint: object) -> None:
+        """Count one marker from its ``(pttl_ms, memory_usage, strlen)`` footprint."""
+        if not isinstance(footprint, tuple) or len(footprint) != 3:
+            raise GatewayContractError(
+                "gateway.key_footprints() must return one (pttl_ms, memory_usage, strlen) tuple per key, "
+                f"got {type(footprint).__name__}."
+            )
+        pttl_ms, memory_usage, strlen = footprint
+        if pttl_ms == -2:
+            # Expired or deleted since SCAN returned it.
+            return
+        self.markers += 1
+        if memory_usage is None:
+            self.memory_measured = False
+            self.estimated_bytes += len(key) + strlen + ESTIMATED_STRING_KEY_OVERHEAD_BYTES
+        else:
+            self.estimated_bytes += memory_usage
+        if pttl_ms < 0:
+            self.without_ttl += 1
+            return
+        ttl_seconds = pttl_ms / 1000
+        bucket = next(bound for bound in CENSUS_EXPIRY_BUCKETS if ttl_seconds <= bound)
+        self.histogram[bucket] += 1
+
+    def census(self, *, complete: bool) -> DeduplicationCensus:
+        return DeduplicationCensus(
+            markers=self.markers,
+            estimated_bytes=self.estimated_bytes,
+            expiry_histogram=dict(self.histogram),
+            without_ttl=self.without_ttl,
+            complete=complete,
+            memory_measured=self.memory_measured,
+        )
@@ -20,6 +20,7 @@ class EventOperation(StrEnum):
     HEARTBEAT_STOP_TIMEOUT = "heartbeat_stop_timeout"
     STALE_LEASE_ACK = "stale_lease_ack"
     STALE_LEASE_NACK = "stale_lease_nack"
+    RELEASE = "release"
     CLEANUP_FAILED = "cleanup_failed"
     TRIM_FAILED = "trim_failed"
     RETRY_ATTEMPT = "retry_attempt"
@@ -74,3 +75,9 @@ class QueueEvent:
     """the caller-requested timeout for drain operations, when applicable"""
     pending_claim_ids: int | None = None
     """number of unresolved pending claim ids for drain operations, when applicable"""
+    queue_wait_ms: float | None = None
+    """
+    for claims, milliseconds between publish (or redrive) and this claim,
+    from the publish time embedded in the message id; measured across hosts'
+    clocks, and None for messages published by versions without it
+    """
@@ -0,0 +1,165 @@
+import collections
+import inspect
+import logging
+import threading
+import time
+from typing import Callable, Literal
+
+from redis_message_queue._callable_utils import is_async_callable
+from redis_message_queue._event import QueueEvent
+from redis_message_queue._exceptions import ConfigurationError
+from redis_message_queue._warnings import warn_runtime_warning
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_EVENTS = 1024
+EventOverflowPolicy = Literal["drop_oldest", "drop_newest"]
+_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+
+def validate_event_buffer_parameters(max_buffered_events: int, overflow_policy: str) -> None:
+    if not isinstance(max_buffered_events, int) or isinstance(max_buffered_events, bool):
+        raise TypeError(f"'max_buffered_events' must be an int, got {type(max_buffered_events).__name__}")
+    if max_buffered_events <= 0:
+        raise ConfigurationError(f"'max_buffered_events' must be a positive integer, got {max_buffered_events}")
+    if overflow_policy not in _OVERFLOW_POLICIES:
+        raise ConfigurationError(f"'overflow_policy' must be one of {_OVERFLOW_POLICIES}, got {overflow_policy!r}")
+
+
+class BackgroundEventDispatcher:
+    """Deliver queue events to ``on_event`` from a background thread.
+
+    Pass an instance as a queue's ``on_event``. The queue's call only appends
+    the event to a bounded buffer, so a slow exporter no longer delays
+    publish, claim, or ack, and no longer runs while the queue holds its
+    publish or drain lock. A daemon thread, started with the first event,
+    hands buffered events to ``on_event`` in order.
+
+    When the buffer already holds ``max_buffered_events`` events, the
+    ``overflow_policy`` decides which event is lost: ``"drop_oldest"`` (the
+    default) evicts the oldest buffered event, ``"drop_newest"`` discards the
+    incoming one. Either way ``dropped_events`` counts it. Events arriving
+    after ``close()`` are dropped and counted too.
+
+    Failures in ``on_event`` are logged and converted to ``RuntimeWarning``,
+    as for an inline ``on_event``. Because the callback runs on the
+    dispatcher's thread, it may call back into the queue. One dispatcher can
+    serve several queues. Call ``close()``, or use the dispatcher as a
+    context manager, to deliver what is still buffered before shutdown.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[QueueEvent], None],
+        *,
+        max_buffered_events: int = DEFAULT_MAX_BUFFERED_EVENTS,
+        overflow_policy: EventOverflowPolicy = "drop_oldest",
+    ) -> None:
+        if not callable(on_event):
+            raise TypeError(f"'on_event' must be callable, got {type(on_event).__name__}.")
+        if is_async_callable(on_event):
+            raise TypeError(
+                "'on_event' is an async callable; use the async BackgroundEventDispatcher from "
+                "redis_message_queue.asyncio instead"
+            )
+        validate_event_buffer_parameters(max_buffered_events, overflow_policy)
+        self._on_event = on_event
+        self._max_buffered_events = max_buffered_events
+        self._overflow_policy = overflow_policy
+        self._buffer: collections.deque[QueueEvent] = collections.deque()
+        self._condition = threading.Condition()
+        self._dropped_events = 0
+        self._delivering = False
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def dropped_events(self) -> int:
+        """Events discarded because the buffer was full or the dispatcher was closed."""
+        return self._dropped_events
+
+    @property
+    def buffered_events(self) -> int:
+        """Events waiting for delivery."""
+        return len(self._buffer)
+
+    def __call__(self, event: QueueEvent) -> None:
+        with self._condition:
+            if self._closed:
+                self._dropped_events += 1
+                return
+            if len(self._buffer) >= self._max_buffered_events:
+                self._dropped_events += 1
+                if self._overflow_policy == "drop_newest":
+                    return
+                self._buffer.popleft()
+            self._buffer.append(event)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rmq-event-dispatcher", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout_seconds: float | None = None) -> bool:
+        """Wait until every buffered event has been delivered; return False on timeout."""
+        deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+        with self._condition:
+            while self._buffer or self._delivering:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout_seconds: float | None = None) -> bool:
+        """Stop accepting events, deliver what is buffered, and stop the thread.
+
+        Returns False if ``timeout_seconds`` elapsed first; the thread then
+        finishes delivery in the background.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout_seconds)
+        return not thread.is_alive()
+
+    def __enter__(self) -> "BackgroundEventDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer:
+                    return
+                event = self._buffer.popleft()
+                self._delivering = True
+            try:
+                self._deliver(event)
+            finally:
+                with self._condition:
+                    self._delivering = False
+                    self._condition.notify_all()
+
+    def _deliver(self, event: QueueEvent) -> None:
+        try:
+            result = self._on_event(event)
+            if inspect.isawaitable(result):
+                close = getattr(result, "close", None)
+                if callable(close):
+                    close()
+                raise TypeError(
+                    "'on_event' returned an awaitable; use the async BackgroundEventDispatcher "
+                    "from redis_message_queue.asyncio instead"
+                )
+        except Exception as exc:
+            logger.exception("on_event callback raised an exception")
+            warn_runtime_warning(f"on_event callback raised {type(exc).__name__}", stacklevel=2)
@@ -0,0 +1,93 @@
+import math
+import random
+from typing import Iterable, Mapping
+
+from redis_message_queue._event import EventOperation, EventOutcome
+from redis_message_queue._exceptions import ConfigurationError
+
+
+def _event_names(
+    name: str, values: Iterable[str] | None, kind: type[EventOperation] | type[EventOutcome]
+) -> frozenset[str]:
+    if values is None:
+        return frozenset()
+    if isinstance(values, str):
+        raise TypeError(f"'{name}' must be an iterable of {kind.__name__} values, not a single str")
+    names: set[str] = set()
+    for value in values:
+        try:
+            names.add(kind(value))
+        except ValueError:
+            raise ConfigurationError(f"'{name}' contains unknown {kind.__name__} {value!r}") from None
+    if not names:
+        raise ConfigurationError(f"'{name}' must not be empty; pass None to allow every {kind.__name__}")
+    return frozenset(names)
+
+
+class EventFilter:
+    """Decide which queue events reach ``on_event``, before any ``QueueEvent`` is built.
+
+    Pass an instance as a queue's ``event_filter``. ``operations`` and
+    ``outcomes`` are allowlists; ``None`` (the default) allows every value.
+    ``sample_rates`` maps an operation to the fraction of its events to
+    deliver, between 0.0 and 1.0. Operations not listed are delivered in
+    full, and a rate of 0.0 drops the operation entirely::
+
+        EventFilter(sample_rates={"lease_renew": 0.01, "claim_empty": 0.0})
+
+    Sampling is random per event, so counts derived from sampled events are
+    estimates. A queue's ``metrics`` collector still counts every event. One
+    filter can be shared by several queues.
+    """
+
+    def __init__(
+        self,
+        *,
+        operations: Iterable[EventOperation | str] | None = None,
+        outcomes: Iterable[EventOutcome | str] | None = None,
+        sample_rates: Mapping[EventOperation | str, float] | None = None,
+    ) -> None:
+        self._operations = _event_names("operations", operations, EventOperation)
+        self._outcomes = _event_names("outcomes", outcomes, EventOutcome)
+        rates: dict[str, float] = {}
+        for operation, rate in (sample_rates or {}).items():
+            try:
+                operation = EventOperation(operation)
+            except ValueError:
+                raise ConfigurationError(f"'sample_rates' contains unknown EventOperation {operation!r}") from None
+            if not isinstance(rate, (int, float)) or isinstance(rate, bool):
+                raise TypeError(
+                    f"'sample_rates' values must be numbers, got {type(rate).__name__} for {str(operation)!r}"
+                )
+            if not math.isfinite(rate) or not 0.0 <= rate <= 1.0:
+                raise ConfigurationError(
+                    f"'sample_rates' values must be between 0.0 and 1.0, got {rate} for {str(operation)!r}"
+                )
+            rates[operation] = float(rate)
+        self._sample_rates = rates
+
+    @property
+    def operations(self) -> frozenset[str] | None:
+        """Allowed operations, or ``None`` when every operation is allowed."""
+        return self._operations or None
+
+    @property
+    def outcomes(self) -> frozenset[str] | None:
+        """Allowed outcomes, or ``None`` when every outcome is allowed."""
+        return self._outcomes or None
+
+    @property
+    def sample_rates(self) -> dict[str, float]:
+        """Per-operation delivery fractions."""
+        return dict(self._sample_rates)
+
+    def allows(self, operation: EventOperation | str, outcome: EventOutcome | str) -> bool:
+        """Return whether one event with this operation and outcome should be delivered."""
+        if self._operations and operation not in self._operations:
+            return False
+        if self._outcomes and outcome not in self._outcomes:
+            return False
+        rate = self._sample_rates.get(operation)
+        if rate is None or rate >= 1.0:
+            return True
+        return random.random() < rate
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+
+from redis_message_queue._exceptions import ConfigurationError, GatewayContractError
+from redis_message_queue._stored_message import ReceivedPayload
+
+DEFAULT_METADATA_GC_BATCH_SIZE = 100
+# Per-message hashes of the processing list that can outlive their messages.
+METADATA_GC_HASHES = ("claim_result_refs", "claim_result_backrefs", "claim_result_ids", "delivery_counts")
+# Entries per fingerprint read while walking pending or processing.
+METADATA_GC_PENDING_WINDOW = 1000
+# Leading bytes of a stored message kept in its fingerprint; they cover the
+# envelope prefix and id.
+MESSAGE_FINGERPRINT_BYTES = 48
+
+
+@dataclass(frozen=True)
+class OrphanedMetadataReport:
+    """Result of ``collect_orphaned_metadata()``.
+
+    ``scanned`` counts the hash fields looked at, ``removed`` those deleted,
+    and ``bytes_reclaimed`` the bytes of their field names and values; Redis
+    frees some per-field overhead on top of that.
+    """
+
+    scanned: int
+    removed: int
+    bytes_reclaimed: int
+
+
+def validate_metadata_gc_batch_size(batch_size: int) -> None:
+    """Validate ``collect_orphaned_metadata()``'s ``batch_size``."""
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int):
+        raise TypeError(f"'batch_size' must be an int, got {type(batch_size).__name__}")
+    if batch_size < 1:
+        raise ConfigurationError(f"'batch_size' must be >= 1, got {batch_size}")
+
+
+def require_scan_result(value: object, method: str = "scan_metadata_fields") -> tuple[int, list[ReceivedPayload]]:
+    """Return a gateway scan method's ``(cursor, items)``, or raise ``GatewayContractError``."""
+    if (
+        not isinstance(value, tuple)
+        or len(value) != 2
+        or not isinstance(value[0], int)
+        or not isinstance(value[1], list)
+    ):
+        raise GatewayContractError(
+            f"gateway.{method}() must return a (cursor, items) tuple, got {type(value).__name__}."
+        )
+    return value
+
+
+def require_metadata_values(value: object, count: int) -> list[ReceivedPayload | None]:
+    """Return ``metadata_values()``'s list of ``count`` values, or raise ``GatewayContractError``."""
+    if not isinstance(value, list) or len(value) != count:
+        raise GatewayContractError(
+            f"gateway.metadata_values() must return a list of {count} values, got {type(value).__name__}."
+        )
+    return value
+
+
+def message_fingerprint(message: ReceivedPayload) -> str:
+    """Return the hex of a stored message's first bytes and its length, as ``range_message_fingerprints()`` does."""
+    raw = message if isinstance(message, bytes) else message.encode("utf-8")
+    return f"{raw[:MESSAGE_FINGERPRINT_BYTES].hex()}:{len(raw)}"
+
+
+def require_fingerprints(value: object) -> list[str]:
+    """Return ``range_message_fingerprints()``'s list, or raise ``GatewayContractError``."""
+    if not isinstance(value, list):
+        raise GatewayContractError(
+            f"gateway.range_message_fingerprints() must return a list, got {type(value).__name__}."
+        )
+    return value
+
+
+def require_removal_result(value: object) -> tuple[int, int]:
+    """Return ``remove_stale_metadata()``'s ``(removed, bytes)``, or raise ``GatewayContractError``."""
+    if not isinstance(value, tuple) or len(value) != 2 or not all(isinstance(item, int) for item in value):
+        raise GatewayContractError(
+            f"gateway.remove_stale_metadata() must return a (removed, bytes) tuple, got {type(value).__name__}."
+        )
+    return value
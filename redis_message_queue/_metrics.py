@@ -0,0 +1,159 @@
+import bisect
+import math
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+from redis_message_queue._exceptions import ConfigurationError
+
+# Upper bounds in milliseconds, spanning sub-millisecond Redis calls through
+# multi-second handler runs.
+DEFAULT_DURATION_BUCKETS_MS: tuple[float, ...] = (
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+
+
+@dataclass(frozen=True)
+class OperationMetrics:
+    """Counters for one ``(queue, operation, outcome)`` key of a ``MetricsCollector``.
+
+    ``count`` counts every event. Events that carried a ``duration_ms`` are
+    also counted in ``duration_count`` and ``duration_sum_ms`` and in
+    ``bucket_counts``, which holds cumulative counts aligned with the
+    collector's ``buckets_ms`` plus a final ``+Inf`` bucket.
+    """
+
+    count: int
+    duration_count: int
+    duration_sum_ms: float
+    bucket_counts: tuple[int, ...]
+
+
+class MetricsCollector:
+    """Aggregate queue events into counters and fixed-bucket duration histograms.
+
+    Pass one collector as ``metrics=`` to any number of sync or async queues.
+    Each event the queue would emit bumps the counter for its ``(queue,
+    operation, outcome)`` and, when the event has a duration, one histogram
+    bucket. No ``QueueEvent`` is built for it, so a queue with ``metrics=``
+    and no ``on_event`` pays only a few integer updates per event. Both can be
+    set at once.
+
+    ``snapshot()`` returns the current counters. ``render_prometheus()``
+    returns them in the Prometheus text exposition format for a ``/metrics``
+    endpoint. No Prometheus client library is needed.
+    """
+
+    def __init__(self, *, buckets_ms: Iterable[float] = DEFAULT_DURATION_BUCKETS_MS) -> None:
+        bounds = tuple(buckets_ms)
+        for bound in bounds:
+            if not isinstance(bound, (int, float)) or isinstance(bound, bool):
+                raise TypeError(f"'buckets_ms' must contain numbers, got {type(bound).__name__}")
+        if not bounds:
+            raise ConfigurationError("'buckets_ms' must contain at least one bucket bound")
+        if any(not math.isfinite(bound) or bound <= 0 for bound in bounds):
+            raise ConfigurationError(f"'buckets_ms' bounds must be finite and positive, got {bounds}")
+        if list(bounds) != sorted(set(bounds)):
+            raise ConfigurationError(f"'buckets_ms' bounds must be strictly increasing, got {bounds}")
+        self._buckets_ms = tuple(float(bound) for bound in bounds)
+        self._lock = threading.Lock()
+        # key -> [count, duration_count, duration_sum_ms, per-bucket counts...]
+        self._rows: dict[tuple[str, str, str], list[float]] = {}
+
+    @property
+    def buckets_ms(self) -> tuple[float, ...]:
+        """Histogram bucket upper bounds in milliseconds, excluding ``+Inf``."""
+        return self._buckets_ms
+
+    def record(self, queue: str, operation: str, outcome: str, duration_ms: float | None = None) -> None:
+        """Count one event; queues call this for every event they emit."""
+        key = (queue, str(operation), str(outcome))
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = [0, 0, 0.0] + [0] * (len(self._buckets_ms) + 1)
+            row[0] += 1
+            if duration_ms is not None:
+                row[1] += 1
+                row[2] += duration_ms
+                row[3 + bisect.bisect_left(self._buckets_ms, duration_ms)] += 1
+
+    def reset(self) -> None:
+        """Drop every counter."""
+        with self._lock:
+            self._rows = {}
+
+    def snapshot(self) -> dict[tuple[str, str, str], OperationMetrics]:
+        """Return the counters keyed by ``(queue, operation, outcome)``."""
+        with self._lock:
+            rows = [(key, list(row)) for key, row in self._rows.items()]
+        snapshot = {}
+        for key, row in rows:
+            cumulative = []
+            running = 0
+            for bucket_count in row[3:]:
+                running += int(bucket_count)
+                cumulative.append(running)
+            snapshot[key] = OperationMetrics(
+                count=int(row[0]),
+                duration_count=int(row[1]),
+                duration_sum_ms=row[2],
+                bucket_counts=tuple(cumulative),
+            )
+        return snapshot
+
+    def render_prometheus(self, *, prefix: str = "rmq") -> str:
+        """Render the counters in the Prometheus text exposition format (version 0.0.4).
+
+        Emits ``<prefix>_events_total`` counters and an
+        ``<prefix>_operation_duration_seconds`` histogram. Both are labeled
+        with ``queue``, ``operation``, and ``outcome``.
+        """
+        snapshot = sorted(self.snapshot().items())
+        events = f"{prefix}_events_total"
+        duration = f"{prefix}_operation_duration_seconds"
+        lines = [
+            f"# HELP {events} redis-message-queue lifecycle events.",
+            f"# TYPE {events} counter",
+        ]
+        for key, metrics in snapshot:
+            lines.append(f"{events}{{{_labels(key)}}} {metrics.count}")
+        lines += [
+            f"# HELP {duration} Duration of redis-message-queue operations.",
+            f"# TYPE {duration} histogram",
+        ]
+        bounds = [_format_number(bound / 1000) for bound in self._buckets_ms] + ["+Inf"]
+        for key, metrics in snapshot:
+            if metrics.duration_count == 0:
+                continue
+            labels = _labels(key)
+            for bound, bucket_count in zip(bounds, metrics.bucket_counts):
+                lines.append(f'{duration}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+            lines.append(f"{duration}_sum{{{labels}}} {_format_number(metrics.duration_sum_ms / 1000)}")
+            lines.append(f"{duration}_count{{{labels}}} {metrics.duration_count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: tuple[str, str, str]) -> str:
+    queue, operation, outcome = key
+    return f'queue="{_escape(queue)}",operation="{_escape(operation)}",outcome="{_escape(outcome)}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value))
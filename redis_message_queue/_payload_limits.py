@@ -85,6 +85,10 @@ def validate_str_payload_size(message: str, max_payload_bytes: int | None) -> No
     )
 
 
+def validate_bytes_payload_size(message: bytes, max_payload_bytes: int | None) -> None:
+    validate_max_payload_bytes(len(message), max_payload_bytes, payload_type="bytes message")
+
+
 def validate_max_payload_bytes(size_bytes: int, max_payload_bytes: int | None, *, payload_type: str) -> None:
     if max_payload_bytes is None or size_bytes <= max_payload_bytes:
         return
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from redis_message_queue._exceptions import ConfigurationError
+from redis_message_queue._stored_message import ReceivedPayload
+
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class PurgeProgress:
+    """Progress of an incremental ``purge()``, reported after every slice.
+
+    ``total`` is the list length when the purge started, ``scanned`` how many
+    of those entries have been looked at, and ``removed`` how many were
+    deleted so far (equal to ``scanned`` without a ``predicate``, barring
+    concurrent removals).
+    """
+
+    target: str
+    removed: int
+    scanned: int
+    total: int
+
+
+def validate_incremental_purge_arguments(
+    batch_size: int | None,
+    predicate: Callable[[ReceivedPayload], bool] | None,
+    on_progress: Callable[[PurgeProgress], object] | None,
+) -> bool:
+    """Validate ``purge()``'s incremental-mode arguments; return whether any was given."""
+    if batch_size is not None:
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int):
+            raise TypeError(f"'batch_size' must be an int or None, got {type(batch_size).__name__}")
+        if batch_size < 1:
+            raise ConfigurationError(f"'batch_size' must be >= 1 when provided, got {batch_size}")
+    if predicate is not None and not callable(predicate):
+        raise TypeError(f"'predicate' must be callable, got {type(predicate).__name__}")
+    if on_progress is not None and not callable(on_progress):
+        raise TypeError(f"'on_progress' must be callable, got {type(on_progress).__name__}")
+    return batch_size is not None or predicate is not None or on_progress is not None
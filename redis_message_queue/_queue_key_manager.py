@@ -2,7 +2,7 @@ from redis_message_queue._exceptions import ConfigurationError
 from redis_message_queue._stored_message import PublishPayload
 
 
-def validate_callable_deduplication_key(dedup_key: object, message: PublishPayload) -> str:
+def validate_callable_deduplication_key(dedup_key: object, message: PublishPayload | bytes) -> str:
     if dedup_key is None:
         raise ConfigurationError(
             f"get_deduplication_key returned None for message {message!r}; the callable must return a non-empty string"
@@ -47,6 +47,10 @@ class QueueKeyManager:
     # what the queue actually writes to when no custom `dead_letter_queue=` is configured.
     _DEAD_LETTER_MESSAGES = "dlq"
 
+    # Bodies of claim-checked messages, one string key per message.
+    # The queue lists carry only a short reference to these keys.
+    _CLAIM_CHECK_BODIES = "payload"
+
     def __init__(self, queue_name: str, key_separator: str):
         if not isinstance(queue_name, str):
             raise TypeError(f"'name' must be a string, got {type(queue_name).__name__}")
@@ -88,6 +92,13 @@ class QueueKeyManager:
     def deduplication_prefix(self) -> str:
         return f"{self._queue_name}{self._key_separator}{self._MESSAGE_DEDUPLICATION_LOG}{self._key_separator}"
 
+    def claim_check(self, reference_id: str) -> str:
+        return f"{self.claim_check_prefix}{reference_id}"
+
+    @property
+    def claim_check_prefix(self) -> str:
+        return f"{self._queue_name}{self._key_separator}{self._CLAIM_CHECK_BODIES}{self._key_separator}"
+
     @property
     def pending(self) -> str:
         return f"{self._queue_name}{self._key_separator}{self._PENDING_MESSAGES}"
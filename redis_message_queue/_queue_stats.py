@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from typing import NamedTuple, Sequence, cast
+
+from redis_message_queue._stored_message import message_age_ms
 
 
 @dataclass(frozen=True)
@@ -8,9 +11,20 @@ class QueueStats:
     ``pending`` and ``processing`` are always integers. ``completed``,
     ``failed``, and ``dead_letter`` are ``None`` when the corresponding feature
     is disabled for the queue (no completed queue, no failed queue, or no
-    dead-letter routing) and an integer depth otherwise. Depths are read with
-    independent ``LLEN`` calls, so a ``QueueStats`` is a best-effort snapshot
-    rather than a single point-in-time-consistent view of every list.
+    dead-letter routing) and an integer depth otherwise.
+
+    With the built-in gateway every field is read by one Lua script, so the
+    snapshot is point-in-time consistent. ``leases`` counts messages holding a
+    visibility-timeout lease and ``expired_leases`` those whose lease has
+    lapsed and await reclaim (both ``0`` without a visibility timeout). A
+    custom gateway without the snapshot method falls back to independent
+    ``LLEN`` calls: the result is then best-effort, and both lease counts are
+    ``None``.
+
+    ``oldest_pending_age_ms`` is how long the next message to be claimed has
+    been waiting, derived from the enqueue time carried in its message id. It
+    is ``None`` when ``pending`` is empty or its oldest entry predates
+    timestamped ids (or is not an envelope at all).
     """
 
     pending: int
@@ -18,3 +32,64 @@ class QueueStats:
     completed: int | None
     failed: int | None
     dead_letter: int | None
+    oldest_pending_age_ms: float | None = None
+    leases: int | None = None
+    expired_leases: int | None = None
+
+
+class QueueStatsKeys(NamedTuple):
+    """Redis keys one stats snapshot reads; disabled lists are ``None``."""
+
+    pending: str
+    processing: str
+    completed: str | None = None
+    failed: str | None = None
+    dead_letter: str | None = None
+
+
+def queue_stats_snapshot_keys(keys: QueueStatsKeys, lease_deadlines_key: str) -> list[str]:
+    """Return the ``KEYS`` of ``QUEUE_STATS_SNAPSHOT_LUA_SCRIPT`` for ``keys``."""
+    optional = [key for key in (keys.completed, keys.failed, keys.dead_letter) if key is not None]
+    return [keys.pending, keys.processing, lease_deadlines_key, *optional]
+
+
+def queue_stats_from_snapshot(keys: QueueStatsKeys, snapshot: object) -> QueueStats:
+    """Build a ``QueueStats`` from one ``QUEUE_STATS_SNAPSHOT_LUA_SCRIPT`` reply."""
+    values = list(cast(Sequence[object], snapshot))
+    pending, processing, leases, expired_leases, oldest_id, *depths = values
+    if isinstance(oldest_id, bytes):
+        oldest_id = oldest_id.decode("ascii", "replace")
+    optional_depths = iter(depths)
+    completed, failed, dead_letter = (
+        None if key is None else int(cast(int, next(optional_depths)))
+        for key in (keys.completed, keys.failed, keys.dead_letter)
+    )
+    return QueueStats(
+        pending=int(cast(int, pending)),
+        processing=int(cast(int, processing)),
+        completed=completed,
+        failed=failed,
+        dead_letter=dead_letter,
+        oldest_pending_age_ms=message_age_ms(oldest_id) if isinstance(oldest_id, str) and oldest_id else None,
+        leases=int(cast(int, leases)),
+        expired_leases=int(cast(int, expired_leases)),
+    )
+
+
+def group_stats_batches(gateways: Sequence[object]) -> tuple[list[list[int]], list[int]]:
+    """Group gateway positions that can share one pipelined stats round trip.
+
+    Returns ``(batches, unbatched)``: each batch lists the positions of gateways
+    that implement ``queue_stats_snapshots`` over the same Redis client (the
+    first one runs the pipeline for all), and ``unbatched`` the rest.
+    """
+    batches: dict[int, list[int]] = {}
+    unbatched: list[int] = []
+    for position, gateway in enumerate(gateways):
+        client = getattr(gateway, "_redis_client", None)
+        if client is None or getattr(gateway, "queue_stats_snapshots", None) is None:
+            unbatched.append(position)
+            continue
+        client = getattr(client, "wrapped_client", client)
+        batches.setdefault(id(client), []).append(position)
+    return list(batches.values()), unbatched
@@ -0,0 +1,232 @@
+import math
+import threading
+import time
+from typing import Iterable, Mapping
+
+from redis_message_queue._exceptions import ConfigurationError
+from redis_message_queue._metrics import _escape, _format_number
+from redis_message_queue._queue_key_manager import QueueKeyManager
+from redis_message_queue._queue_stats import QueueStats, QueueStatsKeys
+from redis_message_queue._redis_cluster import validate_queue_keys_for_redis_cluster
+from redis_message_queue._redis_gateway import RedisGateway
+
+DEFAULT_STATS_CACHE_SECONDS = 5.0
+
+_LIST_FIELDS = ("pending", "processing", "completed", "failed", "dead_letter")
+_GLOB_SPECIAL_CHARACTERS = "\\*?[]"
+
+
+def validate_stats_collector_parameters(
+    queue_names: Iterable[str] | None,
+    name_prefix: str | None,
+    key_separator: str,
+    cache_seconds: float,
+    flags: Mapping[str, bool],
+) -> tuple[str, ...] | None:
+    """Validate ``QueueStatsCollector`` arguments; return the explicit names, if any."""
+    if (queue_names is None) == (name_prefix is None):
+        raise ConfigurationError("Pass exactly one of 'queue_names' or 'name_prefix'")
+    for name, value in flags.items():
+        if not isinstance(value, bool):
+            raise TypeError(f"'{name}' must be a bool, got {type(value).__name__} (use True or False, not 1/0)")
+    if isinstance(cache_seconds, bool) or not isinstance(cache_seconds, (int, float)):
+        raise TypeError(f"'cache_seconds' must be a number, got {type(cache_seconds).__name__}")
+    if not math.isfinite(cache_seconds) or cache_seconds < 0:
+        raise ConfigurationError(f"'cache_seconds' must be a finite number >= 0, got {cache_seconds}")
+    if name_prefix is not None:
+        if not isinstance(name_prefix, str):
+            raise TypeError(f"'name_prefix' must be a str, got {type(name_prefix).__name__}")
+        return None
+    if isinstance(queue_names, str):
+        raise TypeError("'queue_names' must be an iterable of queue names, not a single str")
+    names = tuple(dict.fromkeys(queue_names or ()))
+    for name in names:
+        # Raises for non-str, empty, or separator-containing names.
+        QueueKeyManager(name, key_separator)
+    return names
+
+
+def stats_keys_for(
+    name: str,
+    key_separator: str,
+    *,
+    enable_completed_queue: bool,
+    enable_failed_queue: bool,
+    include_dead_letter: bool,
+    redis_cluster: bool,
+) -> QueueStatsKeys:
+    """Return the stats keys of queue ``name`` as a default-configured queue would name them."""
+    key = QueueKeyManager(name, key_separator)
+    if redis_cluster:
+        validate_queue_keys_for_redis_cluster(key)
+    return QueueStatsKeys(
+        pending=key.pending,
+        processing=key.processing,
+        completed=key.completed if enable_completed_queue else None,
+        failed=key.failed if enable_failed_queue else None,
+        dead_letter=key.dead_letter if include_dead_letter else None,
+    )
+
+
+def escape_scan_pattern(text: str) -> str:
+    """Escape ``text`` so a ``SCAN MATCH`` pattern matches it literally."""
+    return "".join(f"\\{char}" if char in _GLOB_SPECIAL_CHARACTERS else char for char in text)
+
+
+def queue_discovery_patterns(name_prefix: str, key_separator: str) -> list[tuple[str, int]]:
+    """Return ``(SCAN MATCH pattern, suffix length)`` pairs that find queues under ``name_prefix``."""
+    prefix = escape_scan_pattern(name_prefix)
+    separator = escape_scan_pattern(key_separator)
+    # A queue with work in flight may have an empty pending list, so match both.
+    return [
+        (f"{prefix}*{separator}{list_name}", len(key_separator) + len(list_name))
+        for list_name in ("pending", "processing")
+    ]
+
+
+def queue_name_from_key(key: object, suffix_length: int, key_separator: str) -> str | None:
+    """Return the queue name a discovered list key belongs to, or None if it is not a valid one."""
+    if isinstance(key, bytes):
+        key = key.decode("utf-8", "replace")
+    if not isinstance(key, str):
+        return None
+    name = key[:-suffix_length]
+    try:
+        QueueKeyManager(name, key_separator)
+    except (ConfigurationError, TypeError):
+        return None
+    return name
+
+
+def render_queue_stats_prometheus(stats: Mapping[str, QueueStats], *, prefix: str = "rmq") -> str:
+    """Render queue snapshots as Prometheus gauges (text exposition format 0.0.4)."""
+    messages = f"{prefix}_queue_messages"
+    leases = f"{prefix}_queue_leases"
+    expired_leases = f"{prefix}_queue_expired_leases"
+    oldest_age = f"{prefix}_queue_oldest_pending_age_seconds"
+    rows = sorted(stats.items())
+    lines = [
+        f"# HELP {messages} Messages in each redis-message-queue list.",
+        f"# TYPE {messages} gauge",
+    ]
+    for queue, snapshot in rows:
+        for field in _LIST_FIELDS:
+            value = getattr(snapshot, field)
+            if value is not None:
+                lines.append(f'{messages}{{queue="{_escape(queue)}",list="{field}"}} {value}')
+    for name, help_text, field, scale in (
+        (leases, "Messages holding a visibility-timeout lease.", "leases", 1),
+        (expired_leases, "Leases that have lapsed and await reclaim.", "expired_leases", 1),
+        (oldest_age, "Age of the next message to be claimed.", "oldest_pending_age_ms", 1000),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for queue, snapshot in rows:
+            value = getattr(snapshot, field)
+            if value is not None:
+                rendered = value if scale == 1 else _format_number(value / scale)
+                lines.append(f'{name}{{queue="{_escape(queue)}"}} {rendered}')
+    return "\n".join(lines) + "\n"
+
+
+class QueueStatsCollector:
+    """Gather ``QueueStats`` for many queues on one Redis client, cached for dashboards.
+
+    Name the queues with ``queue_names`` or find them with ``name_prefix``,
+    which ``SCAN``s for ``<prefix>*<separator>pending`` and ``...processing``
+    lists on each call that misses the cache. No ``RedisMessageQueue`` is
+    built: keys follow a default-configured queue (``key_separator``, the
+    auto-derived dead-letter queue), so set ``enable_completed_queue``,
+    ``enable_failed_queue``, and ``include_dead_letter`` to match how the
+    queues were created. Each queue is one atomic stats script and all of
+    them go out in one pipeline; on ``redis.RedisCluster`` the pipeline is
+    split per node, so hash-tagged queue names are required.
+
+    ``collect()`` returns ``{queue_name: QueueStats}`` and reuses the last
+    result for ``cache_seconds``; ``render_prometheus()`` exposes the same
+    snapshot as gauges. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        client: object,
+        *,
+        queue_names: Iterable[str] | None = None,
+        name_prefix: str | None = None,
+        key_separator: str = "::",
+        enable_completed_queue: bool = False,
+        enable_failed_queue: bool = False,
+        include_dead_letter: bool = True,
+        cache_seconds: float = DEFAULT_STATS_CACHE_SECONDS,
+    ) -> None:
+        self._queue_names = validate_stats_collector_parameters(
+            queue_names,
+            name_prefix,
+            key_separator,
+            cache_seconds,
+            {
+                "enable_completed_queue": enable_completed_queue,
+                "enable_failed_queue": enable_failed_queue,
+                "include_dead_letter": include_dead_letter,
+            },
+        )
+        self._gateway = RedisGateway(redis_client=client)  # type: ignore[arg-type]
+        self._client = client
+        self._name_prefix = name_prefix
+        self._key_separator = key_separator
+        self._enable_completed_queue = enable_completed_queue
+        self._enable_failed_queue = enable_failed_queue
+        self._include_dead_letter = include_dead_letter
+        self._cache_seconds = float(cache_seconds)
+        self._cached: dict[str, QueueStats] | None = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+        if self._queue_names is not None:
+            self._keys_for(self._queue_names)
+
+    def _keys_for(self, names: Iterable[str]) -> list[QueueStatsKeys]:
+        return [
+            stats_keys_for(
+                name,
+                self._key_separator,
+                enable_completed_queue=self._enable_completed_queue,
+                enable_failed_queue=self._enable_failed_queue,
+                include_dead_letter=self._include_dead_letter,
+                redis_cluster=self._gateway.is_redis_cluster,
+            )
+            for name in names
+        ]
+
+    def _discover(self) -> tuple[str, ...]:
+        assert self._name_prefix is not None
+        names: set[str] = set()
+        for pattern, suffix_length in queue_discovery_patterns(self._name_prefix, self._key_separator):
+            for key in self._client.scan_iter(match=pattern, count=1000, _type="LIST"):  # type: ignore[attr-defined]
+                name = queue_name_from_key(key, suffix_length, self._key_separator)
+                if name is not None:
+                    names.add(name)
+        return tuple(sorted(names))
+
+    def collect(self, *, refresh: bool = False) -> dict[str, QueueStats]:
+        """Return ``{queue_name: QueueStats}``, from cache unless it is older than ``cache_seconds``.
+
+        ``refresh=True`` always reads Redis.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not refresh and self._cached is not None and now - self._cached_at < self._cache_seconds:
+                return dict(self._cached)
+            names = self._queue_names if self._queue_names is not None else self._discover()
+            snapshots = self._gateway.queue_stats_snapshots(self._keys_for(names)) if names else []
+            self._cached = dict(zip(names, snapshots))
+            self._cached_at = time.monotonic()
+            return dict(self._cached)
+
+    def render_prometheus(self, *, prefix: str = "rmq", refresh: bool = False) -> str:
+        """Render ``collect()`` as Prometheus gauges.
+
+        Emits ``<prefix>_queue_messages`` (labeled by ``queue`` and ``list``),
+        ``<prefix>_queue_leases``, ``<prefix>_queue_expired_leases``, and
+        ``<prefix>_queue_oldest_pending_age_seconds``, each labeled by
+        ``queue``. Disabled lists and unknown ages are omitted.
+        """
+        return render_queue_stats_prometheus(self.collect(refresh=refresh), prefix=prefix)
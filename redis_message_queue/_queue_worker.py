@@ -0,0 +1,243 @@
+import inspect
+import logging
+import queue as queue_module
+import threading
+import time
+from contextlib import AbstractContextManager
+from typing import Callable, Optional, cast
+
+from redis_message_queue._callable_utils import is_async_callable
+from redis_message_queue._exceptions import ConfigurationError, MalformedStoredMessageError
+from redis_message_queue._stored_message import ReceivedPayload
+from redis_message_queue.interrupt_handler import BaseGracefulInterruptHandler
+from redis_message_queue.redis_message_queue import (
+    _SYNC_CALLBACK_AWAITABLE_RETURN_MESSAGE,
+    RedisMessageQueue,
+    _close_or_cancel_awaitable,
+    _ReturnMessageToPending,
+    _SharedLeaseHeartbeat,
+    _SkipMessageCleanup,
+)
+
+logger = logging.getLogger(__name__)
+# How often a claimer blocked on a full prefetch buffer re-checks for shutdown.
+_STOP_POLL_INTERVAL_SECONDS = 0.1
+# A claimed message, the entered process_message() context that acks it, and
+# the monotonic time it was claimed.
+_ClaimedWork = tuple[AbstractContextManager[Optional[ReceivedPayload]], ReceivedPayload, float]
+
+
+def _validate_worker_count(name: str, value: int) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"'{name}' must be an int, got {type(value).__name__}")
+    if value <= 0:
+        raise ConfigurationError(f"'{name}' must be a positive integer, got {value}")
+    return value
+
+
+class QueueWorker:
+    """Run ``handler`` over a queue with one claimer and ``concurrency`` handler threads.
+
+    The thread calling ``run()`` is the only one that claims: it fills a local
+    buffer of at most ``prefetch`` claimed-but-not-started messages, and
+    ``concurrency`` handler threads drain it. Each message keeps the
+    ``process_message()`` contract: a normal return acks, an exception is
+    terminal (nack), and a handler that returns an awaitable raises
+    ``TypeError`` and leaves the message in ``processing``, as in
+    ``process_message_callback()``.
+
+    Leases start at claim time, so a buffered message's visibility timeout is
+    already running while it waits for a handler thread. With the queue's
+    ``heartbeat_interval_seconds`` set, every in-flight lease, buffered or
+    being handled, is renewed from claim on by one worker-wide heartbeat
+    thread, one pipelined round trip per interval. (A custom gateway without
+    batched renewal gets a heartbeat thread per message.) Without it, a
+    buffered message whose visibility timeout ran out before a handler thread
+    got to it is returned to pending instead of handled, since another
+    consumer may already have reclaimed it.
+
+    ``run()`` returns after ``stop()``, once ``interrupt`` or the queue's own
+    ``interrupt`` fires, or once the queue is draining. An idle claim wait is
+    cut short, handlers already running finish, and buffered messages no
+    handler has started are returned to the head of pending rather than left
+    in ``processing`` to wait out their visibility timeout. (A custom gateway
+    without this release path gets them handled before ``run()`` returns.)
+    Handler exceptions are logged and do not stop the worker. A claim that
+    fails with ``MalformedStoredMessageError`` is logged and skipped (the
+    message stays in ``processing`` for visibility-timeout reclaim); any other
+    claim error stops the worker and is re-raised from ``run()`` once the
+    buffer is drained.
+    """
+
+    def __init__(
+        self,
+        queue: RedisMessageQueue,
+        handler: Callable[[ReceivedPayload], None],
+        *,
+        concurrency: int = 1,
+        prefetch: int | None = None,
+        interrupt: BaseGracefulInterruptHandler | None = None,
+    ):
+        if not isinstance(queue, RedisMessageQueue):
+            raise TypeError(f"'queue' must be a sync RedisMessageQueue, got {type(queue).__name__}")
+        if not callable(handler):
+            raise TypeError(f"'handler' must be callable, got {type(handler).__name__}")
+        if is_async_callable(handler):
+            raise TypeError(_SYNC_CALLBACK_AWAITABLE_RETURN_MESSAGE)
+        if interrupt is not None and not isinstance(interrupt, BaseGracefulInterruptHandler):
+            raise TypeError(f"'interrupt' must be a BaseGracefulInterruptHandler, got {type(interrupt).__name__}")
+        self._queue = queue
+        self._handler = handler
+        self._concurrency = _validate_worker_count("concurrency", concurrency)
+        self._prefetch = _validate_worker_count("prefetch", concurrency if prefetch is None else prefetch)
+        self._interrupt = interrupt
+        self._stop_requested = threading.Event()
+        self._unstarted: list[_ClaimedWork] = []
+        self._unstarted_lock = threading.Lock()
+        self._visibility_timeout_seconds = queue._redis.message_visibility_timeout_seconds
+        self._can_release = hasattr(queue._redis, "_return_claimed_message_to_pending")
+
+    def stop(self) -> None:
+        """Ask ``run()`` to stop claiming; safe to call from any thread or a signal handler."""
+        self._stop_requested.set()
+
+    def run(self) -> None:
+        """Claim and handle messages until stopped; blocks the calling thread."""
+        # ``None`` tells a handler thread to exit once the messages ahead of it are handled.
+        buffer: queue_module.SimpleQueue[_ClaimedWork | None] = queue_module.SimpleQueue()
+        slots = threading.Semaphore(self._prefetch)
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(buffer, slots),
+                name=f"rmq-worker-{self._queue.key.pending}-{index}",
+                daemon=True,
+            )
+            for index in range(self._concurrency)
+        ]
+        shared_lease_heartbeat = self._queue._build_shared_lease_heartbeat()
+        if shared_lease_heartbeat is not None:
+            shared_lease_heartbeat.start()
+        for thread in threads:
+            thread.start()
+        try:
+            while not self._should_stop():
+                if not slots.acquire(timeout=_STOP_POLL_INTERVAL_SECONDS):
+                    continue
+                if self._should_stop():
+                    break
+                claimed = self._claim(shared_lease_heartbeat)
+                if claimed is None:
+                    slots.release()
+                    continue
+                buffer.put(claimed)
+        finally:
+            for _ in threads:
+                buffer.put(None)
+            for thread in threads:
+                thread.join()
+            # Each release pushes onto the head of pending, so newest first
+            # keeps the original claim order.
+            unstarted = sorted(self._unstarted, key=lambda work: work[2], reverse=True)
+            self._unstarted.clear()
+            for context, _, _ in unstarted:
+                self._release(context)
+            if shared_lease_heartbeat is not None:
+                shared_lease_heartbeat.stop()
+
+    def _should_stop(self) -> bool:
+        if self._stop_requested.is_set() or self._queue.is_draining:
+            return True
+        if self._interrupt is not None and self._interrupt.is_interrupted():
+            return True
+        # The built-in gateway already stops claim waits on the queue's own
+        # ``interrupt``; stop claiming too instead of spinning on empty polls.
+        queue_interrupt = getattr(self._queue._redis, "_interrupt", None)
+        return isinstance(queue_interrupt, BaseGracefulInterruptHandler) and queue_interrupt.is_interrupted()
+
+    def _claim(self, shared_lease_heartbeat: _SharedLeaseHeartbeat | None) -> _ClaimedWork | None:
+        # The context is entered here and exited on a handler thread; the
+        # generator behind it is never resumed by two threads at once.
+        context = cast(
+            AbstractContextManager[Optional[ReceivedPayload]],
+            self._queue._process_message(
+                stop_requested=self._should_stop,
+                attach_trace_context=False,
+                shared_lease_heartbeat=shared_lease_heartbeat,
+            ),
+        )
+        try:
+            message = context.__enter__()
+        except MalformedStoredMessageError:
+            logger.warning("Skipping a message whose envelope could not be decoded", exc_info=True)
+            return None
+        if message is None:
+            context.__exit__(None, None, None)
+            return None
+        return context, message, time.monotonic()
+
+    def _work(self, buffer: "queue_module.SimpleQueue[_ClaimedWork | None]", slots: threading.Semaphore) -> None:
+        while True:
+            claimed = buffer.get()
+            if claimed is None:
+                return
+            slots.release()
+            context, message, claimed_at = claimed
+            if self._can_release and self._should_stop():
+                with self._unstarted_lock:
+                    self._unstarted.append(claimed)
+            elif self._can_release and self._lease_expired(claimed_at):
+                logger.warning("A buffered message outlived its visibility timeout; returning it to pending")
+                self._release(context)
+            else:
+                self._handle(context, message)
+
+    def _lease_expired(self, claimed_at: float) -> bool:
+        if self._visibility_timeout_seconds is None or self._queue._heartbeat_interval_seconds is not None:
+            return False
+        return time.monotonic() - claimed_at >= self._visibility_timeout_seconds
+
+    def _release(self, context: AbstractContextManager[Optional[ReceivedPayload]]) -> None:
+        exc = _ReturnMessageToPending()
+        try:
+            context.__exit__(type(exc), exc, None)
+        except Exception:
+            logger.exception("Returning a buffered message to pending failed; it stays in processing")
+
+    def _handle(self, context: AbstractContextManager[Optional[ReceivedPayload]], message: ReceivedPayload) -> None:
+        try:
+            result = self._handler(message)
+            if inspect.isawaitable(result):
+                _close_or_cancel_awaitable(result)
+                raise _SkipMessageCleanup
+        except _SkipMessageCleanup as exc:
+            context.__exit__(type(exc), exc, exc.__traceback__)
+            logger.error(_SYNC_CALLBACK_AWAITABLE_RETURN_MESSAGE)
+            return
+        except Exception as exc:
+            # process_message() nacks and re-raises the handler error; the
+            # worker keeps running.
+            context.__exit__(type(exc), exc, exc.__traceback__)
+            logger.exception("Message handler raised; the message was not acked")
+            return
+        except BaseException as exc:
+            # SystemExit and friends leave the claim in flight, as in
+            # process_message(); exiting the context still stops its heartbeat.
+            context.__exit__(type(exc), exc, exc.__traceback__)
+            raise
+        try:
+            context.__exit__(None, None, None)
+        except Exception:
+            logger.exception("Ack after successful handling failed")
+
+
+def run_consumers(
+    queue: RedisMessageQueue,
+    handler: Callable[[ReceivedPayload], None],
+    *,
+    concurrency: int = 1,
+    prefetch: int | None = None,
+    interrupt: BaseGracefulInterruptHandler | None = None,
+) -> None:
+    """Build a ``QueueWorker`` and ``run()`` it until stopped; see ``QueueWorker``."""
+    QueueWorker(queue, handler, concurrency=concurrency, prefetch=prefetch, interrupt=interrupt).run()
@@ -0,0 +1,99 @@
+import math
+import time
+from typing import Callable
+
+from redis_message_queue._exceptions import ConfigurationError
+from redis_message_queue._stored_message import ReceivedPayload
+
+DEFAULT_REDRIVE_SCRIPT_BUDGET_SECONDS = 0.01
+# The first batch is the old fixed size; later ones follow the measured cost.
+INITIAL_REDRIVE_BATCH_SIZE = 100
+MAX_REDRIVE_BATCH_SIZE = 10_000
+# Redrive scripts pipelined per round trip.
+REDRIVE_PIPELINE_DEPTH = 4
+
+
+def validate_redrive_arguments(
+    max_messages: int | None,
+    predicate: Callable[[ReceivedPayload], bool] | None,
+    max_per_second: float | None,
+    script_budget_seconds: float,
+) -> None:
+    """Validate ``redrive_dead_letters()`` arguments."""
+    if max_messages is not None:
+        if isinstance(max_messages, bool) or not isinstance(max_messages, int):
+            raise TypeError(f"'max_messages' must be an int or None, got {type(max_messages).__name__}")
+        if max_messages < 1:
+            raise ConfigurationError(f"'max_messages' must be >= 1 when provided, got {max_messages}")
+    if predicate is not None and not callable(predicate):
+        raise TypeError(f"'predicate' must be callable, got {type(predicate).__name__}")
+    if max_per_second is not None:
+        if isinstance(max_per_second, bool) or not isinstance(max_per_second, (int, float)):
+            raise TypeError(f"'max_per_second' must be a number or None, got {type(max_per_second).__name__}")
+        if not math.isfinite(max_per_second) or max_per_second <= 0:
+            raise ConfigurationError(f"'max_per_second' must be a finite number > 0, got {max_per_second}")
+    if isinstance(script_budget_seconds, bool) or not isinstance(script_budget_seconds, (int, float)):
+        raise TypeError(f"'script_budget_seconds' must be a number, got {type(script_budget_seconds).__name__}")
+    if not math.isfinite(script_budget_seconds) or script_budget_seconds <= 0:
+        raise ConfigurationError(f"'script_budget_seconds' must be a finite number > 0, got {script_budget_seconds}")
+
+
+class RedrivePacer:
+    """Spread a redrive over time so it moves at most ``max_per_second`` messages a second.
+
+    Batches shrink to about one second's worth of messages, and ``delay()``
+    says how long to wait before the next batch so the running average stays
+    under the rate. With ``max_per_second=None`` nothing is throttled.
+    """
+
+    def __init__(self, max_per_second: float | None) -> None:
+        self._max_per_second = max_per_second
+        self._started = time.monotonic()
+
+    def batch_size(self, default: int) -> int:
+        if self._max_per_second is None:
+            return default
+        return max(1, min(default, int(self._max_per_second)))
+
+    def limit(self, remaining: int | None) -> int | None:
+        """Return how many messages the next round trip may move."""
+        if self._max_per_second is None:
+            return remaining
+        per_second = max(1, int(self._max_per_second))
+        return per_second if remaining is None else min(per_second, remaining)
+
+    def delay(self, moved_total: int) -> float:
+        if self._max_per_second is None:
+            return 0.0
+        return max(0.0, moved_total / self._max_per_second - (time.monotonic() - self._started))
+
+
+class RedriveBatchSizer:
+    """Size redrive batches so one script call stays within ``budget_seconds``.
+
+    Each round trip's wall time over the messages it moved is the measured
+    per-message cost; the next batch is the budget's worth of that cost. The
+    estimate includes the network round trip, so it errs toward smaller
+    batches, and a batch at most doubles from one round trip to the next.
+    """
+
+    def __init__(self, budget_seconds: float) -> None:
+        self._budget_seconds = budget_seconds
+        self.size = INITIAL_REDRIVE_BATCH_SIZE
+
+    def record(self, moved: int, elapsed_seconds: float) -> None:
+        if moved <= 0:
+            return
+        per_message_seconds = max(elapsed_seconds, 1e-9) / moved
+        target = int(self._budget_seconds / per_message_seconds)
+        self.size = max(1, min(target, 2 * self.size, MAX_REDRIVE_BATCH_SIZE))
+
+    def plan(self, limit: int | None) -> list[int]:
+        """Return the batch sizes of the next round trip, moving at most ``limit`` messages."""
+        sizes: list[int] = []
+        while len(sizes) < REDRIVE_PIPELINE_DEPTH and (limit is None or limit > 0):
+            size = self.size if limit is None else min(self.size, limit)
+            sizes.append(size)
+            if limit is not None:
+                limit -= size
+        return sizes
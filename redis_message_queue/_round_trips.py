@@ -0,0 +1,269 @@
+import contextvars
+import functools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, ParamSpec, TypeVar
+
+import redis.commands.core
+
+_P = ParamSpec("_P")
+_TResult = TypeVar("_TResult")
+
+# Client attributes that send one command per call. register_script only
+# builds a Script wrapper; its calls go through evalsha/eval and count there.
+_COMMAND_NAMES = frozenset(
+    name for name in dir(redis.commands.core.CoreCommands) if not name.startswith("_") and name != "register_script"
+)
+_EVAL_COMMAND_NAMES = frozenset({"eval", "evalsha", "eval_ro", "evalsha_ro"})
+_OTHER_OPERATION = "other"
+_current_operation: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "redis_message_queue_round_trip_operation", default=_OTHER_OPERATION
+)
+
+
+@dataclass(frozen=True)
+class RoundTripStats:
+    """Redis traffic attributed to one gateway operation since tracking began.
+
+    ``calls`` counts gateway operation calls (a publish, a claim attempt, an
+    ack). ``round_trips`` counts client requests, so retries, recovery reads,
+    and result-key cleanup show up as extra trips; a pipeline is one trip
+    carrying ``commands`` commands. ``evals`` counts Lua script invocations.
+    Byte counts are argument and reply payload sizes (script source, keys,
+    values, reply values), excluding RESP framing. ``round_trip_ms`` is
+    client-observed time waiting on Redis, so it includes network latency and
+    any blocking wait.
+    """
+
+    calls: int
+    round_trips: int
+    commands: int
+    evals: int
+    request_bytes: int
+    response_bytes: int
+    round_trip_ms: float
+
+
+class RoundTripRecorder:
+    """Thread-safe per-operation counters behind ``round_trip_stats()``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: dict[str, list[float]] = {}
+
+    def _row(self, operation: str) -> list[float]:
+        row = self._totals.get(operation)
+        if row is None:
+            row = self._totals[operation] = [0, 0, 0, 0, 0, 0, 0.0]
+        return row
+
+    def record_call(self, operation: str) -> None:
+        with self._lock:
+            self._row(operation)[0] += 1
+
+    def record_round_trip(self, commands: int, evals: int, request_bytes: int, response_bytes: int, seconds: float):
+        operation = _current_operation.get()
+        with self._lock:
+            row = self._row(operation)
+            row[1] += 1
+            row[2] += commands
+            row[3] += evals
+            row[4] += request_bytes
+            row[5] += response_bytes
+            row[6] += seconds
+
+    def snapshot(self, *, reset: bool = False) -> dict[str, RoundTripStats]:
+        with self._lock:
+            totals = self._totals
+            if reset:
+                self._totals = {}
+            return {
+                operation: RoundTripStats(
+                    calls=int(row[0]),
+                    round_trips=int(row[1]),
+                    commands=int(row[2]),
+                    evals=int(row[3]),
+                    request_bytes=int(row[4]),
+                    response_bytes=int(row[5]),
+                    round_trip_ms=row[6] * 1000,
+                )
+                for operation, row in totals.items()
+            }
+
+
+def payload_bytes(value: object) -> int:
+    if value is None or isinstance(value, BaseException):
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", "surrogatepass"))
+    if isinstance(value, (list, tuple, set)):
+        return sum(payload_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(payload_bytes(key) + payload_bytes(item) for key, item in value.items())
+    return len(str(value))
+
+
+def _command_bytes(name: str, args: tuple[object, ...]) -> int:
+    return len(name) + payload_bytes(args)
+
+
+def accounted(operation: str) -> Callable[[Callable[_P, _TResult]], Callable[_P, _TResult]]:
+    """Attribute round trips made inside a sync gateway method to ``operation``."""
+
+    def decorate(method: Callable[_P, _TResult]) -> Callable[_P, _TResult]:
+        @functools.wraps(method)
+        def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _TResult:
+            recorder = getattr(args[0], "_round_trip_recorder", None)
+            if recorder is None or _current_operation.get() == operation:
+                return method(*args, **kwargs)
+            recorder.record_call(operation)
+            token = _current_operation.set(operation)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _current_operation.reset(token)
+
+        return wrapper
+
+    return decorate
+
+
+def accounted_async(
+    operation: str,
+) -> Callable[[Callable[_P, Coroutine[Any, Any, _TResult]]], Callable[_P, Coroutine[Any, Any, _TResult]]]:
+    """Attribute round trips made inside an async gateway method to ``operation``."""
+
+    def decorate(method: Callable[_P, Coroutine[Any, Any, _TResult]]) -> Callable[_P, Coroutine[Any, Any, _TResult]]:
+        @functools.wraps(method)
+        async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _TResult:
+            recorder = getattr(args[0], "_round_trip_recorder", None)
+            if recorder is None or _current_operation.get() == operation:
+                return await method(*args, **kwargs)
+            recorder.record_call(operation)
+            token = _current_operation.set(operation)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _current_operation.reset(token)
+
+        return wrapper
+
+    return decorate
+
+
+class _CountingPipeline:
+    """Pipeline proxy: queued commands add up, ``execute()`` is one round trip."""
+
+    def __init__(self, pipeline: Any, recorder: RoundTripRecorder, *, is_async: bool) -> None:
+        self._pipeline = pipeline
+        self._recorder = recorder
+        self._is_async = is_async
+        self._commands = 0
+        self._evals = 0
+        self._request_bytes = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._pipeline, name)
+        if name == "execute":
+            return self._execute_async if self._is_async else self._execute
+        if name not in _COMMAND_NAMES or not callable(attribute):
+            return attribute
+
+        def queue_command(*args: Any, **kwargs: Any) -> Any:
+            self._commands += 1
+            self._evals += name in _EVAL_COMMAND_NAMES
+            self._request_bytes += _command_bytes(name, args)
+            return attribute(*args, **kwargs)
+
+        return queue_command
+
+    def _record(self, result: object, started_at: float) -> None:
+        self._recorder.record_round_trip(
+            self._commands,
+            self._evals,
+            self._request_bytes,
+            payload_bytes(result),
+            time.perf_counter() - started_at,
+        )
+        self._commands = self._evals = self._request_bytes = 0
+
+    def _execute(self, *args: Any, **kwargs: Any) -> Any:
+        started_at = time.perf_counter()
+        result = None
+        try:
+            result = self._pipeline.execute(*args, **kwargs)
+            return result
+        finally:
+            self._record(result, started_at)
+
+    async def _execute_async(self, *args: Any, **kwargs: Any) -> Any:
+        started_at = time.perf_counter()
+        result = None
+        try:
+            result = await self._pipeline.execute(*args, **kwargs)
+            return result
+        finally:
+            self._record(result, started_at)
+
+
+class RoundTripCountingClient:
+    """Sync Redis client proxy that records every command it sends."""
+
+    def __init__(self, client: Any, recorder: RoundTripRecorder) -> None:
+        self.wrapped_client = client
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.wrapped_client, name)
+        if name == "pipeline":
+            return lambda *args, **kwargs: _CountingPipeline(attribute(*args, **kwargs), self._recorder, is_async=False)
+        if name not in _COMMAND_NAMES or not callable(attribute):
+            return attribute
+
+        def command(*args: Any, **kwargs: Any) -> Any:
+            started_at = time.perf_counter()
+            result = None
+            try:
+                result = attribute(*args, **kwargs)
+                return result
+            finally:
+                self._recorder.record_round_trip(
+                    1,
+                    int(name in _EVAL_COMMAND_NAMES),
+                    _command_bytes(name, args),
+                    payload_bytes(result),
+                    time.perf_counter() - started_at,
+                )
+
+        return command
+
+
+class AsyncRoundTripCountingClient(RoundTripCountingClient):
+    """Async Redis client proxy that records every command it sends."""
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.wrapped_client, name)
+        if name == "pipeline":
+            return lambda *args, **kwargs: _CountingPipeline(attribute(*args, **kwargs), self._recorder, is_async=True)
+        if name not in _COMMAND_NAMES or not callable(attribute):
+            return attribute
+
+        async def command(*args: Any, **kwargs: Any) -> Any:
+            started_at = time.perf_counter()
+            result = None
+            try:
+                result = await attribute(*args, **kwargs)
+                return result
+            finally:
+                self._recorder.record_round_trip(
+                    1,
+                    int(name in _EVAL_COMMAND_NAMES),
+                    _command_bytes(name, args),
+                    payload_bytes(result),
+                    time.perf_counter() - started_at,
+                )
+
+        return command
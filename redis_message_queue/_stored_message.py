@@ -1,6 +1,9 @@
+import contextvars
 import json
-import uuid
-from dataclasses import dataclass
+import os
+import re
+import time
+from dataclasses import dataclass, field
 
 from redis_message_queue._exceptions import MalformedStoredMessageError
 
@@ -9,18 +12,56 @@ from redis_message_queue._exceptions import MalformedStoredMessageError
 # json.loads(...) on it to recover the dict.
 ReceivedPayload = str | bytes
 # What you pass to publish(): a str (must be UTF-8-encodable; lone surrogates
-# are rejected) or a dict (JSON-serialized before storage).
+# are rejected) or a dict (JSON-serialized before storage). publish() also
+# takes bytes (stored verbatim in a binary envelope) on the built-in gateways;
+# the alias stays str | dict so existing dedup callbacks and custom gateways
+# typed against it keep type-checking.
 PublishPayload = str | dict[str, object]
 
 _STORED_MESSAGE_PREFIX = "\x1eRMQ1:"
 _STORED_MESSAGE_PREFIX_BYTES = _STORED_MESSAGE_PREFIX.encode("utf-8")
+# Binary envelope for bytes payloads: prefix, message id, ``:``, then the raw
+# payload bytes. Redis strings are binary-safe, so the payload needs neither
+# JSON escaping nor the 2x ``payload_hex`` expansion.
+_BINARY_STORED_MESSAGE_PREFIX = "\x1eRMQ1B:"
+_BINARY_STORED_MESSAGE_PREFIX_BYTES = _BINARY_STORED_MESSAGE_PREFIX.encode("utf-8")
 _NON_ENVELOPE_STRICT_ERROR = "value does not start with RMQ envelope prefix; expected an rmq-published message"
+# Byte layout written by ``encode_stored_message`` (compact separators, ``id``
+# first, then the optional ``trace`` object, then ``payload``). The header
+# fast paths below only trust this exact shape.
+_CANONICAL_ID_OPEN = '{"id":"'
+_CANONICAL_PAYLOAD_OPEN = '","payload":"'
+_CANONICAL_TRACE_OPEN = '","trace":{'
+# A ``"`` inside a JSON string is always escaped, so the first unescaped
+# ``},"payload":"`` after the trace object opens is where it closes.
+_CANONICAL_TRACE_CLOSE = '},"payload":"'
+_CANONICAL_CLOSE = '"}'
+_CANONICAL_ID_OPEN_BYTES = _CANONICAL_ID_OPEN.encode("ascii")
+_CANONICAL_PAYLOAD_OPEN_BYTES = _CANONICAL_PAYLOAD_OPEN.encode("ascii")
+_CANONICAL_TRACE_OPEN_BYTES = _CANONICAL_TRACE_OPEN.encode("ascii")
+_CANONICAL_TRACE_CLOSE_BYTES = _CANONICAL_TRACE_CLOSE.encode("ascii")
+_CANONICAL_CLOSE_BYTES = _CANONICAL_CLOSE.encode("ascii")
+# Below this size the saved copies are worth less than the byte-level checks,
+# which dict payloads (always escaped) pay only to fall back.
+_BYTES_FAST_PATH_MIN_SIZE = 64 * 1024
+# Bytes that end or escape a JSON string, or that JSON forbids raw inside one
+# (``json.dumps`` always escapes control characters). Searched in place so the
+# check allocates nothing.
+_JSON_STRING_SPECIAL_BYTES = re.compile(rb'[\x00-\x1f\\"]')
+# W3C trace-context headers to embed in envelopes built in this context; set by
+# a tracing queue around its gateway publish call.
+envelope_trace_context: contextvars.ContextVar[dict[str, str] | None] = contextvars.ContextVar(
+    "redis_message_queue_envelope_trace_context", default=None
+)
 
 
 @dataclass(frozen=True)
 class ClaimedMessage:
     stored_message: ReceivedPayload
     lease_token: str
+    # Delivery count after this claim, when the claim path reports it. Not part
+    # of the claim's identity: a replayed or recovered claim is the same claim.
+    delivery_count: int | None = field(default=None, compare=False)
 
     def __post_init__(self) -> None:
         if not isinstance(self.lease_token, str):
@@ -42,19 +83,86 @@ class ClaimedMessage:
             )
 
 
-def encode_stored_message(message: str) -> str:
-    envelope = {
-        "id": uuid.uuid4().hex,
-        "payload": message,
-    }
+def new_message_id() -> str:
+    """Return a fresh message id: a UUIDv7 in 32 lowercase hex digits.
+
+    The first 48 bits are the Unix time in milliseconds at publish, so the
+    enqueue time travels inside every envelope (text and binary) with no
+    extra field and no change to the envelope layout. The remaining 74 bits
+    are random, as unique as the uuid4 ids published before.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10))
+    # Version 7 in bits 76-79, RFC 9562 variant (0b10) in bits 62-63.
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return f"{value:032x}"
+
+
+def new_message_id_prefix() -> str:
+    """Return the first 24 hex digits of a fresh ``new_message_id()``.
+
+    Appending 8 hex digits gives a valid id, so one prefix can seed a whole
+    batch of ids (a per-batch counter in the low bits) that share its
+    timestamp and its 42 random bits; the redrive script derives its envelope
+    ids this way instead of receiving one argument per message.
+    """
+    return new_message_id()[:24]
+
+
+def message_enqueued_at_ms(message_id: str | None) -> int | None:
+    """Return the publish time embedded in a ``new_message_id()`` id, or None.
+
+    Ids from older publishers (uuid4) and foreign ids carry no timestamp.
+    """
+    if (
+        message_id is None
+        or len(message_id) != 32
+        or message_id[12] != "7"
+        or message_id[16] not in "89ab"
+        or not all(char in "0123456789abcdef" for char in message_id)
+    ):
+        return None
+    return int(message_id[:12], 16)
+
+
+def message_age_ms(message_id: str | None) -> float | None:
+    """Return milliseconds since the publish time embedded in ``message_id``, or None.
+
+    Measured against this host's clock, so clock skew between publisher and
+    reader shifts it; a publisher clock ahead of ours reads as 0.
+    """
+    enqueued_at_ms = message_enqueued_at_ms(message_id)
+    if enqueued_at_ms is None:
+        return None
+    return max(0.0, time.time() * 1000 - enqueued_at_ms)
+
+
+def encode_stored_message(message: str | bytes) -> ReceivedPayload:
+    """Wrap ``message`` in an RMQ envelope carrying a fresh message id.
+
+    ``str`` payloads get the JSON text envelope; ``bytes`` payloads get the
+    binary envelope and the result is ``bytes``. A text envelope built while
+    ``envelope_trace_context`` is set also carries those headers in a
+    ``trace`` field between ``id`` and ``payload``, where they can be read
+    without scanning the payload; the binary envelope has no room for them.
+    """
+    message_id = new_message_id()
+    if isinstance(message, bytes):
+        return b"".join((_BINARY_STORED_MESSAGE_PREFIX_BYTES, message_id.encode("ascii"), b":", message))
+    envelope: dict[str, object] = {"id": message_id}
+    trace_context = envelope_trace_context.get()
+    if trace_context:
+        envelope["trace"] = trace_context
+    envelope["payload"] = message
     return f"{_STORED_MESSAGE_PREFIX}{json.dumps(envelope, separators=(',', ':'))}"
 
 
 def decode_stored_message(message: ReceivedPayload, *, strict_envelope_decoding: bool = False) -> ReceivedPayload:
     """Strip the stored-message envelope and return the original payload.
 
-    Designed to consume values produced by ``encode_stored_message`` (or the
-    redrive script's binary-safe ``payload_hex`` envelopes) only. Calling this
+    Designed to consume values produced by ``encode_stored_message`` (text or
+    binary envelopes, or the redrive script's binary-safe ``payload_hex``
+    envelopes) only. Calling this
     on a raw user-supplied string that happens to look like a valid envelope
     (matches the prefix and parses as a payload-bearing JSON object) will
     return the inner ``payload`` field — round-trip is preserved only when
@@ -72,8 +180,10 @@ def decode_stored_message(message: ReceivedPayload, *, strict_envelope_decoding:
         return message
     _message_id, payload = envelope
     if isinstance(payload, bytes):
-        # Binary-safe ``payload_hex`` envelope (redrive of non-UTF-8 foreign
-        # bytes): the exact original bytes, regardless of client decode mode.
+        # The bytes fast path (payload sliced straight out of a bytes
+        # envelope), a binary envelope (publish(bytes)), or a binary-safe
+        # ``payload_hex`` envelope (redrive of non-UTF-8 foreign bytes): the
+        # exact original bytes either way.
         return payload
     if isinstance(message, bytes):
         try:
@@ -91,6 +201,28 @@ def decode_stored_message(message: ReceivedPayload, *, strict_envelope_decoding:
     return payload
 
 
+def split_binary_claim_result(cached_claim: ReceivedPayload) -> tuple[ReceivedPayload, str] | None:
+    """Parse a ``<lease_token>:<stored>`` claim result, or return None.
+
+    The visibility-timeout claim Lua caches binary envelopes in this form
+    because their raw payload bytes need not be valid UTF-8 and so cannot
+    ride inside the usual ``cjson.encode({stored, lease_token})`` JSON array.
+    Returns None for JSON-form (``[``-prefixed) and malformed values alike;
+    the caller's JSON parsing then classifies them.
+    """
+    if isinstance(cached_claim, bytes):
+        raw_token, raw_separator, stored_bytes = cached_claim.partition(b":")
+        if not raw_separator or not raw_token.isdigit():
+            return None
+        if not stored_bytes.startswith(_BINARY_STORED_MESSAGE_PREFIX_BYTES):
+            return None
+        return stored_bytes, raw_token.decode("ascii")
+    lease_token, separator, stored = cached_claim.partition(":")
+    if not separator or not lease_token.isdigit() or not stored.startswith(_BINARY_STORED_MESSAGE_PREFIX):
+        return None
+    return stored, lease_token
+
+
 def extract_stored_message_id(message: ReceivedPayload, *, strict_envelope_decoding: bool = False) -> str | None:
     """Return the RMQ envelope id, or None for values that are not RMQ envelopes.
 
@@ -106,20 +238,190 @@ def extract_stored_message_id(message: ReceivedPayload, *, strict_envelope_decod
     return message_id
 
 
+def read_stored_message_id(message: ReceivedPayload, *, strict_envelope_decoding: bool = False) -> str | None:
+    """Return the RMQ envelope id, reading only the envelope header when possible.
+
+    Same result and errors as ``extract_stored_message_id`` for values the
+    header check accepts, but for binary envelopes and canonical text
+    envelopes (``id`` first, no escapes in it) the payload is neither parsed
+    nor copied. Anything else falls back to the full decode.
+    """
+    if isinstance(message, bytes):
+        if message.startswith(_BINARY_STORED_MESSAGE_PREFIX_BYTES):
+            id_end = message.find(b":", len(_BINARY_STORED_MESSAGE_PREFIX_BYTES))
+            raw_id = message[len(_BINARY_STORED_MESSAGE_PREFIX_BYTES) : id_end]
+            if id_end > len(_BINARY_STORED_MESSAGE_PREFIX_BYTES) and raw_id.isascii():
+                return raw_id.decode("ascii")
+        elif message.startswith(_CANONICAL_ID_OPEN_BYTES, len(_STORED_MESSAGE_PREFIX_BYTES)) and message.startswith(
+            _STORED_MESSAGE_PREFIX_BYTES
+        ):
+            id_start = len(_STORED_MESSAGE_PREFIX_BYTES) + len(_CANONICAL_ID_OPEN_BYTES)
+            id_end = message.find(b'"', id_start)
+            raw_id = message[id_start:id_end]
+            if (
+                id_end > id_start
+                and raw_id.isalnum()
+                and message.endswith(_CANONICAL_CLOSE_BYTES)
+                and _read_canonical_header(message, id_end) is not None
+            ):
+                return raw_id.decode("ascii")
+    else:
+        if message.startswith(_BINARY_STORED_MESSAGE_PREFIX):
+            id_end = message.find(":", len(_BINARY_STORED_MESSAGE_PREFIX))
+            if id_end > len(_BINARY_STORED_MESSAGE_PREFIX):
+                return message[len(_BINARY_STORED_MESSAGE_PREFIX) : id_end]
+        elif message.startswith(_CANONICAL_ID_OPEN, len(_STORED_MESSAGE_PREFIX)) and message.startswith(
+            _STORED_MESSAGE_PREFIX
+        ):
+            id_start = len(_STORED_MESSAGE_PREFIX) + len(_CANONICAL_ID_OPEN)
+            id_end = message.find('"', id_start)
+            message_id = message[id_start:id_end]
+            if (
+                id_end > id_start
+                and message_id.isascii()
+                and message_id.isalnum()
+                and message.endswith(_CANONICAL_CLOSE)
+                and _read_canonical_header(message, id_end) is not None
+            ):
+                return message_id
+    return extract_stored_message_id(message, strict_envelope_decoding=strict_envelope_decoding)
+
+
+def read_stored_trace_context(message: ReceivedPayload) -> dict[str, str] | None:
+    """Return the trace-context headers of a text envelope, or None.
+
+    Reads only the envelope header, so the cost does not grow with the
+    payload. Anything unexpected, including a malformed field or a
+    non-canonical layout, yields None: trace propagation is best-effort and
+    must not fail a claim.
+    """
+    if isinstance(message, bytes):
+        if not message.startswith(_STORED_MESSAGE_PREFIX_BYTES + _CANONICAL_ID_OPEN_BYTES):
+            return None
+        id_end = message.find(b'"', len(_STORED_MESSAGE_PREFIX_BYTES) + len(_CANONICAL_ID_OPEN_BYTES))
+    else:
+        if not message.startswith(_STORED_MESSAGE_PREFIX + _CANONICAL_ID_OPEN):
+            return None
+        id_end = message.find('"', len(_STORED_MESSAGE_PREFIX) + len(_CANONICAL_ID_OPEN))
+    header = None if id_end < 0 else _read_canonical_header(message, id_end)
+    if header is None:
+        return None
+    trace_context = header[1]
+    if not isinstance(trace_context, dict) or not all(
+        isinstance(key, str) and isinstance(value, str) for key, value in trace_context.items()
+    ):
+        return None
+    return trace_context
+
+
+def _read_canonical_header(message: ReceivedPayload, id_end: int) -> tuple[int, object] | None:
+    """Return where the payload string starts and the parsed ``trace`` field.
+
+    ``id_end`` is the offset of the quote that closes a canonical ``id``. The
+    trace field is None when the envelope has none. Returns None when what
+    follows the id is not the canonical layout or the trace field is not
+    valid JSON, so callers fall back to the full decode and its errors. Only
+    the header is read, never the payload.
+    """
+    if isinstance(message, bytes):
+        if message.startswith(_CANONICAL_PAYLOAD_OPEN_BYTES, id_end):
+            return id_end + len(_CANONICAL_PAYLOAD_OPEN_BYTES), None
+        if not message.startswith(_CANONICAL_TRACE_OPEN_BYTES, id_end):
+            return None
+        trace_start = id_end + len(_CANONICAL_TRACE_OPEN_BYTES) - 1
+        trace_end = message.find(_CANONICAL_TRACE_CLOSE_BYTES, trace_start)
+    else:
+        if message.startswith(_CANONICAL_PAYLOAD_OPEN, id_end):
+            return id_end + len(_CANONICAL_PAYLOAD_OPEN), None
+        if not message.startswith(_CANONICAL_TRACE_OPEN, id_end):
+            return None
+        trace_start = id_end + len(_CANONICAL_TRACE_OPEN) - 1
+        trace_end = message.find(_CANONICAL_TRACE_CLOSE, trace_start)
+    if trace_end < 0:
+        return None
+    try:
+        trace_context = json.loads(message[trace_start : trace_end + 1])
+    except ValueError:
+        return None
+    return trace_end + len(_CANONICAL_TRACE_CLOSE), trace_context
+
+
+def _decode_canonical_bytes_envelope(message: bytes) -> tuple[str, bytes] | None:
+    """Decode a large canonical bytes envelope without a ``str`` round trip.
+
+    With ``decode_responses=False`` the general path decodes the whole stored
+    value to ``str``, parses it with ``json.loads``, and re-encodes the payload
+    to ``bytes``. Envelopes written by ``encode_stored_message`` are ASCII with
+    a fixed layout (``id``, an optional ``trace`` object that is skipped, then
+    ``payload``), so when neither the id nor the payload needs unescaping (no
+    backslash, quote, or raw control byte) the payload is sliced straight out
+    of the original buffer instead, with one copy. The regex search runs in
+    place and stops at the first escape, so payloads that do need unescaping
+    (e.g. serialized dicts) are handed to the C JSON decoder cheaply. Returns
+    ``None`` for anything else, including every malformed value, so the
+    general path keeps sole ownership of validation and error reporting.
+    """
+    if len(message) < _BYTES_FAST_PATH_MIN_SIZE or not message.isascii():
+        return None
+    id_start = len(_STORED_MESSAGE_PREFIX_BYTES) + len(_CANONICAL_ID_OPEN_BYTES)
+    if not message.startswith(_CANONICAL_ID_OPEN_BYTES, len(_STORED_MESSAGE_PREFIX_BYTES)):
+        return None
+    id_end = message.find(b'"', id_start)
+    header = None if id_end < 0 else _read_canonical_header(message, id_end)
+    if header is None:
+        return None
+    payload_start = header[0]
+    payload_end = len(message) - len(_CANONICAL_CLOSE_BYTES)
+    if payload_end < payload_start or not message.endswith(_CANONICAL_CLOSE_BYTES):
+        return None
+    if _JSON_STRING_SPECIAL_BYTES.search(message, id_start, id_end) or _JSON_STRING_SPECIAL_BYTES.search(
+        message, payload_start, payload_end
+    ):
+        return None
+    return message[id_start:id_end].decode("ascii"), message[payload_start:payload_end]
+
+
+def _decode_binary_envelope(message: ReceivedPayload) -> tuple[str, ReceivedPayload]:
+    # A str value here is a binary envelope read through a
+    # decode_responses=True client (possible only for UTF-8 payloads); its
+    # payload is returned as str like any other str-mode payload.
+    if isinstance(message, bytes):
+        id_end = message.find(b":", len(_BINARY_STORED_MESSAGE_PREFIX_BYTES))
+        raw_id = message[len(_BINARY_STORED_MESSAGE_PREFIX_BYTES) : id_end]
+        if id_end >= 0 and raw_id and not raw_id.isascii():
+            raise MalformedStoredMessageError("Stored RMQ binary envelope id must be ASCII")
+        message_id = raw_id.decode("ascii")
+    else:
+        id_end = message.find(":", len(_BINARY_STORED_MESSAGE_PREFIX))
+        message_id = message[len(_BINARY_STORED_MESSAGE_PREFIX) : id_end]
+    if id_end < 0:
+        raise MalformedStoredMessageError("Stored RMQ binary envelope is missing the ':' that terminates its id")
+    if not message_id:
+        raise MalformedStoredMessageError("Stored RMQ binary envelope has an empty id")
+    return message_id, message[id_end + 1 :]
+
+
 def _decode_envelope(
     message: ReceivedPayload, *, strict_envelope_decoding: bool = False
 ) -> tuple[str, str | bytes] | None:
     if isinstance(message, bytes):
+        if message.startswith(_BINARY_STORED_MESSAGE_PREFIX_BYTES):
+            return _decode_binary_envelope(message)
         if not message.startswith(_STORED_MESSAGE_PREFIX_BYTES):
             if strict_envelope_decoding:
                 raise MalformedStoredMessageError(_NON_ENVELOPE_STRICT_ERROR)
             return None
+        canonical_envelope = _decode_canonical_bytes_envelope(message)
+        if canonical_envelope is not None:
+            return canonical_envelope
         try:
             message = message.decode("utf-8")
         except UnicodeDecodeError as exc:
             raise MalformedStoredMessageError(
                 "Stored message starts with the RMQ envelope prefix but is not valid UTF-8"
             ) from exc
+    elif message.startswith(_BINARY_STORED_MESSAGE_PREFIX):
+        return _decode_binary_envelope(message)
     elif not message.startswith(_STORED_MESSAGE_PREFIX):
         if strict_envelope_decoding:
             raise MalformedStoredMessageError(_NON_ENVELOPE_STRICT_ERROR)
@@ -0,0 +1,135 @@
+import contextlib
+import importlib.metadata
+import threading
+import time
+from typing import Any, Iterator
+
+from redis_message_queue._exceptions import ConfigurationError
+from redis_message_queue._stored_message import ReceivedPayload, envelope_trace_context, read_stored_trace_context
+
+_MESSAGING_SYSTEM = "redis"
+
+
+def _package_version() -> str | None:
+    try:
+        return importlib.metadata.version("redis-message-queue")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _elapsed_ms(started_ns: int, ended_ns: int) -> float:
+    return (ended_ns - started_ns) / 1_000_000
+
+
+class QueueTracing:
+    """OpenTelemetry producer/consumer spans for one queue (``tracing=True``).
+
+    Publish runs inside a ``publish <queue>`` producer span whose W3C trace
+    context is written into the message envelope. Each claimed message gets a
+    ``process <queue>`` consumer span, parented to that context, spanning
+    claim through ack, with the claim, handler, and ack phases recorded as
+    ``rmq.*.duration_ms`` attributes.
+    """
+
+    def __init__(self, queue_name: str) -> None:
+        try:
+            from opentelemetry import context, propagate, trace
+        except ImportError as exc:
+            raise ConfigurationError(
+                "'tracing=True' requires the 'opentelemetry-api' package;"
+                " install it with 'pip install opentelemetry-api'"
+            ) from exc
+        self._context = context
+        self._propagate = propagate
+        self._trace = trace
+        self._tracer = trace.get_tracer("redis_message_queue", _package_version())
+        self._queue_name = queue_name
+
+    @contextlib.contextmanager
+    def publish_span(self) -> Iterator[None]:
+        with self._tracer.start_as_current_span(
+            f"publish {self._queue_name}",
+            kind=self._trace.SpanKind.PRODUCER,
+            attributes={
+                "messaging.system": _MESSAGING_SYSTEM,
+                "messaging.destination.name": self._queue_name,
+                "messaging.operation.type": "send",
+                "messaging.operation.name": "publish",
+            },
+        ):
+            carrier: dict[str, str] = {}
+            self._propagate.inject(carrier)
+            token = envelope_trace_context.set(carrier or None)
+            try:
+                yield
+            finally:
+                envelope_trace_context.reset(token)
+
+    def start_consumer_span(
+        self,
+        stored_message: ReceivedPayload,
+        *,
+        message_id: str | None,
+        delivery_count: int | None,
+        claim_started_ns: int,
+        attach: bool,
+    ) -> "ConsumerSpan":
+        carrier = read_stored_trace_context(stored_message)
+        parent = self._propagate.extract(carrier) if carrier else None
+        claimed_ns = time.time_ns()
+        attributes: dict[str, Any] = {
+            "messaging.system": _MESSAGING_SYSTEM,
+            "messaging.destination.name": self._queue_name,
+            "messaging.operation.type": "process",
+            "messaging.operation.name": "process",
+            "rmq.claim.duration_ms": _elapsed_ms(claim_started_ns, claimed_ns),
+        }
+        if message_id is not None:
+            attributes["messaging.message.id"] = message_id
+        if delivery_count is not None:
+            attributes["rmq.delivery_count"] = delivery_count
+        span = self._tracer.start_span(
+            f"process {self._queue_name}",
+            context=parent,
+            kind=self._trace.SpanKind.CONSUMER,
+            attributes=attributes,
+            start_time=claim_started_ns,
+        )
+        token = self._context.attach(self._trace.set_span_in_context(span)) if attach else None
+        return ConsumerSpan(self, span, claimed_ns, token)
+
+
+class ConsumerSpan:
+    """The consumer span of one claimed message; ended once it is settled."""
+
+    def __init__(self, tracing: QueueTracing, span: Any, claimed_ns: int, token: object | None) -> None:
+        self._tracing = tracing
+        self._span = span
+        self._claimed_ns = claimed_ns
+        self._handler_finished_ns: int | None = None
+        self._token = token
+        self._thread_id = threading.get_ident()
+
+    def handler_finished(self, error: BaseException | None = None) -> None:
+        """Mark the end of the handler; the time until ``end()`` is the ack phase."""
+        self._handler_finished_ns = time.time_ns()
+        self._span.set_attribute("rmq.handler.duration_ms", _elapsed_ms(self._claimed_ns, self._handler_finished_ns))
+        if error is not None:
+            # Only the type: exception messages can carry secrets (see
+            # docs/observability.md), and spans usually leave the process.
+            error_type = type(error).__name__
+            self._span.set_attribute("error.type", error_type)
+            self._span.set_status(self._tracing._trace.Status(self._tracing._trace.StatusCode.ERROR, error_type))
+
+    def end(self, outcome: str) -> None:
+        ended_ns = time.time_ns()
+        if self._handler_finished_ns is None:
+            self.handler_finished()
+        assert self._handler_finished_ns is not None
+        self._span.set_attribute("rmq.ack.duration_ms", _elapsed_ms(self._handler_finished_ns, ended_ns))
+        self._span.set_attribute("rmq.outcome", outcome)
+        self._span.end(end_time=ended_ns)
+        # A runner that claims in one thread and settles in another (QueueWorker)
+        # never attaches, but guard anyway: detaching a foreign token fails.
+        if self._token is not None and threading.get_ident() == self._thread_id:
+            self._tracing._context.detach(self._token)
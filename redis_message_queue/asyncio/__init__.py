@@ -1,4 +1,6 @@
+from redis_message_queue._dedup_census import DeduplicationCensus
 from redis_message_queue._event import EventOperation, EventOutcome, QueueEvent
+from redis_message_queue._event_filter import EventFilter
 from redis_message_queue._exceptions import (
     ClaimStoreFailedError,
     CleanupFailedError,
@@ -14,9 +16,17 @@ from redis_message_queue._exceptions import (
     RedisMessageQueueError,
     RetryBudgetExhaustedError,
 )
+from redis_message_queue._metadata_gc import OrphanedMetadataReport
+from redis_message_queue._metrics import MetricsCollector, OperationMetrics
+from redis_message_queue._purge import PurgeProgress
 from redis_message_queue._queue_stats import QueueStats
+from redis_message_queue._round_trips import RoundTripStats
 from redis_message_queue._stored_message import ClaimedMessage, PublishPayload, ReceivedPayload
 from redis_message_queue.asyncio._abstract_redis_gateway import AbstractRedisGateway
+from redis_message_queue.asyncio._collect_stats import collect_stats
+from redis_message_queue.asyncio._event_dispatch import BackgroundEventDispatcher
+from redis_message_queue.asyncio._message_handle import MessageHandle
+from redis_message_queue.asyncio._queue_stats_collector import QueueStatsCollector
 from redis_message_queue.asyncio._redis_gateway import RedisGateway
 from redis_message_queue.asyncio.redis_message_queue import RedisMessageQueue
 from redis_message_queue.interrupt_handler import (
@@ -30,13 +40,24 @@ __all__ = [
     "RedisGateway",
     "AbstractRedisGateway",
     "ClaimedMessage",
+    "MessageHandle",
     "ReceivedPayload",
     "PublishPayload",
     "QueueStats",
+    "collect_stats",
+    "QueueStatsCollector",
+    "PurgeProgress",
+    "OrphanedMetadataReport",
+    "DeduplicationCensus",
+    "RoundTripStats",
+    "MetricsCollector",
+    "OperationMetrics",
     "EventDrivenInterruptHandler",
     "GracefulInterruptHandler",
     "BaseGracefulInterruptHandler",
     "QueueEvent",
+    "EventFilter",
+    "BackgroundEventDispatcher",
     "EventOperation",
     "EventOutcome",
     "RedisMessageQueueError",
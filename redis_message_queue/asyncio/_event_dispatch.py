@@ -0,0 +1,141 @@
+import asyncio
+import collections
+import inspect
+import logging
+from typing import Awaitable, Callable
+
+from redis_message_queue._event import QueueEvent
+from redis_message_queue._event_dispatch import (
+    DEFAULT_MAX_BUFFERED_EVENTS,
+    EventOverflowPolicy,
+    validate_event_buffer_parameters,
+)
+from redis_message_queue._warnings import warn_runtime_warning
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventDispatcher:
+    """Deliver queue events to an async ``on_event`` from a background task.
+
+    Pass an instance as an async queue's ``on_event``. Awaiting it only
+    appends the event to a bounded buffer, so a slow exporter no longer
+    delays publish, claim, or ack. A task, created on the running loop with
+    the first event, awaits ``on_event`` for each buffered event in order.
+    Use one dispatcher per event loop.
+
+    ``max_buffered_events``, ``overflow_policy``, and ``dropped_events``
+    behave as in the sync ``BackgroundEventDispatcher``. Failures in
+    ``on_event`` are logged and converted to ``RuntimeWarning``. Await
+    ``aclose()``, or use the dispatcher as an async context manager, to
+    deliver what is still buffered before shutdown.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[QueueEvent], Awaitable[None]],
+        *,
+        max_buffered_events: int = DEFAULT_MAX_BUFFERED_EVENTS,
+        overflow_policy: EventOverflowPolicy = "drop_oldest",
+    ) -> None:
+        if not callable(on_event):
+            raise TypeError(f"'on_event' must be callable, got {type(on_event).__name__}.")
+        validate_event_buffer_parameters(max_buffered_events, overflow_policy)
+        self._on_event = on_event
+        self._max_buffered_events = max_buffered_events
+        self._overflow_policy = overflow_policy
+        self._buffer: collections.deque[QueueEvent] = collections.deque()
+        self._dropped_events = 0
+        self._closed = False
+        self._wakeup: asyncio.Event | None = None
+        self._idle: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def dropped_events(self) -> int:
+        """Events discarded because the buffer was full or the dispatcher was closed."""
+        return self._dropped_events
+
+    @property
+    def buffered_events(self) -> int:
+        """Events waiting for delivery."""
+        return len(self._buffer)
+
+    async def __call__(self, event: QueueEvent) -> None:
+        if self._closed:
+            self._dropped_events += 1
+            return
+        if len(self._buffer) >= self._max_buffered_events:
+            self._dropped_events += 1
+            if self._overflow_policy == "drop_newest":
+                return
+            self._buffer.popleft()
+        self._buffer.append(event)
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="rmq-event-dispatcher")
+        assert self._wakeup is not None and self._idle is not None
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def flush(self, timeout_seconds: float | None = None) -> bool:
+        """Wait until every buffered event has been delivered; return False on timeout."""
+        if self._task is None or self._idle is None:
+            return True
+        if self._task.done():
+            return not self._buffer
+        try:
+            await asyncio.wait_for(asyncio.shield(self._idle.wait()), timeout_seconds)
+        except TimeoutError:
+            return False
+        return True
+
+    async def aclose(self, timeout_seconds: float | None = None) -> bool:
+        """Stop accepting events, deliver what is buffered, and stop the task.
+
+        Returns False if ``timeout_seconds`` elapsed first; the task is then
+        cancelled and the undelivered events are counted as dropped.
+        """
+        self._closed = True
+        if self._task is None or self._wakeup is None:
+            return True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout_seconds)
+        except TimeoutError:
+            self._task.cancel()
+            self._dropped_events += len(self._buffer)
+            self._buffer.clear()
+            return False
+        return True
+
+    async def __aenter__(self) -> "BackgroundEventDispatcher":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None and self._idle is not None
+        while True:
+            while self._buffer:
+                await self._deliver(self._buffer.popleft())
+            self._idle.set()
+            if self._closed:
+                return
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    async def _deliver(self, event: QueueEvent) -> None:
+        try:
+            result = self._on_event(event)
+            if not inspect.isawaitable(result):
+                raise TypeError(
+                    f"'on_event' must return an awaitable, got {type(result).__name__}. "
+                    "Use an async callable or return an awaitable."
+                )
+            await result
+        except Exception as exc:
+            logger.exception("on_event callback raised an exception")
+            warn_runtime_warning(f"on_event callback raised {type(exc).__name__}", stacklevel=2)
@@ -0,0 +1,72 @@
+from typing import Awaitable, Callable
+
+from redis_message_queue._stored_message import ReceivedPayload
+
+
+class MessageHandle:
+    """A claimed message whose payload is read only when ``body()`` is called.
+
+    Yielded by ``process_message(lazy=True)``. ``message_id``,
+    ``delivery_count``, and ``size`` come from the claim itself; ``body()``
+    decodes the envelope (and fetches a claim-checked body from Redis) on
+    first await and caches the result. The handle is only valid inside the
+    ``async with`` block that yielded it: after the block exits the message has been
+    acked or nacked and a claim-checked body may already be deleted.
+    """
+
+    __slots__ = ("_message_id", "_delivery_count", "_size", "_load_body", "_body")
+
+    def __init__(
+        self,
+        *,
+        message_id: str | None,
+        delivery_count: int | None,
+        size: int,
+        load_body: Callable[[], Awaitable[ReceivedPayload]],
+    ) -> None:
+        self._message_id = message_id
+        self._delivery_count = delivery_count
+        self._size = size
+        self._load_body = load_body
+        self._body: ReceivedPayload | None = None
+
+    @property
+    def message_id(self) -> str | None:
+        """The envelope id, or ``None`` for a value that is not an RMQ envelope."""
+        return self._message_id
+
+    @property
+    def delivery_count(self) -> int | None:
+        """How many times this message has been claimed, including this claim.
+
+        ``None`` when the gateway does not track deliveries (no visibility
+        timeout) or the claim was recovered after a lost reply.
+        """
+        return self._delivery_count
+
+    @property
+    def size(self) -> int:
+        """Payload size in bytes.
+
+        For claim-checked messages this is the offloaded body's size; for
+        inline messages it is the stored value's size, envelope header
+        included, since measuring the payload alone would mean decoding it.
+        """
+        return self._size
+
+    async def body(self) -> ReceivedPayload:
+        """Decode and return the payload, as ``process_message()`` would yield it.
+
+        Raises ``MalformedStoredMessageError`` for an undecodable envelope or a
+        missing claim-check body. Raised inside the ``async with`` block, that error
+        is handled like any other handler exception.
+        """
+        if self._body is None:
+            self._body = await self._load_body()
+        return self._body
+
+    def __repr__(self) -> str:
+        return (
+            f"<MessageHandle message_id={self._message_id!r} delivery_count={self._delivery_count!r} "
+            f"size={self._size!r}>"
+        )
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Iterable
+
+from redis_message_queue._queue_stats import QueueStats, QueueStatsKeys
+from redis_message_queue._queue_stats_collector import (
+    DEFAULT_STATS_CACHE_SECONDS,
+    queue_discovery_patterns,
+    queue_name_from_key,
+    render_queue_stats_prometheus,
+    stats_keys_for,
+    validate_stats_collector_parameters,
+)
+from redis_message_queue.asyncio._redis_gateway import RedisGateway
+
+
+class QueueStatsCollector:
+    """Async ``QueueStatsCollector``: gather cached ``QueueStats`` for many queues on one client.
+
+    Takes a ``redis.asyncio`` client; ``collect()`` and ``render_prometheus()``
+    are awaitable. Otherwise identical to the sync collector: explicit
+    ``queue_names`` or ``SCAN``-based ``name_prefix`` discovery, one pipelined
+    round trip per refresh (split per node on ``RedisCluster``), and results
+    reused for ``cache_seconds``.
+    """
+
+    def __init__(
+        self,
+        client: object,
+        *,
+        queue_names: Iterable[str] | None = None,
+        name_prefix: str | None = None,
+        key_separator: str = "::",
+        enable_completed_queue: bool = False,
+        enable_failed_queue: bool = False,
+        include_dead_letter: bool = True,
+        cache_seconds: float = DEFAULT_STATS_CACHE_SECONDS,
+    ) -> None:
+        self._queue_names = validate_stats_collector_parameters(
+            queue_names,
+            name_prefix,
+            key_separator,
+            cache_seconds,
+            {
+                "enable_completed_queue": enable_completed_queue,
+                "enable_failed_queue": enable_failed_queue,
+                "include_dead_letter": include_dead_letter,
+            },
+        )
+        self._gateway = RedisGateway(redis_client=client)  # type: ignore[arg-type]
+        self._client = client
+        self._name_prefix = name_prefix
+        self._key_separator = key_separator
+        self._enable_completed_queue = enable_completed_queue
+        self._enable_failed_queue = enable_failed_queue
+        self._include_dead_letter = include_dead_letter
+        self._cache_seconds = float(cache_seconds)
+        self._cached: dict[str, QueueStats] | None = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+        if self._queue_names is not None:
+            self._keys_for(self._queue_names)
+
+    def _keys_for(self, names: Iterable[str]) -> list[QueueStatsKeys]:
+        return [
+            stats_keys_for(
+                name,
+                self._key_separator,
+                enable_completed_queue=self._enable_completed_queue,
+                enable_failed_queue=self._enable_failed_queue,
+                include_dead_letter=self._include_dead_letter,
+                redis_cluster=self._gateway.is_redis_cluster,
+            )
+            for name in names
+        ]
+
+    async def _discover(self) -> tuple[str, ...]:
+        assert self._name_prefix is not None
+        names: set[str] = set()
+        for pattern, suffix_length in queue_discovery_patterns(self._name_prefix, self._key_separator):
+            async for key in self._client.scan_iter(match=pattern, count=1000, _type="LIST"):  # type: ignore[attr-defined]
+                name = queue_name_from_key(key, suffix_length, self._key_separator)
+                if name is not None:
+                    names.add(name)
+        return tuple(sorted(names))
+
+    async def collect(self, *, refresh: bool = False) -> dict[str, QueueStats]:
+        """Return ``{queue_name: QueueStats}``, from cache unless it is older than ``cache_seconds``.
+
+        ``refresh=True`` always reads Redis.
+        """
+        async with self._lock:
+            now = time.monotonic()
+            if not refresh and self._cached is not None and now - self._cached_at < self._cache_seconds:
+                return dict(self._cached)
+            names = self._queue_names if self._queue_names is not None else await self._discover()
+            snapshots = await self._gateway.queue_stats_snapshots(self._keys_for(names)) if names else []
+            self._cached = dict(zip(names, snapshots))
+            self._cached_at = time.monotonic()
+            return dict(self._cached)
+
+    async def render_prometheus(self, *, prefix: str = "rmq", refresh: bool = False) -> str:
+        """Render ``await collect()`` as Prometheus gauges; see the sync ``QueueStatsCollector``."""
+        return render_queue_stats_prometheus(await self.collect(refresh=refresh), prefix=prefix)
@@ -5,14 +5,22 @@ import random
 import threading
 import uuid
 import weakref
-from typing import Awaitable, Callable, Optional, TypeVar
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar, cast
 
 import redis
 import redis.asyncio
 import redis.asyncio.sentinel
 
+from redis_message_queue._claim_check import (
+    CLAIM_CHECK_REFERENCE_MARKERS,
+    CLAIM_CHECK_REFERENCE_PREFIX,
+    MAX_STORED_REFERENCE_SIZE,
+    parse_claim_check_reference,
+    parse_stored_claim_check_reference,
+)
 from redis_message_queue._config import (
     ADD_MESSAGE_LUA_SCRIPT,
+    BYTES_PAYLOAD_REQUIRES_BINARY_CLIENT_MESSAGE,
     CLAIM_MESSAGE_LUA_SCRIPT,
     CLAIM_MESSAGE_WITH_VISIBILITY_TIMEOUT_LUA_SCRIPT,
     CLAIM_STORE_FAILED_LUA_SENTINEL,
@@ -26,17 +34,30 @@ from redis_message_queue._config import (
     INTERRUPTIBLE_RETRY_SLEEP_POLL_SECONDS,
     MOVE_MESSAGE_LUA_SCRIPT,
     MOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT,
+    OLDEST_MESSAGE_ID_LUA_SCRIPT,
     PENDING_OVERLOAD_LUA_SENTINEL,
     PUBLISH_MESSAGE_LUA_SCRIPT,
     PURGE_QUEUE_LUA_SCRIPT,
+    PURGE_QUEUE_SLICE_LUA_SCRIPT,
+    PURGE_QUEUE_SLICE_WITH_CLAIM_CHECKS_LUA_SCRIPT,
+    PURGE_SELECTED_MESSAGES_LUA_SCRIPT,
+    PURGE_UNREFERENCED_QUEUE_LUA_SCRIPT,
+    QUEUE_STATS_SNAPSHOT_LUA_SCRIPT,
+    RANGE_MESSAGE_FINGERPRINTS_LUA_SCRIPT,
+    REDRIVE_DEAD_LETTER_BATCH_LUA_SCRIPT,
     REDRIVE_DEAD_LETTERS_LUA_SCRIPT,
+    REDRIVE_SELECTED_DEAD_LETTERS_LUA_SCRIPT,
     REMOVE_MESSAGE_LUA_SCRIPT,
     REMOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT,
+    REMOVE_STALE_METADATA_LUA_SCRIPT,
     RENEW_MESSAGE_LEASE_LUA_SCRIPT,
+    RETURN_LEASED_MESSAGE_TO_PENDING_LUA_SCRIPT,
     RETURN_MESSAGE_TO_PENDING_LUA_SCRIPT,
+    TRIM_QUEUE_TAIL_LUA_SCRIPT,
     _ChainedInterrupt,
     build_retry_strategy,
     is_redis_retryable_exception,
+    redis_client_decodes_responses,
     validate_dead_letter_parameters,
     validate_gateway_parameters,
     validate_pending_backpressure_parameters,
@@ -51,12 +72,27 @@ from redis_message_queue._exceptions import (
     _set_exception_context,
     wrap_lua_response_error,
 )
+from redis_message_queue._metadata_gc import MESSAGE_FINGERPRINT_BYTES
+from redis_message_queue._queue_stats import (
+    QueueStats,
+    QueueStatsKeys,
+    queue_stats_from_snapshot,
+    queue_stats_snapshot_keys,
+)
+from redis_message_queue._round_trips import (
+    AsyncRoundTripCountingClient,
+    RoundTripRecorder,
+    RoundTripStats,
+    accounted_async,
+)
 from redis_message_queue._stored_message import (
     ClaimedMessage,
     ReceivedPayload,
     decode_stored_message,
     encode_stored_message,
     extract_stored_message_id,
+    new_message_id_prefix,
+    split_binary_claim_result,
 )
 from redis_message_queue.asyncio._abstract_redis_gateway import AbstractRedisGateway
 from redis_message_queue.interrupt_handler._interface import (
@@ -80,6 +116,9 @@ _OPERATION_RESULT_SUFFIX = ":operation_result"
 _PUBLISH_OPERATION_RESULT_SUFFIX = ":publish_operation_result"
 _OPTIONAL_DEAD_LETTER_PLACEHOLDER_SUFFIX = ":dead_letter_placeholder"
 _VISIBILITY_TIMEOUT_POLL_INTERVAL_SECONDS = 0.25
+_CLAIM_CHECK_PURGE_BATCH_SIZE = 500
+# Marks dead-letter entries a selective redrive has moved until one LREM drops them.
+_REDRIVE_TOMBSTONE_PREFIX = "\x1eRMQTOMBSTONE:"
 _PENDING_OVERLOAD_INITIAL_BACKOFF_SECONDS = 0.010
 _PENDING_OVERLOAD_MAX_BACKOFF_SECONDS = 0.500
 _CLAIM_STORE_FAILED_LUA_SENTINEL_BYTES = CLAIM_STORE_FAILED_LUA_SENTINEL.encode("utf-8")
@@ -185,6 +224,11 @@ class RedisGateway(AbstractRedisGateway):
     (``backoff``, ``asyncstdlib.retry``, custom exponential backoff, etc.) or
     fundamentally different retry semantics, subclass
     :class:`AbstractRedisGateway` and override the operation methods directly.
+
+    ``track_round_trips=True`` counts every Redis request, its payload bytes,
+    and client-observed latency per gateway operation; read the totals with
+    ``round_trip_stats()``. Off by default, in which case the client is used
+    unwrapped.
     """
 
     def __init__(
@@ -203,6 +247,7 @@ class RedisGateway(AbstractRedisGateway):
         pending_overload_policy: str = "raise",
         pending_overload_block_timeout_seconds: float = DEFAULT_PENDING_OVERLOAD_BLOCK_TIMEOUT_SECONDS,
         interrupt: BaseGracefulInterruptHandler | None = None,
+        track_round_trips: bool = False,
     ):
         if isinstance(redis_client, redis.asyncio.sentinel.Sentinel):
             raise TypeError(
@@ -230,7 +275,18 @@ class RedisGateway(AbstractRedisGateway):
                 "handler-issued command and the lease can expire. Pass a normal pooled "
                 "redis.asyncio.Redis client instead."
             )
-        self._redis_client = redis_client
+        if not isinstance(track_round_trips, bool):
+            raise TypeError(
+                f"'track_round_trips' must be a bool, got {type(track_round_trips).__name__}"
+                " (use True or False, not 1/0)"
+            )
+        self._round_trip_recorder = RoundTripRecorder() if track_round_trips else None
+        self._redis_client = (
+            redis_client
+            if self._round_trip_recorder is None
+            else AsyncRoundTripCountingClient(redis_client, self._round_trip_recorder)
+        )
+        self._client_decodes_responses = redis_client_decodes_responses(redis_client)
         if interrupt is not None and not isinstance(interrupt, BaseGracefulInterruptHandler):
             raise TypeError(
                 "'interrupt' must be a BaseGracefulInterruptHandler instance"
@@ -498,9 +554,25 @@ class RedisGateway(AbstractRedisGateway):
     def dead_letter_queue(self) -> str | None:
         return self._dead_letter_queue
 
+    def round_trip_stats(self, *, reset: bool = False) -> dict[str, RoundTripStats]:
+        """Return Redis round-trip totals per gateway operation; ``reset=True`` also zeroes them.
+
+        Keys are operation names: ``publish``, ``claim``, ``remove`` (ack or
+        drop from processing), ``move`` (to the completed or failed list),
+        ``ack_and_claim`` (pipelined ack plus next claim), ``lease_renew``,
+        ``reclaim`` (recovery of claims whose reply was lost), ``release``,
+        ``trim``, ``claim_check``, ``operator`` (stats, peek, purge,
+        redrive), ``drain``, and ``other``. Expired-lease reclaim runs inside
+        the claim script, so its cost is part of ``claim``. Requires
+        ``track_round_trips=True`` (``ConfigurationError`` otherwise).
+        """
+        if self._round_trip_recorder is None:
+            raise ConfigurationError("round_trip_stats() requires 'track_round_trips=True'.")
+        return self._round_trip_recorder.snapshot(reset=reset)
+
     @property
     def is_redis_cluster(self) -> bool:
-        return isinstance(self._redis_client, redis.asyncio.RedisCluster)
+        return isinstance(getattr(self._redis_client, "wrapped_client", self._redis_client), redis.asyncio.RedisCluster)
 
     def _raise_if_drop_oldest_deduplicated_publish(self) -> None:
         if self._pending_overload_policy == "drop_oldest":
@@ -511,13 +583,22 @@ class RedisGateway(AbstractRedisGateway):
                 "queues, or use 'raise' or 'block' for deduplicated publishes."
             )
 
-    async def publish_message(self, queue: str, message: str, dedup_key: str) -> bool:
+    def _raise_if_bytes_payload_unreadable(self, message: str | bytes) -> None:
+        # A decode_responses=True client would fail to decode a non-UTF-8
+        # binary envelope on claim, stranding it in processing; refuse before
+        # anything is enqueued.
+        if isinstance(message, bytes) and self._client_decodes_responses:
+            raise ConfigurationError(BYTES_PAYLOAD_REQUIRES_BINARY_CLIENT_MESSAGE)
+
+    @accounted_async("publish")
+    async def publish_message(self, queue: str, message: str | bytes, dedup_key: str) -> bool:
         return await self._publish_message_interruptible(queue, message, dedup_key)
 
+    @accounted_async("publish")
     async def _publish_message_interruptible(
         self,
         queue: str,
-        message: str,
+        message: str | bytes,
         dedup_key: str,
         *,
         is_interrupted: BaseGracefulInterruptHandler | None = None,
@@ -536,6 +617,7 @@ class RedisGateway(AbstractRedisGateway):
                 "an empty key would create a bare-prefix Redis marker that silently suppresses unrelated messages"
             )
         self._raise_if_drop_oldest_deduplicated_publish()
+        self._raise_if_bytes_payload_unreadable(message)
         stored_message = encode_stored_message(message)
         message_id = extract_stored_message_id(stored_message)
         operation_id = uuid.uuid4().hex
@@ -585,7 +667,8 @@ class RedisGateway(AbstractRedisGateway):
             interrupt=_ChainedInterrupt(self._interrupt, is_interrupted),
         )
 
-    async def add_message(self, queue: str, message: str) -> None:
+    @accounted_async("publish")
+    async def add_message(self, queue: str, message: str | bytes) -> None:
         """Non-deduplicated enqueue. Must not be retried to keep at-most-once.
 
         This library deliberately does not wrap the enqueue in a retry — retrying
@@ -603,10 +686,11 @@ class RedisGateway(AbstractRedisGateway):
         """
         await self._add_message_interruptible(queue, message)
 
+    @accounted_async("publish")
     async def _add_message_interruptible(
         self,
         queue: str,
-        message: str,
+        message: str | bytes,
         *,
         is_interrupted: BaseGracefulInterruptHandler | None = None,
     ) -> None:
@@ -614,6 +698,7 @@ class RedisGateway(AbstractRedisGateway):
         # ``_publish_message_interruptible``). The block-policy capacity wait it
         # may enter is the only interruptible part; the at-most-once enqueue is
         # never retried.
+        self._raise_if_bytes_payload_unreadable(message)
         stored_message = encode_stored_message(message)
         message_id = extract_stored_message_id(stored_message)
         if self._max_pending_length is not None:
@@ -641,6 +726,7 @@ class RedisGateway(AbstractRedisGateway):
             _set_exception_context(exc, queue=queue, message_id=message_id, operation="publish")
             raise
 
+    @accounted_async("move")
     async def move_message(
         self,
         from_queue: str,
@@ -692,21 +778,14 @@ class RedisGateway(AbstractRedisGateway):
         async def _move_with_lease():
             return bool(
                 await self._eval(
-                    MOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT,
-                    9,
-                    from_queue,
-                    to_queue,
-                    self._lease_deadlines_key(from_queue),
-                    self._lease_tokens_key(from_queue),
-                    self._delivery_counts_key(from_queue),
-                    self._claim_result_refs_key(from_queue),
-                    self._claim_result_ids_key(from_queue),
-                    self._claim_result_backrefs_key(from_queue),
-                    operation_result_key,
-                    message,
-                    decoded_message,
-                    lease_token,
-                    self._lease_operation_result_ttl_ms(),
+                    *self._lease_ack_eval_args(
+                        from_queue,
+                        message,
+                        lease_token,
+                        operation_result_key,
+                        to_queue=to_queue,
+                        decoded_message=decoded_message,
+                    )
                 )
             )
 
@@ -723,6 +802,7 @@ class RedisGateway(AbstractRedisGateway):
         finally:
             await self._delete_operation_result_key(operation_result_key)
 
+    @accounted_async("remove")
     async def remove_message(self, queue: str, message: ReceivedPayload, *, lease_token: str | None = None) -> bool:
         if lease_token is None:
             operation_id = uuid.uuid4().hex
@@ -761,23 +841,7 @@ class RedisGateway(AbstractRedisGateway):
 
         @self._retry_strategy
         async def _remove_with_lease():
-            return bool(
-                await self._eval(
-                    REMOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT,
-                    8,
-                    queue,
-                    self._lease_deadlines_key(queue),
-                    self._lease_tokens_key(queue),
-                    self._delivery_counts_key(queue),
-                    self._claim_result_refs_key(queue),
-                    self._claim_result_ids_key(queue),
-                    self._claim_result_backrefs_key(queue),
-                    operation_result_key,
-                    message,
-                    lease_token,
-                    self._lease_operation_result_ttl_ms(),
-                )
-            )
+            return bool(await self._eval(*self._lease_ack_eval_args(queue, message, lease_token, operation_result_key)))
 
         try:
             return await _remove_with_lease()
@@ -792,6 +856,142 @@ class RedisGateway(AbstractRedisGateway):
         finally:
             await self._delete_operation_result_key(operation_result_key)
 
+    def _lease_ack_eval_args(
+        self,
+        queue: str,
+        message: ReceivedPayload,
+        lease_token: str,
+        operation_result_key: str,
+        *,
+        to_queue: str | None = None,
+        decoded_message: ReceivedPayload | None = None,
+    ) -> tuple[object, ...]:
+        """EVAL arguments settling a leased message: removed, or moved to ``to_queue``."""
+        if to_queue is None:
+            return (
+                REMOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT,
+                8,
+                queue,
+                self._lease_deadlines_key(queue),
+                self._lease_tokens_key(queue),
+                self._delivery_counts_key(queue),
+                self._claim_result_refs_key(queue),
+                self._claim_result_ids_key(queue),
+                self._claim_result_backrefs_key(queue),
+                operation_result_key,
+                message,
+                lease_token,
+                self._lease_operation_result_ttl_ms(),
+            )
+        return (
+            MOVE_MESSAGE_WITH_LEASE_TOKEN_LUA_SCRIPT,
+            9,
+            queue,
+            to_queue,
+            self._lease_deadlines_key(queue),
+            self._lease_tokens_key(queue),
+            self._delivery_counts_key(queue),
+            self._claim_result_refs_key(queue),
+            self._claim_result_ids_key(queue),
+            self._claim_result_backrefs_key(queue),
+            operation_result_key,
+            message,
+            decoded_message,
+            lease_token,
+            self._lease_operation_result_ttl_ms(),
+        )
+
+    @accounted_async("ack_and_claim")
+    async def _ack_and_claim_next(
+        self,
+        processing_queue: str,
+        message: ReceivedPayload,
+        lease_token: str,
+        *,
+        pending_queue: str,
+        to_queue: str | None = None,
+    ) -> tuple[bool, ClaimedMessage | None]:
+        """Settle a leased message and claim the next one in a single round trip.
+
+        The ack and a non-blocking visibility-timeout claim are pipelined, so
+        a busy consumer pays one network round trip per message instead of
+        two. The two scripts are not one transaction: either can fail alone.
+        Only the ack's outcome is reported as an error; a claim that failed or
+        may have committed is registered as a pending claim id, which the next
+        claim recovers before polling. Returns the ack result and the claimed
+        message, if any. Interrupted gateways settle without claiming.
+        """
+        decoded_message = None if to_queue is None else decode_stored_message(message)
+        operation_result_key = self._lease_operation_result_key(processing_queue, lease_token, uuid.uuid4().hex)
+        ack_args = self._lease_ack_eval_args(
+            processing_queue,
+            message,
+            lease_token,
+            operation_result_key,
+            to_queue=to_queue,
+            decoded_message=decoded_message,
+        )
+
+        @self._retry_strategy
+        async def _ack():
+            return bool(await self._eval(*ack_args))
+
+        try:
+            if self._is_interrupted():
+                return await _ack(), None
+            claim_id = uuid.uuid4().hex
+            self._begin_in_flight_claim_id(processing_queue, claim_id)
+            try:
+                claim_args = self._visible_claim_eval_args(pending_queue, processing_queue, claim_id)
+                pipeline = self._redis_client.pipeline(transaction=False)
+                pipeline.eval(*ack_args)  # type: ignore[arg-type]
+                pipeline.eval(*claim_args)  # type: ignore[arg-type]
+                try:
+                    ack_result, claim_result = await pipeline.execute(raise_on_error=False)
+                except Exception as exc:
+                    if not is_redis_retryable_exception(exc):
+                        raise
+                    # Either script may have run. The ack replays under the
+                    # same operation key; the claim goes to recovery.
+                    self._set_pending_claim_id(processing_queue, claim_id)
+                    return await _ack(), None
+                if isinstance(claim_result, Exception):
+                    self._set_pending_claim_id(processing_queue, claim_id)
+                    logger.warning("Pipelined claim after ack failed: %s", type(claim_result).__name__)
+                    claim_result = None
+                if isinstance(ack_result, Exception):
+                    if claim_result is not None:
+                        # Not handed to the caller; the next claim recovers it.
+                        self._set_pending_claim_id(processing_queue, claim_id)
+                    if isinstance(ack_result, redis.exceptions.ResponseError):
+                        lua_error = wrap_lua_response_error(ack_result)
+                        if lua_error is not None:
+                            raise lua_error from ack_result
+                    raise ack_result
+                next_claim = None
+                if claim_result is not None:
+                    try:
+                        next_claim = await self._visible_claim_from_result(
+                            pending_queue, processing_queue, claim_result
+                        )
+                    except ClaimStoreFailedError:
+                        # The script already put the payload back in pending.
+                        logger.warning("Pipelined claim after ack could not store its lease", exc_info=True)
+                return bool(ack_result), next_claim
+            finally:
+                self._finish_in_flight_claim_id(processing_queue, claim_id)
+        except RedisMessageQueueError as exc:
+            _set_exception_context(
+                exc,
+                queue=processing_queue,
+                message_id=extract_stored_message_id(message),
+                operation="ack",
+            )
+            raise
+        finally:
+            await self._delete_operation_result_key(operation_result_key)
+
+    @accounted_async("lease_renew")
     async def renew_message_lease(
         self,
         queue: str,
@@ -803,20 +1003,7 @@ class RedisGateway(AbstractRedisGateway):
         if self._message_visibility_timeout_seconds is None:
             return False
 
-        if is_interrupted is None:
-            retry_strategy = self._retry_strategy
-        else:
-            # Per-call strategy: compose the gateway-level interrupt with the
-            # caller's stop signal so a heartbeat stop short-circuits the
-            # retry loop without waiting out retry_budget_seconds (AA-01-F2).
-            retry_strategy = build_retry_strategy(
-                retry_budget_seconds=self._retry_budget_seconds,
-                retry_max_delay_seconds=self._retry_max_delay_seconds,
-                retry_initial_delay_seconds=self._retry_initial_delay_seconds,
-                interrupt=_ChainedInterrupt(self._interrupt, is_interrupted),
-            )
-
-        @retry_strategy
+        @self._renewal_retry_strategy(is_interrupted)
         async def _renew():
             return bool(
                 await self._eval(
@@ -832,6 +1019,62 @@ class RedisGateway(AbstractRedisGateway):
 
         return await _renew()
 
+    @accounted_async("lease_renew")
+    async def _renew_message_leases(
+        self,
+        queue: str,
+        leases: Sequence[tuple[ReceivedPayload, str]],
+        *,
+        is_interrupted: BaseGracefulInterruptHandler | None = None,
+    ) -> list[bool]:
+        """Renew many ``(message, lease_token)`` leases in one pipelined round trip.
+
+        Returns one ``renew_message_lease()`` result per lease, in order. The
+        renewals are idempotent, so a retry re-sends the whole batch.
+        """
+        if self._message_visibility_timeout_seconds is None or not leases:
+            return [False] * len(leases)
+        deadlines_key = self._lease_deadlines_key(queue)
+        tokens_key = self._lease_tokens_key(queue)
+        visibility_timeout_ms = str(self._message_visibility_timeout_seconds * 1000)
+
+        @self._renewal_retry_strategy(is_interrupted)
+        async def _renew():
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for message, lease_token in leases:
+                pipeline.eval(  # type: ignore[arg-type]
+                    RENEW_MESSAGE_LEASE_LUA_SCRIPT,
+                    2,
+                    deadlines_key,
+                    tokens_key,
+                    message,
+                    lease_token,
+                    visibility_timeout_ms,
+                )
+            try:
+                results = await pipeline.execute()
+            except redis.exceptions.ResponseError as exc:
+                lua_error = wrap_lua_response_error(exc)
+                if lua_error is not None:
+                    raise lua_error from exc
+                raise
+            return [bool(renewed) for renewed in results]
+
+        return await _renew()
+
+    def _renewal_retry_strategy(self, is_interrupted: BaseGracefulInterruptHandler | None):
+        if is_interrupted is None:
+            return self._retry_strategy
+        # Per-call strategy: compose the gateway-level interrupt with the
+        # caller's stop signal so a heartbeat stop short-circuits the retry
+        # loop without waiting out retry_budget_seconds (AA-01-F2).
+        return build_retry_strategy(
+            retry_budget_seconds=self._retry_budget_seconds,
+            retry_max_delay_seconds=self._retry_max_delay_seconds,
+            retry_initial_delay_seconds=self._retry_initial_delay_seconds,
+            interrupt=_ChainedInterrupt(self._interrupt, is_interrupted),
+        )
+
     async def _wait_for_claim(
         self,
         from_queue: str,
@@ -1085,6 +1328,7 @@ class RedisGateway(AbstractRedisGateway):
                 self._set_pending_claim_id(to_queue, pending_claim_id_to_share)
             finish_active_claim()
 
+    @accounted_async("claim")
     async def wait_for_message_and_move(
         self, from_queue: str, to_queue: str
     ) -> ClaimedMessage | ReceivedPayload | None:
@@ -1092,6 +1336,7 @@ class RedisGateway(AbstractRedisGateway):
             return None
         return await self._wait_for_message_and_move_interruptible(from_queue, to_queue)
 
+    @accounted_async("claim")
     async def _wait_for_message_and_move_interruptible(
         self,
         from_queue: str,
@@ -1184,8 +1429,8 @@ class RedisGateway(AbstractRedisGateway):
         await self._delete_claim_result_key(claim_result_key)
         return result
 
-    async def _claim_visible_message(self, from_queue: str, to_queue: str, *, claim_id: str) -> ClaimedMessage | None:
-        result = await self._eval(
+    def _visible_claim_eval_args(self, from_queue: str, to_queue: str, claim_id: str) -> tuple[object, ...]:
+        return (
             CLAIM_MESSAGE_WITH_VISIBILITY_TIMEOUT_LUA_SCRIPT,
             11,
             from_queue,
@@ -1204,23 +1449,30 @@ class RedisGateway(AbstractRedisGateway):
             str(self._message_visibility_timeout_seconds * 1000),
             claim_id,
         )
+
+    async def _claim_visible_message(self, from_queue: str, to_queue: str, *, claim_id: str) -> ClaimedMessage | None:
+        result = await self._eval(*self._visible_claim_eval_args(from_queue, to_queue, claim_id))
+        return await self._visible_claim_from_result(from_queue, to_queue, result)
+
+    async def _visible_claim_from_result(self, from_queue: str, to_queue: str, result: object) -> ClaimedMessage | None:
         if result is None:
             return None
+        reply = cast(list[Any], result)
 
-        if _is_claim_store_failed_result(result):
-            stored_message = result[2] if len(result) > 2 else None
+        if _is_claim_store_failed_result(reply):
+            stored_message = reply[2] if len(reply) > 2 else None
             message_id = extract_stored_message_id(stored_message) if isinstance(stored_message, (str, bytes)) else None
             raise ClaimStoreFailedError(
                 f"VT claim store failed after delivery_count rollback and payload preservation: "
-                f"{_decode_lua_error(result[1])}",
+                f"{_decode_lua_error(reply[1])}",
                 queue=from_queue,
                 message_id=message_id,
                 operation="claim",
             )
 
-        stored_message, lease_token = result[0], result[1]
-        reclaimed_attempts = _coerce_lua_message_attempts(result[2]) if len(result) > 2 else []
-        dead_lettered_attempts = _coerce_lua_message_attempts(result[3]) if len(result) > 3 else []
+        stored_message, lease_token = reply[0], reply[1]
+        reclaimed_attempts = _coerce_lua_message_attempts(reply[2]) if len(reply) > 2 else []
+        dead_lettered_attempts = _coerce_lua_message_attempts(reply[3]) if len(reply) > 3 else []
         await self._emit_repeated_event(to_queue, "claim_reclaim", reclaimed_attempts)
         await self._emit_repeated_event(
             to_queue,
@@ -1233,15 +1485,23 @@ class RedisGateway(AbstractRedisGateway):
             return None
         if isinstance(lease_token, bytes):
             lease_token = lease_token.decode("utf-8")
-        return ClaimedMessage(stored_message=stored_message, lease_token=lease_token)
+        delivery_count = _coerce_lua_count(reply[4]) if len(reply) > 4 else 0
+        return ClaimedMessage(
+            stored_message=stored_message,
+            lease_token=lease_token,
+            delivery_count=delivery_count or None,
+        )
 
+    @accounted_async("trim")
     async def trim_queue(self, queue: str, max_length: int) -> None:
         await self._redis_client.ltrim(queue, 0, max_length - 1)
 
+    @accounted_async("operator")
     async def queue_length(self, queue: str) -> int:
         """Return the ``LLEN`` of ``queue`` (operator inspection helper)."""
         return int(await self._redis_client.llen(queue))
 
+    @accounted_async("operator")
     async def peek_messages(self, queue: str, count: int) -> list[ReceivedPayload]:
         """Return up to ``count`` stored messages from the head of ``queue``.
 
@@ -1251,10 +1511,230 @@ class RedisGateway(AbstractRedisGateway):
         """
         return list(await self._redis_client.lrange(queue, 0, count - 1))
 
+    @accounted_async("operator")
+    async def range_messages(self, queue: str, start: int, stop: int) -> list[ReceivedPayload]:
+        """Return ``LRANGE queue start stop`` exactly as stored (operator inspection helper).
+
+        Negative indexes count from the tail; ``iter_messages()`` pages with them.
+        """
+        return list(await self._redis_client.lrange(queue, start, stop))
+
+    @accounted_async("operator")
+    async def oldest_message_id(self, queue: str) -> str | None:
+        """Return the id of the oldest (next-to-claim) envelope in ``queue``.
+
+        Returns None for an empty list or an entry that is not an RMQ
+        envelope. Only the id crosses the network, not the payload.
+        """
+        message_id = await self._eval(OLDEST_MESSAGE_ID_LUA_SCRIPT, 1, queue)
+        if isinstance(message_id, bytes):
+            message_id = message_id.decode("ascii", "replace")
+        return message_id if isinstance(message_id, str) and message_id else None
+
+    @accounted_async("operator")
+    async def queue_stats_snapshots(self, key_sets: Sequence[QueueStatsKeys]) -> list[QueueStats]:
+        """Return one atomic ``QueueStats`` per key set in a single round trip.
+
+        Each snapshot is one Lua script reading every list depth, the lease
+        counts, and the oldest pending id. Several key sets are pipelined;
+        every snapshot is consistent on its own, not across queues.
+        """
+        eval_args = [
+            (QUEUE_STATS_SNAPSHOT_LUA_SCRIPT, len(keys), *keys)
+            for keys in (
+                queue_stats_snapshot_keys(key_set, self._lease_deadlines_key(key_set.processing))
+                for key_set in key_sets
+            )
+        ]
+        if len(eval_args) == 1:
+            snapshots = [await self._eval(*eval_args[0])]
+        else:
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for args in eval_args:
+                pipeline.eval(*args)  # type: ignore[arg-type]
+            try:
+                snapshots = await pipeline.execute()
+            except redis.exceptions.ResponseError as exc:
+                lua_error = wrap_lua_response_error(exc)
+                if lua_error is not None:
+                    raise lua_error from exc
+                raise
+        return [queue_stats_from_snapshot(key_set, snapshot) for key_set, snapshot in zip(key_sets, snapshots)]
+
+    @accounted_async("operator")
     async def purge_queue(self, queue: str) -> int:
         """Atomically delete ``queue`` and return how many entries were removed."""
         return _coerce_lua_count(await self._eval(PURGE_QUEUE_LUA_SCRIPT, 1, queue))
 
+    @accounted_async("operator")
+    async def purge_queue_slice(
+        self, queue: str, processing_queue: str, count: int, *, clear_delivery_counts: bool
+    ) -> int:
+        """Atomically pop up to ``count`` of ``queue``'s oldest entries; return how many.
+
+        With ``clear_delivery_counts``, each popped entry's field in the
+        delivery-count hash of ``processing_queue`` is deleted too.
+        """
+        return _coerce_lua_count(
+            await self._eval(
+                PURGE_QUEUE_SLICE_LUA_SCRIPT,
+                2,
+                queue,
+                self._delivery_counts_key(processing_queue),
+                "1" if clear_delivery_counts else "0",
+                count,
+            )
+        )
+
+    @accounted_async("operator")
+    async def purge_selected_messages(
+        self,
+        queue: str,
+        processing_queue: str,
+        messages: list[ReceivedPayload],
+        *,
+        clear_delivery_counts: bool,
+    ) -> list[ReceivedPayload]:
+        """Atomically remove ``messages`` from ``queue`` by value; return the ones removed.
+
+        ``messages`` are raw entries as read with ``range_messages()``, oldest
+        first. Entries already gone are skipped, and the entries left behind
+        keep their order. ``clear_delivery_counts`` works as in
+        ``purge_queue_slice()``.
+        """
+        if not messages:
+            return []
+        removed = await self._eval(
+            PURGE_SELECTED_MESSAGES_LUA_SCRIPT,
+            2,
+            queue,
+            self._delivery_counts_key(processing_queue),
+            "1" if clear_delivery_counts else "0",
+            *messages,
+        )
+        return cast(list[ReceivedPayload], removed)
+
+    @accounted_async("operator")
+    async def scan_metadata_fields(
+        self, processing_queue: str, metadata: str, cursor: int, count: int
+    ) -> tuple[int, list[ReceivedPayload]]:
+        """``HSCAN`` one batch of field names of a per-message metadata hash.
+
+        ``metadata`` is ``"delivery_counts"``, ``"claim_result_refs"``,
+        ``"claim_result_ids"``, or ``"claim_result_backrefs"``, the hash of
+        ``processing_queue``. Returns
+        ``(next_cursor, fields)``; a zero cursor ends the scan.
+        """
+        next_cursor, entries = await self._redis_client.hscan(
+            self._metadata_hash_key(processing_queue, metadata), cursor, count=count
+        )
+        return int(next_cursor), list(entries)
+
+    @accounted_async("operator")
+    async def metadata_values(
+        self, processing_queue: str, metadata: str, fields: list[ReceivedPayload]
+    ) -> list[ReceivedPayload | None]:
+        """``HMGET`` the values of ``fields`` in a per-message metadata hash.
+
+        ``metadata`` names the hash as in ``scan_metadata_fields()``, or is
+        ``"lease_tokens"`` for the lease token of each message. A field that
+        no longer exists reads as None.
+        """
+        if not fields:
+            return []
+        return list(await self._redis_client.hmget(self._metadata_hash_key(processing_queue, metadata), fields))
+
+    @accounted_async("operator")
+    async def range_message_fingerprints(self, queue: str, start: int, stop: int) -> list[str]:
+        """Return ``message_fingerprint()`` of ``queue``'s entries ``start`` to ``stop`` (inclusive).
+
+        Computed in Redis, so only the short fingerprints are sent back.
+        """
+        fingerprints = cast(
+            list[str | bytes],
+            await self._eval(RANGE_MESSAGE_FINGERPRINTS_LUA_SCRIPT, 1, queue, start, stop, MESSAGE_FINGERPRINT_BYTES),
+        )
+        return [
+            fingerprint.decode("ascii") if isinstance(fingerprint, bytes) else fingerprint
+            for fingerprint in fingerprints
+        ]
+
+    @accounted_async("operator")
+    async def remove_stale_metadata(
+        self, processing_queue: str, metadata: str, fields: list[ReceivedPayload]
+    ) -> tuple[int, int]:
+        """Atomically delete the ``fields`` of ``metadata`` whose message is no longer in flight.
+
+        A field is kept while its message holds a lease in ``processing_queue``
+        (an O(1) check) or, on a queue without visibility timeouts, is still in
+        it (one walk of the list per call, only if some field needs it). The
+        caller must already have dropped delivery counts of messages waiting
+        in pending. Returns ``(fields deleted, bytes)``, where bytes counts the
+        deleted field names and values.
+        """
+        if not fields:
+            return 0, 0
+        result = await self._eval(
+            REMOVE_STALE_METADATA_LUA_SCRIPT,
+            6,
+            processing_queue,
+            self._lease_tokens_key(processing_queue),
+            self._delivery_counts_key(processing_queue),
+            self._claim_result_refs_key(processing_queue),
+            self._claim_result_ids_key(processing_queue),
+            self._claim_result_backrefs_key(processing_queue),
+            metadata,
+            "0" if self._message_visibility_timeout_seconds is None else "1",
+            *fields,
+        )
+        removed, reclaimed_bytes = cast(list[object], result)
+        return _coerce_lua_count(removed), _coerce_lua_count(reclaimed_bytes)
+
+    @accounted_async("operator")
+    async def scan_keys(self, match: str, cursor: int, count: int) -> tuple[int, list[ReceivedPayload]]:
+        """``SCAN`` one batch of keys matching ``match``; return ``(next_cursor, keys)``.
+
+        A zero cursor ends the scan. Not supported on ``RedisCluster``, where
+        each node has its own keyspace and cursor.
+        """
+        if self.is_redis_cluster:
+            raise ConfigurationError(
+                "scan_keys() does not support RedisCluster; run SCAN on the node that owns the queue's hash slot."
+            )
+        next_cursor, keys = await self._redis_client.scan(cursor, match=match, count=count)
+        return int(next_cursor), list(keys)
+
+    @accounted_async("operator")
+    async def key_footprints(self, keys: list[ReceivedPayload]) -> list[tuple[int, int | None, int]]:
+        """Return ``(pttl_ms, memory_usage, strlen)`` for each string key, in one round trip.
+
+        ``pttl_ms`` is ``-2`` for a key that no longer exists and ``-1`` for
+        one without a TTL. ``memory_usage`` is None where ``MEMORY USAGE`` is
+        unavailable (some managed services disable it), and ``strlen`` is 0
+        for a key that is not a string.
+        """
+        if not keys:
+            return []
+        pipeline = self._redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.pttl(key)
+            pipeline.strlen(key)
+            pipeline.memory_usage(key)
+        results = await pipeline.execute(raise_on_error=False)
+        footprints: list[tuple[int, int | None, int]] = []
+        for pttl_ms, strlen, memory_usage in zip(results[0::3], results[1::3], results[2::3]):
+            if isinstance(pttl_ms, Exception):
+                raise pttl_ms
+            footprints.append(
+                (
+                    int(pttl_ms),
+                    None if memory_usage is None or isinstance(memory_usage, Exception) else int(memory_usage),
+                    0 if isinstance(strlen, Exception) else int(strlen),
+                )
+            )
+        return footprints
+
+    @accounted_async("operator")
     async def redrive_messages(
         self,
         dead_letter_queue: str,
@@ -1284,6 +1764,190 @@ class RedisGateway(AbstractRedisGateway):
             )
         )
 
+    @accounted_async("operator")
+    async def redrive_message_batches(
+        self,
+        dead_letter_queue: str,
+        pending_queue: str,
+        batch_sizes: Sequence[int],
+    ) -> list[int]:
+        """Run one atomic DLQ -> pending redrive script per batch, in one round trip.
+
+        Like ``redrive_messages()``, but each script derives its envelope ids
+        from one ``new_message_id_prefix()`` instead of taking one id argument
+        per message, and several batches are pipelined. Returns how many
+        messages each batch moved; a short batch means the DLQ ran empty.
+        Each script blocks Redis only for its own batch, but a pipeline's
+        scripts run back to back.
+        """
+        eval_args = [
+            (REDRIVE_DEAD_LETTER_BATCH_LUA_SCRIPT, 2, dead_letter_queue, pending_queue, new_message_id_prefix(), size)
+            for size in batch_sizes
+        ]
+        if len(eval_args) == 1:
+            return [_coerce_lua_count(await self._eval(*eval_args[0]))]
+        pipeline = self._redis_client.pipeline(transaction=False)
+        for args in eval_args:
+            pipeline.eval(*args)  # type: ignore[arg-type]
+        try:
+            results = await pipeline.execute()
+        except redis.exceptions.ResponseError as exc:
+            lua_error = wrap_lua_response_error(exc)
+            if lua_error is not None:
+                raise lua_error from exc
+            raise
+        return [_coerce_lua_count(result) for result in results]
+
+    @accounted_async("operator")
+    async def redrive_selected_messages(
+        self,
+        dead_letter_queue: str,
+        pending_queue: str,
+        envelope_ids: list[str],
+        messages: list[ReceivedPayload],
+        positions: list[int],
+    ) -> int:
+        """Atomically move the given dead-letter entries to pending.
+
+        ``messages`` are raw dead-letter entries, oldest first, as read with
+        ``range_messages()``, and ``positions`` their tail-relative (negative)
+        indices; each is re-wrapped like ``redrive_messages()`` does, with the
+        matching id from ``envelope_ids``. An entry no longer at its position
+        is removed by value, one that is no longer in the dead-letter queue is
+        skipped, and the entries left behind keep their order. One call walks
+        the list to the deepest position once per entry plus once to drop
+        them, so pass a bounded batch. Returns how many were moved.
+        """
+        if not len(envelope_ids) == len(messages) == len(positions):
+            raise ValueError("'envelope_ids', 'messages', and 'positions' must have the same length")
+        if not messages:
+            return 0
+        return _coerce_lua_count(
+            await self._eval(
+                REDRIVE_SELECTED_DEAD_LETTERS_LUA_SCRIPT,
+                2,
+                dead_letter_queue,
+                pending_queue,
+                f"{_REDRIVE_TOMBSTONE_PREFIX}{uuid.uuid4().hex}",
+                *envelope_ids,
+                *messages,
+                *positions,
+            )
+        )
+
+    @accounted_async("claim_check")
+    async def _store_claim_check_body(self, body_key: str, body: str | bytes) -> None:
+        """Write a claim-checked message body before its reference is enqueued."""
+        self._raise_if_bytes_payload_unreadable(body)
+        await self._redis_client.set(body_key, body)
+
+    @accounted_async("claim_check")
+    async def _load_claim_check_body(self, body_key: str) -> ReceivedPayload | None:
+        return await self._redis_client.get(body_key)
+
+    @accounted_async("claim_check")
+    async def _delete_claim_check_body(self, *body_keys: str) -> None:
+        await self._redis_client.unlink(*body_keys)
+
+    @accounted_async("claim_check")
+    async def _expire_claim_check_body(self, body_key: str, ttl_seconds: int) -> None:
+        await self._redis_client.expire(body_key, ttl_seconds)
+
+    @accounted_async("trim")
+    async def _trim_queue_with_claim_checks(self, queue: str, max_length: int, claim_check_prefix: str) -> None:
+        """Trim ``queue`` like ``trim_queue``, unlinking the claim-check bodies of the dropped entries.
+
+        Entries are dropped in atomic batches from the tail; a crash between a
+        batch and its unlink leaves those bodies behind.
+        """
+        while True:
+            dropped, references = cast(
+                tuple[int, list[ReceivedPayload]],
+                await self._eval(
+                    TRIM_QUEUE_TAIL_LUA_SCRIPT,
+                    1,
+                    queue,
+                    max_length,
+                    _CLAIM_CHECK_PURGE_BATCH_SIZE,
+                    CLAIM_CHECK_REFERENCE_PREFIX,
+                ),
+            )
+            # Retained logs hold raw payloads, so references need no envelope decoding.
+            parsed = [parse_claim_check_reference(reference) for reference in references]
+            body_keys = [f"{claim_check_prefix}{reference[0]}" for reference in parsed if reference]
+            if body_keys:
+                await self._redis_client.unlink(*body_keys)
+            if dropped < _CLAIM_CHECK_PURGE_BATCH_SIZE:
+                return
+
+    @accounted_async("operator")
+    async def _purge_queue_with_claim_checks(self, queue: str, processing_queue: str, claim_check_prefix: str) -> int:
+        """Delete ``queue`` like ``purge_queue``, unlinking the claim-check bodies it references.
+
+        A list with no reference entries is deleted atomically after one scan
+        inside Redis. Otherwise it is popped in atomic batches: entries pushed
+        while that runs are popped too, and a crash between a batch and its
+        unlink leaves those bodies behind.
+        """
+        removed = _coerce_lua_count(
+            await self._eval(
+                PURGE_UNREFERENCED_QUEUE_LUA_SCRIPT,
+                1,
+                queue,
+                MAX_STORED_REFERENCE_SIZE,
+                *CLAIM_CHECK_REFERENCE_MARKERS,
+                _CLAIM_CHECK_PURGE_BATCH_SIZE,
+            )
+        )
+        if removed >= 0:
+            return removed
+        removed = 0
+        while True:
+            popped = await self._purge_queue_slice_with_claim_checks(
+                queue,
+                processing_queue,
+                _CLAIM_CHECK_PURGE_BATCH_SIZE,
+                clear_delivery_counts=False,
+                claim_check_prefix=claim_check_prefix,
+            )
+            removed += popped
+            if popped < _CLAIM_CHECK_PURGE_BATCH_SIZE:
+                return removed
+
+    @accounted_async("operator")
+    async def _purge_queue_slice_with_claim_checks(
+        self,
+        queue: str,
+        processing_queue: str,
+        count: int,
+        *,
+        clear_delivery_counts: bool,
+        claim_check_prefix: str,
+    ) -> int:
+        """Pop a slice like ``purge_queue_slice``, unlinking the claim-check bodies it references.
+
+        Only entries that may carry a reference leave Redis; a crash between
+        the pop and the unlink leaves those bodies behind.
+        """
+        popped, references = cast(
+            tuple[int, list[ReceivedPayload]],
+            await self._eval(
+                PURGE_QUEUE_SLICE_WITH_CLAIM_CHECKS_LUA_SCRIPT,
+                2,
+                queue,
+                self._delivery_counts_key(processing_queue),
+                "1" if clear_delivery_counts else "0",
+                count,
+                MAX_STORED_REFERENCE_SIZE,
+                *CLAIM_CHECK_REFERENCE_MARKERS,
+            ),
+        )
+        reference_ids = [parse_stored_claim_check_reference(entry) for entry in references]
+        body_keys = [f"{claim_check_prefix}{reference_id}" for reference_id in reference_ids if reference_id]
+        if body_keys:
+            await self._redis_client.unlink(*body_keys)
+        return _coerce_lua_count(popped)
+
     def _lease_deadlines_key(self, processing_queue: str) -> str:
         return f"{processing_queue}{_LEASE_DEADLINES_SUFFIX}"
 
@@ -1308,6 +1972,17 @@ class RedisGateway(AbstractRedisGateway):
     def _claim_result_backrefs_key(self, processing_queue: str) -> str:
         return f"{processing_queue}{_CLAIM_RESULT_BACKREFS_SUFFIX}"
 
+    def _metadata_hash_key(self, processing_queue: str, metadata: str) -> str:
+        if metadata == "lease_tokens":
+            return self._lease_tokens_key(processing_queue)
+        if metadata == "claim_result_refs":
+            return self._claim_result_refs_key(processing_queue)
+        if metadata == "claim_result_ids":
+            return self._claim_result_ids_key(processing_queue)
+        if metadata == "claim_result_backrefs":
+            return self._claim_result_backrefs_key(processing_queue)
+        return self._delivery_counts_key(processing_queue)
+
     def _optional_dead_letter_key(self, processing_queue: str) -> str:
         if self._dead_letter_queue is not None:
             return self._dead_letter_queue
@@ -1344,6 +2019,7 @@ class RedisGateway(AbstractRedisGateway):
     def _claim_result_ttl_ms(self) -> str:
         return str(max(self._message_wait_interval_seconds, 120) * 1000)
 
+    @accounted_async("drain")
     async def _cleanup_drained_lease_token_counter(self, processing_queue: str) -> bool:
         if self._message_visibility_timeout_seconds is None:
             return False
@@ -1498,6 +2174,7 @@ class RedisGateway(AbstractRedisGateway):
             if not pending_claim_ids:
                 self._pending_claim_ids.pop(processing_queue, None)
 
+    @accounted_async("reclaim")
     async def _recover_pending_non_visibility_timeout_claim(
         self,
         processing_queue: str,
@@ -1523,6 +2200,7 @@ class RedisGateway(AbstractRedisGateway):
         _raise_if_drain_deadline_expired(deadline_monotonic)
         return cached_claim
 
+    @accounted_async("reclaim")
     async def _recover_pending_visibility_timeout_claim(
         self,
         processing_queue: str,
@@ -1547,44 +2225,48 @@ class RedisGateway(AbstractRedisGateway):
             if cached_claim is None:
                 return None
 
-        try:
-            cached_claim_text = cached_claim.decode("utf-8") if isinstance(cached_claim, bytes) else cached_claim
-            claim = json.loads(cached_claim_text)
-        except (UnicodeDecodeError, json.JSONDecodeError):
-            # The claim Lua stores cjson.encode({stored, lease_token}) with raw
-            # payload bytes, so a foreign non-UTF-8 payload yields a claim
-            # result this side cannot parse. Treat it exactly like corrupt
-            # JSON: purge the ledger entries and let lease expiry redeliver.
-            await self._delete_corrupt_claim_result(
-                claim_result_key, processing_queue, claim_id, deadline_monotonic=deadline_monotonic
-            )
-            return None
-
-        if (
-            not isinstance(claim, list)
-            or len(claim) < 2
-            or not isinstance(claim[0], str)
-            or not isinstance(claim[1], str)
-        ):
-            await self._delete_corrupt_claim_result(
-                claim_result_key, processing_queue, claim_id, deadline_monotonic=deadline_monotonic
-            )
-            return None
-
-        stored_message: ReceivedPayload = claim[0]
-        if isinstance(cached_claim, bytes):
+        binary_claim = split_binary_claim_result(cached_claim)
+        if binary_claim is not None:
+            stored_message, lease_token = binary_claim
+        else:
             try:
-                stored_message = stored_message.encode("utf-8")
-            except UnicodeEncodeError:
-                # A bare surrogate escape in the claim JSON cannot come from the
-                # claim Lua (cjson doubles backslashes and never emits surrogate
-                # escapes), so the value is tampered/corrupt: same purge-and-miss
-                # handling as the parse failures above.
+                cached_claim_text = cached_claim.decode("utf-8") if isinstance(cached_claim, bytes) else cached_claim
+                claim = json.loads(cached_claim_text)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                # The claim Lua stores cjson.encode({stored, lease_token}) with raw
+                # payload bytes, so a foreign non-UTF-8 payload yields a claim
+                # result this side cannot parse. Treat it exactly like corrupt
+                # JSON: purge the ledger entries and let lease expiry redeliver.
                 await self._delete_corrupt_claim_result(
                     claim_result_key, processing_queue, claim_id, deadline_monotonic=deadline_monotonic
                 )
                 return None
-        lease_token = claim[1]
+
+            if (
+                not isinstance(claim, list)
+                or len(claim) < 2
+                or not isinstance(claim[0], str)
+                or not isinstance(claim[1], str)
+            ):
+                await self._delete_corrupt_claim_result(
+                    claim_result_key, processing_queue, claim_id, deadline_monotonic=deadline_monotonic
+                )
+                return None
+
+            stored_message = claim[0]
+            if isinstance(cached_claim, bytes):
+                try:
+                    stored_message = stored_message.encode("utf-8")
+                except UnicodeEncodeError:
+                    # A bare surrogate escape in the claim JSON cannot come from the
+                    # claim Lua (cjson doubles backslashes and never emits surrogate
+                    # escapes), so the value is tampered/corrupt: same purge-and-miss
+                    # handling as the parse failures above.
+                    await self._delete_corrupt_claim_result(
+                        claim_result_key, processing_queue, claim_id, deadline_monotonic=deadline_monotonic
+                    )
+                    return None
+            lease_token = claim[1]
 
         await self._delete_claim_result_key(claim_result_key, deadline_monotonic=deadline_monotonic)
         _raise_if_drain_deadline_expired(deadline_monotonic)
@@ -1658,11 +2340,88 @@ class RedisGateway(AbstractRedisGateway):
         finally:
             await self._delete_operation_result_key(operation_result_key)
 
+    @accounted_async("release")
+    async def _return_claimed_message_to_pending(
+        self,
+        processing_queue: str,
+        stored_message: ReceivedPayload,
+        lease_token: str | None,
+    ) -> bool:
+        """Put a claimed message no handler has seen back at the head of pending.
+
+        Returns False when the claim is no longer ours (a visibility-timeout
+        reclaim already moved it) or the message left ``processing``.
+        """
+        pending_queue = self._pending_queue_from_processing_queue(processing_queue)
+        operation_id = uuid.uuid4().hex
+
+        if lease_token is None:
+            # A fresh claim id matches nothing: the script only clears this
+            # message's claim-result backref, which a live claim no longer has.
+            claim_id = uuid.uuid4().hex
+            operation_result_key = self._operation_result_key(processing_queue, operation_id)
+
+            @self._retry_strategy
+            async def _return():
+                return _coerce_lua_count(
+                    await self._eval(
+                        RETURN_MESSAGE_TO_PENDING_LUA_SCRIPT,
+                        6,
+                        processing_queue,
+                        pending_queue,
+                        self._claim_result_ids_key(processing_queue),
+                        self._claim_result_backrefs_key(processing_queue),
+                        operation_result_key,
+                        self._claim_result_key(processing_queue, claim_id),
+                        stored_message,
+                        claim_id,
+                        self._operation_result_ttl_ms(),
+                    )
+                )
+
+        else:
+            operation_result_key = self._lease_operation_result_key(processing_queue, lease_token, operation_id)
+
+            @self._retry_strategy
+            async def _return():
+                return _coerce_lua_count(
+                    await self._eval(
+                        RETURN_LEASED_MESSAGE_TO_PENDING_LUA_SCRIPT,
+                        9,
+                        processing_queue,
+                        pending_queue,
+                        self._lease_deadlines_key(processing_queue),
+                        self._lease_tokens_key(processing_queue),
+                        self._delivery_counts_key(processing_queue),
+                        self._claim_result_refs_key(processing_queue),
+                        self._claim_result_ids_key(processing_queue),
+                        self._claim_result_backrefs_key(processing_queue),
+                        operation_result_key,
+                        stored_message,
+                        lease_token,
+                        self._lease_operation_result_ttl_ms(),
+                    )
+                )
+
+        try:
+            return bool(await _return())
+        except RedisMessageQueueError as exc:
+            _set_exception_context(
+                exc,
+                queue=processing_queue,
+                message_id=extract_stored_message_id(stored_message),
+                operation="release",
+            )
+            raise
+        finally:
+            await self._delete_operation_result_key(operation_result_key)
+
     def _is_interrupted(self, is_interrupted: BaseGracefulInterruptHandler | None = None) -> bool:
         return (self._interrupt is not None and self._interrupt.is_interrupted()) or (
             is_interrupted is not None and is_interrupted.is_interrupted()
         )
 
+    @accounted_async("reclaim")
     async def _drain_pending_claim_ids(
         self,
         processing_queue: str,
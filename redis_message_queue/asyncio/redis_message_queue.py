@@ -1,22 +1,42 @@
 import asyncio
+import collections
+import functools
 import hashlib
 import inspect
 import logging
 import math
 import time
-import uuid
-from contextlib import asynccontextmanager
-from typing import AsyncIterator, Awaitable, Callable, Literal, Optional, TypeVar
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Literal, Optional, TypeVar, cast, overload
 
 import redis.asyncio
 import redis.exceptions
 
+from redis_message_queue._claim_check import (
+    claim_check_body_size,
+    missing_claim_check_body_error,
+    new_claim_check_reference,
+    parse_claim_check_reference,
+    parse_stored_claim_check_reference,
+    read_stored_claim_check_reference,
+    validate_claim_check_parameters,
+)
 from redis_message_queue._config import (
+    BYTES_PAYLOAD_REQUIRES_BUILTIN_GATEWAY_MESSAGE,
     DEFAULT_PENDING_OVERLOAD_BLOCK_TIMEOUT_SECONDS,
+    PREFETCHED_CLAIM_MAX_LEASE_FRACTION,
     validate_dedup_configuration,
     validate_pending_backpressure_parameters,
 )
+from redis_message_queue._dedup_census import (
+    DEFAULT_CENSUS_BATCH_SIZE,
+    CensusTally,
+    DeduplicationCensus,
+    is_deduplication_marker,
+    validate_census_arguments,
+)
 from redis_message_queue._event import EventOperation, EventOutcome, QueueEvent
+from redis_message_queue._event_filter import EventFilter
 from redis_message_queue._exceptions import (
     CleanupFailedError,
     ConfigurationError,
@@ -27,29 +47,61 @@ from redis_message_queue._exceptions import (
     RedisMessageQueueError,
     _set_exception_context,
 )
+from redis_message_queue._metadata_gc import (
+    DEFAULT_METADATA_GC_BATCH_SIZE,
+    METADATA_GC_HASHES,
+    METADATA_GC_PENDING_WINDOW,
+    OrphanedMetadataReport,
+    message_fingerprint,
+    require_fingerprints,
+    require_metadata_values,
+    require_removal_result,
+    require_scan_result,
+    validate_metadata_gc_batch_size,
+)
+from redis_message_queue._metrics import MetricsCollector
 from redis_message_queue._payload_limits import (
     serialize_dict_payload_with_limit,
+    validate_bytes_payload_size,
     validate_max_payload_depth,
     validate_payload_limit_parameter,
     validate_str_payload_size,
     validate_str_payload_utf8_encodable,
 )
+from redis_message_queue._purge import (
+    DEFAULT_PURGE_BATCH_SIZE,
+    PurgeProgress,
+    validate_incremental_purge_arguments,
+)
 from redis_message_queue._queue_key_manager import QueueKeyManager, validate_callable_deduplication_key
-from redis_message_queue._queue_stats import QueueStats
+from redis_message_queue._queue_stats import QueueStats, QueueStatsKeys
+from redis_message_queue._queue_stats_collector import escape_scan_pattern
 from redis_message_queue._redis_cluster import (
     plain_redis_cluster_client_error,
     redis_info_reports_cluster_enabled,
     validate_queue_keys_for_redis_cluster,
 )
+from redis_message_queue._redrive import (
+    DEFAULT_REDRIVE_SCRIPT_BUDGET_SECONDS,
+    RedriveBatchSizer,
+    RedrivePacer,
+    validate_redrive_arguments,
+)
+from redis_message_queue._round_trips import RoundTripStats
 from redis_message_queue._stored_message import (
     ClaimedMessage,
     PublishPayload,
     ReceivedPayload,
     decode_stored_message,
     extract_stored_message_id,
+    message_age_ms,
+    new_message_id,
+    read_stored_message_id,
 )
+from redis_message_queue._tracing import QueueTracing
 from redis_message_queue._warnings import warn_runtime_warning
 from redis_message_queue.asyncio._abstract_redis_gateway import AbstractRedisGateway
+from redis_message_queue.asyncio._message_handle import MessageHandle
 from redis_message_queue.asyncio._redis_gateway import RedisGateway
 from redis_message_queue.interrupt_handler import BaseGracefulInterruptHandler
 
@@ -69,6 +121,8 @@ _PEEK_SOURCES = ("pending", "processing", "completed", "failed", "dead_letter")
 # those verbatim rather than run them back through envelope decoding.
 _PEEK_ENVELOPE_SOURCES = ("pending", "processing")
 _PURGE_TARGETS = ("pending", "completed", "failed", "dead_letter")
+# iter_messages() pages with LRANGE windows of this many entries by default.
+_DEFAULT_ITER_BATCH_SIZE = 500
 # Bound each redrive Lua call so it never blocks Redis for long, mirroring the
 # 100-message cap on the visibility-timeout reclaim/claim loops.
 _REDRIVE_BATCH_SIZE = 100
@@ -447,6 +501,28 @@ class _DrainInterrupt(BaseGracefulInterruptHandler):
         return self._is_draining()
 
 
+async def _call_on_heartbeat_failure(on_heartbeat_failure: Callable[[], Awaitable[None] | None]) -> None:
+    try:
+        result = on_heartbeat_failure()
+        if inspect.isawaitable(result):
+            await result
+    except asyncio.CancelledError as exc:
+        current_task = asyncio.current_task()
+        if current_task is not None and current_task.cancelling() > 0:
+            raise
+        logger.exception("on_heartbeat_failure callback raised an exception")
+        _warn_runtime_warning(
+            f"on_heartbeat_failure callback raised {type(exc).__name__}",
+            stacklevel=1,
+        )
+    except Exception as exc:
+        logger.exception("on_heartbeat_failure callback raised an exception")
+        _warn_runtime_warning(
+            f"on_heartbeat_failure callback raised {type(exc).__name__}",
+            stacklevel=1,
+        )
+
+
 class _LeaseHeartbeat:
     def __init__(
         self,
@@ -529,25 +605,7 @@ class _LeaseHeartbeat:
     async def _invoke_failure_callback(self) -> None:
         if self._stop_event.is_set() or self._suppress_failure_callback.is_set() or self._on_heartbeat_failure is None:
             return
-        try:
-            result = self._on_heartbeat_failure()
-            if inspect.isawaitable(result):
-                await result
-        except asyncio.CancelledError as exc:
-            current_task = asyncio.current_task()
-            if current_task is not None and current_task.cancelling() > 0:
-                raise
-            logger.exception("on_heartbeat_failure callback raised an exception")
-            _warn_runtime_warning(
-                f"on_heartbeat_failure callback raised {type(exc).__name__}",
-                stacklevel=1,
-            )
-        except Exception as exc:
-            logger.exception("on_heartbeat_failure callback raised an exception")
-            _warn_runtime_warning(
-                f"on_heartbeat_failure callback raised {type(exc).__name__}",
-                stacklevel=1,
-            )
+        await _call_on_heartbeat_failure(self._on_heartbeat_failure)
 
     async def _report_renewal_failure(self, exc: BaseException) -> None:
         if self._stop_event.is_set():
@@ -617,6 +675,172 @@ class _LeaseHeartbeat:
             return
 
 
+class _SharedLeaseHeartbeat:
+    """Renew every in-flight lease of ``serve()`` from one task.
+
+    Instead of one ``_LeaseHeartbeat`` task per handler, each message's lease
+    is registered here and all are renewed together, one pipelined round trip
+    per interval. A lease that fails to renew is dropped and reported like a
+    per-message heartbeat failure. Mirrors the sync variant in
+    ``redis_message_queue.redis_message_queue``.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        renew_message_leases: Callable[
+            [list[tuple[ReceivedPayload, str]], BaseGracefulInterruptHandler], Awaitable[list[bool]]
+        ],
+        on_heartbeat_failure: Callable[[], Awaitable[None] | None] | None = None,
+        emit_event: Callable[..., Awaitable[None]] | None = None,
+    ):
+        self._interval_seconds = interval_seconds
+        self._renew_message_leases = renew_message_leases
+        self._on_heartbeat_failure = on_heartbeat_failure
+        self._emit_event = emit_event
+        self._stop_event = asyncio.Event()
+        self._stop_interrupt = _StopEventInterrupt(self._stop_event)
+        self._leases: dict[str, _SharedLease] = {}
+        self._task: asyncio.Task | None = None
+
+    def lease(
+        self,
+        stored_message: ReceivedPayload,
+        lease_token: str | None,
+        message_id: str | None,
+        lease_token_hash: str | None,
+    ) -> "_SharedLease | None":
+        if lease_token is None:
+            return None
+        return _SharedLease(self, stored_message, lease_token, message_id, lease_token_hash)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="redis-message-queue-shared-lease-heartbeat")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop_event.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def _register(self, lease: "_SharedLease") -> None:
+        self._leases[lease.lease_token] = lease
+
+    def _unregister(self, lease: "_SharedLease") -> bool:
+        return self._leases.pop(lease.lease_token, None) is not None
+
+    async def _emit(self, operation: EventOperation | str, outcome: EventOutcome | str, **kwargs: object) -> None:
+        if self._emit_event is not None:
+            await self._emit_event(operation, outcome, **kwargs)
+
+    async def _invoke_failure_callback(self) -> None:
+        if not self._stop_event.is_set() and self._on_heartbeat_failure is not None:
+            await _call_on_heartbeat_failure(self._on_heartbeat_failure)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self._interval_seconds)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+                leases = list(self._leases.values())
+                if not leases:
+                    continue
+                try:
+                    renewed = await self._renew_message_leases(
+                        [(lease.stored_message, lease.lease_token) for lease in leases], self._stop_interrupt
+                    )
+                    if self._stop_event.is_set():
+                        return
+                    if (
+                        not isinstance(renewed, list)
+                        or len(renewed) != len(leases)
+                        or not all(isinstance(result, bool) for result in renewed)
+                    ):
+                        raise GatewayContractError(
+                            "gateway._renew_message_leases() must return one bool per lease, "
+                            f"got {type(renewed).__name__}."
+                        )
+                except Exception as exc:
+                    await self._report_failed_batch(leases, exc)
+                    continue
+                for lease, lease_renewed in zip(leases, renewed):
+                    if lease_renewed:
+                        await self._emit(
+                            "lease_renew",
+                            "success",
+                            message_id=lease.message_id,
+                            lease_token_hash=lease.lease_token_hash,
+                        )
+                    elif self._unregister(lease) and not lease.failure_callback_suppressed:
+                        await self._emit(
+                            "lease_renew_failed",
+                            "skipped",
+                            message_id=lease.message_id,
+                            lease_token_hash=lease.lease_token_hash,
+                        )
+                        await self._invoke_failure_callback()
+        except asyncio.CancelledError:
+            return
+
+    async def _report_failed_batch(self, leases: list["_SharedLease"], exc: BaseException) -> None:
+        # Each lease is dropped, as one per-message heartbeat stops after its
+        # first failed renewal; the log line and warning cover the batch.
+        dropped = [lease for lease in leases if self._unregister(lease) and not lease.failure_callback_suppressed]
+        if not dropped or self._stop_event.is_set():
+            return
+        logger.error("Failed to renew %d message leases", len(dropped), exc_info=exc)
+        for lease in dropped:
+            await self._emit(
+                "lease_renew_failed",
+                "failure",
+                message_id=lease.message_id,
+                lease_token_hash=lease.lease_token_hash,
+                exception_type=type(exc).__name__,
+                error=exc,
+            )
+        _warn_runtime_warning(
+            f"Failed to renew {len(dropped)} message leases "
+            f"({_warning_exception_name(exc)}); those messages will be reclaimed by another consumer "
+            "when the visibility timeout expires",
+            stacklevel=1,
+        )
+        for _ in dropped:
+            await self._invoke_failure_callback()
+
+
+class _SharedLease:
+    """One message's registration with a ``_SharedLeaseHeartbeat``; used like a ``_LeaseHeartbeat``."""
+
+    def __init__(
+        self,
+        heartbeat: _SharedLeaseHeartbeat,
+        stored_message: ReceivedPayload,
+        lease_token: str,
+        message_id: str | None,
+        lease_token_hash: str | None,
+    ):
+        self._heartbeat = heartbeat
+        self.stored_message = stored_message
+        self.lease_token = lease_token
+        self.message_id = message_id
+        self.lease_token_hash = lease_token_hash
+        self.failure_callback_suppressed = False
+
+    def start(self) -> None:
+        self._heartbeat._register(self)
+
+    async def stop(self) -> None:
+        self._heartbeat._unregister(self)
+
+    def suppress_failure_callback(self) -> None:
+        self.failure_callback_suppressed = True
+
+
 class RedisMessageQueue:
     """Async Redis-backed message queue.
 
@@ -649,9 +873,15 @@ class RedisMessageQueue:
         strict_payload_types: bool = False,
         max_payload_bytes: int | None = None,
         max_payload_depth: int | None = None,
+        claim_check_threshold_bytes: int | None = None,
+        claim_check_ttl_seconds: int | None = None,
         interrupt: BaseGracefulInterruptHandler | None = None,
         on_heartbeat_failure: Callable[[], Awaitable[None] | None] | None = None,
         on_event: Callable[[QueueEvent], Awaitable[None]] | None = None,
+        track_round_trips: bool = False,
+        metrics: MetricsCollector | None = None,
+        event_filter: EventFilter | None = None,
+        tracing: bool = False,
     ):
         """Create a queue bound to an async Redis client or custom gateway.
 
@@ -695,6 +925,39 @@ class RedisMessageQueue:
         (unbounded). Set positive integers to reject oversized serialized
         payloads or overly deep dict/list payload trees before enqueue.
 
+        ``claim_check_threshold_bytes`` defaults to ``None`` (off). When set,
+        payloads larger than this many bytes are stored once in their own
+        Redis key and the queue lists carry only a short reference, so claim,
+        ack, and dead-letter scripts never copy the body. Consumers on the
+        built-in gateway resolve references transparently whether or not they
+        set this option. Bodies are deleted on ack/nack, kept while the
+        message sits in the dead-letter queue, and released by ``purge()``.
+        Bodies of messages kept in the completed/failed logs are deleted when
+        ``max_completed_length``/``max_failed_length`` trims their entries;
+        ``claim_check_ttl_seconds`` also expires them after that long. A
+        publish that fails before enqueueing deletes the body it wrote.
+        Claim-check cannot be combined with
+        ``pending_overload_policy="drop_oldest"``.
+
+        ``metrics`` accepts a ``MetricsCollector`` that counts every event
+        this queue emits, with duration histograms, without building
+        ``QueueEvent`` objects. It works with or without ``on_event``.
+
+        ``event_filter`` accepts an ``EventFilter`` that allowlists operations
+        and outcomes and samples noisy operations such as ``lease_renew`` and
+        ``claim_empty`` before a ``QueueEvent`` is built for ``on_event``. It
+        requires ``on_event`` and does not affect ``metrics``.
+
+        ``tracing=True`` creates OpenTelemetry producer spans around publish and
+        consumer spans around each claimed message, and carries the W3C trace
+        context inside text envelopes so traces continue across the queue. It
+        requires the ``opentelemetry-api`` package.
+
+        ``track_round_trips=True`` counts the Redis requests, payload bytes,
+        and client-observed latency of every gateway operation; read them with
+        ``round_trip_stats()``. With ``gateway=``, pass it to ``RedisGateway``
+        instead.
+
         ``max_pending_length`` defaults to ``None`` (unbounded). Set it to a
         positive integer to cap pending-list depth during publish.
 
@@ -734,7 +997,9 @@ class RedisMessageQueue:
         current asyncio task and may execute while an internal publish/drain
         lock is held, so the callback must not call back into the same queue
         instance's ``publish()`` or ``drain()``; that lock is
-        non-reentrant, so re-entering deadlocks the caller permanently.
+        non-reentrant, so re-entering deadlocks the caller permanently. Wrap
+        a slow exporter in ``BackgroundEventDispatcher`` to move delivery to a
+        background task behind a bounded buffer.
         """
         self.key = QueueKeyManager(name, key_separator=key_separator)
         if not isinstance(deduplication, bool):
@@ -756,6 +1021,17 @@ class RedisMessageQueue:
                 "'strict_envelope_decoding' must be a bool, "
                 f"got {type(strict_envelope_decoding).__name__} (use True or False, not 1/0)"
             )
+        if metrics is not None and not isinstance(metrics, MetricsCollector):
+            raise TypeError(f"'metrics' must be a MetricsCollector or None, got {type(metrics).__name__}")
+        if event_filter is not None and not isinstance(event_filter, EventFilter):
+            raise TypeError(f"'event_filter' must be an EventFilter or None, got {type(event_filter).__name__}")
+        if not isinstance(tracing, bool):
+            raise TypeError(f"'tracing' must be a bool, got {type(tracing).__name__} (use True or False, not 1/0)")
+        if not isinstance(track_round_trips, bool):
+            raise TypeError(
+                f"'track_round_trips' must be a bool, got {type(track_round_trips).__name__}"
+                " (use True or False, not 1/0)"
+            )
         if not isinstance(strict_payload_types, bool):
             raise TypeError(
                 f"'strict_payload_types' must be a bool, got {type(strict_payload_types).__name__}"
@@ -763,6 +1039,9 @@ class RedisMessageQueue:
             )
         max_payload_bytes = validate_payload_limit_parameter("max_payload_bytes", max_payload_bytes)
         max_payload_depth = validate_payload_limit_parameter("max_payload_depth", max_payload_depth)
+        claim_check_threshold_bytes, claim_check_ttl_seconds = validate_claim_check_parameters(
+            claim_check_threshold_bytes, claim_check_ttl_seconds
+        )
         if max_completed_length is not None:
             if not isinstance(max_completed_length, int) or isinstance(max_completed_length, bool):
                 bool_hint = " (use True or False, not 1/0)" if isinstance(max_completed_length, bool) else ""
@@ -848,8 +1127,13 @@ class RedisMessageQueue:
             )
         if on_event is not None and not callable(on_event):
             raise TypeError(f"'on_event' must be callable, got {type(on_event).__name__}.")
+        if event_filter is not None and on_event is None:
+            raise ConfigurationError("'event_filter' requires 'on_event' to be set.")
         self._queue_name = name
         self._on_event = on_event
+        self._metrics = metrics
+        self._event_filter = event_filter
+        self._tracing = QueueTracing(name) if tracing else None
         # Queue-local soft-drain flag. See sync queue ``_draining`` docstring
         # (AA-05-F1/F2, AC-03). Distinct from the gateway-level ``interrupt``
         # handler; set via ``drain()`` instead of an
@@ -861,6 +1145,10 @@ class RedisMessageQueue:
         self._drain_lock = asyncio.Lock()
         self._cluster_validation_lock = asyncio.Lock()
         self._drain_result: bool | None = None
+        # Claims taken by process_message_callback()'s pipelined ack, with the
+        # monotonic time they were claimed; the next claim on this instance
+        # takes them first. drain() returns any left over to pending.
+        self._prefetched_claims: collections.deque[tuple[ClaimedMessage, float]] = collections.deque()
         self._deduplication = deduplication
         self._enable_completed_queue = enable_completed_queue
         self._enable_failed_queue = enable_failed_queue
@@ -872,6 +1160,8 @@ class RedisMessageQueue:
         self._strict_payload_types = strict_payload_types
         self._max_payload_bytes = max_payload_bytes
         self._max_payload_depth = max_payload_depth
+        self._claim_check_threshold_bytes = claim_check_threshold_bytes
+        self._claim_check_ttl_seconds = claim_check_ttl_seconds
         self._heartbeat_interval_seconds = None
         self._warned_no_lease_for_heartbeat = False
         self._requires_claimed_message = False
@@ -928,6 +1218,11 @@ class RedisMessageQueue:
                     "'max_pending_length' cannot be provided alongside 'gateway'."
                     " Configure publish backpressure on the gateway directly instead."
                 )
+            if track_round_trips:
+                raise ConfigurationError(
+                    "'track_round_trips' cannot be provided alongside 'gateway'."
+                    " Pass 'track_round_trips=True' to the gateway directly instead."
+                )
             _bind_dead_letter_gateway_to_queue(gateway, self.key.pending, self.key.processing)
             self._max_delivery_count = None
             self._redis = gateway
@@ -959,10 +1254,26 @@ class RedisMessageQueue:
                 max_pending_length=max_pending_length,
                 pending_overload_policy=pending_overload_policy,
                 pending_overload_block_timeout_seconds=pending_overload_block_timeout_seconds,
+                track_round_trips=track_round_trips,
             )
 
         if on_heartbeat_failure is not None and self._heartbeat_interval_seconds is None:
             raise ConfigurationError("'on_heartbeat_failure' requires 'heartbeat_interval_seconds' to be set.")
+        # Claim-check storage is a built-in gateway capability, duck-typed like
+        # the interruptible publish/claim paths so custom gateways stay unaffected.
+        self._supports_claim_check = callable(getattr(self._redis, "_load_claim_check_body", None))
+        if claim_check_threshold_bytes is not None and not self._supports_claim_check:
+            raise ConfigurationError(
+                "'claim_check_threshold_bytes' requires the built-in RedisGateway; "
+                f"{type(self._redis).__name__} does not store claim-check bodies."
+            )
+        if claim_check_threshold_bytes is not None and (
+            getattr(self._redis, "_pending_overload_policy", None) == "drop_oldest"
+        ):
+            raise ConfigurationError(
+                "'claim_check_threshold_bytes' cannot be used with 'pending_overload_policy=drop_oldest' "
+                "because evicted references would leave their bodies in Redis."
+            )
         self._on_heartbeat_failure = on_heartbeat_failure
         set_event_emitter = getattr(self._redis, "_set_event_emitter", None)
         if callable(set_event_emitter):
@@ -984,9 +1295,14 @@ class RedisMessageQueue:
         duration_ms: float | None = None,
         timeout_seconds: float | None = None,
         pending_claim_ids: int | None = None,
+        queue_wait_ms: float | None = None,
     ) -> None:
+        if self._metrics is not None:
+            self._metrics.record(self._queue_name, operation, outcome, duration_ms)
         if self._on_event is None:
             return
+        if self._event_filter is not None and not self._event_filter.allows(operation, outcome):
+            return
         event = QueueEvent(
             queue=self._queue_name,
             operation=EventOperation(operation),
@@ -1002,6 +1318,7 @@ class RedisMessageQueue:
             duration_ms=duration_ms,
             timeout_seconds=timeout_seconds,
             pending_claim_ids=pending_claim_ids,
+            queue_wait_ms=queue_wait_ms,
         )
         try:
             result = self._on_event(event)
@@ -1121,6 +1438,13 @@ class RedisMessageQueue:
         ``os.fsdecode``) raises ``ValueError`` before anything is enqueued,
         because it would fail every downstream decode after storage.
 
+        Bytes messages (protobuf, Avro, images, ...) are stored verbatim in a
+        compact binary envelope, with no base64 or hex expansion, and
+        consumers receive the exact bytes back. They require a client created
+        with ``decode_responses=False``; the built-in gateway raises
+        ``ConfigurationError`` otherwise. ``max_payload_bytes`` applies to
+        ``len(message)``.
+
         Deduplication and publish retry-safety markers are Redis TTL keys. A
         large forward step in Redis server expiration time during a retry
         window can expire those markers before the Python-side monotonic retry
@@ -1150,14 +1474,17 @@ class RedisMessageQueue:
                     duration_ms=_duration_ms(started_at),
                 )
                 raise drained_error
+            if self._tracing is not None:
+                with self._tracing.publish_span():
+                    return await self._publish_unlocked(message)
             return await self._publish_unlocked(message)
 
     async def _publish_unlocked(self, message: PublishPayload) -> bool:
         started_at = time.perf_counter()
         try:
             await self._ensure_plain_redis_client_is_not_cluster()
-            if not isinstance(message, (str, dict)):
-                raise TypeError(f"'message' must be a str or dict, got {type(message).__name__}")
+            if not isinstance(message, (str, bytes, dict)):
+                raise TypeError(f"'message' must be a str, bytes, or dict, got {type(message).__name__}")
             if isinstance(message, dict):
                 non_str_keys = _find_non_string_dict_keys(message)
                 if non_str_keys:
@@ -1168,14 +1495,22 @@ class RedisMessageQueue:
                 if self._strict_payload_types:
                     _validate_strict_payload_types(message)
                 validate_max_payload_depth(message, self._max_payload_depth)
-                message_str = serialize_dict_payload_with_limit(message, self._max_payload_bytes)
+                message_str: str | bytes = serialize_dict_payload_with_limit(message, self._max_payload_bytes)
+            elif isinstance(message, bytes):
+                validate_bytes_payload_size(message, self._max_payload_bytes)
+                message_str = message
             else:
                 validate_str_payload_utf8_encodable(message)
                 validate_str_payload_size(message, self._max_payload_bytes)
                 message_str = message
 
             if not self._deduplication:
-                result = await self._add_message(message_str)
+                message_str, body_key = await self._offload_claim_check_body(message_str)
+                try:
+                    result = await self._add_message(message_str)
+                except Exception as exc:
+                    await self._release_unpublished_claim_check_body(body_key, exc)
+                    raise
                 if result is not None:
                     raise GatewayContractError(
                         f"gateway.add_message() must return None, got {type(result).__name__}. "
@@ -1201,12 +1536,20 @@ class RedisMessageQueue:
                     raise
                 dedup_key = validate_callable_deduplication_key(dedup_key, message)
                 dedup_key = self.key.deduplication(dedup_key)
-                result = await self._publish_message(message_str, dedup_key)
+                message_str, body_key = await self._offload_claim_check_body(message_str)
+                try:
+                    result = await self._publish_message(message_str, dedup_key)
+                except Exception as exc:
+                    await self._release_unpublished_claim_check_body(body_key, exc)
+                    raise
                 if not isinstance(result, bool):
                     raise GatewayContractError(
                         f"gateway.publish_message() must return bool, got {type(result).__name__}. "
                         "See AbstractRedisGateway.publish_message for the full contract."
                     )
+                if not result and body_key is not None:
+                    # Duplicate: nothing references the body just written.
+                    await self._release_claim_check_body(body_key, retained=False)
         except Exception as exc:
             _set_exception_context(exc, queue=self._queue_name, operation="publish")
             await self._emit_event(
@@ -1228,8 +1571,17 @@ class RedisMessageQueue:
         )
         return result
 
-    @asynccontextmanager
-    async def process_message(self) -> AsyncIterator[Optional[ReceivedPayload]]:
+    @overload
+    def process_message(
+        self, *, lazy: Literal[False] = False
+    ) -> AbstractAsyncContextManager[Optional[ReceivedPayload]]: ...
+
+    @overload
+    def process_message(self, *, lazy: Literal[True]) -> AbstractAsyncContextManager[Optional[MessageHandle]]: ...
+
+    def process_message(  # type: ignore[misc]
+        self, *, lazy: bool = False
+    ) -> AbstractAsyncContextManager[Optional[ReceivedPayload | MessageHandle]]:
         """Claim and process one message.
 
         Yields ``str`` if your client uses ``decode_responses=True``, else
@@ -1270,8 +1622,34 @@ class RedisMessageQueue:
 
         See docs/configuration.md "Cancellation observability on the async
         failure path" for details and mitigations.
+
+        With ``lazy=True`` the block receives a ``MessageHandle`` instead of
+        the payload: ``message_id``, ``delivery_count``, and ``size`` are read
+        from the claim, and the payload is decoded (or, for a claim-checked
+        message, fetched from Redis) only when ``await handle.body()`` runs.
+        Handlers that route or drop messages on metadata alone skip that
+        work. A malformed envelope then surfaces from ``body()`` inside the
+        block, so the message is nacked instead of left in ``processing``.
         """
+        return self._process_message(lazy=lazy)
+
+    @asynccontextmanager
+    async def _process_message(
+        self,
+        *,
+        lazy: bool = False,
+        claim_next: bool = False,
+        attach_trace_context: bool = True,
+        shared_lease_heartbeat: _SharedLeaseHeartbeat | None = None,
+    ) -> AsyncIterator[Optional[ReceivedPayload | MessageHandle]]:
+        # ``claim_next`` lets the ack also claim the following message in the
+        # same round trip. ``attach_trace_context=False`` is for runners that
+        # settle the message in another task (serve()), where the consumer
+        # span cannot be made current. ``shared_lease_heartbeat`` renews the
+        # lease with the runner's other in-flight messages instead of on a
+        # heartbeat task of its own.
         claim_started_at = time.perf_counter()
+        claim_started_ns = time.time_ns()
         if self._draining:
             await self._emit_event("claim_empty", "skipped", duration_ms=_duration_ms(claim_started_at))
             # Yield to the event loop before returning ``None``. When ``on_event``
@@ -1294,11 +1672,12 @@ class RedisMessageQueue:
                         "See AbstractRedisGateway.wait_for_message_and_move for the full contract."
                     )
 
-                stored_message = claimed_message
                 lease_token = None
                 if isinstance(claimed_message, ClaimedMessage):
                     stored_message = claimed_message.stored_message
                     lease_token = claimed_message.lease_token
+                else:
+                    stored_message = claimed_message
                 lease_token_hash = _hash_lease_token(lease_token)
 
                 if lease_token is None and self._heartbeat_interval_seconds is not None:
@@ -1334,16 +1713,28 @@ class RedisMessageQueue:
             return
 
         message_id = None
+        message: ReceivedPayload | MessageHandle
         try:
-            message_id = extract_stored_message_id(
-                stored_message,
-                strict_envelope_decoding=self._strict_envelope_decoding,
-            )
-            message = decode_stored_message(
-                stored_message,
-                strict_envelope_decoding=self._strict_envelope_decoding,
-            )
-        except MalformedStoredMessageError as exc:
+            if lazy:
+                if isinstance(claimed_message, ClaimedMessage):
+                    message_id, body_key, message = self._new_message_handle(
+                        claimed_message.stored_message, claimed_message.delivery_count
+                    )
+                else:
+                    message_id, body_key, message = self._new_message_handle(claimed_message, None)
+            else:
+                message_id = extract_stored_message_id(
+                    stored_message,
+                    strict_envelope_decoding=self._strict_envelope_decoding,
+                )
+                message = decode_stored_message(
+                    stored_message,
+                    strict_envelope_decoding=self._strict_envelope_decoding,
+                )
+                body_key = self._claim_check_body_key(message)
+                if body_key is not None:
+                    message = await self._load_claim_check_body(body_key)
+        except Exception as exc:
             _set_exception_context(exc, queue=self._queue_name, message_id=message_id, operation="claim")
             await self._emit_event(
                 "claim",
@@ -1360,10 +1751,26 @@ class RedisMessageQueue:
             "success",
             message_id=message_id,
             lease_token_hash=lease_token_hash,
+            delivery_count=claimed_message.delivery_count if isinstance(claimed_message, ClaimedMessage) else None,
             duration_ms=_duration_ms(claim_started_at),
+            queue_wait_ms=message_age_ms(message_id),
         )
 
-        lease_heartbeat = self._build_lease_heartbeat(stored_message, lease_token, message_id, lease_token_hash)
+        lease_heartbeat: _LeaseHeartbeat | _SharedLease | None
+        if shared_lease_heartbeat is not None:
+            lease_heartbeat = shared_lease_heartbeat.lease(stored_message, lease_token, message_id, lease_token_hash)
+        else:
+            lease_heartbeat = self._build_lease_heartbeat(stored_message, lease_token, message_id, lease_token_hash)
+        consumer_span = None
+        if self._tracing is not None:
+            consumer_span = self._tracing.start_consumer_span(
+                cast(ReceivedPayload, stored_message),
+                message_id=message_id,
+                delivery_count=claimed_message.delivery_count if isinstance(claimed_message, ClaimedMessage) else None,
+                claim_started_ns=claim_started_ns,
+                attach=attach_trace_context,
+            )
+        span_outcome = "abandoned"
         finished_without_error = False
         processing_started_at = time.perf_counter()
         heartbeat_start_failed = False
@@ -1383,13 +1790,16 @@ class RedisMessageQueue:
                     # matching the fatal-signal path.
                     heartbeat_start_failed = True
                     raise
-            yield message  # type: ignore
+            yield message
         except BaseException as exc:
             skip_cleanup = heartbeat_start_failed or _should_skip_message_cleanup(exc)
             if lease_heartbeat is not None:
                 lease_heartbeat.suppress_failure_callback()
+            if consumer_span is not None:
+                consumer_span.handler_finished(exc)
             if skip_cleanup:
                 raise
+            span_outcome = "nack"
             await self._emit_event(
                 "failed",
                 "failure",
@@ -1415,6 +1825,8 @@ class RedisMessageQueue:
                 # The Redis cleanup committed here; an exception in the emits
                 # below must not be misreported as a cleanup failure.
                 cleanup_op_succeeded = True
+                if applied:
+                    await self._release_claim_check_body(body_key, retained=self._enable_failed_queue)
                 await self._emit_event(
                     "nack",
                     "success" if applied else "skipped",
@@ -1475,14 +1887,19 @@ class RedisMessageQueue:
         else:
             if lease_heartbeat is not None:
                 lease_heartbeat.suppress_failure_callback()
+            if consumer_span is not None:
+                consumer_span.handler_finished()
             cleanup_started_at = time.perf_counter()
-            if self._enable_completed_queue:
+            if claim_next and lease_token is not None and self._supports_ack_and_claim_next:
+                cleanup_operation = self._ack_and_claim_next(stored_message, lease_token)
+            elif self._enable_completed_queue:
                 cleanup_operation = self._move_processed_message(self.key.completed, stored_message, lease_token)
             else:
                 cleanup_operation = self._remove_processed_message(stored_message, lease_token)
             try:
                 applied = await _await_preserving_cancellation(cleanup_operation)
             except Exception as cleanup_exc:
+                span_outcome = "cleanup_failed"
                 _set_exception_context(
                     cleanup_exc,
                     queue=self._queue_name,
@@ -1504,6 +1921,9 @@ class RedisMessageQueue:
                     message_id=message_id,
                     operation="cleanup",
                 ) from cleanup_exc
+            span_outcome = "ack" if applied else "stale_lease"
+            if applied:
+                await self._release_claim_check_body(body_key, retained=self._enable_completed_queue)
             if self._enable_completed_queue:
                 await self._emit_event(
                     "completed",
@@ -1531,6 +1951,8 @@ class RedisMessageQueue:
                 _warn_runtime_warning(_STALE_LEASE_ACK_WARNING, stacklevel=2)
             finished_without_error = True
         finally:
+            if consumer_span is not None:
+                consumer_span.end(span_outcome)
             if lease_heartbeat is not None:
                 if finished_without_error:
                     await _await_preserving_cancellation(lease_heartbeat.stop())
@@ -1542,6 +1964,8 @@ class RedisMessageQueue:
     async def process_message_callback(
         self,
         handler: Callable[[ReceivedPayload], Awaitable[None] | None],
+        *,
+        prefetch_next: bool = False,
     ) -> bool:
         """Claim one message and invoke ``handler(message)``.
 
@@ -1552,8 +1976,16 @@ class RedisMessageQueue:
         Returns ``True`` when a message was claimed, the handler was called,
         and the message was acked. Returns ``False`` when no message was
         available.
+
+        With ``prefetch_next=True`` (visibility-timeout queues on the built-in
+        gateway), the ack is pipelined with the claim of the next message,
+        which the next call handles without another round trip. Pass it only
+        from a loop that keeps calling and awaits ``drain()`` before it exits:
+        the prefetched message stays leased until then.
         """
-        async with self.process_message() as message:
+        async with cast(
+            AbstractAsyncContextManager[Optional[ReceivedPayload]], self._process_message(claim_next=prefetch_next)
+        ) as message:
             if message is None:
                 return False
             result = handler(message)
@@ -1561,7 +1993,222 @@ class RedisMessageQueue:
                 await result
         return True
 
-    async def _publish_message(self, message_str: str, dedup_key: str) -> bool:
+    async def serve(
+        self,
+        handler: Callable[[ReceivedPayload], Awaitable[None] | None],
+        *,
+        max_in_flight: int = 1,
+    ) -> None:
+        """Run ``handler`` on up to ``max_in_flight`` messages at once until drained.
+
+        A single claim loop feeds handler tasks, so 500 concurrent I/O-bound
+        handlers cost one polling claimer instead of 500. A new message is
+        claimed only while fewer than ``max_in_flight`` handlers are running,
+        so nothing is claimed ahead of a free slot. Each message keeps the
+        ``process_message_callback()`` contract: sync or async handlers, a
+        normal return acks, an exception is terminal (nack). Handler
+        exceptions are logged and do not stop ``serve()``. With
+        ``heartbeat_interval_seconds`` set, one renewal task renews every
+        in-flight lease per interval in a single pipelined round trip.
+
+        Returns once ``drain()`` is called (or the queue's ``interrupt``
+        fires), after the handlers already running finish; call it as
+        ``await queue.drain()`` from another task. Cancelling ``serve()``
+        cancels the running handlers and leaves their messages in
+        ``processing`` for visibility-timeout reclaim, like cancelling a task
+        inside ``process_message()``. A claim that fails with
+        ``MalformedStoredMessageError`` is logged and skipped; any other claim
+        error ends ``serve()`` after the running handlers finish.
+        """
+        if not callable(handler):
+            raise TypeError(f"'handler' must be callable, got {type(handler).__name__}")
+        if not isinstance(max_in_flight, int) or isinstance(max_in_flight, bool):
+            raise TypeError(f"'max_in_flight' must be an int, got {type(max_in_flight).__name__}")
+        if max_in_flight <= 0:
+            raise ConfigurationError(f"'max_in_flight' must be a positive integer, got {max_in_flight}")
+        slots = asyncio.Semaphore(max_in_flight)
+        in_flight: set[asyncio.Task[None]] = set()
+
+        def collect(task: asyncio.Task[None]) -> None:
+            # Retrieve the result before letting go of the task, so a failure
+            # is logged here instead of as "Task exception was never retrieved".
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("A serve() handler task failed", exc_info=task.exception())
+            in_flight.discard(task)
+
+        shared_lease_heartbeat = self._build_shared_lease_heartbeat()
+        if shared_lease_heartbeat is not None:
+            shared_lease_heartbeat.start()
+        try:
+            while not self._serve_should_stop():
+                await slots.acquire()
+                try:
+                    claimed = await self._serve_claim(shared_lease_heartbeat)
+                except BaseException:
+                    slots.release()
+                    raise
+                if claimed is None:
+                    slots.release()
+                    continue
+                task = asyncio.create_task(self._serve_message(*claimed, handler, slots))
+                in_flight.add(task)
+                task.add_done_callback(collect)
+        except asyncio.CancelledError:
+            for task in in_flight:
+                task.cancel()
+            raise
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            if shared_lease_heartbeat is not None:
+                await shared_lease_heartbeat.stop()
+
+    def _serve_should_stop(self) -> bool:
+        if self._draining:
+            return True
+        # The built-in gateway already cuts claim waits short on the queue's
+        # ``interrupt``; stop claiming too instead of spinning on empty polls.
+        queue_interrupt = getattr(self._redis, "_interrupt", None)
+        return isinstance(queue_interrupt, BaseGracefulInterruptHandler) and queue_interrupt.is_interrupted()
+
+    async def _serve_claim(
+        self, shared_lease_heartbeat: _SharedLeaseHeartbeat | None
+    ) -> tuple[AbstractAsyncContextManager[Optional[ReceivedPayload]], ReceivedPayload] | None:
+        # The context is entered here and exited by the handler task; the
+        # generator behind it is never resumed by two tasks at once.
+        context = cast(
+            AbstractAsyncContextManager[Optional[ReceivedPayload]],
+            self._process_message(attach_trace_context=False, shared_lease_heartbeat=shared_lease_heartbeat),
+        )
+        try:
+            message = await context.__aenter__()
+        except MalformedStoredMessageError:
+            logger.warning("Skipping a message whose envelope could not be decoded", exc_info=True)
+            return None
+        if message is None:
+            await context.__aexit__(None, None, None)
+            return None
+        return context, message
+
+    async def _serve_message(
+        self,
+        context: AbstractAsyncContextManager[Optional[ReceivedPayload]],
+        message: ReceivedPayload,
+        handler: Callable[[ReceivedPayload], Awaitable[None] | None],
+        slots: asyncio.Semaphore,
+    ) -> None:
+        try:
+            try:
+                result = handler(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                # process_message() nacks and re-raises the handler error;
+                # serve() keeps running.
+                await context.__aexit__(type(exc), exc, exc.__traceback__)
+                logger.exception("Message handler raised; the message was not acked")
+                return
+            except BaseException as exc:
+                await context.__aexit__(type(exc), exc, exc.__traceback__)
+                raise
+            try:
+                await context.__aexit__(None, None, None)
+            except Exception:
+                logger.exception("Ack after successful handling failed")
+        finally:
+            slots.release()
+
+    async def _offload_claim_check_body(self, message_str: str | bytes) -> tuple[str | bytes, str | None]:
+        threshold = self._claim_check_threshold_bytes
+        body_size = None if threshold is None else claim_check_body_size(message_str, threshold)
+        if body_size is None:
+            return message_str, None
+        reference_id, reference = new_claim_check_reference(body_size)
+        body_key = self.key.claim_check(reference_id)
+        # Body first, so no consumer can claim a reference without its body.
+        # If the enqueue below fails ambiguously the body is kept: deleting it
+        # could strand a message that did land in pending.
+        await self._redis._store_claim_check_body(body_key, message_str)  # type: ignore[attr-defined]
+        return reference, body_key
+
+    def _new_message_handle(
+        self, stored_message: ReceivedPayload, delivery_count: int | None
+    ) -> tuple[str | None, str | None, MessageHandle]:
+        # A malformed envelope is reported by body() inside the handler block
+        # (and nacked) rather than here at claim time.
+        strict = self._strict_envelope_decoding
+        message_id = None
+        reference = None
+        try:
+            message_id = read_stored_message_id(stored_message)
+            if self._supports_claim_check:
+                reference = read_stored_claim_check_reference(stored_message)
+        except MalformedStoredMessageError:
+            pass
+        if reference is not None:
+            body_key = self.key.claim_check(reference[0])
+            return (
+                message_id,
+                body_key,
+                MessageHandle(
+                    message_id=message_id,
+                    delivery_count=delivery_count,
+                    size=reference[1],
+                    load_body=lambda: self._load_claim_check_body(body_key),
+                ),
+            )
+
+        async def decode_body() -> ReceivedPayload:
+            return decode_stored_message(stored_message, strict_envelope_decoding=strict)
+
+        return (
+            message_id,
+            None,
+            MessageHandle(
+                message_id=message_id,
+                delivery_count=delivery_count,
+                size=len(stored_message),
+                load_body=decode_body,
+            ),
+        )
+
+    def _claim_check_body_key(self, payload: ReceivedPayload) -> str | None:
+        if not self._supports_claim_check:
+            return None
+        reference = parse_claim_check_reference(payload)
+        return None if reference is None else self.key.claim_check(reference[0])
+
+    async def _load_claim_check_body(self, body_key: str) -> ReceivedPayload:
+        body = await self._redis._load_claim_check_body(body_key)  # type: ignore[attr-defined]
+        if body is None:
+            raise missing_claim_check_body_error(body_key)
+        return body
+
+    async def _release_unpublished_claim_check_body(self, body_key: str | None, exc: Exception) -> None:
+        # Library errors that are not Redis errors (backpressure, a drain
+        # refusal, an oversized envelope) are raised before anything is
+        # enqueued, so nothing can reference the body. Redis errors are
+        # ambiguous and keep it.
+        if isinstance(exc, RedisMessageQueueError) and not isinstance(exc, redis.exceptions.RedisError):
+            await self._release_claim_check_body(body_key, retained=False)
+
+    async def _release_claim_check_body(self, body_key: str | None, *, retained: bool) -> None:
+        # Best-effort: the message outcome is already committed, so a failure
+        # here only leaves the body behind (bounded by claim_check_ttl_seconds
+        # for retained bodies) and must not turn a completed ack into an error.
+        if body_key is None:
+            return
+        try:
+            if not retained:
+                await self._redis._delete_claim_check_body(body_key)  # type: ignore[attr-defined]
+            elif self._claim_check_ttl_seconds is not None:
+                await self._redis._expire_claim_check_body(  # type: ignore[attr-defined]
+                    body_key, self._claim_check_ttl_seconds
+                )
+        except Exception:
+            logger.warning("Failed to release claim-check body %s", body_key, exc_info=True)
+
+    async def _publish_message(self, message_str: str | bytes, dedup_key: str) -> bool:
         # Use the gateway's private interruptible publish when available so a
         # block-policy capacity wait aborts on drain even without a configured
         # GracefulInterruptHandler. Duck-typed exactly like
@@ -1574,9 +2221,11 @@ class RedisMessageQueue:
                 dedup_key,
                 is_interrupted=_DrainInterrupt(lambda: self._draining),
             )
+        if isinstance(message_str, bytes):
+            raise TypeError(BYTES_PAYLOAD_REQUIRES_BUILTIN_GATEWAY_MESSAGE)
         return await self._redis.publish_message(self.key.pending, message_str, dedup_key)
 
-    async def _add_message(self, message_str: str) -> None:
+    async def _add_message(self, message_str: str | bytes) -> None:
         interruptible_add = getattr(self._redis, "_add_message_interruptible", None)
         if callable(interruptible_add):
             return await interruptible_add(
@@ -1584,9 +2233,14 @@ class RedisMessageQueue:
                 message_str,
                 is_interrupted=_DrainInterrupt(lambda: self._draining),
             )
+        if isinstance(message_str, bytes):
+            raise TypeError(BYTES_PAYLOAD_REQUIRES_BUILTIN_GATEWAY_MESSAGE)
         return await self._redis.add_message(self.key.pending, message_str)
 
     async def _wait_for_message_and_move(self) -> ClaimedMessage | ReceivedPayload | None:
+        prefetched_claim = await self._take_prefetched_claim()
+        if prefetched_claim is not None:
+            return prefetched_claim
         interruptible_wait = getattr(self._redis, "_wait_for_message_and_move_interruptible", None)
         if callable(interruptible_wait):
             return await interruptible_wait(
@@ -1599,6 +2253,86 @@ class RedisMessageQueue:
             self.key.processing,
         )
 
+    @property
+    def _supports_ack_and_claim_next(self) -> bool:
+        return hasattr(self._redis, "_ack_and_claim_next")
+
+    async def _ack_and_claim_next(self, stored_message: ReceivedPayload, lease_token: str) -> bool:
+        destination_queue = self.key.completed if self._enable_completed_queue else None
+        if self._draining:
+            if destination_queue is not None:
+                return await self._move_processed_message(destination_queue, stored_message, lease_token)
+            return await self._remove_processed_message(stored_message, lease_token)
+        applied, next_claim = await self._redis._ack_and_claim_next(  # type: ignore[attr-defined]
+            self.key.processing,
+            stored_message,
+            lease_token,
+            pending_queue=self.key.pending,
+            to_queue=destination_queue,
+        )
+        if next_claim is not None:
+            self._prefetched_claims.append((next_claim, time.monotonic()))
+            if self._draining:
+                # drain() started while the pipeline was in flight and may
+                # already have swept the buffer.
+                await self._release_prefetched_claims()
+        if applied and destination_queue is not None:
+            await self._trim_if_needed(destination_queue)
+        return applied
+
+    async def _take_prefetched_claim(self) -> ClaimedMessage | None:
+        visibility_timeout_seconds = self._redis.message_visibility_timeout_seconds
+        while True:
+            try:
+                claim, claimed_at = self._prefetched_claims.popleft()
+            except IndexError:
+                return None
+            if (
+                visibility_timeout_seconds is None
+                or time.monotonic() - claimed_at < visibility_timeout_seconds * PREFETCHED_CLAIM_MAX_LEASE_FRACTION
+            ):
+                return claim
+            # Too little of the lease is left to hand the claim to a handler
+            # (or it already ran out and another consumer may own it).
+            await self._release_prefetched_claim(claim)
+
+    async def _release_prefetched_claims(self) -> None:
+        while True:
+            try:
+                claim, _ = self._prefetched_claims.pop()
+            except IndexError:
+                return
+            await self._release_prefetched_claim(claim)
+
+    async def _release_prefetched_claim(self, claim: ClaimedMessage) -> None:
+        started_at = time.perf_counter()
+        lease_token_hash = _hash_lease_token(claim.lease_token)
+        try:
+            applied = await self._redis._return_claimed_message_to_pending(  # type: ignore[attr-defined]
+                self.key.processing, claim.stored_message, claim.lease_token
+            )
+        except Exception as exc:
+            logger.warning(
+                "Failed to return a prefetched message to pending; it is reclaimed when its lease expires",
+                exc_info=True,
+            )
+            await self._emit_event(
+                "release",
+                "failure",
+                lease_token_hash=lease_token_hash,
+                exception_type=type(exc).__name__,
+                error=exc,
+                duration_ms=_duration_ms(started_at),
+            )
+            return
+        await self._emit_event(
+            "release",
+            "success" if applied else "skipped",
+            lease_token_hash=lease_token_hash,
+            destination_queue=self.key.pending,
+            duration_ms=_duration_ms(started_at),
+        )
+
     async def _move_processed_message(
         self,
         destination_queue: str,
@@ -1634,7 +2368,13 @@ class RedisMessageQueue:
             max_length = self._max_failed_length
         if max_length is not None:
             try:
-                await self._redis.trim_queue(destination_queue, max_length)
+                if self._supports_claim_check:
+                    # Entries dropped from the log take their claim-check bodies with them.
+                    await self._redis._trim_queue_with_claim_checks(  # type: ignore[attr-defined]
+                        destination_queue, max_length, self.key.claim_check_prefix
+                    )
+                else:
+                    await self._redis.trim_queue(destination_queue, max_length)
             except Exception as exc:
                 logger.warning("Failed to trim queue %s", destination_queue, exc_info=True)
                 await self._emit_event(
@@ -1754,6 +2494,7 @@ class RedisMessageQueue:
                 timeout_seconds=timeout_seconds,
                 pending_claim_ids=self._pending_claim_ids_count(),
             )
+            await self._release_prefetched_claims()
             drainer = getattr(self._redis, "_drain_pending_claim_ids", None)
             if drainer is None:
                 if cleanup_lease_counter is not None:
@@ -1831,6 +2572,32 @@ class RedisMessageQueue:
         """
         return self._drained
 
+    def round_trip_stats(self, *, reset: bool = False) -> dict[str, RoundTripStats]:
+        """Return Redis round trips, bytes, and latency per gateway operation.
+
+        Totals accumulate from construction (or the last ``reset=True``) on
+        this queue's gateway, so queues sharing a gateway share the totals.
+        See ``RedisGateway.round_trip_stats`` for the operation names. Requires
+        ``track_round_trips=True`` on the queue or the gateway
+        (``ConfigurationError`` otherwise).
+        """
+        round_trip_stats = getattr(self._redis, "round_trip_stats", None)
+        if not callable(round_trip_stats):
+            raise ConfigurationError(
+                "round_trip_stats() requires the built-in RedisGateway; "
+                f"{type(self._redis).__name__} does not track round trips."
+            )
+        return round_trip_stats(reset=reset)
+
+    def _stats_keys(self) -> QueueStatsKeys:
+        return QueueStatsKeys(
+            pending=self.key.pending,
+            processing=self.key.processing,
+            completed=self.key.completed if self._enable_completed_queue else None,
+            failed=self.key.failed if self._enable_failed_queue else None,
+            dead_letter=self._redis.dead_letter_queue,
+        )
+
     async def stats(self) -> QueueStats:
         """Return a snapshot of this queue's Redis list depths.
 
@@ -1838,27 +2605,40 @@ class RedisMessageQueue:
         ``failed``, and ``dead_letter`` are ``None`` when that feature is
         disabled for this queue (``enable_completed_queue=False``,
         ``enable_failed_queue=False``, or no dead-letter routing) and an integer
-        depth otherwise. Each depth is a separate ``LLEN``, so the result is a
-        best-effort snapshot rather than a single point-in-time-consistent view.
+        depth otherwise. ``oldest_pending_age_ms`` is the wait so far of the
+        next message to be claimed, or ``None`` when ``pending`` is empty or
+        holds a legacy id.
+
+        The built-in gateway reads everything, plus the ``leases`` and
+        ``expired_leases`` counts, in one atomic Lua script. A custom gateway
+        without ``queue_stats_snapshots`` gets one ``LLEN`` per list, so the
+        result is a best-effort snapshot and the lease counts are ``None``.
+        Use ``collect_stats()`` to snapshot many queues in one round trip.
         """
         await self._ensure_plain_redis_client_is_not_cluster()
+        keys = self._stats_keys()
+        queue_stats_snapshots = getattr(self._redis, "queue_stats_snapshots", None)
+        if queue_stats_snapshots is not None:
+            (snapshot,) = await queue_stats_snapshots([keys])
+            return cast(QueueStats, snapshot)
         queue_length = self._gateway_operator_method("queue_length")
-        completed = None
-        if self._enable_completed_queue:
-            completed = self._require_int_return(await queue_length(self.key.completed), "queue_length")
-        failed = None
-        if self._enable_failed_queue:
-            failed = self._require_int_return(await queue_length(self.key.failed), "queue_length")
-        dead_letter = None
-        dead_letter_key = self._redis.dead_letter_queue
-        if dead_letter_key is not None:
-            dead_letter = self._require_int_return(await queue_length(dead_letter_key), "queue_length")
+        depths = {}
+        for field, key in keys._asdict().items():
+            if key is not None:
+                depths[field] = self._require_int_return(await queue_length(key), "queue_length")
+        oldest_pending_age_ms = None
+        oldest_message_id = getattr(self._redis, "oldest_message_id", None)
+        if oldest_message_id is not None:
+            message_id = await oldest_message_id(keys.pending)
+            if isinstance(message_id, str):
+                oldest_pending_age_ms = message_age_ms(message_id)
         return QueueStats(
-            pending=self._require_int_return(await queue_length(self.key.pending), "queue_length"),
-            processing=self._require_int_return(await queue_length(self.key.processing), "queue_length"),
-            completed=completed,
-            failed=failed,
-            dead_letter=dead_letter,
+            pending=depths["pending"],
+            processing=depths["processing"],
+            completed=depths.get("completed"),
+            failed=depths.get("failed"),
+            dead_letter=depths.get("dead_letter"),
+            oldest_pending_age_ms=oldest_pending_age_ms,
         )
 
     async def peek(self, count: int = 1, *, source: str = "pending") -> list[ReceivedPayload]:
@@ -1887,19 +2667,94 @@ class RedisMessageQueue:
                 f"gateway.peek_messages() must return a list, got {type(raw_messages).__name__}."
             )
         decode_envelope = source in _PEEK_ENVELOPE_SOURCES
-        results: list[ReceivedPayload] = []
-        for message in raw_messages:
-            if not isinstance(message, (str, bytes)):
+        return [
+            await self._operator_payload(message, decode_envelope=decode_envelope, method="peek_messages")
+            for message in raw_messages
+        ]
+
+    async def _operator_payload(self, message: object, *, decode_envelope: bool, method: str) -> ReceivedPayload:
+        if not isinstance(message, (str, bytes)):
+            raise GatewayContractError(
+                f"gateway.{method}() must return list[str | bytes], got {type(message).__name__}."
+            )
+        if decode_envelope:
+            message = decode_stored_message(message, strict_envelope_decoding=False)
+        body_key = self._claim_check_body_key(message)
+        if body_key is not None:
+            body = await self._redis._load_claim_check_body(body_key)  # type: ignore[attr-defined]
+            if body is not None:
+                message = body
+        return cast(ReceivedPayload, message)
+
+    def iter_messages(
+        self,
+        source: str = "pending",
+        *,
+        batch_size: int = _DEFAULT_ITER_BATCH_SIZE,
+        predicate: Callable[[ReceivedPayload], bool] | None = None,
+    ) -> AsyncIterator[ReceivedPayload]:
+        """Stream every message in ``source``, oldest first, with bounded memory.
+
+        Async counterpart of the sync ``iter_messages()``; iterate with
+        ``async for``. Arguments are validated on the call; Redis is read
+        ``batch_size`` entries at a time as the iteration advances.
+        """
+        decode_envelope = self._validate_iter_messages(source, batch_size, predicate)
+        key = self._resolve_queue_key(source)
+        queue_length = self._gateway_operator_method("queue_length")
+        range_messages = self._gateway_operator_method("range_messages")
+        return self._iter_messages(key, queue_length, range_messages, batch_size, decode_envelope, predicate)
+
+    async def _iter_messages(
+        self,
+        key: str,
+        queue_length: Callable[..., Awaitable[object]],
+        range_messages: Callable[..., Awaitable[object]],
+        batch_size: int,
+        decode_envelope: bool,
+        predicate: Callable[[ReceivedPayload], bool] | None,
+    ) -> AsyncIterator[ReceivedPayload]:
+        await self._ensure_plain_redis_client_is_not_cluster()
+        length = self._require_int_return(await queue_length(key), "queue_length")
+        offset = 0
+        while offset < length:
+            window = min(batch_size, length - offset)
+            raw_messages = await range_messages(key, -(offset + window), -(offset + 1))
+            if not isinstance(raw_messages, list):
                 raise GatewayContractError(
-                    f"gateway.peek_messages() must return list[str | bytes], got {type(message).__name__}."
+                    f"gateway.range_messages() must return a list, got {type(raw_messages).__name__}."
                 )
-            if decode_envelope:
-                results.append(decode_stored_message(message, strict_envelope_decoding=False))
-            else:
-                results.append(message)
-        return results
+            offset += len(raw_messages)
+            for message in reversed(raw_messages):
+                payload = await self._operator_payload(
+                    message, decode_envelope=decode_envelope, method="range_messages"
+                )
+                if predicate is None or predicate(payload):
+                    yield payload
+            if len(raw_messages) < window:
+                return
+
+    def _validate_iter_messages(
+        self, source: str, batch_size: int, predicate: Callable[[ReceivedPayload], bool] | None
+    ) -> bool:
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int):
+            raise TypeError(f"'batch_size' must be an int, got {type(batch_size).__name__}")
+        if batch_size < 1:
+            raise ConfigurationError(f"'batch_size' must be >= 1, got {batch_size}")
+        if predicate is not None and not callable(predicate):
+            raise TypeError(f"'predicate' must be callable, got {type(predicate).__name__}")
+        if source not in _PEEK_SOURCES:
+            raise ConfigurationError(f"'source' must be one of {_PEEK_SOURCES}, got {source!r}")
+        return source in _PEEK_ENVELOPE_SOURCES
 
-    async def redrive_dead_letters(self, max_messages: int | None = None) -> int:
+    async def redrive_dead_letters(
+        self,
+        max_messages: int | None = None,
+        *,
+        predicate: Callable[[ReceivedPayload], bool] | None = None,
+        max_per_second: float | None = None,
+        script_budget_seconds: float = DEFAULT_REDRIVE_SCRIPT_BUDGET_SECONDS,
+    ) -> int:
         """Move dead-lettered messages back to pending and return how many moved.
 
         Requires a configured dead-letter queue (``ConfigurationError``
@@ -1910,6 +2765,27 @@ class RedisMessageQueue:
         ``max_delivery_count`` times again instead of being dead-lettered on its
         next claim. Oldest dead-letter entries are moved first.
 
+        ``predicate`` redrives selectively: it is called with each dead-letter
+        payload (as ``peek(source="dead_letter")`` would return it) and only
+        matching messages move. The dead-letter queue is scanned from its
+        oldest entry in batches of 100; matches are removed by position and
+        moved atomically, and non-matches stay where they are, in order. Each
+        script call moves at most one batch and walks the list about once per
+        match to the scan depth, so it slows as the scan reaches deep into a
+        list of mostly non-matches.
+        ``max_messages`` then caps the number of matches moved. The scan covers
+        the length seen when it starts, and messages moved before a
+        ``predicate`` exception stay moved.
+
+        ``max_per_second`` throttles the redrive so consumers are not flooded:
+        batches shrink to about one second's worth and the call sleeps between
+        them, so a large redrive takes correspondingly long to return.
+
+        Without a predicate, batches are sized from the measured cost of the
+        previous ones so each Lua call runs for about ``script_budget_seconds``
+        (10 ms by default), and several batches share a round trip; envelope
+        ids are derived inside the script rather than sent per message.
+
         Redrive intentionally bypasses ``max_pending_length``: it is an
         operator-invoked recovery tool, and a redrive that stopped partway
         through because pending was "full" would leave the rest of the
@@ -1919,11 +2795,7 @@ class RedisMessageQueue:
         ``QueueBackpressureError`` or block-timeouts. Check ``stats().pending``
         before redriving into a queue whose publishers depend on the cap.
         """
-        if max_messages is not None:
-            if isinstance(max_messages, bool) or not isinstance(max_messages, int):
-                raise TypeError(f"'max_messages' must be an int or None, got {type(max_messages).__name__}")
-            if max_messages < 1:
-                raise ConfigurationError(f"'max_messages' must be >= 1 when provided, got {max_messages}")
+        validate_redrive_arguments(max_messages, predicate, max_per_second, script_budget_seconds)
         dead_letter_key = self._redis.dead_letter_queue
         if dead_letter_key is None:
             raise ConfigurationError(
@@ -1931,12 +2803,46 @@ class RedisMessageQueue:
                 "(set 'max_delivery_count' on the 'client=' path, or 'dead_letter_queue' on the gateway)."
             )
         await self._ensure_plain_redis_client_is_not_cluster()
+        pacer = RedrivePacer(max_per_second)
+        if predicate is not None:
+            return await self._redrive_selected(dead_letter_key, predicate, max_messages, pacer)
+        redrive_message_batches = getattr(self._redis, "redrive_message_batches", None)
+        if redrive_message_batches is None:
+            return await self._redrive_fixed_batches(dead_letter_key, max_messages, pacer)
+        sizer = RedriveBatchSizer(script_budget_seconds)
+        moved_total = 0
+        remaining = max_messages
+        while remaining is None or remaining > 0:
+            await asyncio.sleep(pacer.delay(moved_total))
+            sizes = sizer.plan(pacer.limit(remaining))
+            started = time.perf_counter()
+            counts = await redrive_message_batches(dead_letter_key, self.key.pending, sizes)
+            if not isinstance(counts, list) or len(counts) != len(sizes):
+                raise GatewayContractError(
+                    "gateway.redrive_message_batches() must return one int per batch, "
+                    f"got {counts!r} for {len(sizes)} batches."
+                )
+            moved = sum(self._require_int_return(count, "redrive_message_batches") for count in counts)
+            sizer.record(moved, time.perf_counter() - started)
+            moved_total += moved
+            if remaining is not None:
+                remaining -= moved
+            if moved < sum(sizes):
+                break
+        return moved_total
+
+    async def _redrive_fixed_batches(self, dead_letter_key: str, max_messages: int | None, pacer: RedrivePacer) -> int:
+        # Custom gateways without redrive_message_batches(): one fixed-size
+        # batch per round trip, with Python-generated envelope ids.
         redrive_messages = self._gateway_operator_method("redrive_messages")
         moved_total = 0
         remaining = max_messages
         while remaining is None or remaining > 0:
-            chunk = _REDRIVE_BATCH_SIZE if remaining is None else min(_REDRIVE_BATCH_SIZE, remaining)
-            envelope_ids = [uuid.uuid4().hex for _ in range(chunk)]
+            await asyncio.sleep(pacer.delay(moved_total))
+            chunk = pacer.batch_size(_REDRIVE_BATCH_SIZE)
+            if remaining is not None:
+                chunk = min(chunk, remaining)
+            envelope_ids = [new_message_id() for _ in range(chunk)]
             moved = self._require_int_return(
                 await redrive_messages(dead_letter_key, self.key.pending, envelope_ids),
                 "redrive_messages",
@@ -1948,7 +2854,73 @@ class RedisMessageQueue:
                 break
         return moved_total
 
-    async def purge(self, *, target: str) -> int:
+    async def _redrive_selected(
+        self,
+        dead_letter_key: str,
+        predicate: Callable[[ReceivedPayload], bool],
+        max_messages: int | None,
+        pacer: RedrivePacer,
+    ) -> int:
+        queue_length = self._gateway_operator_method("queue_length")
+        range_messages = self._gateway_operator_method("range_messages")
+        redrive_selected_messages = self._gateway_operator_method("redrive_selected_messages")
+        length = self._require_int_return(await queue_length(dead_letter_key), "queue_length")
+        scanned = 0
+        # Non-matches stay in the list, so they alone push the tail-relative
+        # window back; moved matches close up behind it.
+        kept = 0
+        moved_total = 0
+        while scanned < length and (max_messages is None or moved_total < max_messages):
+            window = min(_REDRIVE_BATCH_SIZE, length - scanned)
+            raw_messages = await range_messages(dead_letter_key, -(kept + window), -(kept + 1))
+            if not isinstance(raw_messages, list):
+                raise GatewayContractError(
+                    f"gateway.range_messages() must return a list, got {type(raw_messages).__name__}."
+                )
+            scanned += len(raw_messages)
+            matches: list[ReceivedPayload] = []
+            # Tail-relative indices, so entries dead-lettered meanwhile (pushed
+            # at the head) do not shift them.
+            positions: list[int] = []
+            depth = kept
+            for offset, message in enumerate(reversed(raw_messages)):
+                if max_messages is not None and moved_total + len(matches) >= max_messages:
+                    break
+                payload = await self._operator_payload(message, decode_envelope=False, method="range_messages")
+                if predicate(payload):
+                    matches.append(message)
+                    positions.append(-(depth + 1 + offset))
+                else:
+                    kept += 1
+            step = pacer.batch_size(_REDRIVE_BATCH_SIZE)
+            moved_before_window = moved_total
+            for start in range(0, len(matches), step):
+                await asyncio.sleep(pacer.delay(moved_total))
+                batch = matches[start : start + step]
+                # Entries moved by earlier batches were nearer the tail.
+                shift = moved_total - moved_before_window
+                moved_total += self._require_int_return(
+                    await redrive_selected_messages(
+                        dead_letter_key,
+                        self.key.pending,
+                        [new_message_id() for _ in batch],
+                        batch,
+                        [position + shift for position in positions[start : start + step]],
+                    ),
+                    "redrive_selected_messages",
+                )
+            if len(raw_messages) < window:
+                break
+        return moved_total
+
+    async def purge(
+        self,
+        *,
+        target: str,
+        batch_size: int | None = None,
+        predicate: Callable[[ReceivedPayload], bool] | None = None,
+        on_progress: Callable[[PurgeProgress], object] | None = None,
+    ) -> int:
         """Delete every message in ``target`` and return how many were removed.
 
         Destructive and irreversible. ``target`` must be named explicitly (no
@@ -1957,8 +2929,27 @@ class RedisMessageQueue:
         in-flight message leases that purging would corrupt. Purging a
         ``dead_letter`` target when no dead-letter queue is configured raises
         ``ConfigurationError``. Only the target list is deleted: deduplication
-        markers and lease metadata are left untouched.
+        markers and lease metadata are left untouched. The built-in gateway
+        also deletes the claim-check bodies the list references, whether or
+        not this queue offloads payloads: the list is scanned inside Redis
+        first, and a list that references bodies is popped in batches instead,
+        which is not a single atomic step.
+
+        Passing ``batch_size``, ``predicate``, or ``on_progress`` selects the
+        incremental purge instead, for cleanups that must not leave per-message
+        state behind or must spare some entries. It removes the entries present
+        when it starts, oldest first, in atomic slices of ``batch_size``
+        entries (default 1000), and also deletes what those entries leave
+        behind: their delivery counts on ``pending`` and their claim-check
+        bodies. ``predicate`` is called with each decoded payload (as
+        ``iter_messages()`` yields it) and only matching entries are removed;
+        the rest stay in order. ``on_progress`` is called with a
+        ``PurgeProgress`` after every slice. Entries pushed during the purge
+        are left alone, and a ``predicate`` or ``on_progress`` exception stops
+        the purge with the slices already removed gone. Deduplication markers
+        are not derivable from an entry and still expire on their TTL.
         """
+        incremental = validate_incremental_purge_arguments(batch_size, predicate, on_progress)
         if target == "processing":
             raise ConfigurationError(
                 "refusing to purge 'processing': it holds in-flight message leases and purging it "
@@ -1968,9 +2959,260 @@ class RedisMessageQueue:
             raise ConfigurationError(f"'target' must be one of {_PURGE_TARGETS}, got {target!r}")
         await self._ensure_plain_redis_client_is_not_cluster()
         key = self._resolve_queue_key(target)
+        if incremental:
+            return await self._purge_incrementally(
+                target, key, batch_size or DEFAULT_PURGE_BATCH_SIZE, predicate, on_progress
+            )
+        if self._supports_claim_check:
+            # Any instance may have published references here; purge by what the list holds.
+            return self._require_int_return(
+                await self._redis._purge_queue_with_claim_checks(  # type: ignore[attr-defined]
+                    key, self.key.processing, self.key.claim_check_prefix
+                ),
+                "purge_queue",
+            )
         purge_queue = self._gateway_operator_method("purge_queue")
         return self._require_int_return(await purge_queue(key), "purge_queue")
 
+    async def _purge_incrementally(
+        self,
+        target: str,
+        key: str,
+        batch_size: int,
+        predicate: Callable[[ReceivedPayload], bool] | None,
+        on_progress: Callable[[PurgeProgress], object] | None,
+    ) -> int:
+        queue_length = self._gateway_operator_method("queue_length")
+        total = self._require_int_return(await queue_length(key), "queue_length")
+        clear_delivery_counts = target == "pending"
+        removed = 0
+        scanned = 0
+        if predicate is None:
+            purge_queue_slice: Callable[..., Awaitable[object]]
+            if self._supports_claim_check:
+                purge_queue_slice = functools.partial(
+                    self._redis._purge_queue_slice_with_claim_checks,  # type: ignore[attr-defined]
+                    claim_check_prefix=self.key.claim_check_prefix,
+                )
+            else:
+                purge_queue_slice = self._gateway_operator_method("purge_queue_slice")
+            while scanned < total:
+                window = min(batch_size, total - scanned)
+                popped = self._require_int_return(
+                    await purge_queue_slice(
+                        key, self.key.processing, window, clear_delivery_counts=clear_delivery_counts
+                    ),
+                    "purge_queue_slice",
+                )
+                removed += popped
+                scanned += popped
+                if on_progress is not None:
+                    progress = PurgeProgress(target=target, removed=removed, scanned=scanned, total=total)
+                    await self._report_purge_progress(on_progress, progress)
+                if popped < window:
+                    break
+            return removed
+        range_messages = self._gateway_operator_method("range_messages")
+        purge_selected_messages = self._gateway_operator_method("purge_selected_messages")
+        decode_envelope = target in _PEEK_ENVELOPE_SOURCES
+        # As in selective redrive, only kept entries move the tail window.
+        kept = 0
+        while scanned < total:
+            window = min(batch_size, total - scanned)
+            raw_messages = await range_messages(key, -(kept + window), -(kept + 1))
+            if not isinstance(raw_messages, list):
+                raise GatewayContractError(
+                    f"gateway.range_messages() must return a list, got {type(raw_messages).__name__}."
+                )
+            scanned += len(raw_messages)
+            matches: list[ReceivedPayload] = []
+            for message in reversed(raw_messages):
+                if predicate is None or predicate(
+                    await self._operator_payload(message, decode_envelope=decode_envelope, method="range_messages")
+                ):
+                    matches.append(message)
+                else:
+                    kept += 1
+            purged = await purge_selected_messages(
+                key, self.key.processing, matches, clear_delivery_counts=clear_delivery_counts
+            )
+            if not isinstance(purged, list):
+                raise GatewayContractError(
+                    f"gateway.purge_selected_messages() must return a list, got {type(purged).__name__}."
+                )
+            removed += len(purged)
+            await self._delete_purged_claim_check_bodies(purged)
+            if on_progress is not None:
+                progress = PurgeProgress(target=target, removed=removed, scanned=scanned, total=total)
+                await self._report_purge_progress(on_progress, progress)
+            if len(raw_messages) < window:
+                break
+        return removed
+
+    async def collect_orphaned_metadata(
+        self, *, batch_size: int = DEFAULT_METADATA_GC_BATCH_SIZE
+    ) -> OrphanedMetadataReport:
+        """Delete per-message metadata left behind by messages that are gone.
+
+        Scans the delivery-count and claim-result (refs, ids, backrefs)
+        hashes of ``processing`` with ``HSCAN``, ``batch_size`` fields at a
+        time, and deletes fields whose message is neither in ``processing``
+        nor holding a lease, nor (for delivery counts) waiting in ``pending``.
+        They accumulate when claims without visibility timeouts are abandoned
+        and their messages removed by hand, or when ``max_delivery_count`` or
+        visibility timeouts are turned off with messages in flight. Returns an
+        ``OrphanedMetadataReport``.
+
+        Each deletion re-checks ``processing`` and the leases atomically, so
+        live claims are never touched; with visibility timeouts that check is
+        an O(1) lease lookup per field. ``pending`` (and, without visibility
+        timeouts, ``processing``) is checked beforehand: the collector reads
+        the hashes once, walks each list once from the head in windows,
+        reading short fingerprints of its entries (envelope header and
+        length) instead of the payloads, and then scans the hashes again to
+        delete. Memory grows with the number of fields, not with the list
+        lengths. A delivery count is kept when its message held a lease
+        before the walk or holds one when its field is re-read, so it is lost
+        only if its message is claimed ahead of the walk and handed back to
+        ``pending`` (a drain, or a lease that expires) before that re-read.
+        """
+        validate_metadata_gc_batch_size(batch_size)
+        remove_stale_metadata = self._gateway_operator_method("remove_stale_metadata")
+        leased = self._redis.message_visibility_timeout_seconds is not None
+        # Fingerprints of the messages of every field that needs a list walk.
+        suspects: dict[str, set[str]] = {
+            metadata: set()
+            for metadata in METADATA_GC_HASHES
+            if metadata == "delivery_counts" or (not leased and metadata != "claim_result_refs")
+        }
+        for metadata, fingerprints in suspects.items():
+            async for fields in self._scan_metadata_fields(metadata, batch_size):
+                messages = await self._metadata_messages(metadata, fields)
+                fingerprints.update(message_fingerprint(message) for message in messages if message is not None)
+        in_pending = await self._fingerprints_in_list(self.key.pending, suspects.get("delivery_counts", set()))
+        in_processing = (
+            set() if leased else await self._fingerprints_in_list(self.key.processing, set().union(*suspects.values()))
+        )
+        scanned = 0
+        removed = 0
+        reclaimed_bytes = 0
+        for metadata in METADATA_GC_HASHES:
+            gone = suspects.get(metadata)
+            if gone is not None:
+                gone = gone - in_processing - (in_pending if metadata == "delivery_counts" else set())
+            async for fields in self._scan_metadata_fields(metadata, batch_size):
+                scanned += len(fields)
+                if gone is not None:
+                    messages = await self._metadata_messages(metadata, fields)
+                    fields = [
+                        field
+                        for field, message in zip(fields, messages)
+                        if message is not None and message_fingerprint(message) in gone
+                    ]
+                for start in range(0, len(fields), batch_size):
+                    batch_removed, batch_bytes = require_removal_result(
+                        await remove_stale_metadata(self.key.processing, metadata, fields[start : start + batch_size])
+                    )
+                    removed += batch_removed
+                    reclaimed_bytes += batch_bytes
+        return OrphanedMetadataReport(scanned=scanned, removed=removed, bytes_reclaimed=reclaimed_bytes)
+
+    async def _scan_metadata_fields(self, metadata: str, batch_size: int) -> AsyncIterator[list[ReceivedPayload]]:
+        scan_metadata_fields = self._gateway_operator_method("scan_metadata_fields")
+        cursor = 0
+        while True:
+            cursor, fields = require_scan_result(
+                await scan_metadata_fields(self.key.processing, metadata, cursor, batch_size)
+            )
+            yield fields
+            if cursor == 0:
+                return
+
+    async def _metadata_messages(self, metadata: str, fields: list[ReceivedPayload]) -> list[ReceivedPayload | None]:
+        # The message each field belongs to, or None when the field is gone
+        # or, for a delivery count, its message holds a lease.
+        metadata_values = self._gateway_operator_method("metadata_values")
+        if metadata == "claim_result_ids":
+            # Keyed by claim id; the value is the message that was claimed.
+            return require_metadata_values(await metadata_values(self.key.processing, metadata, fields), len(fields))
+        if metadata == "delivery_counts":
+            leases = require_metadata_values(
+                await metadata_values(self.key.processing, "lease_tokens", fields), len(fields)
+            )
+            return [field if lease is None else None for field, lease in zip(fields, leases)]
+        return list(fields)
+
+    async def _fingerprints_in_list(self, queue: str, fingerprints: set[str]) -> set[str]:
+        # Walk from the head: pushes shift entries toward the tail, so an
+        # entry that stays in the list is never skipped unless entries ahead
+        # of it are removed meanwhile (acks in processing, which the removal
+        # script re-checks anyway).
+        found: set[str] = set()
+        range_message_fingerprints = self._gateway_operator_method("range_message_fingerprints")
+        start = 0
+        while fingerprints - found:
+            window = require_fingerprints(
+                await range_message_fingerprints(queue, start, start + METADATA_GC_PENDING_WINDOW - 1)
+            )
+            found.update(fingerprint for fingerprint in window if fingerprint in fingerprints)
+            if len(window) < METADATA_GC_PENDING_WINDOW:
+                break
+            start += METADATA_GC_PENDING_WINDOW
+        return found
+
+    async def deduplication_census(
+        self, *, max_markers: int | None = None, batch_size: int = DEFAULT_CENSUS_BATCH_SIZE
+    ) -> DeduplicationCensus:
+        """Count this queue's deduplication markers and estimate their memory.
+
+        ``SCAN``s ``key.deduplication_prefix`` ``batch_size`` keys at a time
+        and reads each marker's ``PTTL`` and ``MEMORY USAGE`` in one pipelined
+        round trip per batch. Returns a ``DeduplicationCensus`` with the marker
+        count, estimated bytes, and a histogram of remaining TTLs, to size
+        ``message_deduplication_log_ttl_seconds`` against measured memory.
+        ``max_markers`` stops after that many markers for a sample; ``SCAN``
+        order is effectively random, so ``bytes_per_marker`` and the
+        histogram's shape are still representative. A full scan may count a
+        marker twice if Redis resizes its keyspace meanwhile. Publish replay
+        keys under the same prefix are skipped. Single-node Redis only.
+        """
+        validate_census_arguments(max_markers, batch_size)
+        scan_keys = self._gateway_operator_method("scan_keys")
+        key_footprints = self._gateway_operator_method("key_footprints")
+        match = f"{escape_scan_pattern(self.key.deduplication_prefix)}*"
+        tally = CensusTally()
+        cursor = 0
+        while True:
+            cursor, keys = require_scan_result(await scan_keys(match, cursor, batch_size), "scan_keys")
+            markers = [key for key in keys if is_deduplication_marker(key)]
+            remaining = None if max_markers is None else max_markers - tally.markers
+            truncated = remaining is not None and len(markers) > remaining
+            if truncated:
+                markers = markers[:remaining]
+            footprints = await key_footprints(markers) if markers else []
+            if not isinstance(footprints, list) or len(footprints) != len(markers):
+                raise GatewayContractError("gateway.key_footprints() must return a list with one entry per key.")
+            for key, footprint in zip(markers, footprints):
+                tally.add(key, footprint)
+            if cursor == 0 and not truncated:
+                return tally.census(complete=True)
+            if truncated or (max_markers is not None and tally.markers >= max_markers):
+                return tally.census(complete=False)
+
+    async def _delete_purged_claim_check_bodies(self, purged: list[ReceivedPayload]) -> None:
+        if not self._supports_claim_check:
+            return
+        reference_ids = [parse_stored_claim_check_reference(message) for message in purged]
+        body_keys = [self.key.claim_check(reference_id) for reference_id in reference_ids if reference_id]
+        if body_keys:
+            await self._redis._delete_claim_check_body(*body_keys)  # type: ignore[attr-defined]
+
+    @staticmethod
+    async def _report_purge_progress(on_progress: Callable[[PurgeProgress], object], progress: PurgeProgress) -> None:
+        result = on_progress(progress)
+        if inspect.isawaitable(result):
+            await result
+
     def _resolve_queue_key(self, source: str) -> str:
         if source == "pending":
             return self.key.pending
@@ -2007,6 +3249,19 @@ class RedisMessageQueue:
     def __repr__(self) -> str:
         return f"<RedisMessageQueue name={self._queue_name!r} drained={self._drained}>"
 
+    def _build_shared_lease_heartbeat(self) -> _SharedLeaseHeartbeat | None:
+        renew_message_leases = getattr(self._redis, "_renew_message_leases", None)
+        if self._heartbeat_interval_seconds is None or not callable(renew_message_leases):
+            return None
+        return _SharedLeaseHeartbeat(
+            interval_seconds=float(self._heartbeat_interval_seconds),
+            renew_message_leases=lambda leases, stop_interrupt: renew_message_leases(
+                self.key.processing, leases, is_interrupted=stop_interrupt
+            ),
+            on_heartbeat_failure=self._on_heartbeat_failure,
+            emit_event=self._emit_event,
+        )
+
     def _build_lease_heartbeat(
         self,
         stored_message: ReceivedPayload,
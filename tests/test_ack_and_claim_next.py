@@ -0,0 +1,235 @@
+"""process_message_callback(prefetch_next=True): the ack pipelines the next claim into the same round trip."""
+
+import time
+import warnings
+
+import fakeredis
+import pytest
+import redis
+
+from redis_message_queue import EventOperation, EventOutcome, RedisMessageQueue
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class _RoundTrips:
+    """Count standalone EVALs and pipeline executes issued through ``client``."""
+
+    def __init__(self, client):
+        self.evals = 0
+        self.pipelines = 0
+        eval_ = client.eval
+        pipeline_ = client.pipeline
+
+        def counting_eval(*args, **kwargs):
+            self.evals += 1
+            return eval_(*args, **kwargs)
+
+        def counting_pipeline(*args, **kwargs):
+            pipeline = pipeline_(*args, **kwargs)
+            execute = pipeline.execute
+
+            def counting_execute(*execute_args, **execute_kwargs):
+                self.pipelines += 1
+                return execute(*execute_args, **execute_kwargs)
+
+            pipeline.execute = counting_execute
+            return pipeline
+
+        client.eval = counting_eval
+        client.pipeline = counting_pipeline
+
+
+def _lease_keys(queue):
+    gateway = queue._redis
+    return gateway._lease_deadlines_key(queue.key.processing), gateway._delivery_counts_key(queue.key.processing)
+
+
+class TestSyncAckAndClaimNext:
+    def test_steady_state_pays_one_eval_round_trip_per_message(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("pipelined", client=client, visibility_timeout_seconds=30)
+        for index in range(5):
+            queue.publish(f"m{index}")
+        round_trips = _RoundTrips(client)
+        handled = []
+
+        for _ in range(5):
+            assert queue.process_message_callback(handled.append, prefetch_next=True) is True
+
+        assert handled == [f"m{index}".encode() for index in range(5)]
+        # One claim to start, then each ack carries the next claim.
+        assert round_trips.evals == 1
+        assert round_trips.pipelines == 5
+        assert queue.process_message_callback(handled.append, prefetch_next=True) is False
+        assert client.llen(queue.key.pending) == 0
+        assert client.llen(queue.key.processing) == 0
+
+    def test_completed_queue_receives_acked_messages(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "pipelined-completed",
+            client=client,
+            visibility_timeout_seconds=30,
+            enable_completed_queue=True,
+        )
+        queue.publish("a")
+        queue.publish("b")
+
+        assert queue.process_message_callback(lambda message: None, prefetch_next=True) is True
+        assert queue.process_message_callback(lambda message: None, prefetch_next=True) is True
+
+        assert client.lrange(queue.key.completed, 0, -1) == [b"b", b"a"]
+        assert client.llen(queue.key.processing) == 0
+
+    def test_drain_returns_the_prefetched_claim_to_pending(self):
+        events = []
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "pipelined-drain",
+            client=client,
+            visibility_timeout_seconds=30,
+            max_delivery_count=3,
+            on_event=events.append,
+        )
+        queue.publish("a")
+        queue.publish("b")
+
+        queue.process_message_callback(lambda message: None, prefetch_next=True)
+        assert client.llen(queue.key.processing) == 1
+        assert queue.drain(timeout=1) is True
+
+        lease_deadlines, delivery_counts = _lease_keys(queue)
+        assert client.llen(queue.key.pending) == 1
+        assert client.llen(queue.key.processing) == 0
+        assert client.zcard(lease_deadlines) == 0
+        assert client.hlen(delivery_counts) == 0
+        releases = [event for event in events if event.operation is EventOperation.RELEASE]
+        assert [event.outcome for event in releases] == [EventOutcome.SUCCESS]
+
+    def test_prefetched_claim_past_half_its_lease_is_released_and_claimed_afresh(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("pipelined-stale", client=client, visibility_timeout_seconds=2)
+        queue.publish("a")
+        queue.publish("b")
+        queue.process_message_callback(lambda message: None, prefetch_next=True)
+        time.sleep(1.1)
+
+        with queue.process_message(lazy=True) as handle:
+            assert handle.body() == b"b"
+            # The stale prefetch was refunded, so this is still delivery one.
+            assert handle.delivery_count == 1
+
+    def test_does_not_prefetch_unless_asked(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "pipelined-default", client=client, visibility_timeout_seconds=30, max_delivery_count=1
+        )
+        queue.publish("a")
+        queue.publish("b")
+
+        assert queue.process_message_callback(lambda message: None) is True
+
+        assert client.llen(queue.key.processing) == 0
+        assert client.llen(queue.key.pending) == 1
+        handled = []
+        assert queue.process_message_callback(handled.append) is True
+        assert handled == [b"b"]
+        assert client.llen(queue.key.dead_letter) == 0
+
+    def test_context_manager_and_no_visibility_timeout_do_not_prefetch(self):
+        client = fakeredis.FakeRedis()
+        leased = RedisMessageQueue("pipelined-cm", client=client, visibility_timeout_seconds=30)
+        unleased = RedisMessageQueue(
+            "pipelined-no-vt", client=client, visibility_timeout_seconds=None, max_delivery_count=None
+        )
+        for queue in (leased, unleased):
+            queue.publish("a")
+            queue.publish("b")
+
+        with leased.process_message():
+            pass
+        unleased.process_message_callback(lambda message: None, prefetch_next=True)
+
+        for queue in (leased, unleased):
+            assert client.llen(queue.key.processing) == 0
+            assert client.llen(queue.key.pending) == 1
+
+    def test_lost_pipeline_reply_acks_once_and_recovers_the_claim(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("pipelined-lost", client=client, visibility_timeout_seconds=30)
+        queue.publish("a")
+        queue.publish("b")
+        pipeline_ = client.pipeline
+
+        def lossy_pipeline(*args, **kwargs):
+            pipeline = pipeline_(*args, **kwargs)
+            execute = pipeline.execute
+
+            def execute_then_drop(*execute_args, **execute_kwargs):
+                execute(*execute_args, **execute_kwargs)
+                raise redis.exceptions.ConnectionError("reply lost")
+
+            pipeline.execute = execute_then_drop
+            return pipeline
+
+        client.pipeline = lossy_pipeline
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            assert queue.process_message_callback(lambda message: None, prefetch_next=True) is True
+        client.pipeline = pipeline_
+
+        # The ack replayed under its operation key instead of reporting a stale lease.
+        assert not [warning for warning in caught if "no-op" in str(warning.message)]
+
+        handled = []
+        assert queue.process_message_callback(handled.append, prefetch_next=True) is True
+        assert handled == [b"b"]
+        assert client.llen(queue.key.processing) == 0
+
+
+class TestAsyncAckAndClaimNext:
+    @pytest.mark.asyncio
+    async def test_steady_state_pays_one_eval_round_trip_per_message(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("pipelined-async", client=client, visibility_timeout_seconds=30)
+        for index in range(4):
+            await queue.publish(f"m{index}")
+        round_trips = _RoundTrips(client)
+        handled = []
+
+        async def handler(message):
+            handled.append(message)
+
+        for _ in range(4):
+            assert await queue.process_message_callback(handler, prefetch_next=True) is True
+
+        assert handled == [f"m{index}".encode() for index in range(4)]
+        assert round_trips.evals == 1
+        assert round_trips.pipelines == 4
+        assert await client.llen(queue.key.processing) == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_returns_the_prefetched_claim_to_pending(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("pipelined-async-drain", client=client, visibility_timeout_seconds=30)
+        await queue.publish("a")
+        await queue.publish("b")
+
+        await queue.process_message_callback(lambda message: None, prefetch_next=True)
+        assert await client.llen(queue.key.processing) == 1
+        assert await queue.drain(timeout=1) is True
+
+        assert await client.llen(queue.key.pending) == 1
+        assert await client.llen(queue.key.processing) == 0
+
+    @pytest.mark.asyncio
+    async def test_does_not_prefetch_unless_asked(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("pipelined-async-default", client=client, visibility_timeout_seconds=30)
+        await queue.publish("a")
+        await queue.publish("b")
+
+        assert await queue.process_message_callback(lambda message: None) is True
+
+        assert await client.llen(queue.key.processing) == 0
+        assert await client.llen(queue.key.pending) == 1
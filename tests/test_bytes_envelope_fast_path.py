@@ -0,0 +1,192 @@
+"""Bytes-native decoding of canonical envelopes (``decode_responses=False``).
+
+Large canonical envelopes whose fields need no JSON unescaping are sliced
+straight out of the stored bytes instead of round-tripping through ``str``.
+The fast path must be observationally identical to the general path: same
+payload bytes, same message id, and every non-canonical or malformed value
+must still reach the general decoder (and its typed errors).
+"""
+
+import json
+
+import fakeredis
+import pytest
+
+from redis_message_queue import MalformedStoredMessageError, _stored_message
+from redis_message_queue._stored_message import (
+    _STORED_MESSAGE_PREFIX_BYTES,
+    _decode_canonical_bytes_envelope,
+    decode_stored_message,
+    encode_stored_message,
+    envelope_trace_context,
+    extract_stored_message_id,
+    read_stored_message_id,
+)
+from redis_message_queue.asyncio.redis_message_queue import RedisMessageQueue as AsyncRedisMessageQueue
+from redis_message_queue.redis_message_queue import RedisMessageQueue
+
+
+@pytest.fixture
+def no_size_threshold(monkeypatch):
+    monkeypatch.setattr(_stored_message, "_BYTES_FAST_PATH_MIN_SIZE", 0)
+
+
+def _general_path(stored: bytes) -> tuple[str, bytes]:
+    envelope = json.loads(stored[len(_STORED_MESSAGE_PREFIX_BYTES) :].decode("utf-8"))
+    return envelope["id"], envelope["payload"].encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "plain ascii text",
+        "",
+        "x" * 100_000,
+        "symbols ~!@#$%^&*()_+{}|:<>?/.,';][=-`",
+    ],
+)
+@pytest.mark.usefixtures("no_size_threshold")
+def test_canonical_ascii_envelope_takes_fast_path_and_matches_general_path(payload):
+    stored = encode_stored_message(payload).encode("utf-8")
+
+    fast = _decode_canonical_bytes_envelope(stored)
+
+    assert fast is not None
+    assert fast == _general_path(stored)
+    assert decode_stored_message(stored) == payload.encode("utf-8")
+    assert extract_stored_message_id(stored) == fast[0]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        'has "quotes"',
+        "back\\slash",
+        "line\nbreak",
+        "tab\tseparated",
+        json.dumps({"order": 7, "items": ["a", "b"]}, sort_keys=True),
+        'quoted \\"backslash\\"',
+        "café",
+        "emoji \U0001f600",
+        "unit\x1fseparator",
+    ],
+)
+@pytest.mark.usefixtures("no_size_threshold")
+def test_payloads_needing_unescape_fall_back_and_still_round_trip(payload):
+    stored = encode_stored_message(payload).encode("utf-8")
+
+    assert _decode_canonical_bytes_envelope(stored) is None
+    assert decode_stored_message(stored) == payload.encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [
+        # Reordered keys (e.g. cjson-written redrive envelopes).
+        b'\x1eRMQ1:{"payload":"x","id":"abc"}',
+        # Whitespace after separators.
+        b'\x1eRMQ1:{"id": "abc", "payload": "x"}',
+        # Trailing data after the object.
+        b'\x1eRMQ1:{"id":"abc","payload":"x"} ',
+        # Extra field.
+        b'\x1eRMQ1:{"id":"abc","payload":"x","extra":"y"}',
+        # Binary-safe payload_hex envelope.
+        b'\x1eRMQ1:{"id":"abc","payload_hex":"ff00"}',
+        # Escapes json.dumps never emits for ASCII text.
+        b'\x1eRMQ1:{"id":"abc","payload":"a\\/b"}',
+        b'\x1eRMQ1:{"id":"abc","payload":"\\u0041"}',
+        # Raw control byte in the id.
+        b'\x1eRMQ1:{"id":"a\x01c","payload":"x"}',
+    ],
+)
+@pytest.mark.usefixtures("no_size_threshold")
+def test_non_canonical_layouts_are_left_to_the_general_decoder(stored):
+    assert _decode_canonical_bytes_envelope(stored) is None
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [
+        b'\x1eRMQ1:{"id":"abc","payload":"x"',
+        b'\x1eRMQ1:{"id":"abc","payload":"\xff\xfe"}',
+        b'\x1eRMQ1:{"id":"abc","payload":"raw\x01control"}',
+        b'\x1eRMQ1:{"id":"abc","payload":"a"b"}',
+        b'\x1eRMQ1:{"id":"abc","payload":"trailing\\"}',
+        b'\x1eRMQ1:{"id":"abc","payload":"bad \\q escape"}',
+    ],
+)
+@pytest.mark.usefixtures("no_size_threshold")
+def test_malformed_envelopes_still_raise_typed_error(stored):
+    with pytest.raises(MalformedStoredMessageError):
+        decode_stored_message(stored)
+
+
+@pytest.fixture
+def traced_envelopes():
+    token = envelope_trace_context.set({"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"})
+    yield
+    envelope_trace_context.reset(token)
+
+
+@pytest.mark.usefixtures("traced_envelopes")
+def test_traced_envelope_still_takes_the_fast_paths(monkeypatch):
+    stored = encode_stored_message("x" * _stored_message._BYTES_FAST_PATH_MIN_SIZE).encode("utf-8")
+
+    fast = _decode_canonical_bytes_envelope(stored)
+
+    assert fast is not None
+    assert fast == _general_path(stored)
+
+    def full_decode(*args, **kwargs):
+        raise AssertionError("read_stored_message_id fell back to a full decode")
+
+    monkeypatch.setattr(_stored_message, "extract_stored_message_id", full_decode)
+    assert read_stored_message_id(stored) == fast[0]
+    assert read_stored_message_id(stored.decode("utf-8")) == fast[0]
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [
+        # Trace object that is not valid JSON.
+        b'\x1eRMQ1:{"id":"abc","trace":{oops},"payload":"x"}',
+        # Trace object never closed before the payload.
+        b'\x1eRMQ1:{"id":"abc","trace":{"a":"b","payload":"x"}',
+    ],
+)
+@pytest.mark.usefixtures("no_size_threshold")
+def test_non_canonical_trace_fields_are_left_to_the_general_decoder(stored):
+    assert _decode_canonical_bytes_envelope(stored) is None
+
+
+def test_fast_path_only_applies_to_large_envelopes():
+    small = encode_stored_message("x" * 100).encode("utf-8")
+    large = encode_stored_message("x" * _stored_message._BYTES_FAST_PATH_MIN_SIZE).encode("utf-8")
+
+    assert _decode_canonical_bytes_envelope(small) is None
+    assert _decode_canonical_bytes_envelope(large) is not None
+
+
+def test_sync_bytes_consumer_receives_exact_payload_bytes():
+    client = fakeredis.FakeRedis()
+    queue = RedisMessageQueue("bytes-fast-path-sync", client=client)
+    queue.publish({"k": "v", "n": 1})
+    queue.publish("café")
+    queue.publish("x" * 100_000)
+
+    with queue.process_message() as first:
+        assert first == b'{"k": "v", "n": 1}'
+    with queue.process_message() as second:
+        assert second == "café".encode("utf-8")
+    with queue.process_message() as third:
+        assert third == b"x" * 100_000
+
+
+@pytest.mark.asyncio
+async def test_async_bytes_consumer_receives_exact_payload_bytes():
+    client = fakeredis.FakeAsyncRedis()
+    queue = AsyncRedisMessageQueue("bytes-fast-path-async", client=client)
+    await queue.publish({"k": "v", "n": 1})
+
+    async with queue.process_message() as message:
+        assert message == b'{"k": "v", "n": 1}'
@@ -0,0 +1,256 @@
+"""publish(bytes): binary envelope round trips on sync and async queues.
+
+Bytes payloads are stored verbatim after a ``\\x1eRMQ1B:<id>:`` header, so
+arbitrary (non-UTF-8) bytes survive publish, claim, ack, dead-lettering and
+redrive unchanged, without base64 or hex expansion.
+"""
+
+import fakeredis
+import pytest
+
+from redis_message_queue import (
+    AbstractRedisGateway,
+    ConfigurationError,
+    EventOperation,
+    MalformedStoredMessageError,
+    PayloadTooLargeError,
+    QueueEvent,
+)
+from redis_message_queue._redis_gateway import RedisGateway
+from redis_message_queue._stored_message import (
+    decode_stored_message,
+    encode_stored_message,
+    extract_stored_message_id,
+)
+from redis_message_queue.asyncio._redis_gateway import RedisGateway as AsyncRedisGateway
+from redis_message_queue.asyncio.redis_message_queue import RedisMessageQueue as AsyncRedisMessageQueue
+from redis_message_queue.redis_message_queue import RedisMessageQueue
+
+BINARY_PAYLOAD = bytes(range(256)) + b"\xff\xfe trailing"
+
+
+class _StrOnlyGateway(AbstractRedisGateway):
+    def __init__(self):
+        self.published = []
+
+    def publish_message(self, queue, message, dedup_key):
+        self.published.append(message)
+        return True
+
+    def add_message(self, queue, message):
+        self.published.append(message)
+
+    def move_message(self, from_queue, to_queue, message, *, lease_token=None):
+        return True
+
+    def remove_message(self, queue, message, *, lease_token=None):
+        return True
+
+    def renew_message_lease(self, queue, message, lease_token, *, is_interrupted=None):
+        return True
+
+    def wait_for_message_and_move(self, from_queue, to_queue):
+        return None
+
+    def trim_queue(self, queue, max_length):
+        return None
+
+
+def _dead_letter_gateway(client, *, gateway_cls=RedisGateway):
+    return gateway_cls(
+        redis_client=client,
+        retry_budget_seconds=0,
+        message_wait_interval_seconds=0,
+        message_visibility_timeout_seconds=30,
+        max_delivery_count=1,
+        dead_letter_queue="bytes::dead_letter",
+    )
+
+
+class TestBinaryEnvelope:
+    def test_encode_produces_compact_binary_envelope(self):
+        stored = encode_stored_message(BINARY_PAYLOAD)
+
+        assert isinstance(stored, bytes)
+        message_id = extract_stored_message_id(stored)
+        assert stored == b"\x1eRMQ1B:" + message_id.encode("ascii") + b":" + BINARY_PAYLOAD
+        assert decode_stored_message(stored) == BINARY_PAYLOAD
+
+    def test_payload_may_contain_the_id_separator(self):
+        stored = encode_stored_message(b"a:b::c")
+
+        assert decode_stored_message(stored) == b"a:b::c"
+
+    def test_empty_payload_round_trips(self):
+        assert decode_stored_message(encode_stored_message(b"")) == b""
+
+    def test_str_read_of_utf8_binary_envelope_returns_str(self):
+        stored = encode_stored_message("café".encode("utf-8")).decode("utf-8")
+
+        assert decode_stored_message(stored) == "café"
+
+    @pytest.mark.parametrize(
+        "stored",
+        [b"\x1eRMQ1B:no-separator", b"\x1eRMQ1B::payload", b"\x1eRMQ1B:\xff\xfe:payload"],
+    )
+    def test_malformed_binary_envelope_raises_typed_error(self, stored):
+        with pytest.raises(MalformedStoredMessageError):
+            decode_stored_message(stored)
+
+    def test_strict_decoding_accepts_binary_envelope(self):
+        stored = encode_stored_message(b"\x00\x01")
+
+        assert decode_stored_message(stored, strict_envelope_decoding=True) == b"\x00\x01"
+
+
+class TestPublishBytesSync:
+    def test_round_trip_preserves_exact_bytes_and_acks_raw_payload(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("bytes-sync", client=client, enable_completed_queue=True)
+
+        assert queue.publish(BINARY_PAYLOAD) is True
+        with queue.process_message() as message:
+            assert message == BINARY_PAYLOAD
+
+        assert client.lrange(queue.key.completed, 0, -1) == [BINARY_PAYLOAD]
+
+    def test_dedup_key_callable_receives_bytes(self):
+        client = fakeredis.FakeRedis()
+        seen = []
+
+        def dedup_key(message):
+            seen.append(message)
+            return message[:4].hex()
+
+        queue = RedisMessageQueue("bytes-dedup", client=client, deduplication=True, get_deduplication_key=dedup_key)
+
+        assert queue.publish(b"\x01\x02\x03\x04first") is True
+        assert queue.publish(b"\x01\x02\x03\x04second") is False
+        assert seen == [b"\x01\x02\x03\x04first", b"\x01\x02\x03\x04second"]
+        assert client.llen(queue.key.pending) == 1
+
+    def test_max_payload_bytes_counts_raw_length(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("bytes-limit", client=client, max_payload_bytes=4)
+
+        queue.publish(b"\xff" * 4)
+        with pytest.raises(PayloadTooLargeError, match="bytes message"):
+            queue.publish(b"\xff" * 5)
+        assert client.llen(queue.key.pending) == 1
+
+    @pytest.mark.parametrize("deduplication", [True, False])
+    def test_decode_responses_client_is_rejected_before_enqueue(self, deduplication):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        queue = RedisMessageQueue(
+            "bytes-str-client",
+            client=client,
+            deduplication=deduplication,
+            get_deduplication_key=(lambda message: "key") if deduplication else None,
+        )
+
+        with pytest.raises(ConfigurationError, match="decode_responses=False"):
+            queue.publish(b"payload")
+        assert client.llen(queue.key.pending) == 0
+
+    @pytest.mark.parametrize("deduplication", [True, False])
+    def test_custom_gateway_rejects_bytes_before_calling_gateway(self, deduplication):
+        gateway = _StrOnlyGateway()
+        queue = RedisMessageQueue(
+            "bytes-custom",
+            gateway=gateway,
+            deduplication=deduplication,
+            get_deduplication_key=(lambda message: "key") if deduplication else None,
+        )
+
+        with pytest.raises(TypeError, match="built-in RedisGateway"):
+            queue.publish(b"payload")
+        assert gateway.published == []
+
+    def test_peek_returns_bytes_payload(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("bytes-peek", client=client)
+        queue.publish(BINARY_PAYLOAD)
+
+        assert queue.peek() == [BINARY_PAYLOAD]
+
+    def test_visibility_timeout_claim_result_is_binary_safe_and_recoverable(self):
+        client = fakeredis.FakeRedis()
+        gateway = _dead_letter_gateway(client)
+        client.lpush("bytes::pending", encode_stored_message(BINARY_PAYLOAD))
+
+        claimed = gateway._claim_visible_message("bytes::pending", "bytes::processing", claim_id="claim-1")
+        assert decode_stored_message(claimed.stored_message) == BINARY_PAYLOAD
+        claim_result = client.get(gateway._claim_result_key("bytes::processing", "claim-1"))
+        assert claim_result == claimed.lease_token.encode("ascii") + b":" + claimed.stored_message
+
+        recovered = gateway._recover_pending_visibility_timeout_claim("bytes::processing", "claim-1")
+
+        assert recovered == claimed
+
+    def test_dead_letter_stores_raw_bytes_and_redrive_restores_them(self):
+        client = fakeredis.FakeRedis()
+        events: list[QueueEvent] = []
+        gateway = _dead_letter_gateway(client)
+        queue = RedisMessageQueue("bytes", gateway=gateway, on_event=events.append)
+        queue.publish(BINARY_PAYLOAD)
+
+        claimed = gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        client.zadd(gateway._lease_deadlines_key(queue.key.processing), {claimed.stored_message: 0})
+        assert gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing) is None
+
+        assert client.lrange("bytes::dead_letter", 0, -1) == [BINARY_PAYLOAD]
+        dlq_events = [event for event in events if event.operation is EventOperation.DLQ]
+        assert [event.message_id for event in dlq_events] == [extract_stored_message_id(claimed.stored_message)]
+
+        assert queue.redrive_dead_letters() == 1
+        with queue.process_message() as message:
+            assert message == BINARY_PAYLOAD
+
+
+class TestPublishBytesAsync:
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_exact_bytes_and_acks_raw_payload(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("bytes-async", client=client, enable_completed_queue=True)
+
+        assert await queue.publish(BINARY_PAYLOAD) is True
+        async with queue.process_message() as message:
+            assert message == BINARY_PAYLOAD
+
+        assert await client.lrange(queue.key.completed, 0, -1) == [BINARY_PAYLOAD]
+
+    @pytest.mark.asyncio
+    async def test_dedup_publish_of_bytes(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue(
+            "bytes-async-dedup", client=client, deduplication=True, get_deduplication_key=lambda m: m.hex()
+        )
+
+        assert await queue.publish(b"\x00same") is True
+        assert await queue.publish(b"\x00same") is False
+        assert await client.llen(queue.key.pending) == 1
+
+    @pytest.mark.asyncio
+    async def test_decode_responses_client_is_rejected_before_enqueue(self):
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        queue = AsyncRedisMessageQueue("bytes-async-str-client", client=client)
+
+        with pytest.raises(ConfigurationError, match="decode_responses=False"):
+            await queue.publish(b"payload")
+        assert await client.llen(queue.key.pending) == 0
+
+    @pytest.mark.asyncio
+    async def test_dead_letter_stores_raw_bytes_and_redrive_restores_them(self):
+        client = fakeredis.FakeAsyncRedis()
+        gateway = _dead_letter_gateway(client, gateway_cls=AsyncRedisGateway)
+        queue = AsyncRedisMessageQueue("bytes", gateway=gateway)
+        await queue.publish(BINARY_PAYLOAD)
+
+        claimed = await gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        await client.zadd(gateway._lease_deadlines_key(queue.key.processing), {claimed.stored_message: 0})
+        assert await gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing) is None
+
+        assert await client.lrange("bytes::dead_letter", 0, -1) == [BINARY_PAYLOAD]
+        assert await queue.redrive_dead_letters() == 1
+        async with queue.process_message() as message:
+            assert message == BINARY_PAYLOAD
@@ -0,0 +1,407 @@
+"""Claim-check offload: large payloads live in their own key, lists carry references."""
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, MalformedStoredMessageError, QueueBackpressureError
+from redis_message_queue._claim_check import (
+    claim_check_body_size,
+    new_claim_check_reference,
+    parse_claim_check_reference,
+)
+from redis_message_queue._config import PURGE_UNREFERENCED_QUEUE_LUA_SCRIPT, TRIM_QUEUE_TAIL_LUA_SCRIPT
+from redis_message_queue._redis_gateway import RedisGateway
+from redis_message_queue._stored_message import decode_stored_message
+from redis_message_queue.asyncio.redis_message_queue import RedisMessageQueue as AsyncRedisMessageQueue
+from redis_message_queue.redis_message_queue import RedisMessageQueue
+
+LARGE = "x" * 2048
+
+
+def _body_keys(client, queue):
+    return sorted(client.scan_iter(match=f"{queue.key.claim_check_prefix}*"))
+
+
+def _dead_letter_gateway(client):
+    return RedisGateway(
+        redis_client=client,
+        retry_budget_seconds=0,
+        message_wait_interval_seconds=0,
+        message_visibility_timeout_seconds=30,
+        max_delivery_count=1,
+        dead_letter_queue="cc::dead_letter",
+    )
+
+
+class TestReferenceHelpers:
+    def test_reference_round_trips_for_str_and_bytes(self):
+        reference_id, reference = new_claim_check_reference(2048)
+
+        assert parse_claim_check_reference(reference) == (reference_id, 2048)
+        assert parse_claim_check_reference(reference.encode("utf-8")) == (reference_id, 2048)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            "plain",
+            "\x1eRMQREF1:",
+            "\x1eRMQREF1:../../other-key",
+            "\x1eRMQREF1:" + "a" * 32,
+            "\x1eRMQREF1:" + "A" * 32 + ":10",
+            b"\x1eRMQREF1:\xff",
+        ],
+    )
+    def test_non_references_are_ignored(self, payload):
+        assert parse_claim_check_reference(payload) is None
+
+    def test_threshold_counts_utf8_bytes(self):
+        assert claim_check_body_size("é" * 3, 5) == 6
+        assert claim_check_body_size("é" * 2, 5) is None
+        assert claim_check_body_size(b"\x00" * 6, 5) == 6
+
+
+class TestConfiguration:
+    def test_ttl_requires_threshold(self):
+        with pytest.raises(ConfigurationError, match="claim_check_threshold_bytes"):
+            RedisMessageQueue("cc", client=fakeredis.FakeRedis(), claim_check_ttl_seconds=60)
+
+    @pytest.mark.parametrize("value", [0, -1])
+    def test_threshold_must_be_positive(self, value):
+        with pytest.raises(ConfigurationError):
+            RedisMessageQueue("cc", client=fakeredis.FakeRedis(), claim_check_threshold_bytes=value)
+
+    def test_threshold_rejects_bool(self):
+        with pytest.raises(TypeError):
+            RedisMessageQueue("cc", client=fakeredis.FakeRedis(), claim_check_threshold_bytes=True)
+
+    def test_drop_oldest_is_rejected(self):
+        # Evicted references would leave their bodies behind.
+        with pytest.raises(ConfigurationError, match="drop_oldest"):
+            RedisMessageQueue(
+                "cc",
+                client=fakeredis.FakeRedis(),
+                max_pending_length=1,
+                pending_overload_policy="drop_oldest",
+                claim_check_threshold_bytes=1024,
+            )
+
+
+class TestClaimCheckSync:
+    def test_small_payload_is_stored_inline(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+
+        queue.publish("small")
+
+        assert _body_keys(client, queue) == []
+        assert decode_stored_message(client.lindex(queue.key.pending, 0)) == b"small"
+
+    def test_large_payload_is_offloaded_and_deleted_on_ack(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+
+        queue.publish(LARGE)
+
+        stored = client.lindex(queue.key.pending, 0)
+        assert len(stored) < 200
+        [body_key] = _body_keys(client, queue)
+        assert client.get(body_key) == LARGE.encode("utf-8")
+        with queue.process_message() as message:
+            assert message == LARGE.encode("utf-8")
+        assert _body_keys(client, queue) == []
+
+    def test_dict_and_bytes_payloads_are_offloaded(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=64)
+        payload = {"blob": "y" * 100}
+        binary = bytes(range(256))
+
+        queue.publish(payload)
+        queue.publish(binary)
+
+        assert len(_body_keys(client, queue)) == 2
+        with queue.process_message() as message:
+            assert message == b'{"blob": "' + b"y" * 100 + b'"}'
+        with queue.process_message() as message:
+            assert message == binary
+
+    def test_decode_responses_consumer_receives_str_body(self):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+
+        with queue.process_message() as message:
+            assert message == LARGE
+
+    def test_consumer_without_threshold_resolves_references(self):
+        client = fakeredis.FakeRedis()
+        RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024).publish(LARGE)
+        consumer = RedisMessageQueue("cc", client=client)
+
+        with consumer.process_message() as message:
+            assert message == LARGE.encode("utf-8")
+        assert _body_keys(client, consumer) == []
+
+    def test_nack_deletes_body(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+
+        with pytest.raises(RuntimeError):
+            with queue.process_message():
+                raise RuntimeError("boom")
+
+        assert _body_keys(client, queue) == []
+
+    def test_completed_log_retains_body_with_ttl(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "cc",
+            client=client,
+            enable_completed_queue=True,
+            claim_check_threshold_bytes=1024,
+            claim_check_ttl_seconds=600,
+        )
+        queue.publish(LARGE)
+
+        with queue.process_message():
+            pass
+
+        [body_key] = _body_keys(client, queue)
+        assert 0 < client.ttl(body_key) <= 600
+        assert queue.peek(source="completed") == [LARGE.encode("utf-8")]
+
+    def test_trimming_the_failed_log_deletes_dropped_bodies(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "cc", client=client, enable_failed_queue=True, max_failed_length=2, claim_check_threshold_bytes=1024
+        )
+        for index in range(4):
+            queue.publish(f"{index}{LARGE}")
+
+        for _ in range(4):
+            with pytest.raises(RuntimeError):
+                with queue.process_message():
+                    raise RuntimeError("boom")
+
+        assert len(_body_keys(client, queue)) == 2
+        assert queue.peek(source="failed", count=5) == [f"{index}{LARGE}".encode("utf-8") for index in (3, 2)]
+
+    def test_trim_drops_an_oversized_log_in_batches(self, monkeypatch):
+        monkeypatch.setattr("redis_message_queue._redis_gateway._CLAIM_CHECK_PURGE_BATCH_SIZE", 2)
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "cc", client=client, enable_completed_queue=True, max_completed_length=1, claim_check_threshold_bytes=1024
+        )
+        for _ in range(6):
+            queue.publish(LARGE)
+        queue.publish("small")
+        for _ in range(6):
+            message = client.rpoplpush(queue.key.pending, queue.key.completed)
+            client.lset(queue.key.completed, 0, decode_stored_message(message))
+
+        with queue.process_message():
+            pass
+
+        assert client.llen(queue.key.completed) == 1
+        assert _body_keys(client, queue) == []
+
+    def test_trim_returns_only_references_from_redis(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, enable_completed_queue=True, max_completed_length=1)
+        eval_ = queue._redis._eval
+        trims = []
+
+        def recording_eval(script, *args):
+            reply = eval_(script, *args)
+            if script == TRIM_QUEUE_TAIL_LUA_SCRIPT:
+                trims.append(reply)
+            return reply
+
+        queue._redis._eval = recording_eval
+        for _ in range(3):
+            queue.publish(LARGE)
+            with queue.process_message():
+                pass
+
+        # Inline payloads dropped by the trim never travel back to the client.
+        assert trims == [[0, []], [1, []], [1, []]]
+        assert client.llen(queue.key.completed) == 1
+
+    def test_duplicate_publish_does_not_leave_a_body(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "cc",
+            client=client,
+            deduplication=True,
+            get_deduplication_key=lambda message: "same",
+            claim_check_threshold_bytes=1024,
+        )
+
+        assert queue.publish(LARGE) is True
+        assert queue.publish(LARGE) is False
+
+        assert len(_body_keys(client, queue)) == 1
+
+    @pytest.mark.parametrize("deduplication", [False, True])
+    def test_rejected_publish_does_not_leave_a_body(self, deduplication):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "cc",
+            client=client,
+            deduplication=deduplication,
+            get_deduplication_key=(lambda message: message[:8]) if deduplication else None,
+            max_pending_length=1,
+            claim_check_threshold_bytes=1024,
+        )
+        queue.publish(LARGE)
+
+        with pytest.raises(QueueBackpressureError):
+            queue.publish("y" * 2048)
+
+        assert len(_body_keys(client, queue)) == 1
+
+    def test_peek_resolves_pending_references(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+
+        assert queue.peek() == [LARGE.encode("utf-8")]
+
+    def test_missing_body_raises_typed_error(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+        client.delete(*_body_keys(client, queue))
+
+        with pytest.raises(MalformedStoredMessageError, match="claim-check body"):
+            with queue.process_message():
+                pass
+
+    def test_dead_letter_keeps_body_until_redriven_and_acked(self):
+        client = fakeredis.FakeRedis()
+        gateway = _dead_letter_gateway(client)
+        queue = RedisMessageQueue("cc", gateway=gateway, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+
+        claimed = gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        client.zadd(gateway._lease_deadlines_key(queue.key.processing), {claimed.stored_message: 0})
+        assert gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing) is None
+
+        assert len(client.lindex("cc::dead_letter", 0)) < 100
+        assert len(_body_keys(client, queue)) == 1
+        assert queue.peek(source="dead_letter") == [LARGE.encode("utf-8")]
+
+        assert queue.redrive_dead_letters() == 1
+        with queue.process_message() as message:
+            assert message == LARGE.encode("utf-8")
+        assert _body_keys(client, queue) == []
+
+    def test_purge_deletes_referenced_bodies(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        for _ in range(3):
+            queue.publish(LARGE)
+        queue.publish("small")
+
+        assert queue.purge(target="pending") == 4
+
+        assert client.llen(queue.key.pending) == 0
+        assert _body_keys(client, queue) == []
+
+    @pytest.mark.parametrize("purge_options", [{}, {"batch_size": 2}], ids=["atomic", "incremental"])
+    def test_purge_without_the_threshold_still_deletes_referenced_bodies(self, purge_options):
+        client = fakeredis.FakeRedis()
+        publisher = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        publisher.publish(LARGE)
+        publisher.publish(LARGE.encode("utf-8"))
+        publisher.publish("small")
+        admin = RedisMessageQueue("cc", client=client)
+
+        assert admin.purge(target="pending", **purge_options) == 3
+
+        assert client.llen(admin.key.pending) == 0
+        assert _body_keys(client, admin) == []
+
+    def test_purge_of_a_list_without_references_stays_atomic(self, monkeypatch):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cc", client=client, claim_check_threshold_bytes=1024)
+        for _ in range(3):
+            queue.publish("small")
+        scripts = []
+        original_eval = queue._redis._eval
+
+        def spy(script, *args):
+            scripts.append(script)
+            return original_eval(script, *args)
+
+        monkeypatch.setattr(queue._redis, "_eval", spy)
+
+        assert queue.purge(target="pending") == 3
+        assert scripts == [PURGE_UNREFERENCED_QUEUE_LUA_SCRIPT]
+
+
+class TestClaimCheckAsync:
+    @pytest.mark.asyncio
+    async def test_round_trip_deletes_body_on_ack(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("cc-async", client=client, claim_check_threshold_bytes=1024)
+
+        await queue.publish(LARGE)
+        assert len([key async for key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*")]) == 1
+
+        async with queue.process_message() as message:
+            assert message == LARGE.encode("utf-8")
+        assert [key async for key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*")] == []
+
+    @pytest.mark.asyncio
+    async def test_rejected_publish_does_not_leave_a_body(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue(
+            "cc-async", client=client, max_pending_length=1, claim_check_threshold_bytes=1024
+        )
+        await queue.publish(LARGE)
+
+        with pytest.raises(QueueBackpressureError):
+            await queue.publish(LARGE)
+
+        assert len([key async for key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*")]) == 1
+
+    @pytest.mark.asyncio
+    async def test_trimming_the_completed_log_deletes_dropped_bodies(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue(
+            "cc-async",
+            client=client,
+            enable_completed_queue=True,
+            max_completed_length=1,
+            claim_check_threshold_bytes=1024,
+        )
+        for _ in range(3):
+            await queue.publish(LARGE)
+            async with queue.process_message():
+                pass
+
+        assert len([key async for key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*")]) == 1
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_referenced_bodies(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("cc-async", client=client, claim_check_threshold_bytes=1024)
+        await queue.publish(LARGE)
+        await queue.publish(LARGE)
+
+        assert await queue.purge(target="pending") == 2
+        assert [key async for key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*")] == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("purge_options", [{}, {"batch_size": 2}], ids=["atomic", "incremental"])
+    async def test_purge_without_the_threshold_still_deletes_referenced_bodies(self, purge_options):
+        client = fakeredis.FakeAsyncRedis()
+        publisher = AsyncRedisMessageQueue("cc-async", client=client, claim_check_threshold_bytes=1024)
+        await publisher.publish(LARGE)
+        await publisher.publish(LARGE.encode("utf-8"))
+        admin = AsyncRedisMessageQueue("cc-async", client=client)
+
+        assert await admin.purge(target="pending", **purge_options) == 2
+        assert [key async for key in client.scan_iter(match=f"{admin.key.claim_check_prefix}*")] == []
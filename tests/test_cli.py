@@ -0,0 +1,210 @@
+"""python -m redis_message_queue export/import: NDJSON streaming of queue lists."""
+
+import io
+import json
+import subprocess
+import sys
+
+import fakeredis
+import pytest
+import redis
+
+from redis_message_queue import RedisMessageQueue
+from redis_message_queue._cli import export_list, import_list, main
+from redis_message_queue._stored_message import encode_stored_message, read_stored_message_id
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda url, **kwargs: client)
+    return client
+
+
+class TestExport:
+    def test_exports_oldest_first_with_envelopes(self, client, tmp_path):
+        queue = RedisMessageQueue("cli", client=client)
+        for message in ("a", "b", "c"):
+            queue.publish(message)
+        output = tmp_path / "pending.ndjson"
+
+        assert main(["export", "--queue", "cli", "--source", "pending", "--output", str(output)]) == 0
+
+        stored = [json.loads(line)["stored"] for line in output.read_text().splitlines()]
+        assert [json.loads(entry.split(":", 1)[1])["payload"] for entry in stored] == ["a", "b", "c"]
+        # Entries are written exactly as stored, envelope and id included.
+        assert client.lrange("cli::pending", -1, -1)[0].decode() == stored[0]
+
+    def test_windows_cover_the_list_across_round_trips(self, client):
+        for index in range(23):
+            client.lpush("raw", f"m{index}")
+        lines = []
+
+        class Sink:
+            def write(self, text):
+                lines.append(json.loads(text)["stored"])
+
+        stats = export_list(client, "raw", Sink(), batch_size=4, pipeline_depth=2)
+
+        assert lines == [f"m{index}" for index in range(23)]
+        assert stats.entries == 23 and stats.payload_bytes == sum(len(line) for line in lines)
+
+    def test_non_utf8_entries_are_base64(self, client, tmp_path, capsys):
+        client.lpush("cli::failed", b"\xff\x00")
+        assert main(["export", "--queue", "cli", "--source", "failed"]) == 0
+
+        out, err = capsys.readouterr()
+        assert json.loads(out) == {"stored_b64": "/wA="}
+        assert "exported 1 entries" in err and "entries/s" in err
+
+
+class TestImport:
+    def test_round_trip_preserves_order_and_ids(self, client, tmp_path):
+        queue = RedisMessageQueue("cli", client=client)
+        for index in range(10):
+            queue.publish(f"m{index}")
+        original = client.lrange("cli::pending", 0, -1)
+        dump = tmp_path / "dump.ndjson"
+        main(["export", "--queue", "cli", "--source", "pending", "--output", str(dump)])
+        client.delete("cli::pending")
+
+        assert (
+            main(["import", "--queue", "cli", "--input", str(dump), "--batch-size", "3", "--pipeline-depth", "2"]) == 0
+        )
+
+        assert client.lrange("cli::pending", 0, -1) == original
+        with queue.process_message() as message:
+            assert message == b"m0"
+
+    def test_rewrap_redrives_dead_letters_with_fresh_ids(self, client, tmp_path):
+        old_ids = []
+        for message in ("x", b"y"):
+            stored = encode_stored_message(message)
+            old_ids.append(read_stored_message_id(stored))
+            client.lpush("cli::dlq", stored)
+        dump = tmp_path / "dlq.ndjson"
+        main(["export", "--queue", "cli", "--output", str(dump)])
+
+        assert main(["import", "--queue", "cli", "--input", str(dump), "--rewrap"]) == 0
+
+        assert client.llen("cli::dlq") == 2  # export copies, it does not drain
+        new_ids = [read_stored_message_id(stored) for stored in client.lrange("cli::pending", 0, -1)]
+        assert None not in new_ids and not set(new_ids) & set(old_ids)
+        queue = RedisMessageQueue("cli", client=client)
+        received = []
+        for _ in range(2):
+            with queue.process_message() as message:
+                received.append(message)
+        assert received == [b"x", b"y"]
+
+    def test_pending_requires_envelopes_unless_rewrapped(self, client, tmp_path, capsys):
+        dump = tmp_path / "raw.ndjson"
+        dump.write_text(json.dumps({"stored": "plain"}) + "\n")
+
+        assert main(["import", "--queue", "cli", "--input", str(dump)]) == 1
+        assert "--rewrap" in capsys.readouterr().err
+        assert client.llen("cli::pending") == 0
+
+        assert main(["import", "--queue", "cli", "--input", str(dump), "--rewrap"]) == 0
+        (stored,) = client.lrange("cli::pending", 0, -1)
+        assert read_stored_message_id(stored) is not None
+
+    def test_rewrap_only_targets_pending(self, client, tmp_path, capsys):
+        dump = tmp_path / "raw.ndjson"
+        dump.write_text("")
+
+        assert main(["import", "--queue", "cli", "--target", "failed", "--input", str(dump), "--rewrap"]) == 1
+        assert "--target pending" in capsys.readouterr().err
+
+    def test_bad_line_reports_its_number(self, client, tmp_path, capsys):
+        dump = tmp_path / "bad.ndjson"
+        dump.write_text(json.dumps({"stored": "a"}) + "\n\n{oops\n")
+
+        assert main(["import", "--queue", "cli", "--target", "failed", "--input", str(dump)]) == 1
+        assert "line 3" in capsys.readouterr().err
+
+    def test_import_list_batches_keep_file_order(self, client):
+        entries = (f"e{index}".encode() for index in range(7))
+
+        stats = import_list(client, "target", entries, batch_size=2, pipeline_depth=1)
+
+        assert stats.entries == 7
+        assert client.lrange("target", 0, -1) == [f"e{index}".encode() for index in reversed(range(7))]
+
+    def test_custom_dead_letter_key(self, client, tmp_path):
+        dump = tmp_path / "dlq.ndjson"
+        dump.write_text(json.dumps({"stored": "payload"}) + "\n")
+
+        main(
+            [
+                "import",
+                "--queue",
+                "cli",
+                "--target",
+                "dead_letter",
+                "--dead-letter-queue",
+                "graveyard",
+                "--input",
+                str(dump),
+            ]
+        )
+
+        assert client.lrange("graveyard", 0, -1) == [b"payload"]
+
+
+class TestClaimCheck:
+    def test_bodies_travel_with_their_references(self, client, tmp_path, monkeypatch):
+        source = RedisMessageQueue("cli", client=client, claim_check_threshold_bytes=16)
+        source.publish("x" * 64)
+        source.publish(b"\xff" * 64)
+        source.publish("small")
+        dump = tmp_path / "pending.ndjson"
+        assert main(["export", "--queue", "cli", "--source", "pending", "--output", str(dump)]) == 0
+        target = fakeredis.FakeRedis()
+        monkeypatch.setattr(redis.Redis, "from_url", lambda url, **kwargs: target)
+
+        assert main(["import", "--queue", "cli", "--input", str(dump)]) == 0
+
+        queue = RedisMessageQueue("cli", client=target)
+        received = []
+        for _ in range(3):
+            with queue.process_message() as message:
+                received.append(message)
+        assert received == [b"x" * 64, b"\xff" * 64, b"small"]
+        assert list(target.scan_iter(match=f"{queue.key.claim_check_prefix}*")) == []
+
+    def test_export_refuses_a_reference_whose_body_is_gone(self, client, tmp_path, capsys):
+        queue = RedisMessageQueue("cli", client=client, claim_check_threshold_bytes=16)
+        queue.publish("x" * 64)
+        for body_key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*"):
+            client.delete(body_key)
+
+        assert main(["export", "--queue", "cli", "--source", "pending", "--output", str(tmp_path / "out")]) == 1
+        assert "is missing" in capsys.readouterr().err
+
+    def test_body_without_a_reference_is_rejected(self, client, tmp_path, capsys):
+        dump = tmp_path / "bad.ndjson"
+        dump.write_text(json.dumps({"stored": "payload", "body": "orphan"}) + "\n")
+
+        assert main(["import", "--queue", "cli", "--target", "failed", "--input", str(dump)]) == 1
+        assert "line 1" in capsys.readouterr().err
+        assert client.keys() == []
+
+
+def test_import_from_stdin_leaves_stdin_open(client, monkeypatch):
+    stdin = io.StringIO(json.dumps({"stored": "payload"}) + "\n")
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    assert main(["import", "--queue", "cli", "--target", "failed"]) == 0
+
+    assert not stdin.closed
+    assert client.lrange("cli::failed", 0, -1) == [b"payload"]
+
+
+def test_module_entry_point_prints_help():
+    result = subprocess.run(
+        [sys.executable, "-m", "redis_message_queue", "--help"], capture_output=True, text=True, check=False
+    )
+
+    assert result.returncode == 0
+    assert "export" in result.stdout and "import" in result.stdout
@@ -0,0 +1,205 @@
+"""ConsumerSupervisor: forked consumer processes with restart and coordinated shutdown.
+
+Children need a Redis they can all reach, so these tests serve fakeredis over
+TCP from the test process.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import fakeredis
+import pytest
+import redis
+
+from redis_message_queue import (
+    ConfigurationError,
+    ConsumerSupervisor,
+    EventDrivenInterruptHandler,
+    EventOperation,
+    RedisMessageQueue,
+    run_consumer_processes,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32" or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="requires the fork start method",
+)
+
+
+@pytest.fixture()
+def redis_address():
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def _queue_factory(address, name="supervised"):
+    def build_queue():
+        host, port = address
+        return RedisMessageQueue(name, client=redis.Redis(host=host, port=port))
+
+    return build_queue
+
+
+def _record_pid(address):
+    def handler(message):
+        host, port = address
+        redis.Redis(host=host, port=port).rpush("handled", f"{os.getpid()}:{message.decode()}")
+
+    return handler
+
+
+def _wait_for(predicate, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.05)
+    raise AssertionError("condition not met in time")
+
+
+def _run_in_thread(supervisor):
+    thread = threading.Thread(target=supervisor.run, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestConfiguration:
+    def test_rejects_async_handler(self):
+        async def handler(message):
+            pass
+
+        with pytest.raises(TypeError):
+            ConsumerSupervisor(lambda: None, handler)
+
+    @pytest.mark.parametrize("name", ["processes", "concurrency", "prefetch"])
+    def test_counts_must_be_positive(self, name):
+        with pytest.raises(ConfigurationError, match=name):
+            ConsumerSupervisor(lambda: None, lambda message: None, **{name: 0})
+
+    def test_backoff_bounds_are_ordered(self):
+        with pytest.raises(ConfigurationError, match="max_restart_backoff_seconds"):
+            ConsumerSupervisor(
+                lambda: None,
+                lambda message: None,
+                restart_backoff_seconds=5,
+                max_restart_backoff_seconds=1,
+            )
+
+
+class TestConsumerSupervisor:
+    def test_children_share_the_work_and_forward_events(self, redis_address):
+        client = redis.Redis(*redis_address)
+        build_queue = _queue_factory(redis_address)
+        producer = build_queue()
+        for index in range(40):
+            producer.publish(f"m{index}")
+        events = []
+        supervisor = ConsumerSupervisor(
+            build_queue,
+            _record_pid(redis_address),
+            processes=2,
+            concurrency=2,
+            on_event=events.append,
+            start_method="fork",
+        )
+
+        thread = _run_in_thread(supervisor)
+        _wait_for(lambda: client.llen("handled") == 40)
+        supervisor.stop()
+        thread.join(timeout=30)
+
+        assert not thread.is_alive()
+        handled = [entry.decode().split(":", 1) for entry in client.lrange("handled", 0, -1)]
+        assert sorted(message for _, message in handled) == sorted(f"m{index}" for index in range(40))
+        assert os.getpid() not in {int(pid) for pid, _ in handled}
+        assert client.llen(producer.key.processing) == 0
+        acks = [event for event in events if event.operation == EventOperation.ACK]
+        assert len(acks) == 40
+        assert all(event.error is None for event in events)
+
+    def test_crashed_child_is_restarted(self, redis_address):
+        client = redis.Redis(*redis_address)
+        build_queue = _queue_factory(redis_address, name="crashy")
+        producer = build_queue()
+        producer.publish("crash")
+
+        supervisor = ConsumerSupervisor(
+            build_queue,
+            _crash_once_handler(redis_address),
+            processes=1,
+            restart_backoff_seconds=0.1,
+            max_restart_backoff_seconds=0.2,
+            start_method="fork",
+        )
+        thread = _run_in_thread(supervisor)
+        _wait_for(lambda: supervisor.restarts >= 1)
+        # Published after the crash: a message prefetched by the dying child
+        # would sit in processing until its visibility timeout.
+        producer.publish("ok")
+        _wait_for(lambda: client.llen("handled") == 1)
+        supervisor.stop()
+        thread.join(timeout=30)
+
+        assert supervisor.restarts >= 1
+        assert client.lrange("handled", 0, -1) == [b"ok"]
+
+    def test_restart_log_reports_the_delay_actually_used(self, redis_address, caplog):
+        client = redis.Redis(*redis_address)
+        build_queue = _queue_factory(redis_address, name="crashy-twice")
+        producer = build_queue()
+        producer.publish("crash")
+
+        supervisor = ConsumerSupervisor(
+            build_queue,
+            _crash_once_handler(redis_address),
+            processes=1,
+            restart_backoff_seconds=0.1,
+            max_restart_backoff_seconds=0.2,
+            start_method="fork",
+        )
+        with caplog.at_level("WARNING", logger="redis_message_queue._consumer_supervisor"):
+            thread = _run_in_thread(supervisor)
+            _wait_for(lambda: supervisor.restarts >= 1)
+            # Outlive the maximum backoff so the next crash resets it.
+            time.sleep(0.5)
+            producer.publish("crash")
+            _wait_for(lambda: supervisor.restarts >= 2)
+            producer.publish("ok")
+            _wait_for(lambda: client.llen("handled") == 1)
+            supervisor.stop()
+            thread.join(timeout=30)
+
+        delays = [record.args[2] for record in caplog.records if "restarting in" in record.getMessage()]
+        assert delays[:2] == [0.1, 0.1]
+
+    def test_run_consumer_processes_stops_on_interrupt(self, redis_address):
+        stop_event = threading.Event()
+        started_at = time.monotonic()
+        threading.Timer(0.5, stop_event.set).start()
+
+        run_consumer_processes(
+            _queue_factory(redis_address, name="idle"),
+            lambda message: None,
+            processes=2,
+            interrupt=EventDrivenInterruptHandler(stop_event),
+        )
+
+        assert time.monotonic() - started_at < 15
+
+
+def _crash_once_handler(address):
+    def handler(message):
+        host, port = address
+        client = redis.Redis(host=host, port=port)
+        if message == b"crash":
+            os._exit(1)
+        client.rpush("handled", message)
+
+    return handler
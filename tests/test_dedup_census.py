@@ -0,0 +1,137 @@
+"""deduplication_census(): SCAN-based count, memory estimate, and expiry histogram of dedup markers."""
+
+import math
+import uuid
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, DeduplicationCensus, RedisGateway, RedisMessageQueue
+from redis_message_queue._dedup_census import ESTIMATED_STRING_KEY_OVERHEAD_BYTES
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+def _queue(client, name: str = "census", **kwargs) -> RedisMessageQueue:
+    return RedisMessageQueue(name, client=client, deduplication=True, get_deduplication_key=lambda m: m, **kwargs)
+
+
+class _MeasuredGateway(RedisGateway):
+    def key_footprints(self, keys):
+        return [(self._redis_client.pttl(key), 100, 0) for key in keys]
+
+
+class TestDeduplicationCensus:
+    def test_counts_markers_by_remaining_ttl(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client)
+        for index in range(30):
+            queue.publish(f"m{index}")
+        client.set(queue.key.deduplication("soon"), "", px=30_000)
+        client.set(queue.key.deduplication("pinned"), "")
+
+        census = queue.deduplication_census(batch_size=7)
+
+        assert census.markers == 32 and census.complete
+        assert census.without_ttl == 1
+        assert census.expiry_histogram[60.0] == 1
+        assert census.expiry_histogram[3600.0] == 30
+        assert list(census.expiry_histogram) == sorted(census.expiry_histogram)
+        assert list(census.expiry_histogram)[-1] == math.inf
+
+    def test_estimates_bytes_without_memory_usage(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client)
+        queue.publish("only")
+
+        census = queue.deduplication_census()
+
+        expected = len(queue.key.deduplication("only")) + ESTIMATED_STRING_KEY_OVERHEAD_BYTES
+        assert census.memory_measured is False
+        assert census.estimated_bytes == expected
+        assert census.bytes_per_marker == expected
+
+    def test_uses_measured_memory_when_available(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "census",
+            gateway=_MeasuredGateway(redis_client=client, retry_budget_seconds=0),
+            deduplication=True,
+            get_deduplication_key=lambda m: m,
+        )
+        for message in ("a", "b", "c"):
+            queue.publish(message)
+
+        census = queue.deduplication_census()
+
+        assert census.memory_measured is True
+        assert census.estimated_bytes == 300 and census.bytes_per_marker == 100
+
+    def test_max_markers_samples(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client)
+        for index in range(20):
+            queue.publish(f"m{index}")
+
+        census = queue.deduplication_census(max_markers=5, batch_size=3)
+
+        assert census.markers == 5 and not census.complete
+        assert queue.deduplication_census(max_markers=20).complete
+
+    def test_ignores_other_queues_and_publish_replay_keys(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client)
+        queue.publish("mine")
+        _queue(client, "census-other").publish("theirs")
+        client.set(f"{queue.key.deduplication('mine')}:publish_operation_result:{uuid.uuid4().hex}", "1")
+
+        assert queue.deduplication_census().markers == 1
+
+    def test_user_keys_that_look_like_replay_keys_are_markers(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client)
+        queue.publish("order:publish_operation_result:42")
+        queue.publish(f"order:publish_operation_result:{uuid.uuid4().hex}:retry")
+
+        assert queue.deduplication_census().markers == 2
+
+    def test_empty_queue(self):
+        census = _queue(fakeredis.FakeRedis()).deduplication_census()
+
+        assert census == DeduplicationCensus(
+            markers=0,
+            estimated_bytes=0,
+            expiry_histogram=census.expiry_histogram,
+            without_ttl=0,
+            complete=True,
+            memory_measured=True,
+        )
+        assert set(census.expiry_histogram.values()) == {0} and census.bytes_per_marker == 0.0
+
+    @pytest.mark.parametrize(
+        ("kwargs", "error"),
+        [
+            ({"max_markers": 0}, ConfigurationError),
+            ({"max_markers": 1.5}, TypeError),
+            ({"batch_size": 0}, ConfigurationError),
+            ({"batch_size": True}, TypeError),
+        ],
+    )
+    def test_rejects_bad_arguments(self, kwargs, error):
+        with pytest.raises(error):
+            _queue(fakeredis.FakeRedis()).deduplication_census(**kwargs)
+
+
+class TestAsyncDeduplicationCensus:
+    @pytest.mark.asyncio
+    async def test_counts_markers(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue(
+            "census-async", client=client, deduplication=True, get_deduplication_key=lambda m: m
+        )
+        for index in range(12):
+            await queue.publish(f"m{index}")
+
+        census = await queue.deduplication_census(batch_size=5)
+
+        assert census.markers == 12 and census.complete
+        assert sum(census.expiry_histogram.values()) == 12
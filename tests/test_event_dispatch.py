@@ -0,0 +1,165 @@
+"""BackgroundEventDispatcher: on_event delivery off the publish/claim/ack path."""
+
+import asyncio
+import threading
+
+import fakeredis
+import pytest
+
+from redis_message_queue import BackgroundEventDispatcher, ConfigurationError, QueueEvent, RedisMessageQueue
+from redis_message_queue.asyncio import BackgroundEventDispatcher as AsyncBackgroundEventDispatcher
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+def _event(operation: str = "publish") -> QueueEvent:
+    return QueueEvent(queue="q", operation=operation, outcome="success")  # type: ignore[arg-type]
+
+
+class TestConfiguration:
+    @pytest.mark.parametrize("dispatcher_class", [BackgroundEventDispatcher, AsyncBackgroundEventDispatcher])
+    def test_rejects_bad_buffer_size(self, dispatcher_class):
+        with pytest.raises(ConfigurationError, match="max_buffered_events"):
+            dispatcher_class(lambda event: None, max_buffered_events=0)
+        with pytest.raises(TypeError, match="max_buffered_events"):
+            dispatcher_class(lambda event: None, max_buffered_events=True)
+
+    def test_rejects_unknown_overflow_policy(self):
+        with pytest.raises(ConfigurationError, match="overflow_policy"):
+            BackgroundEventDispatcher(lambda event: None, overflow_policy="block")
+
+    def test_sync_dispatcher_rejects_async_callback(self):
+        async def on_event(event):
+            pass
+
+        with pytest.raises(TypeError, match="async"):
+            BackgroundEventDispatcher(on_event)
+
+    def test_sync_queue_rejects_async_dispatcher(self):
+        async def on_event(event):
+            pass
+
+        with pytest.raises(TypeError, match="async"):
+            RedisMessageQueue(
+                "dispatch", client=fakeredis.FakeRedis(), on_event=AsyncBackgroundEventDispatcher(on_event)
+            )
+
+
+class TestSyncDispatcher:
+    def test_slow_callback_does_not_block_publish(self):
+        release = threading.Event()
+        delivered: list[QueueEvent] = []
+
+        def on_event(event):
+            release.wait(5)
+            delivered.append(event)
+
+        with BackgroundEventDispatcher(on_event) as dispatcher:
+            queue = RedisMessageQueue("dispatch", client=fakeredis.FakeRedis(), on_event=dispatcher)
+            queue.publish("a")
+            queue.publish("b")
+            # Both publishes returned while the first delivery is still stuck.
+            assert delivered == []
+            release.set()
+            assert dispatcher.flush(timeout_seconds=5)
+
+        assert [event.operation for event in delivered] == ["publish", "publish"]
+        assert dispatcher.dropped_events == 0
+
+    @pytest.mark.parametrize(
+        ("overflow_policy", "expected"),
+        [("drop_oldest", ["publish", "nack", "ack"]), ("drop_newest", ["publish", "claim", "nack"])],
+    )
+    def test_overflow_policy(self, overflow_policy, expected):
+        release = threading.Event()
+        delivered: list[str] = []
+
+        def on_event(event):
+            release.wait(5)
+            delivered.append(event.operation)
+
+        dispatcher = BackgroundEventDispatcher(on_event, max_buffered_events=2, overflow_policy=overflow_policy)
+        dispatcher(_event("publish"))
+        # Wait until the thread holds the first event, so the buffer is empty.
+        while dispatcher.buffered_events:
+            threading.Event().wait(0.01)
+        for operation in ("claim", "nack", "ack"):
+            dispatcher(_event(operation))
+        release.set()
+        assert dispatcher.close(timeout_seconds=5)
+
+        assert delivered == expected
+        assert dispatcher.dropped_events == 1
+
+    def test_events_after_close_are_counted_as_dropped(self):
+        dispatcher = BackgroundEventDispatcher(lambda event: None)
+        assert dispatcher.close()
+        dispatcher(_event())
+
+        assert dispatcher.dropped_events == 1
+
+    def test_callback_failure_warns_and_keeps_delivering(self):
+        delivered: list[str] = []
+
+        def on_event(event):
+            if event.operation == "claim":
+                raise ValueError("exporter down")
+            delivered.append(event.operation)
+
+        dispatcher = BackgroundEventDispatcher(on_event)
+        with pytest.warns(RuntimeWarning, match="ValueError"):
+            dispatcher(_event("claim"))
+            dispatcher(_event("ack"))
+            assert dispatcher.flush(timeout_seconds=5)
+        dispatcher.close()
+
+        assert delivered == ["ack"]
+
+
+class TestAsyncDispatcher:
+    @pytest.mark.asyncio
+    async def test_slow_callback_does_not_block_publish(self):
+        release = asyncio.Event()
+        delivered: list[QueueEvent] = []
+
+        async def on_event(event):
+            await release.wait()
+            delivered.append(event)
+
+        async with AsyncBackgroundEventDispatcher(on_event) as dispatcher:
+            queue = AsyncRedisMessageQueue("dispatch-async", client=fakeredis.FakeAsyncRedis(), on_event=dispatcher)
+            await queue.publish("a")
+            await queue.publish("b")
+            assert delivered == []
+            release.set()
+            assert await dispatcher.flush(timeout_seconds=5)
+
+        assert [event.operation for event in delivered] == ["publish", "publish"]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_counts_overflow(self):
+        delivered: list[str] = []
+
+        async def on_event(event):
+            delivered.append(event.operation)
+
+        dispatcher = AsyncBackgroundEventDispatcher(on_event, max_buffered_events=2)
+        # Enqueueing never yields, so the task only starts after all three calls.
+        for operation in ("publish", "claim", "ack"):
+            await dispatcher(_event(operation))
+        assert await dispatcher.aclose(timeout_seconds=5)
+
+        assert delivered == ["claim", "ack"]
+        assert dispatcher.dropped_events == 1
+
+    @pytest.mark.asyncio
+    async def test_aclose_timeout_cancels_and_counts_undelivered(self):
+        async def on_event(event):
+            await asyncio.sleep(10)
+
+        dispatcher = AsyncBackgroundEventDispatcher(on_event)
+        await dispatcher(_event("publish"))
+        await dispatcher(_event("claim"))
+        await asyncio.sleep(0)
+
+        assert not await dispatcher.aclose(timeout_seconds=0.05)
+        assert dispatcher.dropped_events == 1
@@ -0,0 +1,96 @@
+"""EventFilter: operation/outcome allowlists and sampling before QueueEvent construction."""
+
+from unittest import mock
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, EventFilter, MetricsCollector, QueueEvent, RedisMessageQueue
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class TestConfiguration:
+    def test_rejects_unknown_operation(self):
+        with pytest.raises(ConfigurationError, match="lease_renewed"):
+            EventFilter(operations=["lease_renewed"])
+
+    def test_rejects_single_string(self):
+        with pytest.raises(TypeError, match="operations"):
+            EventFilter(operations="publish")
+
+    def test_rejects_empty_allowlist(self):
+        with pytest.raises(ConfigurationError, match="outcomes"):
+            EventFilter(outcomes=[])
+
+    @pytest.mark.parametrize("rate", [-0.1, 1.5, float("nan")])
+    def test_rejects_out_of_range_rate(self, rate):
+        with pytest.raises(ConfigurationError, match="sample_rates"):
+            EventFilter(sample_rates={"claim_empty": rate})
+
+    def test_queue_requires_on_event(self):
+        with pytest.raises(ConfigurationError, match="event_filter"):
+            RedisMessageQueue("filtered", client=fakeredis.FakeRedis(), event_filter=EventFilter())
+
+    def test_queue_rejects_non_filter(self):
+        with pytest.raises(TypeError, match="event_filter"):
+            RedisMessageQueue("filtered", client=fakeredis.FakeRedis(), on_event=print, event_filter={"ack"})
+
+
+class TestAllows:
+    def test_allowlists(self):
+        event_filter = EventFilter(operations=["ack", "nack"], outcomes=["success"])
+
+        assert event_filter.allows("ack", "success")
+        assert not event_filter.allows("ack", "failure")
+        assert not event_filter.allows("publish", "success")
+
+    def test_sample_rates(self):
+        event_filter = EventFilter(sample_rates={"lease_renew": 0.25, "claim_empty": 0.0})
+
+        assert not event_filter.allows("claim_empty", "skipped")
+        assert event_filter.allows("claim", "success")
+        with mock.patch("redis_message_queue._event_filter.random.random", side_effect=[0.1, 0.9]):
+            assert event_filter.allows("lease_renew", "success")
+            assert not event_filter.allows("lease_renew", "success")
+
+
+class TestQueueIntegration:
+    def test_filtered_events_never_build_queue_events(self):
+        events: list[QueueEvent] = []
+        metrics = MetricsCollector()
+        queue = RedisMessageQueue(
+            "filtered",
+            client=fakeredis.FakeRedis(),
+            on_event=events.append,
+            metrics=metrics,
+            event_filter=EventFilter(sample_rates={"publish": 0.0}),
+        )
+        queue.publish("m")
+        with mock.patch("redis_message_queue.redis_message_queue.QueueEvent", wraps=QueueEvent) as event_class:
+            queue.publish("n")
+            with queue.process_message():
+                pass
+
+        assert [event.operation for event in events] == ["claim", "ack"]
+        assert event_class.call_count == 2
+        # Metrics still count the filtered events.
+        assert metrics.snapshot()[("filtered", "publish", "success")].count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_queue_applies_filter(self):
+        events: list[QueueEvent] = []
+
+        async def on_event(event):
+            events.append(event)
+
+        queue = AsyncRedisMessageQueue(
+            "filtered-async",
+            client=fakeredis.FakeAsyncRedis(),
+            on_event=on_event,
+            event_filter=EventFilter(operations=["ack"]),
+        )
+        await queue.publish("m")
+        async with queue.process_message():
+            pass
+
+        assert [event.operation for event in events] == ["ack"]
@@ -0,0 +1,141 @@
+"""purge(batch_size=/predicate=/on_progress=): sliced purge that also removes per-message state."""
+
+import json
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, PurgeProgress, RedisMessageQueue
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+LARGE = "x" * 2048
+
+
+def _dead_letter_queue(client, count: int) -> RedisMessageQueue:
+    queue = RedisMessageQueue("purge", client=client, max_delivery_count=1)
+    for index in range(count):
+        client.lpush(queue.key.dead_letter, json.dumps({"n": index, "keep": index % 3 == 0}))
+    return queue
+
+
+class TestIncrementalPurge:
+    def test_removes_the_list_in_slices_with_progress(self):
+        client = fakeredis.FakeRedis()
+        queue = _dead_letter_queue(client, 2500)
+        progress: list[PurgeProgress] = []
+
+        assert queue.purge(target="dead_letter", batch_size=1000, on_progress=progress.append) == 2500
+
+        assert client.exists(queue.key.dead_letter) == 0
+        assert [(update.removed, update.scanned, update.total) for update in progress] == [
+            (1000, 1000, 2500),
+            (2000, 2000, 2500),
+            (2500, 2500, 2500),
+        ]
+        assert {update.target for update in progress} == {"dead_letter"}
+
+    def test_pending_purge_clears_delivery_counts(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("purge", client=client, max_delivery_count=3)
+        queue.publish("reclaimed")
+        queue.publish("fresh")
+        delivery_counts = queue._redis._delivery_counts_key(queue.key.processing)
+        client.hset(delivery_counts, client.lindex(queue.key.pending, -1), 1)
+        client.hset(delivery_counts, "in-flight elsewhere", 2)
+
+        assert queue.purge(target="pending", batch_size=1) == 2
+
+        assert client.hkeys(delivery_counts) == [b"in-flight elsewhere"]
+
+    def test_predicate_keeps_the_rest_in_order(self):
+        client = fakeredis.FakeRedis()
+        queue = _dead_letter_queue(client, 250)
+
+        removed = queue.purge(
+            target="dead_letter", batch_size=40, predicate=lambda payload: not json.loads(payload)["keep"]
+        )
+
+        kept = [json.loads(entry)["n"] for entry in reversed(client.lrange(queue.key.dead_letter, 0, -1))]
+        assert kept == [index for index in range(250) if index % 3 == 0]
+        assert removed == 250 - len(kept)
+
+    def test_predicate_sees_decoded_pending_payloads(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("purge", client=client)
+        for message in ("drop-1", "keep", "drop-2"):
+            queue.publish(message)
+
+        assert queue.purge(target="pending", predicate=lambda payload: payload.startswith(b"drop")) == 2
+
+        with queue.process_message() as message:
+            assert message == b"keep"
+
+    def test_entries_pushed_during_the_purge_survive(self):
+        client = fakeredis.FakeRedis()
+        queue = _dead_letter_queue(client, 30)
+
+        def push_more(progress):
+            client.lpush(queue.key.dead_letter, "late")
+
+        assert queue.purge(target="dead_letter", batch_size=10, on_progress=push_more) == 30
+        assert client.lrange(queue.key.dead_letter, 0, -1) == [b"late"] * 3
+
+    def test_claim_check_bodies_are_deleted_with_their_entries(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("purge-cc", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+        queue.publish(LARGE + "keep")
+        queue.publish("small")
+
+        assert queue.purge(target="pending", predicate=lambda payload: not payload.endswith(b"keep")) == 2
+
+        assert len(list(client.scan_iter(match=f"{queue.key.claim_check_prefix}*"))) == 1
+        with queue.process_message() as message:
+            assert message.endswith(b"keep")
+
+    def test_processing_is_still_rejected(self):
+        queue = RedisMessageQueue("purge", client=fakeredis.FakeRedis())
+
+        with pytest.raises(ConfigurationError, match="processing"):
+            queue.purge(target="processing", batch_size=10)
+
+    @pytest.mark.parametrize(
+        ("kwargs", "error"),
+        [
+            ({"batch_size": 0}, ConfigurationError),
+            ({"batch_size": True}, TypeError),
+            ({"predicate": "drop"}, TypeError),
+            ({"on_progress": 1}, TypeError),
+        ],
+    )
+    def test_rejects_bad_arguments(self, kwargs, error):
+        queue = RedisMessageQueue("purge", client=fakeredis.FakeRedis())
+
+        with pytest.raises(error):
+            queue.purge(target="pending", **kwargs)
+
+
+class TestAsyncIncrementalPurge:
+    @pytest.mark.asyncio
+    async def test_slices_with_async_progress(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("purge-async", client=client, max_delivery_count=1)
+        for index in range(25):
+            await client.lpush(queue.key.dead_letter, f"m{index}")
+        progress: list[PurgeProgress] = []
+
+        async def on_progress(update):
+            progress.append(update)
+
+        assert await queue.purge(target="dead_letter", batch_size=10, on_progress=on_progress) == 25
+        assert [update.removed for update in progress] == [10, 20, 25]
+
+    @pytest.mark.asyncio
+    async def test_predicate(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("purge-async", client=client, max_delivery_count=1)
+        for entry in ("a", "b", "a"):
+            await client.lpush(queue.key.dead_letter, entry)
+
+        assert await queue.purge(target="dead_letter", predicate=lambda payload: payload == b"a") == 2
+        assert await client.lrange(queue.key.dead_letter, 0, -1) == [b"b"]
@@ -0,0 +1,96 @@
+"""iter_messages(): bounded-window streaming over queue lists."""
+
+import json
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, GatewayContractError, RedisGateway, RedisMessageQueue
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class _NoRangeGateway(RedisGateway):
+    range_messages = None  # type: ignore[assignment]
+
+
+def _dead_letter_queue(client, count: int) -> RedisMessageQueue:
+    queue = RedisMessageQueue("iter", client=client)
+    for index in range(count):
+        client.lpush(queue.key.dead_letter, json.dumps({"n": index}))
+    return queue
+
+
+class TestIterMessages:
+    def test_streams_oldest_first_in_bounded_windows(self):
+        client = fakeredis.FakeRedis()
+        queue = _dead_letter_queue(client, 25)
+        windows: list[tuple[int, int]] = []
+        lrange = client.lrange
+
+        def recording_lrange(key, start, stop):
+            windows.append((start, stop))
+            return lrange(key, start, stop)
+
+        client.lrange = recording_lrange
+        messages = list(queue.iter_messages("dead_letter", batch_size=10))
+
+        assert [json.loads(message)["n"] for message in messages] == list(range(25))
+        assert windows == [(-10, -1), (-20, -11), (-25, -21)]
+
+    def test_pending_envelopes_are_decoded(self):
+        queue = RedisMessageQueue("iter-pending", client=fakeredis.FakeRedis())
+        queue.publish("text")
+        queue.publish(b"\x00bytes")
+        queue.publish({"k": 1})
+
+        assert list(queue.iter_messages(batch_size=2)) == [b"text", b"\x00bytes", b'{"k": 1}']
+
+    def test_predicate_filters(self):
+        queue = _dead_letter_queue(fakeredis.FakeRedis(), 10)
+
+        odd = queue.iter_messages("dead_letter", batch_size=3, predicate=lambda message: json.loads(message)["n"] % 2)
+
+        assert [json.loads(message)["n"] for message in odd] == [1, 3, 5, 7, 9]
+
+    def test_head_pushes_during_iteration_do_not_repeat_entries(self):
+        client = fakeredis.FakeRedis()
+        queue = _dead_letter_queue(client, 6)
+        seen = []
+        for message in queue.iter_messages("dead_letter", batch_size=2):
+            seen.append(json.loads(message)["n"])
+            client.lpush(queue.key.dead_letter, json.dumps({"n": 100 + len(seen)}))
+
+        # The walk stops at the length seen when it started.
+        assert seen == list(range(6))
+
+    def test_validates_arguments_on_call(self):
+        queue = RedisMessageQueue("iter-args", client=fakeredis.FakeRedis(), max_delivery_count=None)
+        with pytest.raises(ConfigurationError, match="batch_size"):
+            queue.iter_messages(batch_size=0)
+        with pytest.raises(TypeError, match="predicate"):
+            queue.iter_messages(predicate="yes")
+        with pytest.raises(ConfigurationError, match="source"):
+            queue.iter_messages("archive")
+        with pytest.raises(ConfigurationError):
+            queue.iter_messages("dead_letter")
+
+    def test_gateway_without_range_messages(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("iter-custom", gateway=_NoRangeGateway(redis_client=client))
+        with pytest.raises(GatewayContractError, match="range_messages"):
+            queue.iter_messages()
+
+
+class TestAsyncIterMessages:
+    @pytest.mark.asyncio
+    async def test_streams_oldest_first(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("iter-async", client=client)
+        for index in range(7):
+            await queue.publish(f"m{index}")
+
+        messages = [message async for message in queue.iter_messages(batch_size=3)]
+        even = [message async for message in queue.iter_messages(predicate=lambda m: int(m[1:]) % 2 == 0)]
+
+        assert messages == [f"m{index}".encode() for index in range(7)]
+        assert even == [b"m0", b"m2", b"m4", b"m6"]
@@ -0,0 +1,146 @@
+"""process_message(lazy=True): metadata from the claim, payload only on body()."""
+
+from unittest import mock
+
+import fakeredis
+import pytest
+
+from redis_message_queue import MalformedStoredMessageError, MessageHandle, _stored_message
+from redis_message_queue._stored_message import (
+    encode_stored_message,
+    extract_stored_message_id,
+    read_stored_message_id,
+)
+from redis_message_queue.asyncio import MessageHandle as AsyncMessageHandle
+from redis_message_queue.asyncio.redis_message_queue import RedisMessageQueue as AsyncRedisMessageQueue
+from redis_message_queue.redis_message_queue import RedisMessageQueue
+
+LARGE = "x" * 2048
+
+
+def _expire_lease(client, queue):
+    gateway = queue._redis
+    [stored] = client.lrange(queue.key.processing, 0, -1)
+    client.zadd(gateway._lease_deadlines_key(queue.key.processing), {stored: 0})
+
+
+class TestLazyProcessMessageSync:
+    def test_handle_exposes_metadata_and_body(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("lazy", client=client)
+        queue.publish({"k": "v"})
+        stored = client.lindex(queue.key.pending, 0)
+
+        with queue.process_message(lazy=True) as handle:
+            assert isinstance(handle, MessageHandle)
+            assert handle.message_id == extract_stored_message_id(stored)
+            assert handle.delivery_count == 1
+            assert handle.size == len(stored)
+            assert handle.body() == b'{"k": "v"}'
+
+        assert client.llen(queue.key.processing) == 0
+
+    def test_body_is_decoded_once_and_only_on_demand(self):
+        queue = RedisMessageQueue("lazy", client=fakeredis.FakeRedis())
+        queue.publish("payload")
+
+        with mock.patch(
+            "redis_message_queue.redis_message_queue.decode_stored_message",
+            wraps=_stored_message.decode_stored_message,
+        ) as decode:
+            with queue.process_message(lazy=True) as handle:
+                assert decode.call_count == 0
+                assert handle.body() == b"payload"
+                assert handle.body() == b"payload"
+            assert decode.call_count == 1
+
+    def test_empty_queue_yields_none(self):
+        queue = RedisMessageQueue("lazy", client=fakeredis.FakeRedis())
+
+        with queue.process_message(lazy=True) as handle:
+            assert handle is None
+
+    def test_claim_checked_body_is_fetched_lazily_and_released(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("lazy", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+
+        with mock.patch.object(
+            queue._redis, "_load_claim_check_body", wraps=queue._redis._load_claim_check_body
+        ) as load:
+            with queue.process_message(lazy=True) as handle:
+                assert handle.size == 2048
+                assert load.call_count == 0
+                assert handle.body() == LARGE.encode("utf-8")
+            assert load.call_count == 1
+
+        assert list(client.scan_iter(match=f"{queue.key.claim_check_prefix}*")) == []
+
+    def test_unread_claim_checked_body_is_still_released_on_ack(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("lazy", client=client, claim_check_threshold_bytes=1024)
+        queue.publish(LARGE)
+
+        with queue.process_message(lazy=True):
+            pass
+
+        assert list(client.scan_iter(match=f"{queue.key.claim_check_prefix}*")) == []
+
+    def test_delivery_count_increments_on_redelivery(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("lazy", client=client)
+        queue.publish("again")
+        first = queue._redis.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        assert first.delivery_count == 1
+        _expire_lease(client, queue)
+
+        with queue.process_message(lazy=True) as handle:
+            assert handle.delivery_count == 2
+
+    def test_malformed_envelope_surfaces_from_body_and_nacks(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("lazy", client=client, strict_envelope_decoding=True)
+        client.lpush(queue.key.pending, b'\x1eRMQ1:{"id": "abc", "payload": ')
+
+        with pytest.raises(MalformedStoredMessageError):
+            with queue.process_message(lazy=True) as handle:
+                handle.body()
+
+        assert client.llen(queue.key.processing) == 0
+
+
+class TestLazyProcessMessageAsync:
+    @pytest.mark.asyncio
+    async def test_handle_exposes_metadata_and_body(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("lazy-async", client=client, claim_check_threshold_bytes=1024)
+        await queue.publish("small")
+        await queue.publish(LARGE)
+
+        async with queue.process_message(lazy=True) as handle:
+            assert isinstance(handle, AsyncMessageHandle)
+            assert handle.delivery_count == 1
+            assert await handle.body() == b"small"
+        async with queue.process_message(lazy=True) as handle:
+            assert handle.size == 2048
+            assert await handle.body() == LARGE.encode("utf-8")
+            assert await handle.body() == LARGE.encode("utf-8")
+
+        assert [key async for key in client.scan_iter(match=f"{queue.key.claim_check_prefix}*")] == []
+
+
+class TestReadStoredMessageId:
+    @pytest.mark.parametrize(
+        "message",
+        [
+            encode_stored_message("text"),
+            encode_stored_message("text").encode("utf-8"),
+            encode_stored_message(b"\xff\x00binary"),
+            '\x1eRMQ1:{"payload": "p", "id": "reordered"}',
+            "\x1eRMQ1:" + '{"id": "esc\\u0061ped", "payload": "p"}',
+            "legacy plain payload",
+        ],
+        ids=["text", "text-bytes", "binary", "reordered", "escaped-id", "legacy"],
+    )
+    def test_matches_full_decode(self, message):
+        assert read_stored_message_id(message) == extract_stored_message_id(message)
@@ -502,6 +502,31 @@ class TestSyncLeaseRenewal:
         assert client.zscore(lease_key, processing_message) == current_deadline
         assert gateway.renew_message_lease(queue.key.processing, second.stored_message, second.lease_token) is True
 
+    def test_gateway_renews_a_batch_of_leases_in_one_call(self):
+        client = fakeredis.FakeRedis()
+        gateway = RedisGateway(
+            redis_client=client,
+            retry_budget_seconds=0,
+            message_wait_interval_seconds=0,
+            message_visibility_timeout_seconds=30,
+        )
+        queue = RedisMessageQueue("test", gateway=gateway)
+        queue.publish("a")
+        queue.publish("b")
+        first = gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        second = gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        lease_key = gateway._lease_deadlines_key(queue.key.processing)
+        client.zadd(lease_key, {first.stored_message: 0, second.stored_message: 0})
+
+        renewed = gateway._renew_message_leases(
+            queue.key.processing,
+            [(first.stored_message, first.lease_token), (second.stored_message, "stale")],
+        )
+
+        assert renewed == [True, False]
+        assert client.zscore(lease_key, first.stored_message) > 0
+        assert client.zscore(lease_key, second.stored_message) == 0
+
     def test_queue_heartbeat_prevents_redelivery_of_long_running_message(self):
         client = fakeredis.FakeRedis()
         queue_gateway = RedisGateway(
@@ -582,6 +607,32 @@ class TestAsyncLeaseRenewal:
         )
         assert fresh_result is True
 
+    @pytest.mark.asyncio
+    async def test_gateway_renews_a_batch_of_leases_in_one_call(self):
+        client = fakeredis.FakeAsyncRedis()
+        gateway = AsyncRedisGateway(
+            redis_client=client,
+            retry_budget_seconds=0,
+            message_wait_interval_seconds=0,
+            message_visibility_timeout_seconds=30,
+        )
+        queue = AsyncRedisMessageQueue("test", gateway=gateway)
+        await queue.publish("a")
+        await queue.publish("b")
+        first = await gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        second = await gateway.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        lease_key = gateway._lease_deadlines_key(queue.key.processing)
+        await client.zadd(lease_key, {first.stored_message: 0, second.stored_message: 0})
+
+        renewed = await gateway._renew_message_leases(
+            queue.key.processing,
+            [(first.stored_message, first.lease_token), (second.stored_message, "stale")],
+        )
+
+        assert renewed == [True, False]
+        assert await client.zscore(lease_key, first.stored_message) > 0
+        assert await client.zscore(lease_key, second.stored_message) == 0
+
     @pytest.mark.asyncio
     async def test_queue_heartbeat_prevents_redelivery_of_long_running_message(self):
         client = fakeredis.FakeAsyncRedis()
@@ -0,0 +1,247 @@
+"""collect_orphaned_metadata() and `python -m redis_message_queue gc`: per-message metadata GC."""
+
+import fakeredis
+import pytest
+import redis
+
+from redis_message_queue import ConfigurationError, OrphanedMetadataReport, RedisMessageQueue
+from redis_message_queue._cli import main
+from redis_message_queue._config import REMOVE_STALE_METADATA_LUA_SCRIPT
+from redis_message_queue._metadata_gc import message_fingerprint
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+def _hash_lengths(client, queue) -> dict[str, int]:
+    gateway = queue._redis
+    processing = queue.key.processing
+    return {
+        "delivery_counts": client.hlen(gateway._delivery_counts_key(processing)),
+        "claim_result_refs": client.hlen(gateway._claim_result_refs_key(processing)),
+        "claim_result_ids": client.hlen(gateway._claim_result_ids_key(processing)),
+        "claim_result_backrefs": client.hlen(gateway._claim_result_backrefs_key(processing)),
+    }
+
+
+def _claim(queue, count: int) -> None:
+    for _ in range(count):
+        queue._redis.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+
+
+class TestWithoutVisibilityTimeout:
+    def _queue(self, client) -> RedisMessageQueue:
+        queue = RedisMessageQueue("gc", client=client, visibility_timeout_seconds=None, max_delivery_count=None)
+        for message in ("a", "b", "c"):
+            queue.publish(message)
+        _claim(queue, 3)
+        return queue
+
+    def test_claims_still_in_processing_are_kept(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+
+        report = queue.collect_orphaned_metadata()
+
+        assert report == OrphanedMetadataReport(scanned=6, removed=0, bytes_reclaimed=0)
+        assert _hash_lengths(client, queue)["claim_result_ids"] == 3
+
+    def test_abandoned_claims_removed_by_hand_are_collected(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        gone = client.rpop(queue.key.processing)
+
+        report = queue.collect_orphaned_metadata(batch_size=1)
+
+        assert report.removed == 2
+        # The backref's field and the id's value are the message itself.
+        assert report.bytes_reclaimed > 2 * len(gone)
+        assert _hash_lengths(client, queue) == {
+            "delivery_counts": 0,
+            "claim_result_refs": 0,
+            "claim_result_ids": 2,
+            "claim_result_backrefs": 2,
+        }
+        with queue.process_message():
+            pass
+
+    def test_only_fields_of_messages_gone_from_processing_reach_the_script(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        gone = client.rpop(queue.key.processing)
+        remove = queue._redis.remove_stale_metadata
+        batches = {}
+
+        def spy(processing, metadata, fields):
+            batches[metadata] = list(fields)
+            return remove(processing, metadata, fields)
+
+        queue._redis.remove_stale_metadata = spy
+
+        assert queue.collect_orphaned_metadata().removed == 2
+        assert batches["claim_result_backrefs"] == [gone]
+        # Claim ids are keyed by claim id; their value names the message.
+        [claim_id] = batches["claim_result_ids"]
+        assert client.hget(queue._redis._claim_result_ids_key(queue.key.processing), claim_id) is None
+
+    def test_processing_past_many_windows(self, monkeypatch):
+        monkeypatch.setattr("redis_message_queue.redis_message_queue.METADATA_GC_PENDING_WINDOW", 2)
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        for index in range(4):
+            queue.publish(f"more-{index}")
+        _claim(queue, 4)
+        gone = client.lpop(queue.key.processing)
+
+        assert queue.collect_orphaned_metadata(batch_size=2).removed == 2
+        backrefs = client.hkeys(queue._redis._claim_result_backrefs_key(queue.key.processing))
+        assert set(backrefs) == set(client.lrange(queue.key.processing, 0, -1))
+        assert gone not in backrefs
+
+
+class TestWithVisibilityTimeout:
+    def _queue(self, client) -> RedisMessageQueue:
+        queue = RedisMessageQueue("gc-vt", client=client, visibility_timeout_seconds=30, max_delivery_count=3)
+        for message in ("a", "b", "c"):
+            queue.publish(message)
+        return queue
+
+    def test_leased_messages_are_kept(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        _claim(queue, 2)
+
+        assert queue.collect_orphaned_metadata().removed == 0
+        assert set(_hash_lengths(client, queue).values()) == {2}
+
+    def test_leases_are_checked_without_reading_processing(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        _claim(queue, 2)
+        client.hdel(queue._redis._lease_tokens_key(queue.key.processing), client.lindex(queue.key.processing, 0))
+        ranged = []
+        range_fingerprints = queue._redis.range_message_fingerprints
+        queue._redis.range_message_fingerprints = lambda key, *args: (
+            ranged.append(key) or range_fingerprints(key, *args)
+        )
+
+        assert queue.collect_orphaned_metadata().removed == 4
+        assert queue.key.processing not in ranged
+        assert "LPOS" not in REMOVE_STALE_METADATA_LUA_SCRIPT
+
+    def test_metadata_of_a_deleted_processing_list_is_collected(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        _claim(queue, 2)
+        client.delete(queue.key.processing, queue._redis._lease_tokens_key(queue.key.processing))
+
+        report = queue.collect_orphaned_metadata()
+
+        assert report.scanned == 8 and report.removed == 8
+        assert set(_hash_lengths(client, queue).values()) == {0}
+
+    def test_delivery_counts_of_reclaimed_pending_messages_are_kept(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        delivery_counts = queue._redis._delivery_counts_key(queue.key.processing)
+        waiting = client.lindex(queue.key.pending, -1)
+        client.hset(delivery_counts, mapping={waiting: 2, "long gone": 1})
+
+        assert queue.collect_orphaned_metadata().removed == 1
+        assert client.hkeys(delivery_counts) == [waiting]
+
+    def test_delivery_counts_past_many_pending_windows(self, monkeypatch):
+        monkeypatch.setattr("redis_message_queue.redis_message_queue.METADATA_GC_PENDING_WINDOW", 2)
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        for index in range(4):
+            queue.publish(f"more-{index}")
+        delivery_counts = queue._redis._delivery_counts_key(queue.key.processing)
+        pending = client.lrange(queue.key.pending, 0, -1)
+        client.hset(delivery_counts, mapping={**{entry: 1 for entry in pending}, "x": 1, "y": 1, "z": 1})
+        ranged = []
+        range_fingerprints = queue._redis.range_message_fingerprints
+        queue._redis.range_message_fingerprints = lambda key, *args: (
+            ranged.append(args) or range_fingerprints(key, *args)
+        )
+
+        assert queue.collect_orphaned_metadata(batch_size=2).removed == 3
+        assert set(client.hkeys(delivery_counts)) == set(pending)
+        # One walk of pending per run, however many batches the hash takes.
+        assert ranged == [(0, 1), (2, 3), (4, 5), (6, 7)]
+
+    def test_count_of_a_message_handed_back_during_the_walk_is_kept(self):
+        client = fakeredis.FakeRedis()
+        queue = self._queue(client)
+        _claim(queue, 1)
+        gateway = queue._redis
+        delivery_counts = gateway._delivery_counts_key(queue.key.processing)
+        [claimed] = client.lrange(queue.key.processing, 0, -1)
+        range_fingerprints = gateway.range_message_fingerprints
+
+        def walk_then_hand_back(key, *args):
+            window = range_fingerprints(key, *args)
+            # Its lease expires and it is reclaimed after the walker passed.
+            client.hdel(gateway._lease_tokens_key(queue.key.processing), claimed)
+            client.lrem(queue.key.processing, 1, claimed)
+            client.rpush(queue.key.pending, claimed)
+            return window
+
+        gateway.range_message_fingerprints = walk_then_hand_back
+
+        assert queue.collect_orphaned_metadata().removed == 0
+        assert client.hget(delivery_counts, claimed) == b"1"
+
+
+class TestFingerprints:
+    @pytest.mark.parametrize("decode_responses", [False, True])
+    def test_redis_and_python_fingerprints_agree(self, decode_responses):
+        client = fakeredis.FakeRedis(decode_responses=decode_responses)
+        queue = RedisMessageQueue("gc-fp", client=client)
+        for message in ("short", "é" * 40, "x" * 5000):
+            queue.publish(message)
+        if not decode_responses:
+            queue.publish(b"\xff\x00binary")
+
+        entries = client.lrange(queue.key.pending, 0, -1)
+
+        assert queue._redis.range_message_fingerprints(queue.key.pending, 0, -1) == [
+            message_fingerprint(entry) for entry in entries
+        ]
+        assert all(len(fingerprint) < 110 for fingerprint in map(message_fingerprint, entries))
+
+
+class TestValidation:
+    @pytest.mark.parametrize(("batch_size", "error"), [(0, ConfigurationError), (True, TypeError), ("10", TypeError)])
+    def test_rejects_bad_batch_size(self, batch_size, error):
+        queue = RedisMessageQueue("gc", client=fakeredis.FakeRedis())
+
+        with pytest.raises(error, match="batch_size"):
+            queue.collect_orphaned_metadata(batch_size=batch_size)
+
+
+class TestCli:
+    def test_gc_reports_what_it_removed(self, monkeypatch, capsys):
+        client = fakeredis.FakeRedis()
+        monkeypatch.setattr(redis.Redis, "from_url", lambda url, **kwargs: client)
+        queue = RedisMessageQueue("cli-gc", client=client)
+        client.hset(queue._redis._delivery_counts_key(queue.key.processing), "gone", 7)
+
+        assert main(["gc", "--queue", "cli-gc", "--batch-size", "10"]) == 0
+
+        assert "removed 1 of 1 metadata fields of 'cli-gc::processing' (5 bytes)" in capsys.readouterr().out
+
+
+class TestAsyncMetadataGc:
+    @pytest.mark.asyncio
+    async def test_collects_orphans_and_keeps_leases(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("gc-async", client=client, visibility_timeout_seconds=30, max_delivery_count=3)
+        for message in ("a", "b"):
+            await queue.publish(message)
+        await queue._redis.wait_for_message_and_move(queue.key.pending, queue.key.processing)
+        delivery_counts = queue._redis._delivery_counts_key(queue.key.processing)
+        await client.hset(delivery_counts, "gone", 1)
+
+        report = await queue.collect_orphaned_metadata()
+
+        assert report.removed == 1
+        assert await client.hlen(delivery_counts) == 1
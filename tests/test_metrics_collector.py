@@ -0,0 +1,105 @@
+"""MetricsCollector: event counters and duration histograms without QueueEvent objects."""
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, MetricsCollector, QueueEvent, RedisMessageQueue
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class TestConfiguration:
+    @pytest.mark.parametrize("buckets", [(), (5, 1), (1, 1), (0, 1), (1, float("inf"))])
+    def test_rejects_bad_buckets(self, buckets):
+        with pytest.raises(ConfigurationError, match="buckets_ms"):
+            MetricsCollector(buckets_ms=buckets)
+
+    def test_rejects_non_numeric_bucket(self):
+        with pytest.raises(TypeError, match="buckets_ms"):
+            MetricsCollector(buckets_ms=(1, "2"))
+
+    def test_queue_rejects_non_collector(self):
+        with pytest.raises(TypeError, match="metrics"):
+            RedisMessageQueue("metrics", client=fakeredis.FakeRedis(), metrics=object())
+
+
+class TestCollector:
+    def test_histogram_buckets_are_cumulative_and_inclusive(self):
+        metrics = MetricsCollector(buckets_ms=(1, 10))
+        for duration_ms in (0.5, 1.0, 5.0, 50.0):
+            metrics.record("q", "ack", "success", duration_ms)
+        metrics.record("q", "ack", "success")
+
+        sample = metrics.snapshot()[("q", "ack", "success")]
+        assert sample.count == 5
+        assert sample.duration_count == 4
+        assert sample.duration_sum_ms == pytest.approx(56.5)
+        assert sample.bucket_counts == (2, 3, 4)
+
+    def test_reset_drops_counters(self):
+        metrics = MetricsCollector()
+        metrics.record("q", "publish", "success", 1.0)
+        metrics.reset()
+
+        assert metrics.snapshot() == {}
+
+    def test_render_prometheus(self):
+        metrics = MetricsCollector(buckets_ms=(1, 10))
+        metrics.record('a"b', "ack", "success", 2.0)
+        metrics.record('a"b', "claim_empty", "skipped")
+
+        text = metrics.render_prometheus()
+
+        assert "# TYPE rmq_events_total counter" in text
+        ack = 'queue="a\\"b",operation="ack",outcome="success"'
+        assert f"rmq_events_total{{{ack}}} 1" in text
+        assert f'rmq_operation_duration_seconds_bucket{{{ack},le="0.001"}} 0' in text
+        assert f'rmq_operation_duration_seconds_bucket{{{ack},le="0.01"}} 1' in text
+        assert f'rmq_operation_duration_seconds_bucket{{{ack},le="+Inf"}} 1' in text
+        assert f"rmq_operation_duration_seconds_count{{{ack}}} 1" in text
+        # Events without a duration get a counter but no histogram series.
+        assert "claim_empty" in text
+        assert 'operation="claim_empty",outcome="skipped",le=' not in text
+        assert text.endswith("\n")
+
+
+class TestQueueIntegration:
+    def test_sync_queue_counts_lifecycle_without_on_event(self):
+        metrics = MetricsCollector()
+        queue = RedisMessageQueue("metered", client=fakeredis.FakeRedis(), metrics=metrics)
+        queue.publish("m")
+        with queue.process_message():
+            pass
+
+        snapshot = metrics.snapshot()
+        assert snapshot[("metered", "publish", "success")].count == 1
+        assert snapshot[("metered", "claim", "success")].duration_count == 1
+        assert snapshot[("metered", "ack", "success")].count == 1
+
+    def test_metrics_and_on_event_both_receive_events(self):
+        metrics = MetricsCollector()
+        events: list[QueueEvent] = []
+        queue = RedisMessageQueue("both", client=fakeredis.FakeRedis(), metrics=metrics, on_event=events.append)
+        queue.publish("m")
+
+        assert [event.operation for event in events] == ["publish"]
+        assert metrics.snapshot()[("both", "publish", "success")].count == 1
+
+    def test_one_collector_across_queues(self):
+        metrics = MetricsCollector()
+        client = fakeredis.FakeRedis()
+        RedisMessageQueue("one", client=client, metrics=metrics).publish("m")
+        RedisMessageQueue("two", client=client, metrics=metrics).publish("m")
+
+        assert {key[0] for key in metrics.snapshot()} == {"one", "two"}
+
+    @pytest.mark.asyncio
+    async def test_async_queue_counts_lifecycle(self):
+        metrics = MetricsCollector()
+        queue = AsyncRedisMessageQueue("metered-async", client=fakeredis.FakeAsyncRedis(), metrics=metrics)
+        await queue.publish("m")
+        async with queue.process_message():
+            pass
+
+        snapshot = metrics.snapshot()
+        assert snapshot[("metered-async", "publish", "success")].count == 1
+        assert snapshot[("metered-async", "ack", "success")].count == 1
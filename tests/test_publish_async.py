@@ -338,26 +338,26 @@ class TestPublishMessageTypeValidation:
         assert event.error is exc_info.value
 
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("invalid_message", [42, b"hello", None, [1, 2], 3.14, True])
+    @pytest.mark.parametrize("invalid_message", [42, bytearray(b"hello"), None, [1, 2], 3.14, True])
     async def test_non_str_non_dict_message_raises_type_error(self, queue, invalid_message):
-        with pytest.raises(TypeError, match="must be a str or dict"):
+        with pytest.raises(TypeError, match="must be a str, bytes, or dict"):
             await queue.publish(invalid_message)
 
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("invalid_message", [42, b"hello", None, [1, 2], 3.14, True])
+    @pytest.mark.parametrize("invalid_message", [42, bytearray(b"hello"), None, [1, 2], 3.14, True])
     async def test_no_message_enqueued_with_dedup(self, queue, redis_client, invalid_message):
         with pytest.raises(TypeError):
             await queue.publish(invalid_message)
         assert await redis_client.llen(queue.key.pending) == 0
 
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("invalid_message", [42, b"hello", None, [1, 2], 3.14, True])
+    @pytest.mark.parametrize("invalid_message", [42, bytearray(b"hello"), None, [1, 2], 3.14, True])
     async def test_non_str_non_dict_message_raises_without_dedup(self, queue_no_dedup, invalid_message):
-        with pytest.raises(TypeError, match="must be a str or dict"):
+        with pytest.raises(TypeError, match="must be a str, bytes, or dict"):
             await queue_no_dedup.publish(invalid_message)
 
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("invalid_message", [42, b"hello", None, [1, 2], 3.14, True])
+    @pytest.mark.parametrize("invalid_message", [42, bytearray(b"hello"), None, [1, 2], 3.14, True])
     async def test_no_message_enqueued_without_dedup(self, queue_no_dedup, redis_client, invalid_message):
         with pytest.raises(TypeError):
             await queue_no_dedup.publish(invalid_message)
@@ -0,0 +1,123 @@
+"""QueueStatsCollector: cached multi-queue stats without constructing queues."""
+
+from unittest import mock
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, QueueStatsCollector, RedisMessageQueue
+from redis_message_queue.asyncio import QueueStatsCollector as AsyncQueueStatsCollector
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class TestConfiguration:
+    def test_requires_exactly_one_source(self):
+        client = fakeredis.FakeRedis()
+        with pytest.raises(ConfigurationError, match="exactly one"):
+            QueueStatsCollector(client)
+        with pytest.raises(ConfigurationError, match="exactly one"):
+            QueueStatsCollector(client, queue_names=["a"], name_prefix="a")
+
+    def test_rejects_single_string_and_bad_names(self):
+        client = fakeredis.FakeRedis()
+        with pytest.raises(TypeError, match="queue_names"):
+            QueueStatsCollector(client, queue_names="jobs")
+        with pytest.raises(ConfigurationError, match="key separator"):
+            QueueStatsCollector(client, queue_names=["a::b"])
+
+    @pytest.mark.parametrize("cache_seconds", [-1, float("inf")])
+    def test_rejects_bad_cache_seconds(self, cache_seconds):
+        with pytest.raises(ConfigurationError, match="cache_seconds"):
+            QueueStatsCollector(fakeredis.FakeRedis(), queue_names=["a"], cache_seconds=cache_seconds)
+
+    def test_rejects_non_bool_flags(self):
+        with pytest.raises(TypeError, match="include_dead_letter"):
+            QueueStatsCollector(fakeredis.FakeRedis(), queue_names=["a"], include_dead_letter=1)
+
+
+class TestCollect:
+    def test_named_queues_match_queue_stats(self):
+        client = fakeredis.FakeRedis()
+        jobs = RedisMessageQueue("jobs", client=client, enable_completed_queue=True)
+        jobs.publish("a")
+        jobs.publish("b")
+        with jobs.process_message():
+            pass
+        collector = QueueStatsCollector(client, queue_names=["jobs", "idle"], enable_completed_queue=True)
+
+        stats = collector.collect()
+
+        expected = jobs.stats()
+        for field in ("pending", "processing", "completed", "failed", "dead_letter", "leases", "expired_leases"):
+            assert getattr(stats["jobs"], field) == getattr(expected, field)
+        assert (stats["jobs"].pending, stats["jobs"].completed) == (1, 1)
+        assert (stats["idle"].pending, stats["idle"].dead_letter) == (0, 0)
+
+    def test_prefix_discovery_finds_pending_and_processing_only_queues(self):
+        client = fakeredis.FakeRedis()
+        for name in ("tenant-a", "tenant-b", "other"):
+            RedisMessageQueue(name, client=client).publish("m")
+        busy = RedisMessageQueue("tenant-busy", client=client)
+        busy.publish("m")
+        client.set("tenant-x::deduplication::pending", "1")
+
+        with busy.process_message():
+            stats = QueueStatsCollector(client, name_prefix="tenant-").collect()
+
+        assert sorted(stats) == ["tenant-a", "tenant-b", "tenant-busy"]
+        assert (stats["tenant-busy"].pending, stats["tenant-busy"].processing) == (0, 1)
+
+    def test_prefix_glob_characters_are_literal(self):
+        client = fakeredis.FakeRedis()
+        RedisMessageQueue("t*1", client=client).publish("m")
+        RedisMessageQueue("tx1", client=client).publish("m")
+
+        assert sorted(QueueStatsCollector(client, name_prefix="t*").collect()) == ["t*1"]
+
+    def test_results_are_cached_for_cache_seconds(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("cached", client=client)
+        collector = QueueStatsCollector(client, queue_names=["cached"], cache_seconds=60)
+        assert collector.collect()["cached"].pending == 0
+
+        queue.publish("m")
+        assert collector.collect()["cached"].pending == 0
+        assert collector.collect(refresh=True)["cached"].pending == 1
+        with mock.patch("redis_message_queue._queue_stats_collector.time.monotonic", return_value=10**9):
+            queue.publish("n")
+            assert collector.collect()["cached"].pending == 2
+
+    def test_one_pipeline_for_all_queues(self):
+        client = fakeredis.FakeRedis()
+        names = [f"fleet-{index}" for index in range(20)]
+        collector = QueueStatsCollector(client, queue_names=names, cache_seconds=0)
+        with mock.patch.object(client, "pipeline", wraps=client.pipeline) as pipeline:
+            assert len(collector.collect()) == 20
+
+        pipeline.assert_called_once()
+
+    def test_render_prometheus(self):
+        client = fakeredis.FakeRedis()
+        RedisMessageQueue('say"hi', client=client).publish("m")
+
+        text = QueueStatsCollector(client, queue_names=['say"hi']).render_prometheus(prefix="app")
+
+        assert "# TYPE app_queue_messages gauge" in text
+        assert 'app_queue_messages{queue="say\\"hi",list="pending"} 1' in text
+        assert 'app_queue_messages{queue="say\\"hi",list="completed"}' not in text
+        assert 'app_queue_leases{queue="say\\"hi"} 0' in text
+        assert 'app_queue_oldest_pending_age_seconds{queue="say\\"hi"}' in text
+
+
+class TestAsyncCollector:
+    @pytest.mark.asyncio
+    async def test_discovery_and_cache(self):
+        client = fakeredis.FakeAsyncRedis()
+        await AsyncRedisMessageQueue("async-a", client=client).publish("m")
+        collector = AsyncQueueStatsCollector(client, name_prefix="async-", cache_seconds=60)
+
+        assert (await collector.collect())["async-a"].pending == 1
+        await AsyncRedisMessageQueue("async-b", client=client).publish("m")
+        assert sorted(await collector.collect()) == ["async-a"]
+        assert sorted(await collector.collect(refresh=True)) == ["async-a", "async-b"]
+        assert 'rmq_queue_messages{queue="async-b",list="pending"} 1' in await collector.render_prometheus()
@@ -0,0 +1,110 @@
+"""Enqueue time carried in message ids: claim-event queue wait and stats() head age."""
+
+import time
+
+import fakeredis
+import pytest
+
+from redis_message_queue import QueueEvent, RedisMessageQueue
+from redis_message_queue._stored_message import message_age_ms, message_enqueued_at_ms, new_message_id
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+_LEGACY_ENVELOPE = '\x1eRMQ1:{"id":"0f8fad5bd9cb469fa16570867728950e","payload":"old"}'
+
+
+class TestMessageIds:
+    def test_ids_carry_the_enqueue_time(self):
+        before = time.time() * 1000
+        message_id = new_message_id()
+        after = time.time() * 1000
+
+        assert len(message_id) == 32
+        assert before - 1 <= message_enqueued_at_ms(message_id) <= after + 1
+
+    def test_ids_are_unique_and_time_ordered(self):
+        ids = [new_message_id() for _ in range(1000)]
+
+        assert len(set(ids)) == len(ids)
+        assert [message_enqueued_at_ms(message_id) for message_id in ids] == sorted(
+            message_enqueued_at_ms(message_id) for message_id in ids
+        )
+
+    @pytest.mark.parametrize("message_id", ["0f8fad5bd9cb469fa16570867728950e", "not-an-id", ""])
+    def test_legacy_and_foreign_ids_have_no_age(self, message_id):
+        assert message_enqueued_at_ms(message_id) is None
+        assert message_age_ms(message_id) is None
+
+
+class TestClaimEvent:
+    def test_claim_event_reports_queue_wait_and_delivery_count(self):
+        events: list[QueueEvent] = []
+        queue = RedisMessageQueue("waited", client=fakeredis.FakeRedis(), on_event=events.append)
+        queue.publish("m")
+        time.sleep(0.02)
+        with queue.process_message():
+            pass
+
+        (claim,) = [event for event in events if event.operation == "claim"]
+        assert claim.queue_wait_ms >= 15
+        assert claim.delivery_count == 1
+        assert all(event.queue_wait_ms is None for event in events if event is not claim)
+
+    def test_legacy_envelope_has_no_queue_wait(self):
+        events: list[QueueEvent] = []
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("waited-legacy", client=client, on_event=events.append)
+        client.lpush(queue.key.pending, _LEGACY_ENVELOPE)
+        with queue.process_message() as message:
+            assert message == b"old"
+
+        (claim,) = [event for event in events if event.operation == "claim"]
+        assert claim.queue_wait_ms is None
+
+
+class TestStats:
+    def test_oldest_pending_age(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("aged", client=client)
+        assert queue.stats().oldest_pending_age_ms is None
+
+        queue.publish("first")
+        time.sleep(0.02)
+        queue.publish(b"second")
+
+        assert queue.stats().oldest_pending_age_ms >= 15
+
+    def test_legacy_or_foreign_head_has_no_age(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("aged-legacy", client=client)
+        client.lpush(queue.key.pending, _LEGACY_ENVELOPE)
+        assert queue.stats().oldest_pending_age_ms is None
+
+        client.delete(queue.key.pending)
+        client.lpush(queue.key.pending, "raw value")
+        stats = queue.stats()
+        assert stats.pending == 1
+        assert stats.oldest_pending_age_ms is None
+
+    def test_binary_envelope_head_has_an_age(self):
+        queue = RedisMessageQueue("aged-binary", client=fakeredis.FakeRedis())
+        queue.publish(b"\x00\xff")
+
+        assert queue.stats().oldest_pending_age_ms >= 0
+
+    @pytest.mark.asyncio
+    async def test_async_parity(self):
+        events: list[QueueEvent] = []
+
+        async def on_event(event):
+            events.append(event)
+
+        queue = AsyncRedisMessageQueue("aged-async", client=fakeredis.FakeAsyncRedis(), on_event=on_event)
+        assert (await queue.stats()).oldest_pending_age_ms is None
+        await queue.publish("m")
+        assert (await queue.stats()).oldest_pending_age_ms >= 0
+        async with queue.process_message():
+            pass
+
+        (claim,) = [event for event in events if event.operation == "claim"]
+        assert claim.queue_wait_ms >= 0
+        assert claim.delivery_count == 1
@@ -0,0 +1,359 @@
+"""QueueWorker / run_consumers: one claimer feeding a pool of handler threads."""
+
+import threading
+import time
+
+import fakeredis
+import pytest
+
+from redis_message_queue import (
+    ConfigurationError,
+    EventDrivenInterruptHandler,
+    EventOperation,
+    EventOutcome,
+    QueueWorker,
+    RedisMessageQueue,
+    run_consumers,
+)
+
+
+def _queue(name="worker", **kwargs):
+    client = fakeredis.FakeRedis()
+    return client, RedisMessageQueue(name, client=client, **kwargs)
+
+
+def _run_in_thread(worker):
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+class TestConfiguration:
+    @pytest.mark.parametrize("name", ["concurrency", "prefetch"])
+    def test_counts_must_be_positive(self, name):
+        _, queue = _queue()
+        with pytest.raises(ConfigurationError, match=name):
+            QueueWorker(queue, lambda message: None, **{name: 0})
+
+    @pytest.mark.parametrize("name", ["concurrency", "prefetch"])
+    def test_counts_reject_bool(self, name):
+        _, queue = _queue()
+        with pytest.raises(TypeError, match=name):
+            QueueWorker(queue, lambda message: None, **{name: True})
+
+    def test_rejects_async_handler(self):
+        _, queue = _queue()
+
+        async def handler(message):
+            pass
+
+        with pytest.raises(TypeError):
+            QueueWorker(queue, handler)
+
+    def test_rejects_non_queue(self):
+        with pytest.raises(TypeError, match="RedisMessageQueue"):
+            QueueWorker(object(), lambda message: None)
+
+
+class TestQueueWorker:
+    def test_handles_every_message_across_threads_and_acks(self):
+        client, queue = _queue()
+        for index in range(50):
+            queue.publish(f"m{index}")
+        handled = []
+        threads = set()
+        lock = threading.Lock()
+
+        def handler(message):
+            with lock:
+                handled.append(message)
+                threads.add(threading.current_thread().name)
+            time.sleep(0.001)
+
+        worker = QueueWorker(queue, handler, concurrency=4, prefetch=8)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: len(handled) == 50)
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert sorted(handled) == sorted(f"m{index}".encode() for index in range(50))
+        assert len(threads) > 1
+        assert client.llen(queue.key.pending) == 0
+        assert client.llen(queue.key.processing) == 0
+
+    def test_prefetch_bounds_claimed_but_unstarted_messages(self):
+        client, queue = _queue()
+        for index in range(20):
+            queue.publish(f"m{index}")
+        release = threading.Event()
+        started = threading.Event()
+
+        def handler(message):
+            started.set()
+            release.wait(5)
+
+        worker = QueueWorker(queue, handler, concurrency=1, prefetch=2)
+        thread = _run_in_thread(worker)
+        started.wait(5)
+        time.sleep(0.3)
+
+        # One message in the handler plus at most ``prefetch`` buffered.
+        assert client.llen(queue.key.processing) == 3
+        worker.stop()
+        release.set()
+        thread.join(timeout=5)
+        assert client.llen(queue.key.processing) == 0
+        # The two buffered messages were returned, not handled.
+        assert client.llen(queue.key.pending) == 19
+
+    def test_handler_exception_is_terminal_and_worker_keeps_running(self, caplog):
+        client, queue = _queue(enable_failed_queue=True)
+        for payload in ("bad", "good"):
+            queue.publish(payload)
+        handled = []
+
+        def handler(message):
+            if message == b"bad":
+                raise ValueError("boom")
+            handled.append(message)
+
+        worker = QueueWorker(queue, handler)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: handled == [b"good"])
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert client.lrange(queue.key.failed, 0, -1) == [b"bad"]
+        assert "Message handler raised" in caplog.text
+
+    def test_awaitable_return_leaves_message_in_processing(self, caplog):
+        client, queue = _queue()
+        queue.publish("m")
+        returned = []
+
+        async def coroutine():
+            pass
+
+        def handler(message):
+            awaitable = coroutine()
+            returned.append(awaitable)
+            return awaitable
+
+        worker = QueueWorker(queue, handler)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: returned)
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert client.llen(queue.key.processing) == 1
+        assert returned[0].cr_frame is None
+
+    def test_stop_returns_unstarted_buffered_messages_to_pending(self):
+        client, queue = _queue()
+        for index in range(5):
+            queue.publish(f"m{index}")
+        handled = []
+        started = threading.Event()
+        gate = threading.Event()
+
+        def handler(message):
+            started.set()
+            gate.wait(5)
+            handled.append(message)
+
+        worker = QueueWorker(queue, handler, concurrency=1, prefetch=4)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: client.llen(queue.key.processing) == 5)
+        started.wait(5)
+        worker.stop()
+        gate.set()
+        thread.join(timeout=5)
+
+        assert handled == [b"m0"]
+        assert client.llen(queue.key.processing) == 0
+        # Released messages go back to the head, so the next claim gets m1.
+        with queue.process_message() as message:
+            assert message == b"m1"
+
+    def test_drain_stops_the_worker(self):
+        _, queue = _queue()
+        worker = QueueWorker(queue, lambda message: None, concurrency=2)
+        thread = _run_in_thread(worker)
+
+        queue.drain(timeout=1)
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+
+    def test_run_consumers_honors_interrupt(self):
+        client, queue = _queue()
+        for index in range(3):
+            queue.publish(f"m{index}")
+        stop_event = threading.Event()
+        handled = []
+
+        def handler(message):
+            handled.append(message)
+            if len(handled) == 3:
+                stop_event.set()
+
+        run_consumers(
+            queue,
+            handler,
+            concurrency=2,
+            interrupt=EventDrivenInterruptHandler(stop_event),
+        )
+
+        assert len(handled) == 3
+        assert client.llen(queue.key.processing) == 0
+
+    def test_queue_interrupt_stops_the_worker_promptly(self):
+        stop_event = threading.Event()
+        _, queue = _queue(interrupt=EventDrivenInterruptHandler(stop_event))
+        worker = QueueWorker(queue, lambda message: None)
+        thread = _run_in_thread(worker)
+        time.sleep(0.1)
+
+        started_at = time.monotonic()
+        stop_event.set()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert time.monotonic() - started_at < 2
+
+    def test_stop_cuts_an_empty_claim_wait_short(self):
+        _, queue = _queue()
+        worker = QueueWorker(queue, lambda message: None)
+        thread = _run_in_thread(worker)
+        time.sleep(0.1)
+
+        started_at = time.monotonic()
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert time.monotonic() - started_at < 2
+
+
+class TestLeaseAwareBuffer:
+    def test_drain_releases_buffered_leases_and_refunds_delivery_counts(self):
+        events = []
+        client, queue = _queue(visibility_timeout_seconds=30, max_delivery_count=2, on_event=events.append)
+        for index in range(4):
+            queue.publish(f"m{index}")
+        started = threading.Event()
+        gate = threading.Event()
+
+        def handler(message):
+            started.set()
+            gate.wait(5)
+
+        worker = QueueWorker(queue, handler, concurrency=1, prefetch=3)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: client.llen(queue.key.processing) == 4)
+        started.wait(5)
+        queue.drain(timeout=1)
+        gate.set()
+        thread.join(timeout=5)
+
+        assert client.llen(queue.key.processing) == 0
+        assert client.llen(queue.key.pending) == 3
+        assert client.zcard(queue._redis._lease_deadlines_key(queue.key.processing)) == 0
+        assert client.hlen(queue._redis._delivery_counts_key(queue.key.processing)) == 0
+        releases = [event for event in events if event.operation is EventOperation.RELEASE]
+        assert [event.outcome for event in releases] == [EventOutcome.SUCCESS] * 3
+
+    def test_buffered_message_past_its_visibility_timeout_is_not_handled(self):
+        client, queue = _queue(visibility_timeout_seconds=1)
+        queue.publish("slow")
+        queue.publish("stale")
+        handled = []
+
+        def handler(message):
+            handled.append(message)
+            if message == b"slow":
+                time.sleep(1.2)
+
+        worker = QueueWorker(queue, handler, concurrency=1, prefetch=1)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: len(handled) == 2, timeout=10)
+        worker.stop()
+        thread.join(timeout=5)
+
+        # "stale" waited out its lease in the buffer, went back to pending,
+        # and was claimed again with a fresh lease before being handled once.
+        assert handled == [b"slow", b"stale"]
+        assert client.llen(queue.key.processing) == 0
+
+
+class TestSharedLeaseHeartbeat:
+    def _spy_on_renewals(self, queue, batches, renewed=None):
+        renew = queue._redis._renew_message_leases
+
+        def spy(processing, leases, **kwargs):
+            batches.append(len(leases))
+            if renewed is not None:
+                return [renewed] * len(leases)
+            return renew(processing, leases, **kwargs)
+
+        queue._redis._renew_message_leases = spy
+
+    def test_in_flight_leases_are_renewed_together_from_one_thread(self):
+        events = []
+        client, queue = _queue(visibility_timeout_seconds=5, heartbeat_interval_seconds=0.1, on_event=events.append)
+        for index in range(3):
+            queue.publish(f"m{index}")
+        batches = []
+        self._spy_on_renewals(queue, batches)
+        per_message_heartbeats = []
+        queue._build_lease_heartbeat = lambda *args: per_message_heartbeats.append(args)
+        gate = threading.Event()
+
+        worker = QueueWorker(queue, lambda message: gate.wait(5), concurrency=3)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: 3 in batches)
+        gate.set()
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert per_message_heartbeats == []
+        renewed_ids = {event.message_id for event in events if event.operation is EventOperation.LEASE_RENEW}
+        assert len(renewed_ids) == 3
+        assert client.llen(queue.key.processing) == 0
+
+    def test_lost_leases_are_dropped_and_reported_once_each(self):
+        failures = []
+        events = []
+        client, queue = _queue(
+            visibility_timeout_seconds=5,
+            heartbeat_interval_seconds=0.1,
+            on_heartbeat_failure=lambda: failures.append(1),
+            on_event=events.append,
+        )
+        queue.publish("a")
+        queue.publish("b")
+        batches = []
+        self._spy_on_renewals(queue, batches, renewed=False)
+        gate = threading.Event()
+
+        worker = QueueWorker(queue, lambda message: gate.wait(5), concurrency=2)
+        thread = _run_in_thread(worker)
+        _wait_for(lambda: len(failures) == 2)
+        time.sleep(0.3)
+        gate.set()
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert batches == [2]
+        lost = [event for event in events if event.operation is EventOperation.LEASE_RENEW_FAILED]
+        assert [event.outcome for event in lost] == [EventOutcome.SKIPPED] * 2
@@ -0,0 +1,145 @@
+"""redrive_dead_letters(): pipelined, adaptively sized batches with server-derived envelope ids."""
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, RedisGateway, RedisMessageQueue
+from redis_message_queue._redrive import MAX_REDRIVE_BATCH_SIZE, RedriveBatchSizer
+from redis_message_queue._stored_message import (
+    decode_stored_message,
+    message_enqueued_at_ms,
+    read_stored_message_id,
+)
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class _FixedBatchGateway(RedisGateway):
+    redrive_message_batches = None  # type: ignore[assignment]
+
+
+def _queue(client, count: int, **kwargs) -> RedisMessageQueue:
+    queue = RedisMessageQueue("batches", client=client, max_delivery_count=1, **kwargs)
+    for index in range(count):
+        client.lpush(queue.key.dead_letter, f"m{index}")
+    return queue
+
+
+def _recording(monkeypatch, gateway) -> list[list[int]]:
+    calls: list[list[int]] = []
+    redrive_message_batches = gateway.redrive_message_batches
+
+    def recording(dead_letter_queue, pending_queue, batch_sizes):
+        calls.append(list(batch_sizes))
+        return redrive_message_batches(dead_letter_queue, pending_queue, batch_sizes)
+
+    monkeypatch.setattr(gateway, "redrive_message_batches", recording)
+    return calls
+
+
+class TestBatchSizer:
+    def test_grows_at_most_twofold_toward_the_budget(self):
+        sizer = RedriveBatchSizer(0.01)
+        sizer.record(moved=100, elapsed_seconds=0.0001)
+
+        assert sizer.size == 200
+
+    def test_shrinks_to_the_budget(self):
+        sizer = RedriveBatchSizer(0.01)
+        sizer.record(moved=100, elapsed_seconds=0.1)
+
+        assert sizer.size == 10
+
+    def test_clamps(self):
+        sizer = RedriveBatchSizer(1.0)
+        for _ in range(20):
+            sizer.record(moved=sizer.size, elapsed_seconds=0.0)
+        assert sizer.size == MAX_REDRIVE_BATCH_SIZE
+        sizer.record(moved=1, elapsed_seconds=10.0)
+        assert sizer.size == 1
+
+    def test_plan_respects_the_limit(self):
+        sizer = RedriveBatchSizer(0.01)
+
+        assert sizer.plan(None) == [100, 100, 100, 100]
+        assert sizer.plan(250) == [100, 100, 50]
+
+
+class TestRedriveBatches:
+    def test_large_redrive_keeps_order_and_fresh_unique_ids(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, 2500)
+
+        assert queue.redrive_dead_letters() == 2500
+
+        entries = list(reversed(client.lrange(queue.key.pending, 0, -1)))
+        assert [decode_stored_message(entry) for entry in entries] == [f"m{index}".encode() for index in range(2500)]
+        ids = [read_stored_message_id(entry) for entry in entries]
+        assert len(set(ids)) == 2500
+        assert all(message_enqueued_at_ms(message_id) is not None for message_id in ids)
+
+    def test_batches_share_a_round_trip(self, monkeypatch):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, 250)
+        calls = _recording(monkeypatch, queue._redis)
+
+        assert queue.redrive_dead_letters() == 250
+
+        assert calls[0] == [100, 100, 100, 100]
+        assert len(calls) == 1
+
+    def test_max_messages_is_split_across_batches(self, monkeypatch):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, 400)
+        calls = _recording(monkeypatch, queue._redis)
+
+        assert queue.redrive_dead_letters(max_messages=250) == 250
+
+        assert calls == [[100, 100, 50]]
+        assert client.llen(queue.key.dead_letter) == 150
+
+    def test_non_utf8_payload_round_trips(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("batches", client=client, max_delivery_count=1)
+        client.lpush(queue.key.dead_letter, b"\xff\x00raw")
+
+        assert queue.redrive_dead_letters() == 1
+        with queue.process_message() as message:
+            assert message == b"\xff\x00raw"
+
+    def test_gateway_without_batches_falls_back_to_fixed_batches(self):
+        client = fakeredis.FakeRedis()
+        gateway = _FixedBatchGateway(
+            redis_client=client,
+            retry_budget_seconds=0,
+            message_visibility_timeout_seconds=30,
+            max_delivery_count=1,
+            dead_letter_queue="batches::dlq",
+        )
+        queue = RedisMessageQueue("batches", gateway=gateway)
+        for index in range(150):
+            client.lpush("batches::dlq", f"m{index}")
+
+        assert queue.redrive_dead_letters() == 150
+        assert client.llen(queue.key.pending) == 150
+
+    @pytest.mark.parametrize(("budget", "error"), [(0, ConfigurationError), ("10ms", TypeError)])
+    def test_rejects_bad_budget(self, budget, error):
+        queue = _queue(fakeredis.FakeRedis(), 1)
+
+        with pytest.raises(error, match="script_budget_seconds"):
+            queue.redrive_dead_letters(script_budget_seconds=budget)
+
+
+class TestAsyncRedriveBatches:
+    @pytest.mark.asyncio
+    async def test_large_redrive_keeps_order(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("batches-async", client=client, max_delivery_count=1)
+        for index in range(700):
+            await client.lpush(queue.key.dead_letter, f"m{index}")
+
+        assert await queue.redrive_dead_letters(max_messages=650) == 650
+
+        entries = list(reversed(await client.lrange(queue.key.pending, 0, -1)))
+        assert [decode_stored_message(entry) for entry in entries] == [f"m{index}".encode() for index in range(650)]
+        assert len({read_stored_message_id(entry) for entry in entries}) == 650
@@ -0,0 +1,143 @@
+"""track_round_trips: per-operation Redis round-trip, byte, and latency accounting."""
+
+import fakeredis
+import pytest
+import redis
+
+from redis_message_queue import ConfigurationError, RedisGateway, RedisMessageQueue, RoundTripStats
+from redis_message_queue.asyncio import RedisGateway as AsyncRedisGateway
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+class TestConfiguration:
+    def test_disabled_by_default(self):
+        queue = RedisMessageQueue("rt-off", client=fakeredis.FakeRedis())
+        with pytest.raises(ConfigurationError, match="track_round_trips"):
+            queue.round_trip_stats()
+
+    def test_rejects_non_bool(self):
+        with pytest.raises(TypeError, match="track_round_trips"):
+            RedisMessageQueue("rt-bad", client=fakeredis.FakeRedis(), track_round_trips=1)
+
+    def test_queue_option_conflicts_with_gateway(self):
+        gateway = RedisGateway(redis_client=fakeredis.FakeRedis())
+        with pytest.raises(ConfigurationError, match="track_round_trips"):
+            RedisMessageQueue("rt-gw", gateway=gateway, track_round_trips=True)
+
+    def test_gateway_option_feeds_the_queue(self):
+        gateway = RedisGateway(redis_client=fakeredis.FakeRedis(), track_round_trips=True)
+        queue = RedisMessageQueue("rt-gw", gateway=gateway)
+        queue.publish("m")
+
+        assert queue.round_trip_stats()["publish"].calls == 1
+        assert not gateway.is_redis_cluster
+
+
+class TestSyncRoundTrips:
+    def test_counts_publish_claim_and_ack(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("rt", client=client, track_round_trips=True)
+        queue.publish("hello")
+        with queue.process_message() as message:
+            assert message is not None
+
+        stats = queue.round_trip_stats()
+        publish = stats["publish"]
+        assert isinstance(publish, RoundTripStats)
+        # Without deduplication or a pending cap, publish is one plain LPUSH.
+        assert (publish.calls, publish.round_trips, publish.evals) == (1, 1, 0)
+        assert publish.request_bytes > len("hello")
+        assert publish.round_trip_ms >= 0
+        assert stats["claim"].calls == 1
+        assert stats["claim"].evals >= 1
+        # The claim script's source travels with every EVAL.
+        assert stats["claim"].request_bytes > 1000
+        # The ack EVAL plus deleting its replay-result key.
+        assert stats["remove"].round_trips == 2
+        assert stats["remove"].evals == 1
+        assert stats["claim"].response_bytes > len("hello")
+
+    def test_pipelined_ack_sends_both_scripts_in_one_round_trip(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("rt-pipe", client=client, track_round_trips=True)
+        queue.publish("a")
+        queue.publish("b")
+
+        queue.process_message_callback(lambda message: None, prefetch_next=True)
+
+        ack_and_claim = queue.round_trip_stats()["ack_and_claim"]
+        # One pipeline with both scripts, then deleting the ack's result key.
+        assert (ack_and_claim.calls, ack_and_claim.round_trips) == (1, 2)
+        assert (ack_and_claim.commands, ack_and_claim.evals) == (3, 2)
+
+    def test_operator_calls_and_reset(self):
+        queue = RedisMessageQueue("rt-ops", client=fakeredis.FakeRedis(), track_round_trips=True)
+        queue.stats()
+
+        stats = queue.round_trip_stats(reset=True)
+        # Every depth and lease count comes from one stats script.
+        assert stats["operator"].calls == 1
+        assert (stats["operator"].round_trips, stats["operator"].evals) == (1, 1)
+        assert queue.round_trip_stats() == {}
+
+    def test_retries_show_up_as_extra_round_trips(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue(
+            "rt-retry",
+            client=client,
+            deduplication=True,
+            get_deduplication_key=lambda message: message,
+            track_round_trips=True,
+        )
+        eval_ = client.eval
+        failures = [redis.exceptions.ConnectionError("blip")]
+
+        def flaky_eval(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return eval_(*args, **kwargs)
+
+        client.eval = flaky_eval
+        queue.publish("m")
+
+        # The deduplicated publish script is retried after the dropped reply.
+        publish = queue.round_trip_stats()["publish"]
+        assert publish.calls == 1
+        assert publish.evals == 2
+        assert client.llen(queue.key.pending) == 1
+
+
+class TestAsyncRoundTrips:
+    @pytest.mark.asyncio
+    async def test_counts_publish_claim_and_ack(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("rt-async", client=client, track_round_trips=True)
+        await queue.publish("hello")
+        async with queue.process_message() as message:
+            assert message is not None
+
+        stats = queue.round_trip_stats()
+        assert stats["publish"].calls == 1
+        assert stats["claim"].calls == 1
+        assert stats["remove"].evals == 1
+
+    @pytest.mark.asyncio
+    async def test_pipelined_ack_sends_both_scripts_in_one_round_trip(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("rt-async-pipe", client=client, track_round_trips=True)
+        await queue.publish("a")
+        await queue.publish("b")
+
+        await queue.process_message_callback(lambda message: None, prefetch_next=True)
+
+        ack_and_claim = queue.round_trip_stats()["ack_and_claim"]
+        assert (ack_and_claim.round_trips, ack_and_claim.commands, ack_and_claim.evals) == (2, 3, 2)
+
+    @pytest.mark.asyncio
+    async def test_gateway_option_feeds_the_queue(self):
+        gateway = AsyncRedisGateway(redis_client=fakeredis.FakeAsyncRedis(), track_round_trips=True)
+        queue = AsyncRedisMessageQueue("rt-async-gw", gateway=gateway)
+        await queue.stats()
+
+        assert queue.round_trip_stats()["operator"].calls == 1
+        assert not gateway.is_redis_cluster
@@ -0,0 +1,180 @@
+"""redrive_dead_letters(predicate=..., max_per_second=...): selective, throttled redrive."""
+
+import json
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, RedisMessageQueue
+from redis_message_queue._redrive import RedrivePacer
+from redis_message_queue._stored_message import decode_stored_message, read_stored_message_id
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+
+def _queue(client, tenants) -> RedisMessageQueue:
+    queue = RedisMessageQueue("selective", client=client, max_delivery_count=1)
+    for index, tenant in enumerate(tenants):
+        client.lpush(queue.key.dead_letter, json.dumps({"n": index, "tenant": tenant}))
+    return queue
+
+
+def _is_tenant(tenant):
+    return lambda payload: json.loads(payload)["tenant"] == tenant
+
+
+def _dead_letters(client, queue):
+    return [json.loads(entry)["n"] for entry in reversed(client.lrange(queue.key.dead_letter, 0, -1))]
+
+
+def _pending(client, queue):
+    return [
+        json.loads(decode_stored_message(entry))["n"] for entry in reversed(client.lrange(queue.key.pending, 0, -1))
+    ]
+
+
+class TestSelectiveRedrive:
+    def test_moves_only_matches_and_keeps_the_rest_in_order(self):
+        client = fakeredis.FakeRedis()
+        tenants = ["a", "b", "a", "a", "b", "c", "a"] * 40
+        queue = _queue(client, tenants)
+
+        moved = queue.redrive_dead_letters(predicate=_is_tenant("a"))
+
+        expected_moved = [index for index, tenant in enumerate(tenants) if tenant == "a"]
+        assert moved == len(expected_moved)
+        assert _pending(client, queue) == expected_moved
+        assert _dead_letters(client, queue) == [index for index, tenant in enumerate(tenants) if tenant != "a"]
+
+    def test_redriven_entries_get_fresh_envelopes(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, ["a"])
+        client.lpush(queue.key.dead_letter, b"\xff\xfe")
+
+        assert queue.redrive_dead_letters(predicate=lambda payload: True) == 2
+
+        entries = client.lrange(queue.key.pending, 0, -1)
+        assert all(read_stored_message_id(entry) for entry in entries)
+        with queue.process_message() as message:
+            assert json.loads(message) == {"n": 0, "tenant": "a"}
+        with queue.process_message() as message:
+            assert message == b"\xff\xfe"
+
+    def test_max_messages_caps_matches(self):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, ["b", "a", "b", "a", "a"])
+
+        assert queue.redrive_dead_letters(2, predicate=_is_tenant("a")) == 2
+
+        assert _pending(client, queue) == [1, 3]
+        assert _dead_letters(client, queue) == [0, 2, 4]
+
+    def test_entry_removed_concurrently_is_skipped(self, monkeypatch):
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, ["a", "a"])
+        gateway = queue._redis
+        redrive_selected = gateway.redrive_selected_messages
+
+        def racing(dead_letter_queue, pending_queue, envelope_ids, messages, positions):
+            client.rpop(dead_letter_queue)
+            return redrive_selected(dead_letter_queue, pending_queue, envelope_ids, messages, positions)
+
+        monkeypatch.setattr(gateway, "redrive_selected_messages", racing)
+
+        assert queue.redrive_dead_letters(predicate=_is_tenant("a")) == 1
+        assert _pending(client, queue) == [1]
+
+    def test_entries_dead_lettered_meanwhile_stay_in_place(self, monkeypatch):
+        monkeypatch.setattr("redis_message_queue.redis_message_queue.time.sleep", lambda seconds: None)
+        client = fakeredis.FakeRedis()
+        tenants = ["a", "b"] * 120
+        queue = _queue(client, tenants)
+        gateway = queue._redis
+        redrive_selected = gateway.redrive_selected_messages
+        arrivals = iter(range(1000, 2000))
+
+        def racing(dead_letter_queue, *args):
+            client.lpush(dead_letter_queue, json.dumps({"n": next(arrivals), "tenant": "a"}))
+            return redrive_selected(dead_letter_queue, *args)
+
+        monkeypatch.setattr(gateway, "redrive_selected_messages", racing)
+
+        assert queue.redrive_dead_letters(predicate=_is_tenant("a"), max_per_second=30) == 120
+
+        assert _pending(client, queue) == list(range(0, 240, 2))
+        remaining = _dead_letters(client, queue)
+        assert remaining[:120] == list(range(1, 240, 2))
+        assert remaining[120:] == list(range(1000, 1000 + len(remaining) - 120))
+        assert not any(entry.startswith(b"\x1eRMQTOMBSTONE:") for entry in client.lrange(queue.key.dead_letter, 0, -1))
+
+    def test_duplicate_payloads_move_one_entry_each(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("selective", client=client, max_delivery_count=1)
+        for entry in ("same", "other", "same"):
+            client.lpush(queue.key.dead_letter, entry)
+
+        assert queue.redrive_dead_letters(predicate=lambda payload: payload == b"same") == 2
+        assert client.lrange(queue.key.dead_letter, 0, -1) == [b"other"]
+
+    @pytest.mark.parametrize(
+        ("kwargs", "error"),
+        [
+            ({"predicate": "tenant"}, TypeError),
+            ({"max_per_second": 0}, ConfigurationError),
+            ({"max_per_second": float("inf")}, ConfigurationError),
+            ({"max_per_second": True}, TypeError),
+        ],
+    )
+    def test_rejects_bad_arguments(self, kwargs, error):
+        queue = _queue(fakeredis.FakeRedis(), ["a"])
+
+        with pytest.raises(error):
+            queue.redrive_dead_letters(**kwargs)
+
+
+class TestThrottling:
+    def test_pacer_sizes_batches_to_about_one_second(self):
+        assert RedrivePacer(None).batch_size(100) == 100
+        assert RedrivePacer(25).batch_size(100) == 25
+        assert RedrivePacer(0.5).batch_size(100) == 1
+
+    def test_rate_limited_redrive_sleeps_between_batches(self, monkeypatch):
+        sleeps: list[float] = []
+        monkeypatch.setattr("redis_message_queue.redis_message_queue.time.sleep", sleeps.append)
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, ["a", "b"] * 5)
+
+        assert queue.redrive_dead_letters(predicate=_is_tenant("a"), max_per_second=2) == 5
+
+        # Batches of two, each started no earlier than moved / rate seconds in.
+        assert len(sleeps) == 3
+        assert sleeps[0] == 0
+        assert 0.5 < sleeps[1] <= 1.0 and 1.5 < sleeps[2] <= 2.0
+
+    def test_plain_redrive_is_throttled_too(self, monkeypatch):
+        sleeps: list[float] = []
+        monkeypatch.setattr("redis_message_queue.redis_message_queue.time.sleep", sleeps.append)
+        client = fakeredis.FakeRedis()
+        queue = _queue(client, ["a"] * 6)
+
+        assert queue.redrive_dead_letters(max_per_second=3) == 6
+
+        # Two full batches of three; the third call finds the list empty.
+        assert len(sleeps) == 3 and 1.5 < sleeps[2] <= 2.0
+
+
+class TestAsyncSelectiveRedrive:
+    @pytest.mark.asyncio
+    async def test_moves_only_matches(self):
+        client = fakeredis.FakeAsyncRedis()
+        queue = AsyncRedisMessageQueue("selective-async", client=client, max_delivery_count=1)
+        for index, tenant in enumerate(["a", "b", "a"]):
+            await client.lpush(queue.key.dead_letter, json.dumps({"n": index, "tenant": tenant}))
+
+        assert await queue.redrive_dead_letters(predicate=_is_tenant("b"), max_per_second=100) == 1
+
+        assert await client.lrange(queue.key.dead_letter, 0, -1) == [
+            b'{"n": 2, "tenant": "a"}',
+            b'{"n": 0, "tenant": "a"}',
+        ]
+        async with queue.process_message() as message:
+            assert json.loads(message)["n"] == 1
@@ -0,0 +1,250 @@
+"""Async serve(): one claim loop feeding up to max_in_flight handler tasks."""
+
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError
+from redis_message_queue.asyncio import RedisMessageQueue
+
+
+def _queue(name="serve", **kwargs):
+    client = fakeredis.FakeAsyncRedis()
+    return client, RedisMessageQueue(name, client=client, **kwargs)
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+class TestServeValidation:
+    @pytest.mark.asyncio
+    async def test_max_in_flight_must_be_positive(self):
+        _, queue = _queue()
+        with pytest.raises(ConfigurationError, match="max_in_flight"):
+            await queue.serve(lambda message: None, max_in_flight=0)
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight_rejects_bool(self):
+        _, queue = _queue()
+        with pytest.raises(TypeError, match="max_in_flight"):
+            await queue.serve(lambda message: None, max_in_flight=True)
+
+
+class TestServe:
+    @pytest.mark.asyncio
+    async def test_runs_handlers_concurrently_up_to_the_bound(self):
+        client, queue = _queue()
+        for index in range(30):
+            await queue.publish(f"m{index}")
+        running = 0
+        peak = 0
+        handled = []
+        saturated = asyncio.Event()
+
+        async def handler(message):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            if running == 5:
+                saturated.set()
+            # Hold the first handlers until every slot is busy so the peak
+            # does not depend on how fast claims land.
+            try:
+                await asyncio.wait_for(saturated.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                pass
+            running -= 1
+            handled.append(message)
+
+        server = asyncio.create_task(queue.serve(handler, max_in_flight=5))
+        await _wait_for(lambda: _true(len(handled) == 30))
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+        assert peak == 5
+        assert sorted(handled) == sorted(f"m{index}".encode() for index in range(30))
+        assert await client.llen(queue.key.processing) == 0
+
+    @pytest.mark.asyncio
+    async def test_claims_only_for_free_slots(self):
+        client, queue = _queue()
+        for index in range(10):
+            await queue.publish(f"m{index}")
+        release = asyncio.Event()
+
+        async def handler(message):
+            await release.wait()
+
+        server = asyncio.create_task(queue.serve(handler, max_in_flight=3))
+        await _wait_for(lambda: _llen_is(client, queue.key.processing, 3))
+        await asyncio.sleep(0.1)
+
+        assert await client.llen(queue.key.processing) == 3
+        release.set()
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_sync_handler_and_terminal_failures(self, caplog):
+        client, queue = _queue(enable_failed_queue=True)
+        await queue.publish("bad")
+        await queue.publish("good")
+        handled = []
+
+        def handler(message):
+            if message == b"bad":
+                raise ValueError("boom")
+            handled.append(message)
+
+        server = asyncio.create_task(queue.serve(handler))
+        await _wait_for(lambda: _true(handled == [b"good"]))
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+        assert await client.lrange(queue.key.failed, 0, -1) == [b"bad"]
+        assert "Message handler raised" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_running_handlers(self):
+        client, queue = _queue()
+        await queue.publish("slow")
+        started = asyncio.Event()
+        finished = []
+
+        async def handler(message):
+            started.set()
+            await asyncio.sleep(0.2)
+            finished.append(message)
+
+        server = asyncio.create_task(queue.serve(handler, max_in_flight=2))
+        await started.wait()
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+        assert finished == [b"slow"]
+        assert await client.llen(queue.key.processing) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_leaves_running_messages_in_processing(self):
+        client, queue = _queue()
+        await queue.publish("stuck")
+        started = asyncio.Event()
+
+        async def handler(message):
+            started.set()
+            await asyncio.sleep(60)
+
+        server = asyncio.create_task(queue.serve(handler))
+        await started.wait()
+        server.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server
+
+        assert await client.llen(queue.key.processing) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_handler_task_is_collected_and_logged(self, caplog):
+        class Fatal(BaseException):
+            pass
+
+        _, queue = _queue()
+        await queue.publish("fatal")
+        await queue.publish("next")
+        handled = []
+
+        def handler(message):
+            if message == b"fatal":
+                raise Fatal
+            handled.append(message)
+
+        server = asyncio.create_task(queue.serve(handler))
+        await _wait_for(lambda: _true(handled == [b"next"]))
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+        [record] = [record for record in caplog.records if "handler task failed" in record.getMessage()]
+        assert isinstance(record.exc_info[1], Fatal)
+
+
+class TestServeSharedLeaseHeartbeat:
+    @pytest.mark.asyncio
+    async def test_in_flight_leases_are_renewed_together_from_one_task(self):
+        events = []
+
+        async def observe(event):
+            events.append(event)
+
+        client, queue = _queue(visibility_timeout_seconds=5, heartbeat_interval_seconds=0.1, on_event=observe)
+        for index in range(3):
+            await queue.publish(f"m{index}")
+        renew = queue._redis._renew_message_leases
+        batches = []
+
+        async def spy(processing, leases, **kwargs):
+            batches.append(len(leases))
+            return await renew(processing, leases, **kwargs)
+
+        queue._redis._renew_message_leases = spy
+        per_message_heartbeats = []
+        queue._build_lease_heartbeat = lambda *args: per_message_heartbeats.append(args)
+        release = asyncio.Event()
+
+        async def handler(message):
+            await release.wait()
+
+        server = asyncio.create_task(queue.serve(handler, max_in_flight=3))
+        await _wait_for(lambda: _true(3 in batches))
+        release.set()
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+        assert per_message_heartbeats == []
+        renewed_ids = {event.message_id for event in events if event.operation == "lease_renew"}
+        assert len(renewed_ids) == 3
+        assert await client.llen(queue.key.processing) == 0
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_is_dropped_and_reported(self):
+        failures = []
+        client, queue = _queue(
+            visibility_timeout_seconds=5,
+            heartbeat_interval_seconds=0.1,
+            on_heartbeat_failure=lambda: failures.append(1),
+        )
+        await queue.publish("lost")
+        batches = []
+
+        async def spy(processing, leases, **kwargs):
+            batches.append(len(leases))
+            return [False] * len(leases)
+
+        queue._redis._renew_message_leases = spy
+        release = asyncio.Event()
+
+        async def handler(message):
+            await release.wait()
+
+        server = asyncio.create_task(queue.serve(handler))
+        await _wait_for(lambda: _true(failures == [1]))
+        await asyncio.sleep(0.3)
+        release.set()
+        await queue.drain(timeout=1)
+        await asyncio.wait_for(server, timeout=5)
+
+        assert batches == [1]
+
+
+async def _true(value):
+    return value
+
+
+async def _llen_is(client, key, expected):
+    return await client.llen(key) == expected
@@ -0,0 +1,117 @@
+"""stats() as one atomic Lua snapshot, and collect_stats() batching across queues."""
+
+import fakeredis
+import pytest
+import redis
+
+from redis_message_queue import LuaScriptError, RedisGateway, RedisMessageQueue, collect_stats
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+from redis_message_queue.asyncio import collect_stats as async_collect_stats
+
+
+class _LengthOnlyGateway(RedisGateway):
+    """A gateway with the per-list operator methods but no stats snapshot, like many custom gateways."""
+
+    queue_stats_snapshots = None
+
+
+def _expire_leases(client: fakeredis.FakeRedis, queue: RedisMessageQueue) -> None:
+    lease_deadlines = f"{queue.key.processing}:lease_deadlines"
+    for member in client.zrange(lease_deadlines, 0, -1):
+        client.zadd(lease_deadlines, {member: 0})
+
+
+class TestSnapshot:
+    def test_reports_depths_and_lease_counts(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("snap", client=client, visibility_timeout_seconds=60, heartbeat_interval_seconds=None)
+        for message in ("a", "b", "c"):
+            queue.publish(message)
+        with queue.process_message():
+            stats = queue.stats()
+            assert (stats.pending, stats.processing, stats.leases, stats.expired_leases) == (2, 1, 1, 0)
+            assert stats.oldest_pending_age_ms is not None
+
+            _expire_leases(client, queue)
+            assert queue.stats().expired_leases == 1
+
+    def test_without_visibility_timeout_lease_counts_are_zero(self):
+        queue = RedisMessageQueue(
+            "snap-plain",
+            client=fakeredis.FakeRedis(),
+            visibility_timeout_seconds=None,
+            max_delivery_count=None,
+            enable_completed_queue=True,
+        )
+        queue.publish("m")
+
+        stats = queue.stats()
+        assert (stats.pending, stats.processing, stats.completed, stats.failed, stats.dead_letter) == (
+            1,
+            0,
+            0,
+            None,
+            None,
+        )
+        assert (stats.leases, stats.expired_leases) == (0, 0)
+
+    def test_wrong_key_type_fails_closed(self):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("snap-wrongtype", client=client)
+        client.set(f"{queue.key.processing}:lease_deadlines", "x")
+
+        with pytest.raises((LuaScriptError, redis.exceptions.ResponseError), match="WRONGTYPE"):
+            queue.stats()
+
+    def test_gateway_without_snapshot_falls_back_to_lengths(self):
+        client = fakeredis.FakeRedis()
+        RedisMessageQueue("snap-custom", client=client).publish("m")
+        queue = RedisMessageQueue("snap-custom", gateway=_LengthOnlyGateway(redis_client=client))
+
+        stats = queue.stats()
+        assert (stats.pending, stats.processing) == (1, 0)
+        assert stats.leases is None and stats.expired_leases is None
+
+
+class TestCollectStats:
+    def test_one_pipeline_per_client_in_input_order(self):
+        client = fakeredis.FakeRedis()
+        queues = [RedisMessageQueue(f"many-{index}", client=client, track_round_trips=True) for index in range(5)]
+        for index, queue in enumerate(queues):
+            for _ in range(index):
+                queue.publish("m")
+
+        results = collect_stats(queues)
+
+        assert [stats.pending for stats in results] == [0, 1, 2, 3, 4]
+        operator = queues[0].round_trip_stats()["operator"]
+        assert (operator.round_trips, operator.evals) == (1, 5)
+
+    def test_mixed_clients_and_custom_gateways(self):
+        first, second = fakeredis.FakeRedis(), fakeredis.FakeRedis()
+        a = RedisMessageQueue("mixed-a", client=first)
+        b = RedisMessageQueue("mixed-b", client=second)
+        a.publish("m")
+        custom = RedisMessageQueue("mixed-a", gateway=_LengthOnlyGateway(redis_client=first))
+
+        results = collect_stats([b, custom, a])
+
+        assert [stats.pending for stats in results] == [0, 1, 1]
+        assert results[1].leases is None and results[2].leases == 0
+
+    def test_rejects_non_queue(self):
+        with pytest.raises(TypeError, match="queues"):
+            collect_stats(["jobs"])
+
+    @pytest.mark.asyncio
+    async def test_async_parity(self):
+        client = fakeredis.FakeAsyncRedis()
+        queues = [AsyncRedisMessageQueue(f"many-async-{index}", client=client) for index in range(3)]
+        await queues[2].publish("m")
+        async with queues[2].process_message():
+            results = await async_collect_stats(queues)
+            single = await queues[2].stats()
+
+        assert [stats.pending for stats in results] == [0, 0, 0]
+        assert (results[2].processing, results[2].leases) == (1, 1)
+        assert (single.processing, single.leases) == (1, 1)
@@ -0,0 +1,158 @@
+"""tracing=True: OpenTelemetry spans with trace context carried in the envelope."""
+
+import sys
+
+import fakeredis
+import pytest
+
+from redis_message_queue import ConfigurationError, QueueWorker, RedisMessageQueue
+from redis_message_queue._stored_message import encode_stored_message, envelope_trace_context, read_stored_trace_context
+from redis_message_queue.asyncio import RedisMessageQueue as AsyncRedisMessageQueue
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+from opentelemetry.trace import SpanKind, StatusCode  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def exporter(monkeypatch):
+    """Route the queue's spans to an in-memory exporter for one test only.
+
+    ``trace.set_tracer_provider`` can be called once per process, so the test
+    provider is swapped in through ``get_tracer_provider`` instead of being
+    installed globally.
+    """
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer_provider", lambda: provider)
+    yield exporter
+    provider.shutdown()
+
+
+@pytest.fixture
+def tracer():
+    return trace.get_tracer("tests")
+
+
+def _spans(exporter: InMemorySpanExporter, name: str):
+    return [span for span in exporter.get_finished_spans() if span.name == name]
+
+
+class TestConfiguration:
+    def test_rejects_non_bool(self):
+        with pytest.raises(TypeError, match="tracing"):
+            RedisMessageQueue("traced", client=fakeredis.FakeRedis(), tracing=1)
+
+    def test_missing_opentelemetry_is_a_configuration_error(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "opentelemetry", None)
+        with pytest.raises(ConfigurationError, match="opentelemetry-api"):
+            RedisMessageQueue("traced", client=fakeredis.FakeRedis(), tracing=True)
+
+
+class TestEnvelope:
+    def test_untraced_envelopes_have_no_trace_context(self):
+        assert read_stored_trace_context(encode_stored_message("plain")) is None
+        assert read_stored_trace_context(encode_stored_message(b"bytes")) is None
+
+    def test_payload_lookalike_is_not_mistaken_for_trace_context(self):
+        stored = encode_stored_message('x","trace":{"traceparent":"forged"}')
+
+        assert read_stored_trace_context(stored) is None
+
+    def test_trace_context_is_written_ahead_of_the_payload(self):
+        carrier = {"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"}
+        token = envelope_trace_context.set(carrier)
+        try:
+            stored = encode_stored_message('x","trace":{"traceparent":"forged"}')
+        finally:
+            envelope_trace_context.reset(token)
+
+        assert stored.index('"trace"') < stored.index('"payload"')
+        assert read_stored_trace_context(stored) == carrier
+        assert read_stored_trace_context(stored.encode("utf-8")) == carrier
+
+
+class TestSyncTracing:
+    def test_consumer_span_continues_the_publisher_trace(self, exporter, tracer):
+        client = fakeredis.FakeRedis()
+        queue = RedisMessageQueue("traced", client=client, tracing=True)
+        with tracer.start_as_current_span("request"):
+            queue.publish("hello")
+        with queue.process_message() as message:
+            assert message == b"hello"
+            with tracer.start_as_current_span("handler work"):
+                pass
+
+        (request,) = _spans(exporter, "request")
+        (producer,) = _spans(exporter, "publish traced")
+        (consumer,) = _spans(exporter, "process traced")
+        (work,) = _spans(exporter, "handler work")
+        assert producer.kind is SpanKind.PRODUCER
+        assert producer.parent.span_id == request.context.span_id
+        assert consumer.kind is SpanKind.CONSUMER
+        assert consumer.context.trace_id == request.context.trace_id
+        assert consumer.parent.span_id == producer.context.span_id
+        # The consumer span is current inside the block.
+        assert work.parent.span_id == consumer.context.span_id
+        attributes = consumer.attributes
+        assert attributes["messaging.destination.name"] == "traced"
+        assert attributes["rmq.outcome"] == "ack"
+        assert attributes["rmq.delivery_count"] == 1
+        for phase in ("claim", "handler", "ack"):
+            assert attributes[f"rmq.{phase}.duration_ms"] >= 0
+        assert trace.get_current_span() is trace.INVALID_SPAN
+
+    def test_handler_failure_marks_the_span_without_the_message(self, exporter):
+        queue = RedisMessageQueue("traced-fail", client=fakeredis.FakeRedis(), tracing=True)
+        queue.publish("m")
+        with pytest.raises(ValueError):
+            with queue.process_message():
+                raise ValueError("secret=hunter2")
+
+        (consumer,) = _spans(exporter, "process traced-fail")
+        assert consumer.status.status_code is StatusCode.ERROR
+        assert consumer.attributes["error.type"] == "ValueError"
+        assert consumer.attributes["rmq.outcome"] == "nack"
+        assert "hunter2" not in str(consumer.status.description) and not consumer.events
+
+    def test_untraced_publisher_starts_a_new_trace(self, exporter):
+        client = fakeredis.FakeRedis()
+        RedisMessageQueue("traced-mixed", client=client).publish("m")
+        queue = RedisMessageQueue("traced-mixed", client=client, tracing=True)
+        with queue.process_message():
+            pass
+
+        (consumer,) = _spans(exporter, "process traced-mixed")
+        assert consumer.parent is None
+
+    def test_queue_worker_records_spans(self, exporter):
+        queue = RedisMessageQueue("traced-worker", client=fakeredis.FakeRedis(), tracing=True)
+        queue.publish("m")
+        worker = QueueWorker(queue, lambda message: worker.stop(), concurrency=2)
+        worker.run()
+
+        (consumer,) = _spans(exporter, "process traced-worker")
+        assert consumer.attributes["rmq.outcome"] == "ack"
+        assert consumer.parent.span_id == _spans(exporter, "publish traced-worker")[0].context.span_id
+
+
+class TestAsyncTracing:
+    @pytest.mark.asyncio
+    async def test_consumer_span_continues_the_publisher_trace(self, exporter, tracer):
+        queue = AsyncRedisMessageQueue("traced-async", client=fakeredis.FakeAsyncRedis(), tracing=True)
+        await queue.publish("hello")
+        async with queue.process_message():
+            with tracer.start_as_current_span("handler work"):
+                pass
+
+        (producer,) = _spans(exporter, "publish traced-async")
+        (consumer,) = _spans(exporter, "process traced-async")
+        (work,) = _spans(exporter, "handler work")
+        assert consumer.parent.span_id == producer.context.span_id
+        assert work.parent.span_id == consumer.context.span_id
+        assert consumer.attributes["rmq.outcome"] == "ack"